@@ -0,0 +1,50 @@
+"""Competitor keyword results
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "competitor_keyword_results",
+        sa.Column("id", postgresql.UUID(as_uuid=False), primary_key=True),
+        sa.Column("query", sa.String(255), nullable=False, index=True),
+        sa.Column("domain_profile", sa.String(50), nullable=False, server_default=""),
+        sa.Column("max_articles", sa.Integer, nullable=False),
+        sa.Column("total_articles", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("result", postgresql.JSONB, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "query", "domain_profile", name="uq_competitor_keyword_results_query_profile"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("competitor_keyword_results")
@@ -0,0 +1,72 @@
+"""SERP snapshots
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "serp_pages",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("url", sa.Text, nullable=False, index=True),
+        sa.Column("title", sa.Text, nullable=False, server_default=""),
+        sa.Column("content", sa.Text, nullable=False, server_default=""),
+        sa.Column(
+            "first_seen_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    op.create_table(
+        "serp_snapshots",
+        sa.Column("id", postgresql.UUID(as_uuid=False), primary_key=True),
+        sa.Column("query", sa.String(500), nullable=False, index=True),
+        sa.Column("domain_profile", sa.String(50), nullable=False, server_default=""),
+        sa.Column("search_depth", sa.String(20), nullable=False, server_default="basic"),
+        sa.Column("max_results", sa.Integer, nullable=False),
+        sa.Column("snapshot_date", sa.Date, nullable=False),
+        sa.Column("answer", sa.Text, nullable=False, server_default=""),
+        sa.Column("results", postgresql.JSONB, nullable=False),
+        sa.Column("results_hash", sa.String(64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "query",
+            "domain_profile",
+            "search_depth",
+            "snapshot_date",
+            name="uq_serp_snapshots_query_profile_depth_date",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("serp_snapshots")
+    op.drop_table("serp_pages")
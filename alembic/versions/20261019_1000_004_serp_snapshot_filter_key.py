@@ -0,0 +1,53 @@
+"""SERP snapshot filter key
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing snapshots keep "" (filters unknown), so they stay in the history
+    # but never match a lookup
+    op.add_column(
+        "serp_snapshots",
+        sa.Column("filter_key", sa.String(64), nullable=False, server_default=""),
+    )
+    op.drop_constraint(
+        "uq_serp_snapshots_query_profile_depth_date", "serp_snapshots", type_="unique"
+    )
+    op.create_unique_constraint(
+        "uq_serp_snapshots_query_profile_depth_filter_date",
+        "serp_snapshots",
+        ["query", "domain_profile", "search_depth", "filter_key", "snapshot_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_serp_snapshots_query_profile_depth_filter_date", "serp_snapshots", type_="unique"
+    )
+    op.execute(
+        "DELETE FROM serp_snapshots a USING serp_snapshots b "
+        "WHERE a.query = b.query AND a.domain_profile = b.domain_profile "
+        "AND a.search_depth = b.search_depth AND a.snapshot_date = b.snapshot_date "
+        "AND a.updated_at < b.updated_at"
+    )
+    op.drop_column("serp_snapshots", "filter_key")
+    op.create_unique_constraint(
+        "uq_serp_snapshots_query_profile_depth_date",
+        "serp_snapshots",
+        ["query", "domain_profile", "search_depth", "snapshot_date"],
+    )
@@ -0,0 +1,151 @@
+"""
+EPM Note Engine - Competitor Keyword Extraction Benchmark
+
+Compare the previous per-text keyword extraction (every title/heading tokenized
+in sequence, articles approximated by text index) with the batched analyzer on
+synthetic competitor result sets, and report how far the old article counts
+were off.
+
+Usage:
+    python scripts/benchmark_competitor_keywords.py
+    python scripts/benchmark_competitor_keywords.py --sizes 10 50 200 --headings 8 --repeat 3
+
+Options:
+    --sizes     Numbers of search results to benchmark (default: 10 50 200)
+    --headings  Headings per article (default: 8)
+    --repeat    Runs per measurement; the best is reported (default: 3)
+    --seed      Random seed for the synthetic corpus (default: 42)
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services import japanese_tokenizer
+from src.services.competitor_keywords import (
+    CompetitorDocument,
+    CompetitorKeywordAnalyzer,
+)
+from src.services.japanese_tokenizer import JANOME_AVAILABLE
+
+TOPICS = ["予算管理", "経営管理", "管理会計", "予実分析", "資金繰り", "原価計算", "KPI設計", "事業計画"]
+ASPECTS = ["とは", "の基本", "の進め方", "のメリット", "の課題", "の事例", "のツール比較", "のポイント"]
+COMMON_HEADINGS = ["まとめ", "よくある質問", "関連記事", "お問い合わせ"]
+
+
+def build_corpus(size: int, headings_per_article: int, seed: int) -> list[CompetitorDocument]:
+    """Build synthetic results with the repetition typical of real SERPs."""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(size):
+        topic = rng.choice(TOPICS)
+        title = f"{topic}{rng.choice(ASPECTS)}【{2020 + i % 6}年版】"
+        headings = [
+            f"{rng.choice(TOPICS)}{rng.choice(ASPECTS)}"
+            for _ in range(headings_per_article - 1)
+        ]
+        headings.append(rng.choice(COMMON_HEADINGS))
+        documents.append(CompetitorDocument(title=title, headings=headings))
+    return documents
+
+
+def legacy_extract(documents: list[CompetitorDocument]) -> dict[str, dict[str, int]]:
+    """Previous implementation: sequential per-text tokenization, idx // 2 articles."""
+    tokenizer = japanese_tokenizer.get_tokenizer()
+    text_parts = []
+    for document in documents:
+        if document.title:
+            text_parts.append(("title", document.title))
+        text_parts.extend(("heading", h) for h in document.headings)
+
+    articles: dict[str, set[int]] = {}
+    titles: dict[str, int] = {}
+    headings: dict[str, int] = {}
+    for idx, (text_type, text) in enumerate(text_parts):
+        tokens = list(tokenizer.tokenize(text))
+        nouns = {
+            t.surface for t in tokens
+            if t.part_of_speech.startswith("名詞") and len(t.surface) >= 2 and not t.surface.isdigit()
+        }
+        surfaces = [t.surface for t in tokens if t.part_of_speech.startswith("名詞")]
+        nouns.update(
+            a + b for a, b in zip(surfaces, surfaces[1:]) if len(a + b) >= 3
+        )
+        for noun in nouns:
+            articles.setdefault(noun, set()).add(idx // 2)
+            titles[noun] = titles.get(noun, 0) + (text_type == "title")
+            headings[noun] = headings.get(noun, 0) + (text_type == "heading")
+
+    return {
+        kw: {
+            "article_count": len(articles[kw]),
+            "found_in_titles": titles[kw],
+            "found_in_headings": headings[kw],
+        }
+        for kw in articles
+    }
+
+
+def best_of(repeat: int, fn, before=None) -> float:
+    """Best wall-clock time of fn over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark competitor keyword extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--headings", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not JANOME_AVAILABLE:
+        print("Janome is not installed; nothing to benchmark.")
+        return
+
+    # Dictionary load is a one-time startup cost, not part of the comparison
+    japanese_tokenizer.warm_up()
+
+    print(f"{'results':>7} {'texts':>6} {'unique':>6} {'legacy':>9} {'cold':>9} {'warm':>9} {'speedup':>7} {'wrong counts':>12}")
+    for size in args.sizes:
+        documents = build_corpus(size, args.headings, args.seed)
+        texts = [d.title for d in documents] + [h for d in documents for h in d.headings]
+
+        legacy_time = best_of(args.repeat, lambda: legacy_extract(documents))
+        cold_time = best_of(
+            args.repeat,
+            lambda: CompetitorKeywordAnalyzer().analyze(documents),
+            before=japanese_tokenizer.clear_cache,
+        )
+        warm_time = best_of(args.repeat, lambda: CompetitorKeywordAnalyzer().analyze(documents))
+
+        legacy = legacy_extract(documents)
+        exact = CompetitorKeywordAnalyzer().analyze(documents)
+        shared = exact.keys() & legacy.keys()
+        wrong = sum(
+            1 for kw in shared
+            if legacy[kw]["article_count"] != exact[kw]["article_count"]
+        )
+
+        print(
+            f"{size:>7} {len(texts):>6} {len(set(texts)):>6} "
+            f"{legacy_time * 1000:>7.1f}ms {cold_time * 1000:>7.1f}ms {warm_time * 1000:>7.1f}ms "
+            f"{legacy_time / cold_time:>6.1f}x {wrong:>5}/{len(shared):<6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
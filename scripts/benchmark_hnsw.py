@@ -0,0 +1,330 @@
+"""
+EPM Note Engine - HNSW Parameter Benchmark
+
+Sweep Chroma HNSW parameters over a snapshot of our own embeddings and report
+recall@k against brute-force search, p50/p95 query latency and index size on disk.
+
+A snapshot is an .npz file with the ids and embeddings of a collection, so the
+sweep never calls the embedding API. Query vectors are held out of the index.
+
+Usage:
+    # 1. Export a snapshot of the live collection
+    python scripts/benchmark_hnsw.py --collection archive_index --export data/archive_snapshot.npz
+
+    # 2. Sweep parameters against the snapshot
+    python scripts/benchmark_hnsw.py --snapshot data/archive_snapshot.npz \\
+        --space l2 cosine --m 8 16 32 --construction-ef 100 200 --search-ef 10 50 100
+
+Options:
+    --collection       Collection to export/benchmark (knowledge_base or archive_index)
+    --export PATH      Write a snapshot of the collection and exit
+    --snapshot PATH    Benchmark a snapshot (default: read the live collection)
+    --space            Distance metrics to sweep
+    --m                HNSW max neighbors values to sweep
+    --construction-ef  Build-time candidate list sizes to sweep
+    --search-ef        Query-time candidate list sizes to sweep
+    --k                Neighbors per query for recall@k (default: 10)
+    --queries          Number of held-out query vectors (default: 200)
+    --json PATH        Also write the results as JSON
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import chromadb
+from chromadb.api.shared_system_client import SharedSystemClient
+from chromadb.config import Settings as ChromaSettings
+
+BENCHMARK_COLLECTION = "hnsw_benchmark"
+
+
+def load_collection_embeddings(collection_name: str, page_size: int = 1000) -> tuple[list[str], np.ndarray]:
+    """Read ids and stored embeddings from the live collection, page by page."""
+    from src.repositories.rag_service import RAGService
+
+    collection = RAGService()._get_collection(collection_name)
+    ids: list[str] = []
+    vectors: list[np.ndarray] = []
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings"], limit=page_size, offset=offset)
+        page_ids = page.get("ids") or []
+        if not page_ids:
+            break
+        ids.extend(page_ids)
+        vectors.append(np.asarray(page["embeddings"], dtype=np.float32))
+        if len(page_ids) < page_size:
+            break
+        offset += len(page_ids)
+
+    if not ids:
+        return [], np.empty((0, 0), dtype=np.float32)
+    return ids, np.vstack(vectors)
+
+
+def save_snapshot(path: Path, ids: list[str], embeddings: np.ndarray) -> None:
+    """Write a snapshot file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, ids=np.asarray(ids), embeddings=embeddings)
+
+
+def load_snapshot(path: Path) -> tuple[list[str], np.ndarray]:
+    """Read a snapshot file."""
+    data = np.load(path, allow_pickle=False)
+    return [str(i) for i in data["ids"]], data["embeddings"].astype(np.float32)
+
+
+def brute_force_neighbors(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    space: str,
+) -> np.ndarray:
+    """
+    Exact top-k neighbor indices using the same distance as Chroma.
+
+    Returns:
+        Array of shape (len(queries), k) with corpus row indices.
+    """
+    if space == "cosine":
+        corpus_n = corpus / np.linalg.norm(corpus, axis=1, keepdims=True).clip(min=1e-12)
+        queries_n = queries / np.linalg.norm(queries, axis=1, keepdims=True).clip(min=1e-12)
+        distances = 1.0 - queries_n @ corpus_n.T
+    elif space == "ip":
+        distances = 1.0 - queries @ corpus.T
+    else:
+        distances = (
+            (queries ** 2).sum(axis=1, keepdims=True)
+            - 2.0 * queries @ corpus.T
+            + (corpus ** 2).sum(axis=1)
+        )
+
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    rows = np.arange(len(queries))[:, None]
+    order = np.argsort(distances[rows, top], axis=1)
+    return top[rows, order]
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of all files under path."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def build_index(
+    workdir: Path,
+    ids: list[str],
+    embeddings: np.ndarray,
+    space: str,
+    m: int,
+    construction_ef: int,
+) -> None:
+    """Build a fresh persistent collection from the snapshot vectors."""
+    client = chromadb.PersistentClient(
+        path=str(workdir),
+        settings=ChromaSettings(anonymized_telemetry=False),
+    )
+    collection = client.create_collection(
+        name=BENCHMARK_COLLECTION,
+        metadata={
+            "hnsw:space": space,
+            "hnsw:M": m,
+            "hnsw:construction_ef": construction_ef,
+        },
+        embedding_function=None,
+    )
+    batch_size = client.get_max_batch_size()
+    for i in range(0, len(ids), batch_size):
+        collection.add(
+            ids=ids[i:i + batch_size],
+            embeddings=embeddings[i:i + batch_size],
+        )
+
+
+def close_clients() -> None:
+    """Stop all cached Chroma clients so segments are flushed and reloaded fresh."""
+    SharedSystemClient.clear_system_cache()
+
+
+def open_index(workdir: Path, search_ef: int):
+    """
+    Open the built collection with the given search_ef.
+
+    search_ef is read when the HNSW segment is loaded, so it is set before the
+    first query of a freshly opened client.
+    """
+    client = chromadb.PersistentClient(
+        path=str(workdir),
+        settings=ChromaSettings(anonymized_telemetry=False),
+    )
+    collection = client.get_collection(BENCHMARK_COLLECTION, embedding_function=None)
+    collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+    return collection
+
+
+def run_queries(collection, queries: np.ndarray, k: int) -> tuple[list[list[str]], list[float]]:
+    """Run one query at a time and record per-query latency in milliseconds."""
+    results: list[list[str]] = []
+    latencies: list[float] = []
+    for query in queries:
+        start = time.perf_counter()
+        response = collection.query(query_embeddings=[query], n_results=k, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(response["ids"][0])
+    return results, latencies
+
+
+def recall_at_k(found: list[list[str]], expected: list[list[str]]) -> float:
+    """Mean fraction of the exact top-k ids returned by the index."""
+    if not expected:
+        return 0.0
+    hits = [
+        len(set(f) & set(e)) / len(e)
+        for f, e in zip(found, expected)
+        if e
+    ]
+    return float(np.mean(hits)) if hits else 0.0
+
+
+def benchmark(
+    ids: list[str],
+    embeddings: np.ndarray,
+    spaces: list[str],
+    m_values: list[int],
+    construction_efs: list[int],
+    search_efs: list[int],
+    k: int = 10,
+    num_queries: int = 200,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Sweep HNSW parameters and measure recall, latency and size.
+
+    Each (space, M, construction_ef) combination is built once; each search_ef
+    is measured on a freshly reopened client.
+
+    Returns:
+        One result dict per parameter combination.
+    """
+    rng = np.random.default_rng(seed)
+    num_queries = min(num_queries, max(len(ids) - k, 0))
+    if num_queries <= 0:
+        raise ValueError(f"Snapshot has {len(ids)} vectors; need more than k={k}")
+
+    order = rng.permutation(len(ids))
+    query_rows, corpus_rows = order[:num_queries], order[num_queries:]
+    corpus_ids = [ids[i] for i in corpus_rows]
+    corpus = embeddings[corpus_rows]
+    queries = embeddings[query_rows]
+
+    results: list[dict] = []
+    for space in spaces:
+        exact = brute_force_neighbors(corpus, queries, k, space)
+        expected = [[corpus_ids[j] for j in row] for row in exact]
+
+        for m, construction_ef in itertools.product(m_values, construction_efs):
+            with tempfile.TemporaryDirectory(prefix="hnsw_bench_") as tmp:
+                workdir = Path(tmp)
+                start = time.perf_counter()
+                build_index(workdir, corpus_ids, corpus, space, m, construction_ef)
+                build_seconds = time.perf_counter() - start
+                # Closing the client flushes the HNSW segment to disk
+                close_clients()
+                size_bytes = directory_size(workdir)
+
+                for search_ef in search_efs:
+                    collection = open_index(workdir, search_ef)
+                    found, latencies = run_queries(collection, queries, k)
+                    close_clients()
+                    row = {
+                        "space": space,
+                        "m": m,
+                        "construction_ef": construction_ef,
+                        "search_ef": search_ef,
+                        "recall_at_k": recall_at_k(found, expected),
+                        "p50_ms": float(np.percentile(latencies, 50)),
+                        "p95_ms": float(np.percentile(latencies, 95)),
+                        "build_seconds": build_seconds,
+                        "index_mb": size_bytes / (1024 * 1024),
+                    }
+                    results.append(row)
+                    print(
+                        f"  {space:<6} M={m:<3} cef={construction_ef:<4} sef={search_ef:<4} "
+                        f"recall@{k}={row['recall_at_k']:.3f}  "
+                        f"p50={row['p50_ms']:.2f}ms  p95={row['p95_ms']:.2f}ms  "
+                        f"build={build_seconds:.1f}s  size={row['index_mb']:.1f}MB"
+                    )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Chroma HNSW parameters")
+    parser.add_argument(
+        "--collection",
+        choices=["knowledge_base", "archive_index"],
+        default="archive_index",
+        help="Collection to export/benchmark",
+    )
+    parser.add_argument("--export", type=Path, help="Write a snapshot and exit")
+    parser.add_argument("--snapshot", type=Path, help="Benchmark a snapshot file")
+    parser.add_argument("--space", nargs="+", default=["l2"], choices=["l2", "cosine", "ip"])
+    parser.add_argument("--m", nargs="+", type=int, default=[16])
+    parser.add_argument("--construction-ef", nargs="+", type=int, default=[100])
+    parser.add_argument("--search-ef", nargs="+", type=int, default=[10, 50, 100])
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out query vectors")
+    parser.add_argument("--json", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EPM Note Engine - HNSW Benchmark")
+    print("=" * 60)
+
+    if args.snapshot:
+        ids, embeddings = load_snapshot(args.snapshot)
+        print(f"Snapshot: {args.snapshot}")
+    else:
+        ids, embeddings = load_collection_embeddings(args.collection)
+        print(f"Collection: {args.collection}")
+    print(f"Vectors: {len(ids)}  Dimensions: {embeddings.shape[1] if len(ids) else 0}")
+
+    if args.export:
+        save_snapshot(args.export, ids, embeddings)
+        print(f"Snapshot written: {args.export}")
+        return
+
+    if not ids:
+        print("[ERROR] No vectors to benchmark")
+        sys.exit(1)
+
+    print(f"\nSweeping (k={args.k}, queries={args.queries}):")
+    results = benchmark(
+        ids,
+        embeddings,
+        spaces=args.space,
+        m_values=args.m,
+        construction_efs=args.construction_ef,
+        search_efs=args.search_ef,
+        k=args.k,
+        num_queries=args.queries,
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written: {args.json}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
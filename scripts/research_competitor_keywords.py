@@ -0,0 +1,100 @@
+"""
+EPM Note Engine - Batch Competitor Keyword Research
+
+Extract competitor keywords for many seed queries with bounded concurrency and
+store the results in PostgreSQL (competitor_keyword_results) for instant
+lookup in the editor.
+
+Usage:
+    # Every planned article's SEO keywords
+    python scripts/research_competitor_keywords.py --from-articles
+
+    # Explicit queries
+    python scripts/research_competitor_keywords.py 予算管理 予実管理 FP&A
+
+Options:
+    --from-articles     Use SEO keywords of planned (PLANNING) articles
+    --all-statuses      With --from-articles, include articles in any status
+    --profile NAME      Tavily domain profile
+    --max-articles N    Articles analyzed per query (default: 10)
+    --concurrency N     Concurrent searches (default: COMPETITOR_BATCH_CONCURRENCY)
+    --max-age-days D    Reuse stored results younger than D days
+    --refresh           Re-research every query
+    --dry-run           List the queries without searching
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.models import ArticleStatus
+from src.services.competitor_keyword_batch import (
+    collect_planned_queries,
+    run_competitor_keyword_batch,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch competitor keyword research")
+    parser.add_argument("queries", nargs="*", help="Seed queries")
+    parser.add_argument("--from-articles", action="store_true", help="Use planned articles' SEO keywords")
+    parser.add_argument("--all-statuses", action="store_true", help="Include articles in any status")
+    parser.add_argument("--profile", default=None, help="Tavily domain profile")
+    parser.add_argument("--max-articles", type=int, default=10, help="Articles per query")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent searches")
+    parser.add_argument("--max-age-days", type=float, default=None, help="Reuse results younger than this")
+    parser.add_argument("--refresh", action="store_true", help="Ignore stored results")
+    parser.add_argument("--dry-run", action="store_true", help="List queries only")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("EPM Note Engine - Batch Competitor Keyword Research")
+    print("=" * 60)
+
+    queries = list(args.queries)
+    if args.from_articles:
+        statuses = tuple(ArticleStatus) if args.all_statuses else (ArticleStatus.PLANNING,)
+        queries.extend(collect_planned_queries(statuses=statuses))
+    queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+
+    if not queries:
+        print("No queries. Pass queries or --from-articles.")
+        return
+
+    print(f"Queries: {len(queries)}")
+    if args.dry_run:
+        for query in queries:
+            print(f"  - {query}")
+        print("=" * 60)
+        return
+
+    def on_progress(query: str, status: str) -> None:
+        print(f"  [{status}] {query}", flush=True)
+
+    stats = run_competitor_keyword_batch(
+        queries,
+        domain_profile=args.profile,
+        max_articles=args.max_articles,
+        max_concurrency=args.concurrency,
+        max_age_days=args.max_age_days,
+        refresh=args.refresh,
+        on_progress=on_progress,
+    )
+
+    print("\nSummary:")
+    print(f"  Queries: {stats.queries}")
+    print(f"  Reused (stored): {stats.reused}")
+    print(f"  Researched: {stats.researched}")
+    print(f"  Stored: {stats.stored}")
+    print(f"  Failed: {len(stats.failed)}")
+    for query in stats.failed:
+        print(f"    - {query}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
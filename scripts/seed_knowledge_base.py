@@ -4,7 +4,7 @@ EPM Note Engine - Knowledge Base Seeder
 91_RefDoc/ 配下の資料をChromaDBのknowledge_baseコレクションに投入する。
 
 使い方:
-    python scripts/seed_knowledge_base.py
+    python scripts/seed_knowledge_base.py [--workers N]
 
 対応形式:
     - .md (Markdown)
@@ -21,8 +21,12 @@ EPM Note Engine - Knowledge Base Seeder
 
 import hashlib
 import json
+import os
 import re
 import sys
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 # Add project root to path
@@ -46,6 +50,9 @@ FOLDER_TO_DOCTYPE = {
     "05_": "article_candidate",
 }
 
+# 埋め込み・upsertに流すチャンク数の単位（add_documentsのAPIバッチと揃える）
+INSERT_BATCH_SIZE = 100
+
 
 def sanitize_text(text: str) -> str:
     """Remove control characters that can break embeddings."""
@@ -194,6 +201,11 @@ def read_pdf(file_path: Path) -> tuple[str, dict]:
     return content, metadata
 
 
+def source_id_prefix(source_rel_path: str) -> str:
+    """相対パスから決定的なドキュメントIDプレフィックスを生成する。"""
+    return hashlib.sha1(str(source_rel_path).encode("utf-8")).hexdigest()[:12]
+
+
 def process_file(file_path: Path, ref_doc_dir: Path) -> list[tuple[str, str, dict]]:
     """
     ファイルを処理してチャンクのリストを返す。
@@ -223,9 +235,9 @@ def process_file(file_path: Path, ref_doc_dir: Path) -> list[tuple[str, str, dic
         # チャンクに分割
         chunks = chunk_text(content)
 
+        rel_hash = source_id_prefix(metadata["source_rel_path"])
         results = []
         for i, chunk in enumerate(chunks):
-            rel_hash = hashlib.sha1(str(metadata["source_rel_path"]).encode("utf-8")).hexdigest()[:12]
             doc_id = f"{rel_hash}_{i:03d}"
             chunk_metadata = {
                 **metadata,
@@ -241,13 +253,117 @@ def process_file(file_path: Path, ref_doc_dir: Path) -> list[tuple[str, str, dic
         return []
 
 
-def seed_knowledge_base(ref_doc_dir: Path, dry_run: bool = False, prune_missing: bool = False) -> dict:
+def iter_parsed_files(
+    files: list[Path],
+    ref_doc_dir: Path,
+    workers: int = 1,
+) -> Iterator[tuple[Path, list[tuple[str, str, dict]]]]:
+    """
+    ファイルをプロセスプールで並列にパース・チャンク分割し、完了順に返す。
+
+    投入待ちのファイル数を workers * 2 件までに制限し、
+    パース結果がメモリに溜まり続けないようにする。
+
+    ワーカープロセスが異常終了してプールが壊れた場合は、その時点で処理中だった
+    ファイルを失敗扱い（チャンクなし）とし、残りのファイルは同一プロセスで逐次処理する。
+
+    Args:
+        files: 処理対象ファイル
+        ref_doc_dir: 91_RefDoc ディレクトリのパス
+        workers: ワーカープロセス数（1以下なら同一プロセスで逐次処理）
+
+    Yields:
+        (file_path, process_file の結果) のタプル
+    """
+    file_iter = iter(files)
+    if workers > 1:
+        yield from _iter_parsed_in_pool(file_iter, ref_doc_dir, workers)
+
+    for file_path in file_iter:
+        yield file_path, process_file(file_path, ref_doc_dir)
+
+
+def _iter_parsed_in_pool(
+    file_iter: Iterator[Path],
+    ref_doc_dir: Path,
+    workers: int,
+) -> Iterator[tuple[Path, list[tuple[str, str, dict]]]]:
+    """プロセスプールでパースする。プールが壊れたら処理中のファイルを失敗として返して終了する。"""
+    max_pending = workers * 2
+    pending: dict = {}
+    # 壊れたプールへの投入に失敗したファイル
+    unsubmitted: list[Path] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next() -> None:
+            file_path = next(file_iter, None)
+            if file_path is not None:
+                try:
+                    pending[executor.submit(process_file, file_path, ref_doc_dir)] = file_path
+                except BrokenProcessPool:
+                    unsubmitted.append(file_path)
+                    raise
+
+        try:
+            for _ in range(max_pending):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending[future]
+                    try:
+                        chunks = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        print(f"  Error processing {file_path}: {e}")
+                        chunks = []
+                    del pending[future]
+                    yield file_path, chunks
+                    submit_next()
+        except BrokenProcessPool as e:
+            in_flight = list(pending.values())
+            print(
+                f"  Worker process died ({e}); skipping {len(in_flight)} file(s) in flight: "
+                + ", ".join(str(f.relative_to(ref_doc_dir)) for f in in_flight)
+            )
+            print("  Parsing the remaining files in this process")
+            for file_path in in_flight:
+                yield file_path, []
+
+    for file_path in unsubmitted:
+        yield file_path, process_file(file_path, ref_doc_dir)
+
+
+def _insert_chunks(rag_service: RAGService, documents: list[tuple[str, str, dict]]) -> None:
+    """チャンクをknowledge_baseにupsertする。"""
+    rag_service.add_documents(
+        collection_name="knowledge_base",
+        document_ids=[d[0] for d in documents],
+        contents=[d[1] for d in documents],
+        metadatas=[d[2] for d in documents],
+    )
+
+
+def seed_knowledge_base(
+    ref_doc_dir: Path,
+    dry_run: bool = False,
+    prune_missing: bool = False,
+    workers: int | None = None,
+) -> dict:
     """
     91_RefDoc/ 配下のファイルをknowledge_baseに投入する。
 
+    パースは複数プロセスで並列に行い、完了したファイルから順次
+    INSERT_BATCH_SIZE 単位で埋め込み・upsertする。
+
     Args:
         ref_doc_dir: 91_RefDoc ディレクトリのパス
         dry_run: Trueの場合、実際には投入せずカウントのみ
+        prune_missing: Trueの場合、存在しないファイル由来のチャンクも削除（source_path を持つシード由来のチャンクのみ）
+        workers: パース用ワーカープロセス数（省略時はCPUコア数）
 
     Returns:
         統計情報の辞書
@@ -260,69 +376,73 @@ def seed_knowledge_base(ref_doc_dir: Path, dry_run: bool = False, prune_missing:
 
     # 対象ファイルを収集
     supported_extensions = {".md", ".txt", ".json", ".pdf"}
-    files = [
+    files = sorted(
         f for f in ref_doc_dir.rglob("*")
         if f.is_file() and f.suffix.lower() in supported_extensions
-    ]
+    )
 
-    print(f"Found {len(files)} files to process")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+
+    print(f"Found {len(files)} files to process (workers: {workers})")
 
     if not dry_run:
         rag_service = RAGService()
-        if prune_missing:
-            existing = rag_service.get_all_documents("knowledge_base")
-            existing_paths = set()
-            for meta in existing.get("metadatas", []) or []:
-                if meta and meta.get("source_path"):
-                    existing_paths.add(meta.get("source_path"))
-            current_paths = set(str(f) for f in files)
-            stale_paths = existing_paths - current_paths
-            for stale_path in stale_paths:
-                rag_service.delete_by_metadata("knowledge_base", {"source_path": stale_path})
         # 既存のknowledge_baseをクリア（オプション）
         # rag_service.clear_collection("knowledge_base")
 
     stats = {
         "files_processed": 0,
         "chunks_created": 0,
+        "chunks_pruned": 0,
         "by_document_type": {},
         "errors": 0,
     }
 
-    all_documents = []
+    pending_documents: list[tuple[str, str, dict]] = []
+    # ソースプレフィックス -> 残すべきチャンクID（None は失敗したため既存を保持）
+    manifest: dict[str, set[str] | None] = {}
 
-    for file_path in files:
-        print(f"  Processing: {file_path.relative_to(ref_doc_dir)}")
+    for file_path, chunks in iter_parsed_files(files, ref_doc_dir, workers):
+        print(f"  Processed: {file_path.relative_to(ref_doc_dir)} ({len(chunks)} chunks)")
 
-        chunks = process_file(file_path, ref_doc_dir)
+        prefix = source_id_prefix(str(file_path.relative_to(ref_doc_dir)))
         if chunks:
-            if not dry_run:
-                rag_service.delete_by_metadata("knowledge_base", {"source_path": str(file_path)})
-            all_documents.extend(chunks)
+            manifest[prefix] = {c[0] for c in chunks}
             stats["files_processed"] += 1
             stats["chunks_created"] += len(chunks)
 
             doc_type = chunks[0][2].get("document_type", "unknown")
             stats["by_document_type"][doc_type] = stats["by_document_type"].get(doc_type, 0) + len(chunks)
         else:
+            manifest[prefix] = None
             stats["errors"] += 1
+            continue
 
-    # バッチで投入
-    if not dry_run and all_documents:
-        print(f"\nInserting {len(all_documents)} chunks into ChromaDB...")
+        if dry_run:
+            continue
 
-        doc_ids = [d[0] for d in all_documents]
-        contents = [d[1] for d in all_documents]
-        metadatas = [d[2] for d in all_documents]
+        # パース済みチャンクを溜めすぎず、一定量ごとに埋め込み・upsert
+        pending_documents.extend(chunks)
+        if len(pending_documents) >= INSERT_BATCH_SIZE:
+            _insert_chunks(rag_service, pending_documents)
+            pending_documents = []
 
-        rag_service.add_documents(
-            collection_name="knowledge_base",
-            document_ids=doc_ids,
-            contents=contents,
-            metadatas=metadatas,
-        )
+    if not dry_run and pending_documents:
+        _insert_chunks(rag_service, pending_documents)
+
+    if not dry_run and stats["chunks_created"]:
+        print(f"\nSuccessfully inserted {stats['chunks_created']} chunks")
 
-        print(f"Successfully inserted {len(all_documents)} chunks")
+    # 決定的IDで古いチャンクをまとめて削除（upsert後に実行して欠損期間を作らない）
+    if not dry_run:
+        stats["chunks_pruned"] = rag_service.prune_documents(
+            "knowledge_base",
+            manifest,
+            prune_missing=prune_missing,
+            owner_key="source_path",
+        )
 
     return stats
 
@@ -339,7 +459,8 @@ def main():
     parser.add_argument(
         "--prune-missing",
         action="store_true",
-        help="Delete documents whose source files no longer exist",
+        help="Delete seeded documents whose source files no longer exist "
+             "(documents without source_path metadata are kept)",
     )
     parser.add_argument(
         "--ref-doc-dir",
@@ -347,6 +468,12 @@ def main():
         default=project_root / "91_RefDoc",
         help="Path to reference documents directory",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parser processes (default: CPU count, 1 = sequential)",
+    )
 
     args = parser.parse_args()
 
@@ -361,12 +488,14 @@ def main():
         args.ref_doc_dir,
         dry_run=args.dry_run,
         prune_missing=args.prune_missing,
+        workers=args.workers,
     )
 
     print("\n" + "=" * 60)
     print("Summary:")
     print(f"  Files processed: {stats.get('files_processed', 0)}")
     print(f"  Chunks created: {stats.get('chunks_created', 0)}")
+    print(f"  Chunks pruned: {stats.get('chunks_pruned', 0)}")
     print(f"  Errors: {stats.get('errors', 0)}")
     print("\nBy document type:")
     for doc_type, count in stats.get("by_document_type", {}).items():
@@ -7,28 +7,30 @@ Includes keyword density analysis using Janome for Japanese NLP.
 
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import Any
-
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Any, Callable
 
 from src.config import (
-    get_openai_client,
     get_settings,
-    get_tavily_client,
     resolve_tavily_domains,
 )
 from src.repositories.rag_service import RAGService
+from src.services.competitor_keywords import CompetitorDocument, CompetitorKeywordAnalyzer
+from src.services.competitor_pages import fetch_competitor_headings
+from src.services.japanese_tokenizer import JANOME_AVAILABLE, tokenize
+from src.services.keyword_scanner import scan_sections
+from src.services.llm_gateway import get_llm_gateway, get_openai_client
+from src.services.markdown_document import parse_markdown
+from src.services.paragraph_stats import ParagraphStatsCache, count_nouns
+from src.services.serp_snapshots import search_with_snapshots
+from src.services.task_graph import TaskGraph
 
 logger = logging.getLogger(__name__)
 
-# Try to import Janome for Japanese NLP
-try:
-    from janome.tokenizer import Tokenizer
-    JANOME_AVAILABLE = True
-except ImportError:
-    JANOME_AVAILABLE = False
-    logger.warning("Janome not installed. Keyword analysis will be limited.")
+# Non-Markdown heading styles common in competitor content: 【見出し】 and ■ 見出し
+_EXTRA_HEADING_PATTERNS = (re.compile(r"^【(.+)】"), re.compile(r"^■\s*(.+)$"))
 
 
 @dataclass
@@ -50,6 +52,7 @@ class ResearchResult:
     suggested_outline: list[str] = field(default_factory=list)
     research_summary: str = ""
     tavily_answer: str = ""
+    step_timings: dict[str, float] = field(default_factory=dict)  # step name -> seconds
 
 
 @dataclass
@@ -170,6 +173,18 @@ class CompetitorKeywordResult:
             "suggestions": self.suggestions,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CompetitorKeywordResult":
+        """Restore a result stored with to_dict."""
+        return cls(
+            query=data.get("query", ""),
+            total_articles=data.get("total_articles", 0),
+            keywords=[CompetitorKeyword(**kw) for kw in data.get("keywords", [])],
+            article_titles=list(data.get("article_titles", [])),
+            article_urls=list(data.get("article_urls", [])),
+            suggestions=list(data.get("suggestions", [])),
+        )
+
 
 class ResearchAgent:
     """
@@ -183,15 +198,19 @@ class ResearchAgent:
         Initialize the research agent.
 
         Args:
-            rag_service: Optional RAG service for internal knowledge search.
+            rag_service: Optional RAG service for internal knowledge search
+                         (created on first use, so keyword analysis and
+                         competitor search never open the vector store).
         """
         self.settings = get_settings()
-        self.rag_service = rag_service or RAGService()
+        self.rag_service = rag_service
+
+    def _get_rag_service(self) -> RAGService:
+        """Get or create RAG service (lazy initialization)."""
+        if self.rag_service is None:
+            self.rag_service = RAGService()
+        return self.rag_service
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def search_competitors(
         self,
         seo_keywords: str,
@@ -201,6 +220,9 @@ class ResearchAgent:
         """
         Search for competitor articles using Tavily API.
 
+        The search runs on the shared Tavily gateway, which retries rate-limited
+        and transient errors within its deadline.
+
         Args:
             seo_keywords: SEO keywords to search for.
             max_results: Maximum number of results to return.
@@ -209,8 +231,6 @@ class ResearchAgent:
             Tavily response dict including results and (optional) answer.
         """
         try:
-            client = get_tavily_client()
-
             # Build search query
             query = f"{seo_keywords} 経営管理 FP&A 予実管理"
             payload = {
@@ -231,14 +251,7 @@ class ResearchAgent:
             if exclude_domains:
                 payload["exclude_domains"] = exclude_domains
 
-            try:
-                response = client.search(**payload)
-            except TypeError as e:
-                # Fallback for older client versions without domain filters
-                logger.warning(f"Tavily domain filters not supported, retrying without filters: {e}")
-                payload.pop("include_domains", None)
-                payload.pop("exclude_domains", None)
-                response = client.search(**payload)
+            response = search_with_snapshots(payload, domain_profile)
 
             # Soft preference: re-rank results by preferred domains
             if prefer_domains and isinstance(response, dict) and response.get("results"):
@@ -262,20 +275,17 @@ class ResearchAgent:
         Returns:
             List of headings found in the content.
         """
-        import re
-
-        # Match common heading patterns
-        heading_patterns = [
-            r"^#{1,3}\s+(.+)$",  # Markdown headings
-            r"^【(.+)】",  # Japanese bracket headings
-            r"^■\s*(.+)$",  # Bullet headings
-            r"^\d+\.\s+(.+)$",  # Numbered headings
-        ]
-
         headings = []
-        for line in content.split("\n"):
-            for pattern in heading_patterns:
-                match = re.match(pattern, line.strip())
+        for line in parse_markdown(content).lines:
+            if line.kind == "heading":
+                if line.level <= 3:
+                    headings.append(line.content)
+                continue
+            if line.kind == "ordered":
+                headings.append(line.content.strip())
+                continue
+            for pattern in _EXTRA_HEADING_PATTERNS:
+                match = pattern.match(line.stripped)
                 if match:
                     headings.append(match.group(1).strip())
                     break
@@ -293,7 +303,7 @@ class ResearchAgent:
         Returns:
             List of relevant content snippets.
         """
-        results = self.rag_service.search_knowledge_base(query, top_k=top_k)
+        results = self._get_rag_service().search_knowledge_base(query, top_k=top_k)
         return [r.content for r in results]
 
     def analyze_content_gaps(
@@ -338,7 +348,9 @@ class ResearchAgent:
 競合が触れていない、または深掘りしていないトピックで、社内の知見を活かせるポイントを特定してください。
 """
 
-            response = client.chat.completions.create(
+            response = get_llm_gateway().create_chat_completion(
+                "research.content_gaps",
+                client=client,
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "あなたはFP&A・経営管理の専門家です。"},
@@ -412,7 +424,9 @@ class ResearchAgent:
 差別化ポイントを必ず1つ以上含めてください。
 """
 
-            response = client.chat.completions.create(
+            response = get_llm_gateway().create_chat_completion(
+                "research.outline",
+                client=client,
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "あなたはSEOと経営管理の専門家です。"},
@@ -443,47 +457,69 @@ class ResearchAgent:
         """
         Perform full research analysis for given SEO keywords.
 
+        Independent steps run concurrently; per-step durations are returned in
+        ResearchResult.step_timings.
+
         Args:
             seo_keywords: Target SEO keywords.
+            domain_profile: Optional Tavily domain profile.
 
         Returns:
             Complete research results.
         """
         logger.info(f"Starting research for keywords: {seo_keywords}")
 
-        # Step 1: Search competitors
-        competitor_payload = self.search_competitors(
-            seo_keywords,
-            domain_profile=domain_profile,
-        )
-        competitor_results = competitor_payload.get("results", [])
-        tavily_answer = competitor_payload.get("answer", "") if isinstance(competitor_payload, dict) else ""
-        urls = [r.get("url", "") for r in competitor_results]
-        contents = [r.get("content", "") for r in competitor_results]
+        # Steps run as a DAG: the internal knowledge search does not depend on
+        # Tavily, so the wall clock follows the critical path
+        # max(search, internal_refs) -> headings -> content_gaps -> outline -> summary.
+        def search() -> dict:
+            payload = self.search_competitors(seo_keywords, domain_profile=domain_profile)
+            return payload if isinstance(payload, dict) else {}
 
-        # Step 2: Extract headings from competitor content
-        headings = [self.extract_headings(c) for c in contents]
+        def headings(search: dict) -> list[list[str]]:
+            results = search.get("results", [])
+            # Real page outlines when the fetch stage is enabled, snippet headings otherwise
+            try:
+                fetched = fetch_competitor_headings([r.get("url", "") for r in results])
+            except Exception as e:
+                logger.warning(f"Competitor page fetch failed (non-critical): {e}")
+                fetched = {}
+            return [
+                fetched.get(r.get("url", "")) or self.extract_headings(r.get("content", ""))
+                for r in results
+            ]
 
-        # Step 3: Search internal knowledge
-        internal_refs = self.search_internal_knowledge(seo_keywords)
+        def content_gaps(search: dict, internal_refs: list[str]) -> list[str]:
+            contents = [r.get("content", "") for r in search.get("results", [])]
+            return self.analyze_content_gaps(contents, internal_refs, search.get("answer", ""))
 
-        # Step 4: Analyze content gaps
-        content_gaps = self.analyze_content_gaps(contents, internal_refs, tavily_answer)
+        def outline(search: dict, headings: list[list[str]], content_gaps: list[str]) -> list[str]:
+            return self.generate_outline_suggestion(
+                seo_keywords, headings, content_gaps, search.get("answer", "")
+            )
 
-        # Step 5: Generate outline suggestion
-        suggested_outline = self.generate_outline_suggestion(
-            seo_keywords, headings, content_gaps, tavily_answer
-        )
+        graph = TaskGraph(name="research")
+        graph.add("search", search)
+        graph.add("internal_refs", lambda: self.search_internal_knowledge(seo_keywords))
+        graph.add("headings", headings, deps=["search"])
+        graph.add("content_gaps", content_gaps, deps=["search", "internal_refs"])
+        graph.add("outline", outline, deps=["search", "headings", "content_gaps"])
+        results = graph.run()
+
+        competitor_payload = results["search"]
+        competitor_results = competitor_payload.get("results", [])
+        tavily_answer = competitor_payload.get("answer", "")
+        internal_refs = results["internal_refs"]
+        suggested_outline = results["outline"]
 
-        # Step 6: Create competitor analysis
         competitor_analysis = CompetitorAnalysis(
-            urls=urls,
-            headings=headings,
-            content_gaps=content_gaps,
+            urls=[r.get("url", "") for r in competitor_results],
+            headings=results["headings"],
+            content_gaps=results["content_gaps"],
             key_points=[r.get("title", "") for r in competitor_results],
         )
 
-        # Step 7: Generate research summary
+        summary_start = time.perf_counter()
         research_summary = self._generate_summary(
             seo_keywords,
             competitor_analysis,
@@ -492,12 +528,17 @@ class ResearchAgent:
             tavily_answer,
         )
 
+        step_timings = {name: round(t.duration, 3) for name, t in graph.timings.items()}
+        step_timings["summary"] = round(time.perf_counter() - summary_start, 3)
+        step_timings["total"] = round(graph.total_duration + step_timings["summary"], 3)
+
         return ResearchResult(
             competitor_analysis=competitor_analysis,
             internal_references=internal_refs,
             suggested_outline=suggested_outline,
             research_summary=research_summary,
             tavily_answer=tavily_answer,
+            step_timings=step_timings,
         )
 
     @staticmethod
@@ -579,6 +620,7 @@ class ResearchAgent:
         self,
         content: str,
         target_keywords: list[str],
+        paragraph_cache: ParagraphStatsCache | None = None,
     ) -> KeywordAnalysis:
         """
         Analyze keyword density and placement in content.
@@ -586,6 +628,9 @@ class ResearchAgent:
         Args:
             content: Article content in Markdown format.
             target_keywords: Target SEO keywords to analyze.
+            paragraph_cache: Optional per-paragraph statistics cache; when given,
+                             only paragraphs changed since the last call are
+                             tokenized (used for live analysis in the editor).
 
         Returns:
             KeywordAnalysis with metrics and suggestions.
@@ -598,53 +643,43 @@ class ResearchAgent:
                 suggestions=["Janomeがインストールされていないため、詳細分析ができません。pip install janome を実行してください。"],
             )
 
-        # Initialize tokenizer lazily
-        if not hasattr(self, "_tokenizer"):
-            self._tokenizer = Tokenizer()
-
         # Parse content sections
         sections = self._parse_content_sections(content)
 
-        # Tokenize and count
-        tokens = list(self._tokenizer.tokenize(content))
-        nouns = [
-            t.surface
-            for t in tokens
-            if t.part_of_speech.startswith("名詞")
-            and len(t.surface) > 1
-            and not t.surface.isdigit()
-        ]
+        # Tokenize and count nouns
+        if paragraph_cache is not None:
+            document_stats = paragraph_cache.document_stats(content)
+            total_words = document_stats.total_words
+            noun_freq = document_stats.noun_frequency
+        else:
+            # Shared tokenizer, cached per text
+            tokens = tokenize(content)
+            total_words = len(tokens)
+            noun_freq = dict(count_nouns(tokens))
 
-        total_words = len(tokens)
         total_chars = len(content)
 
-        # Count noun frequency
-        noun_freq: dict[str, int] = {}
-        for noun in nouns:
-            noun_freq[noun] = noun_freq.get(noun, 0) + 1
+        # Candidate keywords: targets, then frequent nouns from the content
+        targets = [kw.strip() for kw in target_keywords if kw.strip()]
+        frequent_nouns = [
+            noun
+            for noun, count in sorted(noun_freq.items(), key=lambda x: x[1], reverse=True)[:15]
+            if noun not in target_keywords and count >= 3
+        ]
+
+        # One multi-keyword pass instead of a full scan per keyword
+        occurrences = self._analyze_keyword_occurrences(
+            targets + frequent_nouns, sections, total_words
+        )
 
-        # Analyze target keywords
         primary_kw = None
         related_kws = []
-
-        for keyword in target_keywords:
-            if not keyword.strip():
-                continue
-            occurrence = self._analyze_keyword_occurrence(
-                keyword.strip(), content, sections, total_words
-            )
+        for keyword in targets:
             if primary_kw is None:
-                primary_kw = occurrence
+                primary_kw = occurrences[keyword]
             else:
-                related_kws.append(occurrence)
-
-        # Find additional related keywords from content
-        for noun, count in sorted(noun_freq.items(), key=lambda x: x[1], reverse=True)[:15]:
-            if noun not in target_keywords and count >= 3:
-                occurrence = self._analyze_keyword_occurrence(
-                    noun, content, sections, total_words
-                )
-                related_kws.append(occurrence)
+                related_kws.append(occurrences[keyword])
+        related_kws.extend(occurrences[noun] for noun in frequent_nouns)
 
         # Calculate scores
         density_score = self._calculate_density_score(primary_kw)
@@ -678,82 +713,49 @@ class ResearchAgent:
             "h3_headings": [],
             "body": content,
             "conclusion": "",
+            "conclusion_start": None,  # Offset of the conclusion in body
         }
 
-        lines = content.split("\n")
-
-        # Extract title (first H1)
-        for line in lines:
-            if line.startswith("# "):
-                sections["title"] = line[2:].strip()
-                break
-
-        # Extract first paragraph (first non-heading, non-empty block)
-        in_first_para = False
-        first_para_lines = []
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                if in_first_para:
-                    break
-                continue
-            if stripped.startswith("#"):
-                if in_first_para:
-                    break
-                continue
-            in_first_para = True
-            first_para_lines.append(stripped)
-        sections["first_paragraph"] = " ".join(first_para_lines)
-
-        # Extract H2/H3 headings
-        sections["h2_headings"] = re.findall(r"^## (.+)$", content, re.MULTILINE)
-        sections["h3_headings"] = re.findall(r"^### (.+)$", content, re.MULTILINE)
-
-        # Extract conclusion (content after last H2 containing "まとめ" or after ---)
-        conclusion_patterns = [r"## .*まとめ", r"## .*終わり", r"---\s*$"]
-        for pattern in conclusion_patterns:
-            match = re.search(pattern, content, re.MULTILINE)
-            if match:
-                sections["conclusion"] = content[match.start():]
-                break
+        document = parse_markdown(content)
+
+        sections["title"] = document.title
+        sections["first_paragraph"] = document.first_paragraph
+        sections["h2_headings"] = document.headings_at(2)
+        sections["h3_headings"] = document.headings_at(3)
+
+        # Conclusion: from the first H2+ heading with "まとめ" (or "終わり"), else from ---
+        conclusion = (
+            document.find_heading("まとめ", min_level=2)
+            or document.find_heading("終わり", min_level=2)
+            or document.find_break()
+        )
+        if conclusion is not None:
+            sections["conclusion"] = content[conclusion.offset:]
+            sections["conclusion_start"] = conclusion.offset
 
         return sections
 
-    def _analyze_keyword_occurrence(
+    def _analyze_keyword_occurrences(
         self,
-        keyword: str,
-        content: str,
+        keywords: list[str],
         sections: dict[str, Any],
         total_words: int,
-    ) -> KeywordOccurrence:
-        """Analyze a single keyword's occurrence in content."""
-        # Count occurrences (case-insensitive)
-        count = len(re.findall(re.escape(keyword), content, re.IGNORECASE))
-        density = (count / max(total_words, 1)) * 100
-
-        # Check positions
-        positions = []
-        if keyword.lower() in sections["title"].lower():
-            positions.append("title")
-        if any(keyword.lower() in h.lower() for h in sections["h2_headings"]):
-            positions.append("h2")
-        if any(keyword.lower() in h.lower() for h in sections["h3_headings"]):
-            positions.append("h3")
-        if keyword.lower() in sections["first_paragraph"].lower():
-            positions.append("first_paragraph")
-        if keyword.lower() in sections["conclusion"].lower():
-            positions.append("conclusion")
-        if keyword.lower() in sections["body"].lower():
-            positions.append("body")
-
-        return KeywordOccurrence(
-            keyword=keyword,
-            count=count,
-            density=round(density, 2),
-            positions=positions,
-            in_first_paragraph="first_paragraph" in positions,
-            in_conclusion="conclusion" in positions,
-        )
+    ) -> dict[str, KeywordOccurrence]:
+        """Analyze occurrences of all keywords in a single scan of the content."""
+        stats = scan_sections(keywords, sections)
+        occurrences = {}
+        for keyword in keywords:
+            keyword_stats = stats[keyword]
+            density = (keyword_stats.count / max(total_words, 1)) * 100
+            occurrences[keyword] = KeywordOccurrence(
+                keyword=keyword,
+                count=keyword_stats.count,
+                density=round(density, 2),
+                positions=keyword_stats.positions,
+                in_first_paragraph="first_paragraph" in keyword_stats.positions,
+                in_conclusion="conclusion" in keyword_stats.positions,
+            )
+        return occurrences
 
     def _calculate_density_score(self, primary_kw: KeywordOccurrence | None) -> float:
         """Calculate keyword density score (0-100)."""
@@ -857,6 +859,7 @@ class ResearchAgent:
         self,
         query: str,
         max_articles: int = 10,
+        domain_profile: str | None = None,
     ) -> CompetitorKeywordResult:
         """
         Extract common keywords from competitor articles via Tavily search.
@@ -864,6 +867,8 @@ class ResearchAgent:
         Args:
             query: Search query (e.g., "予算管理")
             max_articles: Maximum number of articles to analyze.
+            domain_profile: Optional Tavily domain profile (same as analyze, so
+                            the search is served from the Tavily cache).
 
         Returns:
             CompetitorKeywordResult with extracted keywords and usage stats.
@@ -872,7 +877,11 @@ class ResearchAgent:
 
         # Search for competitor articles
         try:
-            tavily_response = self.search_competitors(query, max_results=max_articles)
+            tavily_response = self.search_competitors(
+                query,
+                max_results=max_articles,
+                domain_profile=domain_profile,
+            )
         except Exception as e:
             logger.error(f"Failed to search competitors: {e}")
             return CompetitorKeywordResult(
@@ -887,33 +896,29 @@ class ResearchAgent:
                 suggestions=["競合記事が見つかりませんでした"],
             )
 
-        # Extract titles and content from results
+        # One document per result so article_count is exact per article
         article_titles = []
         article_urls = []
-        all_text_parts = []  # Combined titles + headings for analysis
+        documents = []
 
         for result in results:
             title = result.get("title", "")
             url = result.get("url", "")
-            content = result.get("content", "")
 
             if title:
                 article_titles.append(title)
-                all_text_parts.append(("title", title))
             if url:
                 article_urls.append(url)
 
-            # Extract headings from content
-            headings = self.extract_headings(content)
-            for heading in headings:
-                all_text_parts.append(("heading", heading))
+            documents.append(CompetitorDocument(
+                title=title,
+                headings=self.extract_headings(result.get("content", "")),
+            ))
 
-        total_articles = len(article_titles)
+        total_articles = len(documents)
 
-        # Extract and count keywords using Janome
-        keyword_stats = self._extract_keywords_from_texts(
-            all_text_parts, article_titles, total_articles
-        )
+        # Distinct texts are tokenized once (shared cached Janome tokenizer)
+        keyword_stats = CompetitorKeywordAnalyzer().analyze(documents)
 
         # Sort by usage rate and create CompetitorKeyword objects
         sorted_keywords = sorted(
@@ -956,108 +961,67 @@ class ResearchAgent:
             suggestions=suggestions,
         )
 
-    def _extract_keywords_from_texts(
+    def extract_competitor_keywords_batch(
         self,
-        text_parts: list[tuple[str, str]],  # [("title", "text"), ("heading", "text")]
-        article_titles: list[str],
-        total_articles: int,
-    ) -> dict[str, dict[str, int]]:
+        queries: list[str],
+        max_articles: int = 10,
+        domain_profile: str | None = None,
+        max_concurrency: int | None = None,
+        on_result: Callable[[str, CompetitorKeywordResult], None] | None = None,
+    ) -> dict[str, CompetitorKeywordResult]:
         """
-        Extract keywords from text parts and count their occurrences.
+        Extract competitor keywords for many queries with bounded concurrency.
+
+        Searches from every worker go through the shared Tavily gateway (one
+        connection pool, rate limit and concurrency cap) and tokenization
+        through the shared tokenizer, so repeated queries are cheap.
+
+        Args:
+            queries: Seed queries (blank and duplicate queries are skipped).
+            max_articles: Maximum number of articles to analyze per query.
+            domain_profile: Optional Tavily domain profile.
+            max_concurrency: Maximum concurrent searches (default from settings).
+            on_result: Called in the calling thread as each query finishes.
 
         Returns:
-            Dict mapping keyword -> {"article_count": N, "found_in_titles": N, "found_in_headings": N}
+            Dict mapping query -> CompetitorKeywordResult, in input order.
         """
-        keyword_stats: dict[str, dict[str, int]] = {}
+        unique_queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        if not unique_queries:
+            return {}
+
+        workers = max_concurrency or self.settings.competitor_batch_concurrency
+        logger.info(
+            f"Batch competitor keyword extraction: {len(unique_queries)} queries, "
+            f"concurrency={workers}"
+        )
 
-        if not JANOME_AVAILABLE:
-            # Fallback: simple word extraction
-            return self._extract_keywords_simple(text_parts, article_titles)
-
-        # Initialize tokenizer lazily
-        if not hasattr(self, "_tokenizer"):
-            self._tokenizer = Tokenizer()
-
-        # Track which articles contain each keyword
-        keyword_articles: dict[str, set[int]] = {}
-        keyword_titles: dict[str, int] = {}
-        keyword_headings: dict[str, int] = {}
-
-        for idx, (text_type, text) in enumerate(text_parts):
-            # Tokenize and extract nouns
-            tokens = list(self._tokenizer.tokenize(text))
-            nouns = set()
-
-            for token in tokens:
-                if token.part_of_speech.startswith("名詞"):
-                    surface = token.surface
-                    # Filter out short words and numbers
-                    if len(surface) >= 2 and not surface.isdigit():
-                        nouns.add(surface)
-
-            # Also extract compound nouns (2-gram)
-            token_surfaces = [t.surface for t in tokens if t.part_of_speech.startswith("名詞")]
-            for i in range(len(token_surfaces) - 1):
-                compound = token_surfaces[i] + token_surfaces[i + 1]
-                if len(compound) >= 3:
-                    nouns.add(compound)
-
-            # Update stats for each noun
-            article_idx = idx // 2  # Rough mapping to article index
-            for noun in nouns:
-                if noun not in keyword_articles:
-                    keyword_articles[noun] = set()
-                    keyword_titles[noun] = 0
-                    keyword_headings[noun] = 0
-
-                keyword_articles[noun].add(article_idx)
-
-                if text_type == "title":
-                    keyword_titles[noun] += 1
-                elif text_type == "heading":
-                    keyword_headings[noun] += 1
-
-        # Build final stats
-        for keyword in keyword_articles:
-            keyword_stats[keyword] = {
-                "article_count": len(keyword_articles[keyword]),
-                "found_in_titles": keyword_titles.get(keyword, 0),
-                "found_in_headings": keyword_headings.get(keyword, 0),
+        results: dict[str, CompetitorKeywordResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="competitor_kw") as executor:
+            futures = {
+                executor.submit(
+                    self.extract_competitor_keywords,
+                    query,
+                    max_articles=max_articles,
+                    domain_profile=domain_profile,
+                ): query
+                for query in unique_queries
             }
-
-        return keyword_stats
-
-    def _extract_keywords_simple(
-        self,
-        text_parts: list[tuple[str, str]],
-        article_titles: list[str],
-    ) -> dict[str, dict[str, int]]:
-        """Simple keyword extraction without Janome (fallback)."""
-        keyword_stats: dict[str, dict[str, int]] = {}
-
-        # Common Japanese stop words to filter
-        stop_words = {"の", "は", "が", "を", "に", "で", "と", "も", "や", "へ", "から", "まで", "より", "など"}
-
-        for text_type, text in text_parts:
-            # Simple split by common delimiters
-            words = re.split(r"[【】「」\s\-\|｜・、。！？\n]+", text)
-
-            for word in words:
-                word = word.strip()
-                if len(word) >= 2 and word not in stop_words:
-                    if word not in keyword_stats:
-                        keyword_stats[word] = {
-                            "article_count": 0,
-                            "found_in_titles": 0,
-                            "found_in_headings": 0,
-                        }
-                    keyword_stats[word]["article_count"] += 1
-                    if text_type == "title":
-                        keyword_stats[word]["found_in_titles"] += 1
-                    elif text_type == "heading":
-                        keyword_stats[word]["found_in_headings"] += 1
-
-        return keyword_stats
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Competitor keyword extraction failed for {query} (non-critical): {e}")
+                    result = CompetitorKeywordResult(
+                        query=query,
+                        suggestions=[f"競合分析に失敗しました: {e}"],
+                    )
+                results[query] = result
+                if on_result is not None:
+                    on_result(query, result)
+
+        return {query: results[query] for query in unique_queries}
 
     def _generate_competitor_keyword_suggestions(
         self,
@@ -10,11 +10,82 @@ import logging
 import re
 from dataclasses import dataclass, field
 
-from src.config import get_anthropic_client
+from src.services.llm_gateway import get_anthropic_client, get_llm_gateway
+from src.services.llm_usage import cached_system
 
 logger = logging.getLogger(__name__)
 
 
+# Static scoring rubric and output format. Sent as a cached system prompt
+# prefix, so it must not contain per-article data.
+REVIEW_INSTRUCTIONS = """あなたは経営管理・FP&Aコンテンツの品質審査官です。ユーザーが提示する記事を以下の基準で評価してください。
+
+## 評価基準（4カテゴリ・100点満点）
+
+### 1. ターゲット訴求力（25点満点）
+- ペルソナの課題・悩みに直接言及しているか
+- 「会議の一言」で共感を得られるか
+- 読者が「自分のことだ」と感じられるか
+- 情シス/DXコーナーで副読者も拾えているか
+
+### 2. 論理構成（30点満点）
+- 冒頭→結論3行→本論の流れが明確か
+- 原因/問題が3つに構造化されているか
+- 打ち手/ロードマップが期間付きで具体的か
+- 各セクションのつながりが自然か
+
+### 3. SEO適合性（25点満点）
+- キーワードが適切に配置されているか（タイトル、見出し、本文）
+- 見出し構成が競合に勝てる内容か
+- チェックリスト/次に読むで読者の行動を促しているか
+- 控えめCTAが適切か
+
+### 4. 記事構造（20点満点）※ユーザーメッセージのプログラム検出スコアを参考にする
+以下の11必須要素の品質を評価：
+1. 会議の一言（共感フック）
+2. 結論3行
+3. 目次
+4. 一枚絵（テキスト図解）
+5. 原因/問題 3つ
+6. 打ち手/ロードマップ
+7. アンチパターン
+8. 情シス/DXコーナー
+9. チェックリスト
+10. 次に読む
+11. 控えめCTA
+
+## 出力形式（JSON）
+{
+  "target_appeal": {
+    "score": [0-25の整数],
+    "evaluation": "[評価コメント]",
+    "improvements": ["改善点1", "改善点2"]
+  },
+  "logical_structure": {
+    "score": [0-30の整数],
+    "evaluation": "[評価コメント]",
+    "improvements": ["改善点1", "改善点2"]
+  },
+  "seo_fitness": {
+    "score": [0-25の整数],
+    "evaluation": "[評価コメント]",
+    "improvements": ["改善点1", "改善点2"]
+  },
+  "article_structure": {
+    "score": [0-20の整数],
+    "evaluation": "[評価コメント]",
+    "missing_elements": ["不足要素1", "不足要素2"],
+    "quality_issues": ["品質問題1", "品質問題2"]
+  },
+  "overall_feedback": "[総合フィードバック]",
+  "strengths": ["強み1", "強み2"],
+  "priority_improvements": ["最優先改善点1", "最優先改善点2"]
+}
+
+JSONのみを出力してください。
+"""
+
+
 # 11 mandatory structure elements with detection patterns
 STRUCTURE_ELEMENTS = {
     "hook": {
@@ -74,6 +145,39 @@ STRUCTURE_ELEMENTS = {
     },
 }
 
+# Compiled once at import instead of on every review
+_STRUCTURE_PATTERNS = {
+    key: re.compile(element["pattern"], re.IGNORECASE | re.MULTILINE)
+    for key, element in STRUCTURE_ELEMENTS.items()
+}
+
+
+def found_structure_elements(content: str) -> set[str]:
+    """
+    Find the mandatory structure elements present in an article.
+
+    Args:
+        content: Article content in Markdown (or one section of it).
+
+    Returns:
+        Keys of STRUCTURE_ELEMENTS whose pattern matches.
+    """
+    return {key for key, pattern in _STRUCTURE_PATTERNS.items() if pattern.search(content)}
+
+
+def missing_structure_elements(content: str) -> list[str]:
+    """
+    Find mandatory structure elements missing from an article.
+
+    Args:
+        content: Article content in Markdown.
+
+    Returns:
+        Names of the missing elements in structure order.
+    """
+    found = found_structure_elements(content)
+    return [element["name"] for key, element in STRUCTURE_ELEMENTS.items() if key not in found]
+
 
 @dataclass
 class StructureCheckResult:
@@ -122,6 +226,7 @@ class ReviewerAgent:
     - Article Structure (20 points): Presence of 11 mandatory elements
     """
 
+    MODEL = "claude-sonnet-4-20250514"
     PASS_THRESHOLD = 80
 
     def __init__(self) -> None:
@@ -142,8 +247,7 @@ class ReviewerAgent:
         missing = []
 
         for key, element in STRUCTURE_ELEMENTS.items():
-            pattern = element["pattern"]
-            found = bool(re.search(pattern, content, re.IGNORECASE | re.MULTILINE))
+            found = _STRUCTURE_PATTERNS[key].search(content) is not None
 
             results.append(StructureCheckResult(
                 element_name=element["name"],
@@ -239,7 +343,7 @@ class ReviewerAgent:
 この情報を考慮して評価してください。
 """
 
-        prompt = f"""あなたは経営管理・FP&Aコンテンツの品質審査官です。以下の記事を評価してください。
+        prompt = f"""以下の記事を評価してください。
 
 ## 評価対象記事
 {draft_content}
@@ -250,74 +354,16 @@ class ReviewerAgent:
 ## ターゲットSEOキーワード
 {seo_keywords}
 {seo_metrics_info}{missing_info}
-## 評価基準（4カテゴリ・100点満点）
-
-### 1. ターゲット訴求力（25点満点）
-- ペルソナの課題・悩みに直接言及しているか
-- 「会議の一言」で共感を得られるか
-- 読者が「自分のことだ」と感じられるか
-- 情シス/DXコーナーで副読者も拾えているか
-
-### 2. 論理構成（30点満点）
-- 冒頭→結論3行→本論の流れが明確か
-- 原因/問題が3つに構造化されているか
-- 打ち手/ロードマップが期間付きで具体的か
-- 各セクションのつながりが自然か
-
-### 3. SEO適合性（25点満点）
-- キーワードが適切に配置されているか（タイトル、見出し、本文）
-- 見出し構成が競合に勝てる内容か
-- チェックリスト/次に読むで読者の行動を促しているか
-- 控えめCTAが適切か
-
-### 4. 記事構造（20点満点）※プログラム検出スコア: {structure_score}/20
-以下の11必須要素の品質を評価：
-1. 会議の一言（共感フック）
-2. 結論3行
-3. 目次
-4. 一枚絵（テキスト図解）
-5. 原因/問題 3つ
-6. 打ち手/ロードマップ
-7. アンチパターン
-8. 情シス/DXコーナー
-9. チェックリスト
-10. 次に読む
-11. 控えめCTA
-
-## 出力形式（JSON）
-{{
-  "target_appeal": {{
-    "score": [0-25の整数],
-    "evaluation": "[評価コメント]",
-    "improvements": ["改善点1", "改善点2"]
-  }},
-  "logical_structure": {{
-    "score": [0-30の整数],
-    "evaluation": "[評価コメント]",
-    "improvements": ["改善点1", "改善点2"]
-  }},
-  "seo_fitness": {{
-    "score": [0-25の整数],
-    "evaluation": "[評価コメント]",
-    "improvements": ["改善点1", "改善点2"]
-  }},
-  "article_structure": {{
-    "score": [0-20の整数],
-    "evaluation": "[評価コメント]",
-    "missing_elements": ["不足要素1", "不足要素2"],
-    "quality_issues": ["品質問題1", "品質問題2"]
-  }},
-  "overall_feedback": "[総合フィードバック]",
-  "strengths": ["強み1", "強み2"],
-  "priority_improvements": ["最優先改善点1", "最優先改善点2"]
-}}
-
-JSONのみを出力してください。
+## 記事構造のプログラム検出スコア
+{structure_score}/20
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
+        response = get_llm_gateway().create_message(
+            "reviewer.review",
+            client=self.client,
+            model=self.MODEL,
             max_tokens=2000,
+            system=cached_system(REVIEW_INSTRUCTIONS),
             messages=[
                 {"role": "user", "content": prompt}
             ],
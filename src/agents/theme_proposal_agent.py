@@ -14,12 +14,12 @@ from typing import Any
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.config import (
-    get_anthropic_client,
     get_settings,
-    get_tavily_client,
     resolve_tavily_domains,
 )
 from src.repositories.rag_service import RAGService
+from src.services.llm_gateway import get_anthropic_client, get_llm_gateway
+from src.services.serp_snapshots import search_with_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -110,10 +110,6 @@ class ThemeProposalAgent:
             self.rag_service = RAGService()
         return self.rag_service
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def search_seo_trends(
         self,
         keyword: str,
@@ -123,6 +119,9 @@ class ThemeProposalAgent:
         """
         Search SEO trends using Tavily API.
 
+        The search runs on the shared Tavily gateway, which retries rate-limited
+        and transient errors within its deadline.
+
         Args:
             keyword: Search keyword.
             max_results: Maximum number of results.
@@ -133,11 +132,6 @@ class ThemeProposalAgent:
         """
         logger.info(f"Searching SEO trends for: {keyword}")
 
-        client = get_tavily_client()
-        if client is None:
-            logger.warning("Tavily client not available")
-            return [], ""
-
         # Construct search query
         query = f"{keyword} 記事 ブログ コンテンツ 経営管理 FP&A"
 
@@ -158,7 +152,7 @@ class ThemeProposalAgent:
             payload["exclude_domains"] = exclude_domains
 
         try:
-            response = client.search(**payload)
+            response = search_with_snapshots(payload, domain_profile)
             results = response.get("results", [])
             answer = response.get("answer", "")
 
@@ -326,7 +320,9 @@ class ThemeProposalAgent:
 JSON形式のみを出力してください。"""
 
         try:
-            response = client.messages.create(
+            response = get_llm_gateway().create_message(
+                "theme_proposal.generate",
+                client=client,
                 model="claude-sonnet-4-20250514",
                 max_tokens=2500,
                 system="あなたはEPM・FP&A領域のコンテンツマーケティング専門家です。JSON形式で回答してください。",
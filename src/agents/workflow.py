@@ -97,6 +97,9 @@ def writing_node(state: ArticleState) -> dict:
                     "logical_structure": state.review_result.breakdown.logical_structure if state.review_result else 0,
                     "seo_fitness": state.review_result.breakdown.seo_fitness if state.review_result else 0,
                 },
+                missing_elements=state.review_result.missing_elements if state.review_result else None,
+                article_title=state.article_title,
+                target_persona=state.target_persona,
             )
             result = DraftResult(
                 draft_content_md=revised_content,
@@ -4,185 +4,83 @@ EPM Note Engine - Writer Agent
 Generates article content using Claude 3.5 Sonnet.
 """
 
+import asyncio
 import logging
+import queue
 import re
+import threading
+import time
 from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, TypeVar
 
-from src.config import get_anthropic_client
+from src.config import get_settings
 from src.agents.research_agent import ResearchResult
+from src.agents.reviewer_agent import (
+    STRUCTURE_ELEMENTS,
+    found_structure_elements,
+    missing_structure_elements,
+)
+from src.services.article_sections import (
+    FIXED_SECTIONS,
+    ArticlePart,
+    SectionSpec,
+    assemble_article,
+    join_parts,
+    normalize_section,
+    plan_sections,
+    refresh_toc,
+    split_article,
+)
+from src.services.context_packer import ContextSection, PackReport, pack_context
+from src.services.llm_stream import (
+    CHARS_PER_TOKEN_ESTIMATE,
+    GenerationCancelledError,
+    StreamCallback,
+    StreamProgress,
+    complete_streaming,
+    estimate_tokens,
+)
+from src.services.llm_gateway import (
+    get_anthropic_client,
+    get_async_anthropic_client,
+    get_llm_gateway,
+)
+from src.services.llm_usage import cacheable_text, cached_system
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-@dataclass
-class DraftResult:
-    """Result of article draft generation."""
+# Keywords tying a reviewer finding to a structure element
+_ELEMENT_KEYWORDS = {
+    "hook": ("会議の一言", "冒頭", "フック", "共感"),
+    "conclusion": ("結論",),
+    "toc": ("目次",),
+    "diagram": ("一枚絵", "図解"),
+    "causes": ("原因",),
+    "roadmap": ("ロードマップ", "打ち手", "解決策"),
+    "antipattern": ("アンチパターン", "失敗", "落とし穴"),
+    "it_corner": ("情シス", "DX"),
+    "checklist": ("チェックリスト", "持ち帰り"),
+    "related": ("次に読む", "関連記事"),
+    "cta": ("CTA",),
+}
 
-    draft_content_md: str = ""
-    title_candidates: list[str] = field(default_factory=list)
-    image_prompts: list[str] = field(default_factory=list)
-    image_suggestions: list[dict] = field(default_factory=list)  # From Unsplash/Pexels
-    sns_posts: dict[str, str] = field(default_factory=dict)
-
-
-class WriterAgent:
-    """
-    Agent for generating article content.
-
-    Uses Claude 3.5 Sonnet for high-quality Japanese article generation.
-    """
-
-    # Target word count
-    TARGET_WORDS_MIN = 3000
-    TARGET_WORDS_MAX = 4500
-    CANONICAL_SSoT = "SSoT"
-
-    def __init__(self) -> None:
-        """Initialize the writer agent."""
-        self.client = get_anthropic_client()
-
-    def generate_draft(
-        self,
-        research_result: ResearchResult,
-        essences: list[dict],
-        target_persona: str,
-        article_title: str,
-        competitor_keywords: list[dict] | None = None,
-        internal_references: list[str] | None = None,
-    ) -> DraftResult:
-        """
-        Generate article draft based on research and user essences.
-
-        Args:
-            research_result: Research analysis results.
-            essences: User-provided essence snippets.
-            target_persona: Target reader persona.
-            article_title: Base article title.
-            competitor_keywords: Competitor keywords from research phase (optional).
-            internal_references: RAG knowledge base content for context (optional).
-
-        Returns:
-            Complete draft result with content, titles, and SNS posts.
-        """
-        logger.info(f"Generating draft for: {article_title}")
-
-        # Step 1: Generate main content
-        content = self._generate_content(
-            research_result, essences, target_persona, article_title,
-            competitor_keywords, internal_references
-        )
-
-        # Step 1.5: Refine content (compression + summaries + CTA)
-        refined_content = self._refine_content(
-            content=content,
-            target_persona=target_persona,
-            article_title=article_title,
-        )
-        refined_content = self._normalize_terms(refined_content)
+# Reviewer feedback headings whose bullets are concrete findings
+_ACTIONABLE_FEEDBACK = ("構造の品質問題", "優先改善点")
 
-        # Step 2: Generate title candidates
-        titles = self._generate_titles(article_title, target_persona, refined_content[:500])
-        titles = [self._normalize_terms(t) for t in titles]
+# Fixed corners that get no generated transition sentence before or after them
+_NO_TRANSITION_SECTIONS = frozenset({"opening", "it_corner", "checklist", "closing"})
 
-        # Step 3: Generate image prompts
-        image_prompts = self._generate_image_prompts(refined_content, research_result)
-        image_prompts = [self._normalize_terms(p) for p in image_prompts]
+# How often the calling thread checks the cancel event while sections are written
+_CANCEL_POLL_SECONDS = 0.2
 
-        # Step 3.5: Search images for prompts (auto-integration)
-        image_suggestions = self.search_images_for_prompts(image_prompts)
 
-        # Step 4: Generate SNS posts
-        sns_posts = self._generate_sns_posts(
-            titles[0] if titles else article_title,
-            refined_content,
-        )
-        sns_posts = {k: self._normalize_terms(v) for k, v in sns_posts.items()}
-
-        return DraftResult(
-            draft_content_md=refined_content,
-            title_candidates=titles,
-            image_prompts=image_prompts,
-            image_suggestions=image_suggestions,
-            sns_posts=sns_posts,
-        )
-
-    def _generate_content(
-        self,
-        research_result: ResearchResult,
-        essences: list[dict],
-        target_persona: str,
-        article_title: str,
-        competitor_keywords: list[dict] | None = None,
-        internal_references: list[str] | None = None,
-    ) -> str:
-        """Generate the main article content."""
-        # Format essences for prompt
-        essence_text = ""
-        for e in essences:
-            category = e.get("category", "")
-            content = e.get("content", "")
-            if isinstance(category, str):
-                cat_label = category
-            else:
-                cat_label = category.value if hasattr(category, "value") else str(category)
-            essence_text += f"【{cat_label}】{content}\n\n"
-
-        # Format outline
-        outline_text = "\n".join(
-            f"- {h}" for h in research_result.suggested_outline
-        )
-
-        # Format competitor keywords
-        competitor_kw_text = ""
-        if competitor_keywords:
-            kw_lines = []
-            for kw in competitor_keywords:
-                priority = kw.get("priority", "検討")
-                keyword = kw.get("keyword", "")
-                usage_rate = kw.get("usage_rate", 0)
-                kw_lines.append(f"- 【{priority}】{keyword}（使用率: {usage_rate:.0f}%）")
-            competitor_kw_text = "\n".join(kw_lines)
-
-        # Format internal references (RAG knowledge base content)
-        internal_refs_text = ""
-        if internal_references:
-            # Limit to top 3 most relevant references, truncate each to 500 chars
-            refs_to_use = internal_references[:3]
-            formatted_refs = []
-            for i, ref in enumerate(refs_to_use, 1):
-                truncated = ref[:500] + "..." if len(ref) > 500 else ref
-                formatted_refs.append(f"【参考{i}】{truncated}")
-            internal_refs_text = "\n\n".join(formatted_refs)
-
-        prompt = f"""あなたは経営管理・FP&Aの専門家として、Note.com向けの**高品質な記事**を執筆します。
+# Static writer instructions shared by draft, refine and revise. Sent as a
+# cached system prompt prefix, so it must not contain per-article data.
+WRITER_INSTRUCTIONS = """あなたは経営管理・FP&Aの専門家として、Note.com向けの**高品質な記事**を執筆・編集します。
 有名SaaS企業のオウンドメディア記事のように、読者に価値を届ける構成で書いてください。
 
-## 記事タイトル
-{article_title}
-
-## ターゲット読者
-{target_persona}
-
-## 推奨構成（参考）
-{outline_text}
-
-## 差別化ポイント
-{chr(10).join(f"- {gap}" for gap in research_result.competitor_analysis.content_gaps[:3])}
-
-## 競合キーワード（上位記事で頻出）
-{competitor_kw_text if competitor_kw_text else "（なし）"}
-
-※「必須」のキーワードは見出しや本文に自然に含めてください。SEOで上位表示を狙うために重要です。
-
-## 参考資料（ナレッジベース）
-{internal_refs_text if internal_refs_text else "（なし）"}
-
-※上記の参考資料は直接引用する必要はありません。考え方・フレームワーク・視点を記事に反映させてください。
-名著や専門家の知見がある場合は、その考え方を踏まえた論述にしてください。
-
-## 著者のエッセンス（必ず記事に反映）
-{essence_text if essence_text else "（なし）"}
-
 ## ★必須の記事構造（この順序で必ず含めること）
 
 ### 1. タイトル
@@ -277,22 +175,656 @@ class WriterAgent:
 3. Markdown形式で見出し（##, ###）を適切に使用
 4. 段落は2〜4行で区切る（スマホ対応）
 5. 太字は1ブロック1〜2個まで
-6. 文字数は{self.TARGET_WORDS_MIN}-{self.TARGET_WORDS_MAX}文字程度
+6. 文字数は{words_min}-{words_max}文字程度
 7. 表記は「SSoT」に統一
 
+## 編集指針（推敲・改善時）
+1. 冗長な表現や重複を削り、読みやすくする（10-15%程度の圧縮を目安）
+2. 段落は2〜4行で区切る（スマホ対応）
+3. 太字は1ブロック1〜2個まで
+4. 表記は「SSoT」に統一
+5. 文字数は{words_min}-{words_max}文字程度を維持
+6. Markdown形式を維持
+"""
+
+
+@dataclass
+class SectionRevision:
+    """A planned change to one part of an article during revision."""
+
+    index: int  # Part index; for inserts, the part the new section follows (-1: first)
+    findings: list[str] = field(default_factory=list)  # Reviewer findings for this part
+    add_elements: list[str] = field(default_factory=list)  # Missing element names to add
+    insert: SectionSpec | None = None  # Set when a new section is written
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from sync code on the LLM gateway's event loop."""
+    return get_llm_gateway().run(coro)
+
+
+@dataclass
+class DraftResult:
+    """Result of article draft generation."""
+
+    draft_content_md: str = ""
+    title_candidates: list[str] = field(default_factory=list)
+    image_prompts: list[str] = field(default_factory=list)
+    image_suggestions: list[dict] = field(default_factory=list)  # From Unsplash/Pexels
+    sns_posts: dict[str, str] = field(default_factory=dict)
+
+
+class WriterAgent:
+    """
+    Agent for generating article content.
+
+    Uses Claude 3.5 Sonnet for high-quality Japanese article generation.
+    """
+
+    MODEL = "claude-sonnet-4-20250514"
+
+    # Target word count
+    TARGET_WORDS_MIN = 3000
+    TARGET_WORDS_MAX = 4500
+    CANONICAL_SSoT = "SSoT"
+
+    def __init__(
+        self,
+        on_stream: StreamCallback | None = None,
+        cancel_event: threading.Event | None = None,
+        draft_mode: str | None = None,
+        section_parallel: bool | None = None,
+    ) -> None:
+        """
+        Initialize the writer agent.
+
+        Args:
+            on_stream: If given, long generations (draft, refine, revise) are
+                       streamed and every StreamProgress is passed to it.
+            cancel_event: Set to stop a streamed generation early
+                          (raises GenerationCancelledError).
+            draft_mode: "single_pass" or "two_pass" (defaults to WRITER_DRAFT_MODE).
+            section_parallel: Write the draft section by section concurrently
+                              (defaults to WRITER_SECTION_PARALLEL).
+        """
+        settings = get_settings()
+        self.client = get_anthropic_client()
+        self.on_stream = on_stream
+        self.cancel_event = cancel_event
+        self.draft_mode = draft_mode or settings.writer_draft_mode
+        self.context_report: PackReport | None = None  # Set when the draft context is built
+        self.section_parallel = (
+            settings.writer_section_parallel if section_parallel is None else section_parallel
+        )
+
+    def _system_prompt(self) -> list[dict[str, Any]]:
+        """Static writer instructions as a cacheable system prompt."""
+        return cached_system(WRITER_INSTRUCTIONS.format(
+            words_min=self.TARGET_WORDS_MIN,
+            words_max=self.TARGET_WORDS_MAX,
+        ))
+
+    def _create(self, stage: str, **kwargs: Any) -> Any:
+        """Call messages.create through the LLM gateway, accounted as writer.<stage>."""
+        return get_llm_gateway().create_message(f"writer.{stage}", client=self.client, **kwargs)
+
+    def _complete(self, prompt: str, max_tokens: int, stage: str) -> str:
+        """
+        Run a long generation, streaming it when a stream callback is set.
+
+        The writer instructions are sent as a cached system prompt, so only
+        the per-article prompt is processed as new input on repeated calls.
+
+        Args:
+            prompt: User prompt with the per-article data.
+            max_tokens: Maximum output tokens.
+            stage: Stage label for stream progress ("draft", "refine", "revise").
+
+        Returns:
+            Generated text.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        system = self._system_prompt()
+        if self.on_stream is None and self.cancel_event is None:
+            response = self._create(
+                stage,
+                model=self.MODEL,
+                max_tokens=max_tokens,
+                system=system,
+                messages=messages,
+            )
+            return response.content[0].text
+
+        return complete_streaming(
+            self.client,
+            on_progress=self.on_stream,
+            stage=stage,
+            cancel_event=self.cancel_event,
+            usage_label=f"writer.{stage}",
+            model=self.MODEL,
+            max_tokens=max_tokens,
+            system=system,
+            messages=messages,
+        )
+
+    def generate_draft(
+        self,
+        research_result: ResearchResult,
+        essences: list[dict],
+        target_persona: str,
+        article_title: str,
+        competitor_keywords: list[dict] | None = None,
+        internal_references: list[str] | None = None,
+    ) -> DraftResult:
+        """
+        Generate article draft based on research and user essences.
+
+        Args:
+            research_result: Research analysis results.
+            essences: User-provided essence snippets.
+            target_persona: Target reader persona.
+            article_title: Base article title.
+            competitor_keywords: Competitor keywords from research phase (optional).
+            internal_references: RAG knowledge base content for context (optional).
+
+        Returns:
+            Complete draft result with content, titles, and SNS posts.
+        """
+        logger.info(f"Generating draft for: {article_title}")
+
+        # Step 1: Generate main content
+        if self.section_parallel and research_result.suggested_outline:
+            content = self._generate_sections(
+                research_result, essences, target_persona, article_title,
+                competitor_keywords, internal_references
+            )
+        else:
+            content = self._generate_content(
+                research_result, essences, target_persona, article_title,
+                competitor_keywords, internal_references
+            )
+
+        # Step 1.5: Refine content (two-pass) or fix up missing structure (single-pass)
+        if self.draft_mode == "single_pass":
+            refined_content = self._fix_structure(content)
+        else:
+            refined_content = self._refine_content(
+                content=content,
+                target_persona=target_persona,
+                article_title=article_title,
+            )
+        refined_content = self._normalize_terms(refined_content)
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise GenerationCancelledError("assets")
+
+        # Steps 2-4 depend only on the refined content (image search on the
+        # image prompts), so they run concurrently
+        assets = self._generate_assets(refined_content, research_result, article_title, target_persona)
+        titles = [self._normalize_terms(t) for t in assets["titles"]]
+        image_prompts = [self._normalize_terms(p) for p in assets["image_prompts"]]
+        image_suggestions = assets["image_suggestions"]
+        sns_posts = {k: self._normalize_terms(v) for k, v in assets["sns_posts"].items()}
+
+        return DraftResult(
+            draft_content_md=refined_content,
+            title_candidates=titles,
+            image_prompts=image_prompts,
+            image_suggestions=image_suggestions,
+            sns_posts=sns_posts,
+        )
+
+    def _generate_assets(
+        self,
+        content: str,
+        research_result: ResearchResult,
+        article_title: str,
+        target_persona: str,
+    ) -> dict[str, Any]:
+        """
+        Generate titles, image prompts, image suggestions and SNS posts concurrently.
+
+        Calls go through the async Anthropic client, each with its own timeout.
+        A failed or timed-out step falls back to an empty result (titles fall
+        back to the base title) without affecting the others.
+
+        Args:
+            content: Refined article content.
+            research_result: Research analysis results.
+            article_title: Base article title (also used for the SNS posts).
+            target_persona: Target reader persona.
+
+        Returns:
+            Dict with "titles", "image_prompts", "image_suggestions" and "sns_posts".
+        """
+        fallbacks: dict[str, Any] = {
+            "titles": [article_title],
+            "image_prompts": [],
+            "image_suggestions": [],
+            "sns_posts": {"x": "", "linkedin": ""},
+        }
+        timeout = get_settings().writer_asset_timeout_seconds
+
+        async def guarded(name: str, step: Awaitable[Any]) -> Any:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(step, timeout)
+            except Exception as e:
+                logger.warning(f"Draft asset step '{name}' failed (non-critical): {e!r}")
+                return fallbacks[name]
+            logger.debug(f"Draft asset step '{name}' took {time.perf_counter() - start:.2f}s")
+            return result
+
+        async def ask(stage: str, prompt: str, max_tokens: int, parse: Callable[[str], Any]) -> Any:
+            response = await get_llm_gateway().acreate_message(
+                f"writer.{stage}",
+                client=client,
+                model=self.MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return parse(response.content[0].text)
+
+        async def images() -> tuple[list[str], list[dict]]:
+            prompts = await guarded("image_prompts", ask(
+                "image_prompts",
+                self._image_prompts_prompt(content, research_result),
+                800,
+                lambda text: [self._normalize_terms(p) for p in self._parse_image_prompts(text)],
+            ))
+            if not prompts:
+                return prompts, []
+            suggestions = await guarded(
+                "image_suggestions", asyncio.to_thread(self.search_images_for_prompts, prompts)
+            )
+            return prompts, suggestions
+
+        async def run() -> dict[str, Any]:
+            titles, (prompts, suggestions), sns_posts = await asyncio.gather(
+                guarded("titles", ask(
+                    "titles",
+                    self._titles_prompt(article_title, target_persona, content[:500]),
+                    500,
+                    lambda text: self._parse_titles(text, article_title),
+                )),
+                images(),
+                guarded("sns_posts", ask(
+                    "sns_posts",
+                    self._sns_prompt(article_title, content),
+                    500,
+                    self._parse_sns_posts,
+                )),
+            )
+            return {
+                "titles": titles,
+                "image_prompts": prompts,
+                "image_suggestions": suggestions,
+                "sns_posts": sns_posts,
+            }
+
+        client = get_async_anthropic_client()
+        start = time.perf_counter()
+        assets = _run_coroutine(run())
+        logger.info(f"Draft assets generated in {time.perf_counter() - start:.2f}s")
+        return assets
+
+    def _article_context(
+        self,
+        research_result: ResearchResult,
+        essences: list[dict],
+        target_persona: str,
+        article_title: str,
+        competitor_keywords: list[dict] | None = None,
+        internal_references: list[str] | None = None,
+    ) -> str:
+        """
+        Format the per-article writing conditions shared by all draft prompts.
+
+        The context is packed into WRITER_CONTEXT_TOKEN_BUDGET: title,
+        persona and essences are always kept; knowledge base references,
+        then competitor keywords, content gaps and the outline are cut
+        first. The report of what was cut is kept in self.context_report.
+        """
+        # Format essences for prompt
+        essence_items = []
+        for e in essences:
+            category = e.get("category", "")
+            content = e.get("content", "")
+            if isinstance(category, str):
+                cat_label = category
+            else:
+                cat_label = category.value if hasattr(category, "value") else str(category)
+            essence_items.append(f"【{cat_label}】{content}")
+
+        # Format competitor keywords
+        kw_items = []
+        for kw in competitor_keywords or []:
+            priority = kw.get("priority", "検討")
+            keyword = kw.get("keyword", "")
+            usage_rate = kw.get("usage_rate", 0)
+            kw_items.append(f"- 【{priority}】{keyword}（使用率: {usage_rate:.0f}%）")
+
+        # Format internal references (RAG knowledge base content), most relevant first
+        ref_items = []
+        for i, ref in enumerate((internal_references or [])[:3], 1):
+            truncated = ref[:500] + "..." if len(ref) > 500 else ref
+            ref_items.append(f"【参考{i}】{truncated}")
+
+        sections = [
+            ContextSection("title", "記事タイトル", [article_title], required=True),
+            ContextSection("persona", "ターゲット読者", [target_persona], required=True),
+            ContextSection(
+                "outline", "推奨構成（参考）",
+                [f"- {h}" for h in research_result.suggested_outline], priority=40,
+            ),
+            ContextSection(
+                "content_gaps", "差別化ポイント",
+                [f"- {gap}" for gap in research_result.competitor_analysis.content_gaps[:3]],
+                priority=30,
+            ),
+            ContextSection(
+                "competitor_keywords", "競合キーワード（上位記事で頻出）", kw_items,
+                priority=20, empty_text="（なし）",
+                note="※「必須」のキーワードは見出しや本文に自然に含めてください。"
+                "SEOで上位表示を狙うために重要です。",
+            ),
+            ContextSection(
+                "references", "参考資料（ナレッジベース）", ref_items,
+                priority=10, separator="\n\n", empty_text="（なし）",
+                note="※上記の参考資料は直接引用する必要はありません。"
+                "考え方・フレームワーク・視点を記事に反映させてください。\n"
+                "名著や専門家の知見がある場合は、その考え方を踏まえた論述にしてください。",
+            ),
+            ContextSection(
+                "essences", "著者のエッセンス（必ず記事に反映）", essence_items,
+                required=True, separator="\n\n", empty_text="（なし）",
+            ),
+        ]
+        context, self.context_report = pack_context(
+            sections, get_settings().writer_context_token_budget
+        )
+        if self.context_report.over_budget:
+            logger.warning(f"Writer context over budget: {self.context_report.summary()}")
+        else:
+            logger.info(f"Writer context: {self.context_report.summary()}")
+        return f"{context}\n"
+
+    def _generate_content(
+        self,
+        research_result: ResearchResult,
+        essences: list[dict],
+        target_persona: str,
+        article_title: str,
+        competitor_keywords: list[dict] | None = None,
+        internal_references: list[str] | None = None,
+    ) -> str:
+        """Generate the main article content."""
+        context = self._article_context(
+            research_result, essences, target_persona, article_title,
+            competitor_keywords, internal_references,
+        )
+
+        # Single-pass drafts get no separate refine call, so the editing
+        # rules have to be applied while writing
+        finishing_text = ""
+        if self.draft_mode == "single_pass":
+            finishing_text = """## 仕上げ
+推敲工程は別途ありません。編集指針（圧縮・段落・太字・表記・文字数）を適用した完成稿として書いてください。
+"""
+
+        prompt = f"""以下の条件で記事を執筆してください。
+
+{context}
+{finishing_text}
 ## 出力
-上記の必須構造を全て含むMarkdown形式の記事本文を出力してください。
+★必須の記事構造を全て含むMarkdown形式の記事本文を出力してください。
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+        return self._complete(prompt, max_tokens=4096, stage="draft")
+
+    def _generate_sections(
+        self,
+        research_result: ResearchResult,
+        essences: list[dict],
+        target_persona: str,
+        article_title: str,
+        competitor_keywords: list[dict] | None = None,
+        internal_references: list[str] | None = None,
+    ) -> str:
+        """
+        Write the article section by section, concurrently, and stitch it.
+
+        Every section call shares the cached writer instructions and a cached
+        context header (writing conditions and the section plan), so each
+        call only adds its own short task. At most WRITER_SECTION_CONCURRENCY
+        sections are written at once. If any section fails, the article is
+        written in one call instead.
+
+        Args:
+            research_result: Research analysis results.
+            essences: User-provided essence snippets.
+            target_persona: Target reader persona.
+            article_title: Base article title.
+            competitor_keywords: Competitor keywords from research phase (optional).
+            internal_references: RAG knowledge base content (optional).
+
+        Returns:
+            Stitched article content.
+        """
+        specs = plan_sections(research_result.suggested_outline, self.TARGET_WORDS_MAX)
+        context = self._article_context(
+            research_result, essences, target_persona, article_title,
+            competitor_keywords, internal_references,
+        )
+        plan_text = "\n".join(
+            f"{i}. " + (f"## {spec.heading}" if spec.has_heading else "冒頭（見出しなし）")
+            for i, spec in enumerate(specs, 1)
         )
+        header = f"""以下の条件で記事をセクションごとに分担執筆します。あなたはそのうち1セクションだけを担当します。
+
+{context}
+## セクション構成（この順序で結合され、目次は結合時に自動生成されます）
+{plan_text}
+"""
+        tasks = [
+            (
+                self._section_task(i, spec),
+                min(4096, max(1024, int(spec.target_chars / CHARS_PER_TOKEN_ESTIMATE * 1.5))),
+            )
+            for i, spec in enumerate(specs, 1)
+        ]
+        try:
+            texts = self._write_concurrently(header, tasks, stage="sections")
+        except GenerationCancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Section-parallel drafting failed, writing in one pass (non-critical): {e!r}")
+            return self._generate_content(
+                research_result, essences, target_persona, article_title,
+                competitor_keywords, internal_references,
+            )
+
+        return assemble_article(article_title, specs, texts, self._section_transitions(specs, texts))
+
+    def _write_concurrently(self, header: str, tasks: list[tuple[str, int]], stage: str) -> list[str]:
+        """
+        Run independent section generations concurrently.
+
+        Every call sends the cached writer instructions and the same header
+        as a cached prefix, followed by its own task. At most
+        WRITER_SECTION_CONCURRENCY calls are in flight on the LLM gateway's
+        event loop. The calling thread waits for them, passes one
+        StreamProgress per finished call to the stream callback and checks
+        the cancel event, so both work from a UI script thread.
+
+        Args:
+            header: Context shared by all calls.
+            tasks: (task prompt, max_tokens) per call.
+            stage: Stage label for stream progress and token accounting.
+
+        Returns:
+            Generated texts in task order.
+
+        Raises:
+            GenerationCancelledError: If the cancel event is set.
+        """
+        settings = get_settings()
+        shared = cacheable_text(header)
+        system = self._system_prompt()
+        semaphore = asyncio.Semaphore(max(1, settings.writer_section_concurrency))
+        gateway = get_llm_gateway()
+        written: dict[int, str] = {}
+        start = time.perf_counter()
+        first_done: float | None = None
+
+        def cancelled() -> bool:
+            return self.cancel_event is not None and self.cancel_event.is_set()
+
+        def report(i: int, text: str) -> None:
+            nonlocal first_done
+            written[i] = text
+            if self.on_stream is None:
+                return
+            elapsed = time.perf_counter() - start
+            first_done = first_done if first_done is not None else elapsed
+            so_far = "\n\n".join(written[k] for k in sorted(written))
+            self.on_stream(StreamProgress(
+                stage=stage,
+                delta=text,
+                text=so_far,
+                output_tokens=estimate_tokens(so_far),
+                elapsed=elapsed,
+                first_token_seconds=first_done,
+            ))
+
+        finished: queue.Queue[tuple[int, str]] = queue.Queue()
+        failed = False
+
+        async def write(i: int, task: str, max_tokens: int) -> None:
+            nonlocal failed
+            async with semaphore:
+                if failed or cancelled():
+                    raise GenerationCancelledError(stage)
+                try:
+                    response = await asyncio.wait_for(gateway.acreate_message(
+                        f"writer.{stage}",
+                        model=self.MODEL,
+                        max_tokens=max_tokens,
+                        system=system,
+                        messages=[{"role": "user", "content": [shared, {"type": "text", "text": task}]}],
+                    ), settings.generation_timeout)
+                except BaseException:
+                    failed = True  # Set before the slot is released, so queued calls never start
+                    raise
+            finished.put((i, response.content[0].text))
+
+        async def run() -> None:
+            jobs = [
+                asyncio.ensure_future(write(i, task, max_tokens))
+                for i, (task, max_tokens) in enumerate(tasks)
+            ]
+            try:
+                await asyncio.gather(*jobs)
+            finally:
+                for job in jobs:
+                    job.cancel()
+
+        future = gateway.submit(run())
+        try:
+            while len(written) < len(tasks):
+                if cancelled():
+                    raise GenerationCancelledError(stage)
+                try:
+                    i, text = finished.get(timeout=_CANCEL_POLL_SECONDS)
+                except queue.Empty:
+                    if future.done():
+                        future.result()  # Raises the first failure
+                    continue
+                report(i, text)
+        finally:
+            future.cancel()
+
+        logger.info(f"Wrote {len(tasks)} sections ({stage}) in {time.perf_counter() - start:.2f}s")
+        return [written[i] for i in range(len(tasks))]
+
+    def _section_task(self, number: int, spec: SectionSpec) -> str:
+        """Format the task of one section for section-parallel drafting."""
+        if spec.has_heading:
+            start_text = f"「## {spec.heading}」で始め（見出しはキーワードを含めて言い換えても構いません）"
+            label = f"## {spec.heading}"
+        else:
+            start_text = "見出しを付けずに"
+            label = "冒頭（見出しなし）"
+        return f"""## 担当セクション
+{number}. {label}
+
+## 書く内容
+{spec.instructions}
+
+## 分量
+約{spec.target_chars}文字（編集指針を適用した完成稿として書く）
+
+## 出力
+{start_text}、担当セクションのMarkdown本文のみを出力してください。
+記事タイトル・目次・他のセクションの内容は書かないでください。
+"""
+
+    def _section_transitions(self, specs: list[SectionSpec], texts: list[str]) -> dict[int, str]:
+        """
+        Write one bridging sentence for each boundary between body sections.
+
+        This is the lightweight stitch pass: only the text around each
+        boundary is sent and only the short sentences come back.
 
-        return response.content[0].text
+        Args:
+            specs: Planned sections.
+            texts: Written sections in the same order.
+
+        Returns:
+            Dict mapping section index to the sentence appended to it.
+        """
+        boundaries = [
+            i for i in range(len(specs) - 1)
+            if specs[i].key not in _NO_TRANSITION_SECTIONS
+            and specs[i + 1].key not in _NO_TRANSITION_SECTIONS
+        ]
+        if not boundaries:
+            return {}
+
+        blocks = []
+        for n, i in enumerate(boundaries, 1):
+            following = texts[i + 1].strip().split("\n", 1)
+            blocks.append(f"""### 境目{n}
+前のセクションの末尾: {texts[i].strip()[-200:]}
+次のセクション: {following[0]}
+次のセクションの冒頭: {following[1].strip()[:150] if len(following) > 1 else ""}""")
+
+        prompt = f"""以下は記事の連続するセクションの境目です。各境目について、前のセクションの末尾に置くつなぎの文を1文（40文字程度）書いてください。
+前後の内容を自然につなぎ、新しい情報は加えないでください。
+
+{chr(10).join(blocks)}
+
+## 出力形式
+1. [境目1のつなぎの文]
+2. [境目2のつなぎの文]
+...
+"""
+        try:
+            response = self._create(
+                "transitions",
+                model="claude-haiku-3-5-20241022",
+                max_tokens=600,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        except Exception as e:
+            logger.warning(f"Section transitions failed (non-critical): {e}")
+            return {}
+
+        sentences = {}
+        for line in response.content[0].text.strip().split("\n"):
+            match = re.match(r"^(\d+)[.．)]\s*(.+)$", line.strip())
+            if match and 1 <= int(match.group(1)) <= len(boundaries):
+                sentences[boundaries[int(match.group(1)) - 1]] = self._normalize_terms(match.group(2).strip())
+        return sentences
 
     def _generate_titles(
         self,
@@ -301,7 +833,19 @@ class WriterAgent:
         content_preview: str,
     ) -> list[str]:
         """Generate title candidates."""
-        prompt = f"""以下の記事に対して、Note向けのタイトル候補を5つ提案してください。
+        response = self._create(
+            "titles",
+            model=self.MODEL,
+            max_tokens=500,
+            messages=[
+                {"role": "user", "content": self._titles_prompt(base_title, target_persona, content_preview)}
+            ],
+        )
+        return self._parse_titles(response.content[0].text, base_title)
+
+    def _titles_prompt(self, base_title: str, target_persona: str, content_preview: str) -> str:
+        """Build the title candidates prompt."""
+        return f"""以下の記事に対して、Note向けのタイトル候補を5つ提案してください。
 
 ## 元のタイトル
 {base_title}
@@ -327,20 +871,12 @@ class WriterAgent:
 5. タイトル案5
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
-
-        content = response.content[0].text
+    def _parse_titles(self, text: str, base_title: str) -> list[str]:
+        """Parse numbered title candidates from a model response."""
         titles = []
-        for line in content.split("\n"):
+        for line in text.split("\n"):
             line = line.strip()
             if line and (line[0].isdigit() or line.startswith("-")):
-                import re
                 match = re.match(r"[\d\.\-\s]*(.+)", line)
                 if match:
                     titles.append(match.group(1).strip())
@@ -353,7 +889,19 @@ class WriterAgent:
         research_result: ResearchResult,
     ) -> list[str]:
         """Generate prompts for image generation."""
-        prompt = f"""以下の記事に挿入する図解のプロンプトを2-3個作成してください。
+        response = self._create(
+            "image_prompts",
+            model=self.MODEL,
+            max_tokens=800,
+            messages=[
+                {"role": "user", "content": self._image_prompts_prompt(content, research_result)}
+            ],
+        )
+        return self._parse_image_prompts(response.content[0].text)
+
+    def _image_prompts_prompt(self, content: str, research_result: ResearchResult) -> str:
+        """Build the image prompts prompt."""
+        return f"""以下の記事に挿入する図解のプロンプトを2-3個作成してください。
 
 ## 記事内容（抜粋）
 {content[:1500]}
@@ -373,20 +921,11 @@ class WriterAgent:
 ...
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=800,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
-
-        content = response.content[0].text
-
-        # Split by "### 図解" markers
+    def _parse_image_prompts(self, text: str) -> list[str]:
+        """Split a model response into image prompts at "### 図解" markers."""
         prompts = []
         current = []
-        for line in content.split("\n"):
+        for line in text.split("\n"):
             if line.strip().startswith("### 図解"):
                 if current:
                     prompts.append("\n".join(current))
@@ -401,7 +940,19 @@ class WriterAgent:
 
     def _generate_sns_posts(self, title: str, content: str) -> dict[str, str]:
         """Generate SNS post drafts."""
-        prompt = f"""以下の記事に対して、SNS投稿文を作成してください。
+        response = self._create(
+            "sns_posts",
+            model=self.MODEL,
+            max_tokens=500,
+            messages=[
+                {"role": "user", "content": self._sns_prompt(title, content)}
+            ],
+        )
+        return self._parse_sns_posts(response.content[0].text)
+
+    def _sns_prompt(self, title: str, content: str) -> str:
+        """Build the SNS posts prompt."""
+        return f"""以下の記事に対して、SNS投稿文を作成してください。
 
 ## 記事タイトル
 {title}
@@ -420,24 +971,13 @@ class WriterAgent:
 ※記事のリンクは含めないでください（後で追加します）
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
-
-        content = response.content[0].text
-
-        # Parse X and LinkedIn posts
+    def _parse_sns_posts(self, text: str) -> dict[str, str]:
+        """Parse X and LinkedIn posts from a model response."""
         x_post = ""
         linkedin_post = ""
-
-        lines = content.split("\n")
         current_section = None
 
-        for line in lines:
+        for line in text.split("\n"):
             if "X (Twitter)" in line or "Twitter" in line:
                 current_section = "x"
             elif "LinkedIn" in line:
@@ -458,71 +998,271 @@ class WriterAgent:
         original_content: str,
         feedback: str,
         score_breakdown: dict,
+        missing_elements: list[str] | None = None,
+        article_title: str = "",
+        target_persona: str = "",
     ) -> str:
         """
         Revise a draft based on reviewer feedback.
 
+        Reviewer findings and missing structure elements are mapped onto the
+        article's H2 sections; only those sections are regenerated (and
+        missing sections written) concurrently and spliced back, and the
+        table of contents is rebuilt locally. When the feedback cannot be
+        tied to sections, or touches most of them, the whole article is
+        rewritten instead.
+
         Args:
             original_content: Original draft content.
             feedback: Reviewer feedback.
             score_breakdown: Score breakdown by category.
+            missing_elements: Missing structure element names (checked
+                              locally when omitted).
+            article_title: Article title, checked against in the refine
+                           pass of a whole rewrite (optional).
+            target_persona: Target reader persona, likewise (optional).
 
         Returns:
             Revised content.
+
+        Raises:
+            GenerationCancelledError: If the cancel event is set (a stop is
+                                      never turned into a whole rewrite).
+        """
+        parts = split_article(original_content)
+        if missing_elements is None:
+            missing_elements = missing_structure_elements(original_content)
+        revisions = self._plan_revision(parts, self._feedback_findings(feedback), missing_elements)
+        if not revisions or len(revisions) > max(2, len(parts) // 2):
+            return self._revise_whole(
+                original_content, feedback, score_breakdown, article_title, target_persona,
+            )
+
+        logger.info(
+            f"Revising {len(revisions)} of {len(parts)} sections: "
+            f"{[parts[r.index].heading if r.insert is None and r.index >= 0 else 'new' for r in revisions]}"
+        )
+        header = f"""以下の記事を、レビューフィードバックに基づいてセクション単位で改善します。あなたはそのうち1か所だけを担当します。
+
+## 現在の記事
+{original_content}
+
+## レビュースコア
+- ターゲット訴求力: {score_breakdown.get('target_appeal', 0)}/25
+- 論理構成: {score_breakdown.get('logical_structure', 0)}/30
+- SEO適合性: {score_breakdown.get('seo_fitness', 0)}/25
+
+## フィードバック
+{feedback}
+"""
+        tasks = [self._revision_task(parts, revision) for revision in revisions]
+        try:
+            texts = self._write_concurrently(header, tasks, stage="revise")
+        except GenerationCancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Section revision failed, rewriting the whole draft (non-critical): {e!r}")
+            return self._revise_whole(
+                original_content, feedback, score_breakdown, article_title, target_persona,
+            )
+
+        revised = join_parts(self._splice_revisions(parts, revisions, texts))
+        return self._normalize_terms(self._fix_structure(revised))
+
+    def _feedback_findings(self, feedback: str) -> list[str]:
+        """Extract concrete findings (bullets) from reviewer feedback."""
+        lines = [line.strip() for line in feedback.split("\n")]
+        if not any(heading in feedback for heading in _ACTIONABLE_FEEDBACK):
+            # Free-form feedback: every non-heading line is a finding
+            return [line.lstrip("-* ").strip() for line in lines if line and not line.startswith("#")]
+
+        findings = []
+        active = False
+        for line in lines:
+            if line.startswith("#"):
+                active = any(heading in line for heading in _ACTIONABLE_FEEDBACK)
+            elif active and line.startswith("- "):
+                findings.append(line[2:].strip())
+        return findings
+
+    def _plan_revision(
+        self,
+        parts: list[ArticlePart],
+        findings: list[str],
+        missing_elements: list[str],
+    ) -> list[SectionRevision]:
         """
+        Map reviewer findings and missing elements onto article parts.
+
+        Args:
+            parts: Article parts from split_article.
+            findings: Reviewer findings.
+            missing_elements: Missing structure element names.
+
+        Returns:
+            Section rewrites and inserts in article order (empty when no
+            finding could be tied to a part).
+        """
+        order = list(STRUCTURE_ELEMENTS)
+        names = {element["name"]: key for key, element in STRUCTURE_ELEMENTS.items()}
+        missing = {names[name] for name in missing_elements if name in names}
+        elements = [found_structure_elements(part.text) for part in parts]
+        has_preamble = bool(parts) and not parts[0].heading
+        rewrites: dict[int, SectionRevision] = {}
+
+        def rewrite(index: int) -> SectionRevision:
+            return rewrites.setdefault(index, SectionRevision(index=index))
+
+        for finding in findings:
+            index = next((
+                i for i, part in enumerate(parts)
+                if part.heading and not part.is_toc and part.heading in finding
+            ), None)
+            if index is None:
+                keys = [key for key in order if any(k in finding for k in _ELEMENT_KEYWORDS[key])]
+                if keys and keys[0] in ("hook", "conclusion") and has_preamble:
+                    index = 0
+                elif keys and keys[0] != "toc":
+                    index = next((i for i, found in enumerate(elements) if keys[0] in found), None)
+            if index is not None:
+                rewrite(index).findings.append(finding)
+
+        inserts = []
+        for key in order:
+            if key not in missing or key == "toc":
+                continue
+            name = STRUCTURE_ELEMENTS[key]["name"]
+            if key in ("hook", "conclusion") and has_preamble:
+                rewrite(0).add_elements.append(name)
+            elif key in ("hook", "conclusion"):
+                if not any(r.insert is FIXED_SECTIONS["opening"] for r in inserts):
+                    inserts.append(SectionRevision(index=-1, insert=FIXED_SECTIONS["opening"]))
+            elif key == "cta" and "related" in missing:
+                continue  # Written together with the related-articles section below
+            elif key == "cta":
+                rewrite(len(parts) - 1).add_elements.append(name)
+            else:
+                earlier = set(order[:order.index(key)])
+                after = max((i for i, found in enumerate(elements) if found & earlier), default=0)
+                spec = FIXED_SECTIONS["closing" if key == "related" and "cta" in missing else key]
+                inserts.append(SectionRevision(index=after, add_elements=[name], insert=spec))
+
+        return sorted(
+            [*rewrites.values(), *inserts],
+            key=lambda r: (r.index, r.insert is not None),
+        )
+
+    def _revision_task(self, parts: list[ArticlePart], revision: SectionRevision) -> tuple[str, int]:
+        """Format the task and output budget for one section revision."""
+        if revision.insert is not None:
+            spec = revision.insert
+            position = "記事の冒頭" if revision.index < 0 else f"「{parts[revision.index].heading or '冒頭'}」の直後"
+            start_text = (
+                f"「## {spec.heading}」で始め（見出しはキーワードを含めて言い換えても構いません）"
+                if spec.has_heading else "見出しを付けずに"
+            )
+            return f"""## 担当：新しいセクションの追加
+{position}に入る新しいセクションを書いてください。
+
+## 書く内容
+{spec.instructions}
+
+## 出力
+{start_text}、このセクションのMarkdownのみを出力してください。
+""", 1024
+
+        part = parts[revision.index]
+        findings_text = "\n".join(f"- {f}" for f in revision.findings) or "（なし）"
+        elements_text = "\n".join(f"- {e}" for e in revision.add_elements) or "（なし）"
+        keep_text = (
+            f"見出し「## {part.heading}」を維持し" if part.heading
+            else "冒頭（見出しなし）として、記事タイトル（# の行）は書かずに"
+        )
+        section_text = "\n".join(line for line in part.text.split("\n") if not re.match(r"^#\s", line))
+        max_tokens = min(4096, max(1024, int(len(section_text) / CHARS_PER_TOKEN_ESTIMATE * 1.3)))
+        return f"""## 担当セクション
+{section_text}
+
+## このセクションへの指摘
+{findings_text}
+
+## このセクションに追加する必須要素
+{elements_text}
+
+## 出力
+{keep_text}、改善後のこのセクションのMarkdownのみを出力してください。
+他のセクションの内容は書かないでください。
+""", max_tokens
+
+    def _splice_revisions(
+        self,
+        parts: list[ArticlePart],
+        revisions: list[SectionRevision],
+        texts: list[str],
+    ) -> list[ArticlePart]:
+        """Replace revised parts, insert new sections and rebuild the TOC."""
+        replaced = list(parts)
+        inserted: dict[int, list[ArticlePart]] = {}
+        for revision, text in zip(revisions, texts):
+            if revision.insert is not None:
+                text = normalize_section(revision.insert, text)
+                inserted.setdefault(revision.index, []).append(
+                    ArticlePart(revision.insert.heading if revision.insert.has_heading else "", text)
+                )
+                continue
+            part = parts[revision.index]
+            if part.heading:
+                text = normalize_section(SectionSpec("revision", part.heading, ""), text)
+                heading = split_article(text)[0].heading or part.heading
+                replaced[revision.index] = ArticlePart(heading, text)
+            else:
+                title_lines = [line for line in part.text.split("\n") if re.match(r"^#\s", line)]
+                text = normalize_section(FIXED_SECTIONS["opening"], text)
+                replaced[revision.index] = ArticlePart("", "\n\n".join([*title_lines, text]))
+
+        spliced = [*inserted.get(-1, [])]
+        for i, part in enumerate(replaced):
+            spliced.append(part)
+            spliced.extend(inserted.get(i, []))
+        return refresh_toc(spliced)
+
+    def _revise_whole(
+        self,
+        original_content: str,
+        feedback: str,
+        score_breakdown: dict,
+        article_title: str = "",
+        target_persona: str = "",
+    ) -> str:
+        """Rewrite the whole article from feedback, then refine it."""
         prompt = f"""以下の記事を、レビューフィードバックに基づいて改善してください。
 
 ## 現在の記事
 {original_content}
 
 ## レビュースコア
-- ターゲット訴求力: {score_breakdown.get('target_appeal', 0)}/30
-- 論理構成: {score_breakdown.get('logical_structure', 0)}/40
-- SEO適合性: {score_breakdown.get('seo_fitness', 0)}/30
+- ターゲット訴求力: {score_breakdown.get('target_appeal', 0)}/25
+- 論理構成: {score_breakdown.get('logical_structure', 0)}/30
+- SEO適合性: {score_breakdown.get('seo_fitness', 0)}/25
 
 ## フィードバック
 {feedback}
 
-## 必須構造（不足があれば追加）
-以下の要素が全て含まれているか確認し、不足があれば追加してください：
-1. 冒頭「会議の一言」（共感フック）
-2. 結論3行（「**結論から言います。**」で始まる）
-3. 目次（## 目次 セクション）
-4. 一枚絵（テキスト図解）
-5. 原因/問題 3つ（構造化）
-6. 打ち手/解決策（期間付きロードマップ）
-7. アンチパターン（失敗①、失敗②...）
-8. 情シス/DXの方へ（固定1段落）
-9. チェックリスト（- [ ] 形式、5〜7項目）
-10. 次に読む（関連記事2本）
-11. 控えめCTA（区切り線後に1行）
-
-## 改善ガイドライン
+## 改善の進め方
 1. スコアが低い項目を重点的に改善
 2. フィードバックの具体的な指摘に対応
-3. 冗長な表現を削り、読みやすさを改善（10-15%程度の圧縮を目安）
-4. 段落は2〜4行で区切る（スマホ対応）
-5. 文字数は{self.TARGET_WORDS_MIN}-{self.TARGET_WORDS_MAX}文字を維持
-6. Markdown形式を維持
-7. 表記は「SSoT」に統一
+3. ★必須の記事構造（2〜12）に不足があれば追加
+4. 編集指針に沿って冗長な表現を削る
 
 ## 出力
 改善後の記事本文をMarkdown形式で出力してください。
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
-
-        revised = response.content[0].text
+        revised = self._complete(prompt, max_tokens=4096, stage="revise")
         refined = self._refine_content(
             content=revised,
-            target_persona="",
-            article_title="",
+            target_persona=target_persona,
+            article_title=article_title,
         )
         return self._normalize_terms(refined)
 
@@ -533,47 +1273,70 @@ class WriterAgent:
         return re.sub(r"\bSSOT\b", self.CANONICAL_SSoT, text, flags=re.IGNORECASE)
 
     def _refine_content(self, content: str, target_persona: str, article_title: str) -> str:
-        """Refine content: compress, ensure structure, and polish."""
-        prompt = f"""あなたはNote記事の編集者です。以下のMarkdown記事を最終チェック・改善してください。
-
-## 必須構造チェック（不足があれば追加）
-以下の要素が全て含まれているか確認し、不足があれば追加してください：
-
-1. ✅ 冒頭「会議の一言」（「〇〇〇〇？」から始まる共感フック）
-2. ✅ 結論3行（「**結論から言います。**」で始まる）
-3. ✅ 目次（## 目次 セクション）
-4. ✅ 一枚絵（テキスト図解、罫線文字使用）
-5. ✅ 原因/問題 3つ（構造化された説明）
-6. ✅ 打ち手/解決策（期間付きロードマップ）
-7. ✅ アンチパターン（失敗①、失敗②...の形式）
-8. ✅ 情シス/DXの方へ（1段落の固定コーナー）
-9. ✅ チェックリスト（- [ ] 形式、5〜7項目）
-10. ✅ 次に読む（関連記事2本、準備中でもOK）
-11. ✅ 控えめCTA（区切り線後に1行）
-
-## 編集指針
-1. 冗長な表現や重複を削り、読みやすくする（10-15%程度の圧縮を目安）
-2. 段落は2〜4行で区切る（スマホ対応）
-3. 太字は1ブロック1〜2個まで
-4. 表記は「SSoT」に統一
-5. 文字数は{self.TARGET_WORDS_MIN}-{self.TARGET_WORDS_MAX}文字程度を維持
+        """
+        Refine content: compress, ensure structure, and polish.
 
-## 記事本文
+        The title and persona checks are only asked for when they are given.
+        """
+        checks = []
+        blocks = ""
+        if article_title:
+            checks.append("記事タイトルの約束に本文が応えているか")
+            blocks += f"## 記事タイトル\n{article_title}\n\n"
+        if target_persona:
+            checks.append("ターゲット読者にとっての言葉遣い・具体例になっているか")
+            blocks += f"## ターゲット読者\n{target_persona}\n\n"
+        check_text = f"{'、'.join(checks)}も確認し、ずれていれば直してください。\n" if checks else ""
+        prompt = f"""以下のMarkdown記事を編集者として最終チェック・改善してください。
+★必須の記事構造（2〜12）が全て含まれているか確認し、不足があれば追加したうえで、
+編集指針に沿って仕上げてください。
+{check_text}
+{blocks}## 記事本文
 {content}
 
 ## 出力
 改善後のMarkdown本文のみを出力してください。
 """
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
+        return self._complete(prompt, max_tokens=4096, stage="refine")
+
+    def _fix_structure(self, content: str) -> str:
+        """
+        Add missing mandatory structure elements to a single-pass draft.
+
+        The reviewer's structure rules are checked locally first; the fix-up
+        call is only made when an element is missing.
+
+        Args:
+            content: Draft content.
+
+        Returns:
+            Content with the missing elements added, or unchanged.
+        """
+        missing = missing_structure_elements(content)
+        if not missing:
+            logger.info("Single-pass draft has all structure elements; skipping refine")
+            return content
+
+        logger.info(f"Single-pass draft is missing {len(missing)} structure elements: {missing}")
+        missing_text = "\n".join(f"- {name}" for name in missing)
+        prompt = f"""以下のMarkdown記事には、★必須の記事構造のうち次の要素が不足しています。
+
+## 不足している要素
+{missing_text}
+
+## 修正方針
+1. 不足している要素だけを、★必須の記事構造の順序どおりの位置に追加する
+2. 既存の見出し・本文は変更しない
+
+## 記事本文
+{content}
+
+## 出力
+修正後のMarkdown本文全体のみを出力してください。
+"""
 
-        return response.content[0].text
+        return self._complete(prompt, max_tokens=4096, stage="fixup")
 
     def search_images_for_prompts(
         self,
@@ -642,7 +1405,8 @@ class WriterAgent:
 """
 
         try:
-            response = self.client.messages.create(
+            response = self._create(
+                "meta_description",
                 model="claude-haiku-3-5-20241022",  # Use Haiku for cost efficiency
                 max_tokens=200,
                 messages=[
@@ -705,7 +1469,8 @@ JSONのみを出力してください。
 """
 
         try:
-            response = self.client.messages.create(
+            response = self._create(
+                "faq_schema",
                 model="claude-haiku-3-5-20241022",
                 max_tokens=1000,
                 messages=[
@@ -772,7 +1537,8 @@ JSONのみを出力してください。
 """
 
         try:
-            response = self.client.messages.create(
+            response = self._create(
+                "cta_variants",
                 model="claude-haiku-3-5-20241022",
                 max_tokens=300,
                 messages=[
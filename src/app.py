@@ -5,6 +5,8 @@ Entry point for the article generation system.
 """
 
 import re
+import threading
+import time
 
 import streamlit as st
 
@@ -29,6 +31,8 @@ from src.database.connection import get_session, init_db
 from src.database.models import Article, ArticleStatus
 from src.repositories.article_repository import ArticleRepository
 from src.repositories.snippet_repository import SnippetRepository
+from src.services.japanese_tokenizer import warm_up_in_background
+from src.services.llm_stream import GenerationCancelledError, StreamProgress
 from src.ui.state import SessionState, UIPhase, get_phase_display_info
 from src.ui.components import (
     render_sidebar,
@@ -56,6 +60,9 @@ def main():
     # Initialize session state
     SessionState.initialize()
 
+    # Load the Janome dictionary once per process, off the request path
+    warm_up_in_background()
+
     # Check for admin mode
     if st.session_state.get("admin_mode"):
         render_admin_mode()
@@ -254,6 +261,14 @@ def render_research_phase(article: Article | None, repo: ArticleRepository) -> N
                     st.markdown("**コンテンツギャップ:**")
                     for gap in gaps:
                         st.markdown(f"- {gap}")
+                timings = article.competitor_analysis.get("timings", {})
+                if timings:
+                    steps = ", ".join(
+                        f"{name} {seconds:.1f}s"
+                        for name, seconds in timings.items()
+                        if name != "total"
+                    )
+                    st.caption(f"所要時間: {timings.get('total', 0):.1f}秒（{steps}）")
 
         if st.button("エッセンス入力へ進む", type="primary"):
             SessionState.set_ui_phase(UIPhase.ESSENCE_INPUT)
@@ -382,6 +397,9 @@ def render_drafting_phase(article: Article | None, repo: ArticleRepository) -> N
 
     # Check if we should start generation
     if not st.session_state.get("generation_started"):
+        if st.session_state.pop("generation_cancelled", False):
+            st.info("記事生成を中止しました")
+
         st.markdown("""
         ### 記事生成の準備ができました
 
@@ -397,11 +415,27 @@ def render_drafting_phase(article: Article | None, repo: ArticleRepository) -> N
             st.rerun()
         return
 
+    # Clicking stop reruns the script, which interrupts the running generation
+    # and closes the model stream; the cancel event also stops work that is
+    # not waiting on the script (e.g. sections in flight on the LLM gateway)
+    if st.button("⏹ 生成を中止", key="cancel_generation"):
+        cancel_event = st.session_state.pop("generation_cancel_event", None)
+        if cancel_event is not None:
+            cancel_event.set()
+        del st.session_state["generation_started"]
+        st.session_state["generation_cancelled"] = True
+        st.rerun()
+
     # Run generation with review via WorkflowService
     progress_placeholder = st.empty()
     status_placeholder = st.empty()
+    stream_status_placeholder = st.empty()
+    stream_preview_placeholder = st.container(height=420).empty()
     result_placeholder = st.empty()
 
+    stream_stage_labels = {"draft": "本文を生成中", "refine": "推敲中", "revise": "修正中", "fixup": "不足要素を補完中", "sections": "セクションを並列生成中"}
+    last_stream_render = [0.0]
+
     try:
         from src.workflow.service import WorkflowService
 
@@ -409,16 +443,38 @@ def render_drafting_phase(article: Article | None, repo: ArticleRepository) -> N
             progress_placeholder.progress(percent / 100, text=message)
             status_placeholder.markdown(f"⚙️ {message}")
 
+        def on_stream(progress: StreamProgress) -> None:
+            # Throttle re-rendering; the final event always renders
+            now = time.monotonic()
+            if not progress.done and now - last_stream_render[0] < 0.3:
+                return
+            last_stream_render[0] = now
+            label = stream_stage_labels.get(progress.stage, "生成中")
+            state_label = "完了" if progress.done else "…"
+            stream_status_placeholder.caption(
+                f"✍️ {label}{state_label} {progress.output_tokens:,} tokens · "
+                f"{progress.tokens_per_second:.1f} tokens/s · {progress.elapsed:.0f}秒"
+            )
+            stream_preview_placeholder.markdown(progress.text)
+
+        cancel_event = threading.Event()
+        st.session_state["generation_cancel_event"] = cancel_event
+
         with st.spinner("記事生成・レビューを実行中..."):
             service = WorkflowService()
             state = service.run_generation_with_review(
                 article_id=str(article.id),
                 on_progress=on_progress,
+                on_stream=on_stream,
+                cancel_event=cancel_event,
             )
+        stream_status_placeholder.empty()
+        stream_preview_placeholder.empty()
 
         # Clear session state
         if "generation_started" in st.session_state:
             del st.session_state["generation_started"]
+        st.session_state.pop("generation_cancel_event", None)
 
         # Show result
         score = state["review_score"]
@@ -437,12 +493,19 @@ def render_drafting_phase(article: Article | None, repo: ArticleRepository) -> N
             SessionState.set_ui_phase(UIPhase.EDITOR)
             st.rerun()
 
+    except GenerationCancelledError:
+        st.info("記事生成を中止しました")
+        if "generation_started" in st.session_state:
+            del st.session_state["generation_started"]
+        st.session_state.pop("generation_cancel_event", None)
+
     except Exception as e:
         st.error(f"記事生成に失敗しました: {e}")
         import traceback
         st.code(traceback.format_exc())
         if "generation_started" in st.session_state:
             del st.session_state["generation_started"]
+        st.session_state.pop("generation_cancel_event", None)
         if st.button("再試行"):
             st.session_state["generation_started"] = True
             st.rerun()
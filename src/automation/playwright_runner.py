@@ -245,48 +245,47 @@ def _markdown_to_html(markdown_text: str) -> str:
     except Exception:
         pass
 
-    lines = markdown_text.splitlines()
+    from src.services.markdown_document import parse_markdown
+
     html_lines: list[str] = []
     in_ul = False
     in_ol = False
 
-    for line in lines:
-        stripped = line.rstrip()
-        if not stripped:
-            if in_ul:
-                html_lines.append("</ul>")
-                in_ul = False
-            if in_ol:
-                html_lines.append("</ol>")
-                in_ol = False
-            continue
+    for line in parse_markdown(markdown_text).lines:
+        if line.kind != "unordered" and in_ul:
+            html_lines.append("</ul>")
+            in_ul = False
+        if line.kind != "ordered" and in_ol:
+            html_lines.append("</ol>")
+            in_ol = False
 
-        if stripped.startswith("### "):
-            html_lines.append(f"<h3>{_format_inline(stripped[4:])}</h3>")
+        if line.kind == "blank":
             continue
-        if stripped.startswith("## "):
-            html_lines.append(f"<h2>{_format_inline(stripped[3:])}</h2>")
-            continue
-        if stripped.startswith("# "):
-            html_lines.append(f"<h1>{_format_inline(stripped[2:])}</h1>")
+
+        if line.kind == "heading":
+            tag = f"h{line.level}"
+            html_lines.append(f"<{tag}>{_format_inline(line.content)}</{tag}>")
             continue
 
-        if stripped.startswith("- ") or stripped.startswith("* "):
+        if line.kind == "unordered":
             if not in_ul:
                 html_lines.append("<ul>")
                 in_ul = True
-            html_lines.append(f"<li>{_format_inline(stripped[2:])}</li>")
+            html_lines.append(f"<li>{_format_inline(line.content)}</li>")
             continue
 
-        ordered_match = re.match(r"\d+\.\s+(.+)", stripped)
-        if ordered_match:
+        if line.kind == "ordered":
             if not in_ol:
                 html_lines.append("<ol>")
                 in_ol = True
-            html_lines.append(f"<li>{_format_inline(ordered_match.group(1))}</li>")
+            html_lines.append(f"<li>{_format_inline(line.content)}</li>")
             continue
 
-        html_lines.append(f"<p>{_format_inline(stripped)}</p>")
+        if line.kind == "break":
+            html_lines.append("<hr>")
+            continue
+
+        html_lines.append(f"<p>{_format_inline(line.text.strip())}</p>")
 
     if in_ul:
         html_lines.append("</ul>")
@@ -632,6 +631,11 @@ def run_test_login(email: str, password: str, headless: bool = True, screenshot_
 
 
 if __name__ == "__main__":
+    # Add project root to path (this file runs as a standalone script)
+    project_root = str(Path(__file__).resolve().parent.parent.parent)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
     # Read command from stdin as JSON
     input_data = json.loads(sys.stdin.read())
 
@@ -75,6 +75,70 @@ class Settings(BaseSettings):
         default_factory=list,
         description="Domains to prioritize in Tavily results (soft preference)",
     )
+    tavily_cache_enabled: bool = Field(
+        default=True,
+        description="Cache Tavily responses on disk and coalesce identical requests",
+    )
+    tavily_cache_ttl_hours: float = Field(
+        default=24,
+        description="Lifetime of cached Tavily responses in hours",
+    )
+    tavily_rate_limit_per_minute: float = Field(
+        default=60,
+        description="Tavily requests per minute per API key (0 = unlimited)",
+    )
+    tavily_rate_limit_burst: int = Field(
+        default=5,
+        description="Tavily requests allowed in a burst before rate limiting",
+    )
+    tavily_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent Tavily requests",
+    )
+    tavily_timeout_seconds: float = Field(
+        default=30,
+        description="Deadline for one Tavily search including retries",
+    )
+    tavily_max_retries: int = Field(
+        default=3,
+        description="Retries on Tavily 429/5xx responses in the async gateway",
+    )
+    competitor_batch_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent searches in batch competitor keyword research",
+    )
+    competitor_keywords_max_age_days: float = Field(
+        default=7,
+        description="Stored competitor keyword results younger than this are reused",
+    )
+    competitor_page_fetch_enabled: bool = Field(
+        default=False,
+        description="Fetch competitor pages during research to extract their real h1-h3 outline",
+    )
+    competitor_page_fetch_concurrency: int = Field(
+        default=4,
+        description="Maximum competitor pages downloaded at once",
+    )
+    competitor_page_timeout_seconds: float = Field(
+        default=10,
+        description="Timeout for fetching one competitor page",
+    )
+    competitor_page_cache_path: str = Field(
+        default="./data/cache/competitor_pages",
+        description="Directory for cached competitor page headings",
+    )
+    competitor_page_cache_ttl_hours: float = Field(
+        default=24,
+        description="Cached competitor headings younger than this are used without revalidation",
+    )
+    serp_snapshot_enabled: bool = Field(
+        default=True,
+        description="Record Tavily results as dated SERP snapshots in Postgres",
+    )
+    serp_snapshot_max_age_days: float = Field(
+        default=1,
+        description="Searches reuse SERP snapshots younger than this (0 = always call Tavily)",
+    )
 
     # ===========================================
     # Note.com Credentials
@@ -108,6 +172,27 @@ class Settings(BaseSettings):
         description="ChromaDB persistence directory",
     )
 
+    chroma_hnsw_space: Literal["l2", "cosine", "ip"] = Field(
+        default="l2",
+        description="HNSW distance metric (applies when a collection is created)",
+    )
+    chroma_hnsw_m: int = Field(
+        default=16,
+        description="HNSW max neighbors per node (applies when a collection is created)",
+    )
+    chroma_hnsw_construction_ef: int = Field(
+        default=100,
+        description="HNSW candidate list size while building (applies when a collection is created)",
+    )
+    chroma_hnsw_search_ef: int = Field(
+        default=100,
+        description="HNSW candidate list size while querying (applied to existing collections)",
+    )
+    archive_write_through: bool = Field(
+        default=True,
+        description="Index completed articles into archive_index on a background worker",
+    )
+
     @property
     def chroma_path(self) -> Path:
         """Get ChromaDB path as Path object."""
@@ -129,6 +214,81 @@ class Settings(BaseSettings):
         default=300,
         description="Article generation timeout in seconds (5 minutes default)",
     )
+    writer_asset_timeout_seconds: float = Field(
+        default=90,
+        description="Timeout for each title/image prompt/image search/SNS step after drafting",
+    )
+    writer_draft_mode: Literal["single_pass", "two_pass"] = Field(
+        default="single_pass",
+        description="single_pass writes the finished draft in one call and only runs a fix-up "
+        "call when structure elements are missing; two_pass always refines the whole draft",
+    )
+    writer_section_parallel: bool = Field(
+        default=False,
+        description="Write drafts section by section concurrently from the suggested outline",
+    )
+    writer_section_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent section generations per draft",
+    )
+    writer_context_token_budget: int = Field(
+        default=6000,
+        description="Estimated input token budget for the per-article draft context; lower-priority "
+        "material (references, competitor keywords, gaps, outline) is cut to fit (0 = unlimited)",
+    )
+    anthropic_prompt_cache_enabled: bool = Field(
+        default=True,
+        description="Mark static writer/reviewer instructions as cacheable prompt prefixes",
+    )
+    llm_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent LLM requests per model (per event loop for async calls)",
+    )
+    llm_model_concurrency: dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-model overrides of LLM_MAX_CONCURRENCY, e.g. claude-haiku-3-5-20241022=8",
+    )
+    llm_rate_limit_per_minute: float = Field(
+        default=0,
+        description="LLM requests per minute per model and API key (0 = unlimited)",
+    )
+    llm_rate_limit_burst: int = Field(
+        default=5,
+        description="LLM requests per model allowed in a burst before rate limiting",
+    )
+    llm_max_retries: int = Field(
+        default=3,
+        description="Retries on LLM 429/5xx responses and connection errors",
+    )
+    llm_cache_enabled: bool = Field(
+        default=False,
+        description="Replay identical LLM requests from an on-disk response cache",
+    )
+    llm_cache_labels: list[str] = Field(
+        default_factory=lambda: [
+            "writer.meta_description",
+            "writer.faq_schema",
+            "writer.cta_variants",
+            "writer.titles",
+        ],
+        description="Usage labels (or label prefixes such as 'writer') whose calls are cached",
+    )
+    llm_cache_ttl_hours: float = Field(
+        default=24,
+        description="Lifetime of cached LLM responses in hours",
+    )
+    llm_cache_max_mb: float = Field(
+        default=100,
+        description="Size budget of cached LLM responses in MB (oldest evicted first, 0 = unlimited)",
+    )
+    tokenizer_cache_size: int = Field(
+        default=512,
+        description="Number of tokenized texts kept in the shared Janome LRU cache (0 disables)",
+    )
+    response_cache_path: str = Field(
+        default="./data/cache/responses.sqlite3",
+        description="SQLite file for cached external API responses",
+    )
 
     @field_validator("log_level", mode="before")
     @classmethod
@@ -136,10 +296,16 @@ class Settings(BaseSettings):
         """Ensure log level is uppercase."""
         return v.upper() if isinstance(v, str) else v
 
-    @field_validator("tavily_include_domains", "tavily_exclude_domains", "tavily_prefer_domains", mode="before")
+    @field_validator(
+        "tavily_include_domains",
+        "tavily_exclude_domains",
+        "tavily_prefer_domains",
+        "llm_cache_labels",
+        mode="before",
+    )
     @classmethod
     def parse_domain_list(cls, v):
-        """Parse comma-separated domain lists from env."""
+        """Parse comma-separated domain and label lists from env."""
         if v is None:
             return []
         if isinstance(v, list):
@@ -149,6 +315,21 @@ class Settings(BaseSettings):
             return [p for p in parts if p]
         return []
 
+    @field_validator("llm_model_concurrency", mode="before")
+    @classmethod
+    def parse_model_limits(cls, v):
+        """Parse comma-separated model=limit pairs from env."""
+        if not v:
+            return {}
+        if isinstance(v, dict):
+            return v
+        limits = {}
+        for pair in str(v).replace("\n", ",").split(","):
+            model, sep, limit = pair.partition("=")
+            if sep and model.strip() and limit.strip():
+                limits[model.strip()] = int(limit)
+        return limits
+
     def validate_api_keys(self) -> dict[str, bool]:
         """
         Validate that required API keys are configured.
@@ -323,10 +504,13 @@ def resolve_tavily_domains(
 # API Client Factories
 # ===========================================
 
-def get_anthropic_client():
+def get_anthropic_client(**options):
     """
     Get configured Anthropic client.
 
+    Args:
+        **options: Extra client arguments (e.g. max_retries).
+
     Returns:
         Anthropic client instance.
 
@@ -339,13 +523,38 @@ def get_anthropic_client():
     if not settings.anthropic_api_key:
         raise ValueError("ANTHROPIC_API_KEY is not configured")
 
-    return Anthropic(api_key=settings.anthropic_api_key)
+    return Anthropic(api_key=settings.anthropic_api_key, **options)
+
+
+def get_async_anthropic_client(**options):
+    """
+    Get configured async Anthropic client.
+
+    Args:
+        **options: Extra client arguments (e.g. max_retries).
+
+    Returns:
+        AsyncAnthropic client instance.
+
+    Raises:
+        ValueError: If API key is not configured.
+    """
+    from anthropic import AsyncAnthropic
+
+    settings = get_settings()
+    if not settings.anthropic_api_key:
+        raise ValueError("ANTHROPIC_API_KEY is not configured")
+
+    return AsyncAnthropic(api_key=settings.anthropic_api_key, **options)
 
 
-def get_openai_client():
+def get_openai_client(**options):
     """
     Get configured OpenAI client.
 
+    Args:
+        **options: Extra client arguments (e.g. max_retries).
+
     Returns:
         OpenAI client instance.
 
@@ -358,7 +567,7 @@ def get_openai_client():
     if not settings.openai_api_key:
         raise ValueError("OPENAI_API_KEY is not configured")
 
-    return OpenAI(api_key=settings.openai_api_key)
+    return OpenAI(api_key=settings.openai_api_key, **options)
 
 
 def get_tavily_client():
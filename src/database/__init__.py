@@ -4,7 +4,16 @@ EPM Note Engine - Database Module
 Provides database connection, session management, and model exports.
 """
 
-from src.database.models import Article, ArticleStatus, Snippet, SnippetCategory, Base
+from src.database.models import (
+    Article,
+    ArticleStatus,
+    Base,
+    CompetitorKeywordRecord,
+    SerpPage,
+    SerpSnapshot,
+    Snippet,
+    SnippetCategory,
+)
 from src.database.connection import (
     get_engine,
     get_session,
@@ -19,6 +28,9 @@ __all__ = [
     "ArticleStatus",
     "Snippet",
     "SnippetCategory",
+    "CompetitorKeywordRecord",
+    "SerpPage",
+    "SerpSnapshot",
     "Base",
     # Connection
     "get_engine",
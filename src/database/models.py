@@ -1,22 +1,24 @@
 """
 EPM Note Engine - SQLAlchemy Models
 
-Defines Article and Snippet models with full type safety.
+Defines Article, Snippet and stored research result models with full type safety.
 """
 
 import enum
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import (
     Boolean,
+    Date,
     DateTime,
     Enum,
     ForeignKey,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
@@ -219,3 +221,144 @@ class Snippet(Base):
 
     def __repr__(self) -> str:
         return f"<Snippet(id={self.id}, category={self.category}, content={self.content[:30]}...)>"
+
+
+class CompetitorKeywordRecord(Base):
+    """
+    Stored competitor keyword analysis for one search query.
+
+    Written by batch competitor keyword research so the editor can show
+    results instantly; one row per (query, domain profile), overwritten on refresh.
+    """
+
+    __tablename__ = "competitor_keyword_results"
+    __table_args__ = (
+        UniqueConstraint(
+            "query", "domain_profile", name="uq_competitor_keyword_results_query_profile"
+        ),
+    )
+
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+
+    # Search parameters
+    query: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    domain_profile: Mapped[str] = mapped_column(
+        String(50), nullable=False, default=""
+    )  # "" = default Tavily domains
+    max_articles: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Result
+    total_articles: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    result: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, nullable=False
+    )  # CompetitorKeywordResult.to_dict()
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CompetitorKeywordRecord(query={self.query}, profile={self.domain_profile})>"
+
+
+class SerpPage(Base):
+    """
+    Content of one search result page, stored once per distinct content.
+
+    Keyed by a hash of url, title and content, so a page that has not changed
+    between SERP snapshots is stored only once.
+    """
+
+    __tablename__ = "serp_pages"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    url: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    title: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    content: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    first_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<SerpPage(hash={self.content_hash[:12]}, url={self.url})>"
+
+
+class SerpSnapshot(Base):
+    """
+    Normalized Tavily results for one search on one day.
+
+    One row per (query, domain profile, search depth, filters, date); repeated
+    searches on the same day overwrite it. Results reference SerpPage rows by
+    hash.
+    """
+
+    __tablename__ = "serp_snapshots"
+    __table_args__ = (
+        UniqueConstraint(
+            "query",
+            "domain_profile",
+            "search_depth",
+            "filter_key",
+            "snapshot_date",
+            name="uq_serp_snapshots_query_profile_depth_filter_date",
+        ),
+    )
+
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+
+    # Search parameters
+    query: Mapped[str] = mapped_column(String(500), nullable=False, index=True)  # Normalized
+    domain_profile: Mapped[str] = mapped_column(
+        String(50), nullable=False, default=""
+    )  # "" = default Tavily domains
+    search_depth: Mapped[str] = mapped_column(String(20), nullable=False, default="basic")
+    filter_key: Mapped[str] = mapped_column(
+        String(64), nullable=False, default=""
+    )  # Hash of the answer flag and domain lists actually sent
+    max_results: Mapped[int] = mapped_column(Integer, nullable=False)
+    snapshot_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # Results
+    answer: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    results: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False
+    )  # [{rank, url, title, score, content_hash}]
+    results_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<SerpSnapshot(query={self.query}, date={self.snapshot_date})>"
@@ -1,15 +1,20 @@
 """
 EPM Note Engine - Repository Layer
 
-Provides data access abstractions for Articles, Snippets, and RAG.
+Provides data access abstractions for Articles, Snippets, competitor keyword
+results, SERP snapshots, and RAG.
 """
 
 from src.repositories.article_repository import ArticleRepository
+from src.repositories.competitor_keyword_repository import CompetitorKeywordRepository
+from src.repositories.serp_snapshot_repository import SerpSnapshotRepository
 from src.repositories.snippet_repository import SnippetRepository
 from src.repositories.rag_service import RAGService
 
 __all__ = [
     "ArticleRepository",
+    "CompetitorKeywordRepository",
+    "SerpSnapshotRepository",
     "SnippetRepository",
     "RAGService",
 ]
@@ -0,0 +1,125 @@
+"""
+EPM Note Engine - Competitor Keyword Repository
+
+Storage for batch competitor keyword research results.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database.models import CompetitorKeywordRecord
+
+
+class CompetitorKeywordRepository:
+    """Repository for stored competitor keyword results."""
+
+    def __init__(self, session: Session) -> None:
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy session instance.
+        """
+        self.session = session
+
+    def get(self, query: str, domain_profile: str | None = None) -> CompetitorKeywordRecord | None:
+        """
+        Get the stored result for a query.
+
+        Args:
+            query: Search query.
+            domain_profile: Tavily domain profile (None = default domains).
+
+        Returns:
+            CompetitorKeywordRecord or None if not stored.
+        """
+        stmt = select(CompetitorKeywordRecord).where(
+            CompetitorKeywordRecord.query == query,
+            CompetitorKeywordRecord.domain_profile == (domain_profile or ""),
+        )
+        return self.session.scalars(stmt).first()
+
+    def get_fresh(
+        self,
+        query: str,
+        domain_profile: str | None = None,
+        max_age: timedelta | None = None,
+        min_articles: int = 0,
+    ) -> CompetitorKeywordRecord | None:
+        """
+        Get the stored result if it is recent and analyzed enough articles.
+
+        Args:
+            query: Search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            max_age: Maximum age of the result (None = any age).
+            min_articles: Minimum max_articles the result was computed with.
+
+        Returns:
+            CompetitorKeywordRecord or None if missing or stale.
+        """
+        record = self.get(query, domain_profile)
+        if record is None or record.max_articles < min_articles:
+            return None
+        if max_age is not None:
+            updated_at = record.updated_at
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if datetime.now(timezone.utc) - updated_at > max_age:
+                return None
+        return record
+
+    def save(
+        self,
+        query: str,
+        domain_profile: str | None,
+        max_articles: int,
+        result: dict[str, Any],
+    ) -> CompetitorKeywordRecord:
+        """
+        Insert or overwrite the result for a query.
+
+        Args:
+            query: Search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            max_articles: Number of articles requested from the search.
+            result: CompetitorKeywordResult.to_dict().
+
+        Returns:
+            The stored record.
+        """
+        record = self.get(query, domain_profile)
+        if record is None:
+            record = CompetitorKeywordRecord(
+                query=query,
+                domain_profile=domain_profile or "",
+            )
+            self.session.add(record)
+
+        record.max_articles = max_articles
+        record.total_articles = result.get("total_articles", 0)
+        record.result = result
+        # Set explicitly so freshness checks work before the row is reloaded
+        record.updated_at = datetime.now(timezone.utc)
+        self.session.flush()
+        return record
+
+    def list_recent(self, limit: int = 50) -> Sequence[CompetitorKeywordRecord]:
+        """
+        Get the most recently updated results.
+
+        Args:
+            limit: Maximum number of records.
+
+        Returns:
+            Records ordered by last update, newest first.
+        """
+        stmt = (
+            select(CompetitorKeywordRecord)
+            .order_by(CompetitorKeywordRecord.updated_at.desc())
+            .limit(limit)
+        )
+        return self.session.scalars(stmt).all()
@@ -6,6 +6,8 @@ Uses OpenAI text-embedding-3-small for high-quality Japanese embeddings.
 """
 
 import logging
+import re
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
 from typing import Any
 
@@ -17,6 +19,37 @@ from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Chunk ids are built as "<source prefix>_<chunk index>" (e.g. "article_<uuid>_003")
+_CHUNK_SUFFIX_PATTERN = re.compile(r"_\d+$")
+
+
+def document_id_prefix(document_id: str) -> str:
+    """
+    Derive the source prefix from a deterministic chunk id.
+
+    Strips the trailing "_NNN" chunk index; ids without one (e.g. "snippet_<uuid>")
+    are returned unchanged.
+    """
+    return _CHUNK_SUFFIX_PATTERN.sub("", document_id)
+
+
+def hnsw_metadata(settings) -> dict[str, Any]:
+    """
+    Build Chroma HNSW collection metadata from settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Metadata dict with hnsw:space, hnsw:M, hnsw:construction_ef and hnsw:search_ef.
+    """
+    return {
+        "hnsw:space": settings.chroma_hnsw_space,
+        "hnsw:M": settings.chroma_hnsw_m,
+        "hnsw:construction_ef": settings.chroma_hnsw_construction_ef,
+        "hnsw:search_ef": settings.chroma_hnsw_search_ef,
+    }
+
 
 @dataclass
 class SearchResult:
@@ -41,6 +74,10 @@ class RAGService:
 
     KNOWLEDGE_BASE_COLLECTION = "knowledge_base_v2"  # New collection with OpenAI embeddings
     ARCHIVE_INDEX_COLLECTION = "archive_index_v2"
+    COLLECTION_DESCRIPTIONS = {
+        KNOWLEDGE_BASE_COLLECTION: "Internal knowledge documents",
+        ARCHIVE_INDEX_COLLECTION: "Past articles and snippets",
+    }
 
     def __init__(self, persist_directory: str | None = None) -> None:
         """
@@ -66,22 +103,62 @@ class RAGService:
         self._embedding_function = self._create_embedding_function(settings)
 
         # Initialize collections with OpenAI embeddings
+        self._hnsw_metadata = hnsw_metadata(settings)
         self._knowledge_base = self.client.get_or_create_collection(
             name=self.KNOWLEDGE_BASE_COLLECTION,
-            metadata={
-                "description": "Internal knowledge documents",
-                "embedding_model": "text-embedding-3-small",
-            },
+            metadata=self._collection_metadata(self.KNOWLEDGE_BASE_COLLECTION),
             embedding_function=self._embedding_function,
         )
         self._archive_index = self.client.get_or_create_collection(
             name=self.ARCHIVE_INDEX_COLLECTION,
-            metadata={
-                "description": "Past articles and snippets",
-                "embedding_model": "text-embedding-3-small",
-            },
+            metadata=self._collection_metadata(self.ARCHIVE_INDEX_COLLECTION),
             embedding_function=self._embedding_function,
         )
+        for collection in (self._knowledge_base, self._archive_index):
+            self._apply_search_ef(collection)
+
+    def _collection_metadata(self, collection_name: str) -> dict[str, Any]:
+        """Build creation metadata (description + HNSW parameters) for a collection."""
+        return {
+            "description": self.COLLECTION_DESCRIPTIONS[collection_name],
+            "embedding_model": "text-embedding-3-small",
+            **self._hnsw_metadata,
+        }
+
+    def _apply_search_ef(self, collection) -> None:
+        """
+        Bring an existing collection's search_ef in line with settings.
+
+        search_ef is a query-time parameter and can be changed in place; space, M
+        and construction_ef are fixed at build time, so a mismatch is only logged
+        (clear_collection + reseed rebuilds with the configured values).
+        """
+        hnsw = (getattr(collection, "configuration", None) or {}).get("hnsw") or {}
+        if not hnsw:
+            return
+
+        search_ef = self._hnsw_metadata["hnsw:search_ef"]
+        if hnsw.get("ef_search") != search_ef:
+            try:
+                collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+                logger.info(f"Set search_ef={search_ef} on {collection.name}")
+            except Exception as e:
+                logger.warning(f"Could not update search_ef on {collection.name}: {e}")
+
+        built = {
+            "hnsw:space": hnsw.get("space"),
+            "hnsw:M": hnsw.get("max_neighbors"),
+            "hnsw:construction_ef": hnsw.get("ef_construction"),
+        }
+        mismatched = {
+            key: value for key, value in built.items()
+            if value is not None and value != self._hnsw_metadata[key]
+        }
+        if mismatched:
+            logger.warning(
+                f"{collection.name} was built with {mismatched}; "
+                "clear and reseed the collection to apply the configured HNSW settings"
+            )
 
     def _create_embedding_function(self, settings):
         """Create the embedding function based on available API keys."""
@@ -167,7 +244,7 @@ class RAGService:
 
         # Batch in chunks of 100 to avoid API rate limits
         batch_size = 100
-        total = len(document_ids)
+        total = len(doc_ids)
 
         for i in range(0, total, batch_size):
             end = min(i + batch_size, total)
@@ -284,23 +361,39 @@ class RAGService:
             where: Metadata filter for deletion.
         """
         collection = self._get_collection(collection_name)
-        # Chroma expects a single operator at the top level (e.g., $and).
-        # Normalize simple dict filters into operator form.
         if not where:
             return
 
+        collection.delete(where=self._normalize_where(where))
+
+    def get_document_ids(self, collection_name: str, where: dict[str, Any]) -> list[str]:
+        """
+        Get IDs of documents matching a metadata filter, without loading content.
+
+        Args:
+            collection_name: Name of the collection.
+            where: Metadata filter.
+
+        Returns:
+            Matching document IDs.
+        """
+        collection = self._get_collection(collection_name)
+        result = collection.get(where=self._normalize_where(where), include=[])
+        return result.get("ids") or []
+
+    @staticmethod
+    def _normalize_where(where: dict[str, Any]) -> dict[str, Any]:
+        """Normalize simple dict filters into Chroma operator form."""
+        # Chroma expects a single operator at the top level (e.g., $and).
         if len(where) == 1:
             key, value = next(iter(where.items()))
-            normalized = {key: value} if isinstance(value, dict) else {key: {"$eq": value}}
-        else:
-            normalized = {
-                "$and": [
-                    {k: v} if isinstance(v, dict) else {k: {"$eq": v}}
-                    for k, v in where.items()
-                ]
-            }
-
-        collection.delete(where=normalized)
+            return {key: value} if isinstance(value, dict) else {key: {"$eq": value}}
+        return {
+            "$and": [
+                {k: v} if isinstance(v, dict) else {k: {"$eq": v}}
+                for k, v in where.items()
+            ]
+        }
 
     def get_all_documents(self, collection_name: str) -> dict[str, Any]:
         """
@@ -313,6 +406,123 @@ class RAGService:
         # ids are always returned by Chroma; include only metadatas to avoid validation errors
         return collection.get(include=["metadatas"])
 
+    def iter_document_ids(
+        self,
+        collection_name: str,
+        page_size: int = 1000,
+    ) -> Iterator[list[str]]:
+        """
+        Page through all document IDs in a collection without loading metadata.
+
+        Args:
+            collection_name: Name of the collection.
+            page_size: Number of IDs fetched per request.
+
+        Yields:
+            Lists of document IDs, one list per page.
+        """
+        collection = self._get_collection(collection_name)
+        offset = 0
+        while True:
+            page = collection.get(include=[], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            yield ids
+            if len(ids) < page_size:
+                break
+            offset += len(ids)
+
+    def delete_documents(
+        self,
+        collection_name: str,
+        document_ids: list[str],
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Delete documents by ID in large batches.
+
+        Args:
+            collection_name: Name of the collection.
+            document_ids: IDs of the documents to delete.
+            batch_size: Number of IDs per delete request.
+
+        Returns:
+            Number of IDs submitted for deletion.
+        """
+        collection = self._get_collection(collection_name)
+        for i in range(0, len(document_ids), batch_size):
+            collection.delete(ids=document_ids[i:i + batch_size])
+        return len(document_ids)
+
+    def prune_documents(
+        self,
+        collection_name: str,
+        manifest: Mapping[str, set[str] | None],
+        prune_missing: bool = True,
+        page_size: int = 1000,
+        batch_size: int = 500,
+        owner_key: str | None = None,
+    ) -> int:
+        """
+        Delete stale chunks by comparing stored IDs against a source manifest.
+
+        The manifest maps a source prefix (see document_id_prefix) to the chunk IDs
+        that should remain for that source, or None to keep every stored chunk of
+        the source (e.g. when the source failed to process this run).
+
+        A stored ID is stale when its source is in the manifest but the ID is not
+        listed (the source shrank), or when its source is absent from the manifest
+        and prune_missing is True (the source was deleted).
+
+        Without owner_key, prune_missing deletes every document whose source is
+        not in the manifest, including documents added by other tools. With
+        owner_key, such documents are only deleted when their metadata has that
+        key (i.e. they were written by the caller that built the manifest).
+
+        Args:
+            collection_name: Name of the collection.
+            manifest: Mapping of source prefix to the IDs to keep.
+            prune_missing: Whether to delete sources absent from the manifest.
+            page_size: Number of IDs fetched per request while scanning.
+            batch_size: Number of IDs per delete request.
+            owner_key: Metadata key marking documents owned by the caller
+                       (None = every document in the collection is owned).
+
+        Returns:
+            Number of deleted documents.
+        """
+        stale_ids: list[str] = []
+        missing_ids: list[str] = []
+        for ids in self.iter_document_ids(collection_name, page_size=page_size):
+            for doc_id in ids:
+                prefix = document_id_prefix(doc_id)
+                if prefix in manifest:
+                    keep = manifest[prefix]
+                    if keep is not None and doc_id not in keep:
+                        stale_ids.append(doc_id)
+                elif prune_missing:
+                    missing_ids.append(doc_id)
+
+        if owner_key is None:
+            stale_ids.extend(missing_ids)
+        elif missing_ids:
+            # Only sources absent from the manifest need their metadata checked
+            collection = self._get_collection(collection_name)
+            for start in range(0, len(missing_ids), page_size):
+                page = collection.get(
+                    ids=missing_ids[start:start + page_size], include=["metadatas"]
+                )
+                for doc_id, metadata in zip(page.get("ids") or [], page.get("metadatas") or []):
+                    if metadata and metadata.get(owner_key):
+                        stale_ids.append(doc_id)
+
+        # Delete only after the scan so offsets stay stable while paging
+        if stale_ids:
+            logger.info(f"Pruning {len(stale_ids)} stale documents from {collection_name}")
+            self.delete_documents(collection_name, stale_ids, batch_size=batch_size)
+        return len(stale_ids)
+
     def get_document(
         self,
         collection_name: str,
@@ -389,19 +599,13 @@ class RAGService:
         if collection_name == self.KNOWLEDGE_BASE_COLLECTION:
             self._knowledge_base = self.client.create_collection(
                 name=self.KNOWLEDGE_BASE_COLLECTION,
-                metadata={
-                    "description": "Internal knowledge documents",
-                    "embedding_model": "text-embedding-3-small",
-                },
+                metadata=self._collection_metadata(self.KNOWLEDGE_BASE_COLLECTION),
                 embedding_function=self._embedding_function,
             )
         elif collection_name == self.ARCHIVE_INDEX_COLLECTION:
             self._archive_index = self.client.create_collection(
                 name=self.ARCHIVE_INDEX_COLLECTION,
-                metadata={
-                    "description": "Past articles and snippets",
-                    "embedding_model": "text-embedding-3-small",
-                },
+                metadata=self._collection_metadata(self.ARCHIVE_INDEX_COLLECTION),
                 embedding_function=self._embedding_function,
             )
 
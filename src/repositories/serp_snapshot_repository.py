@@ -0,0 +1,224 @@
+"""
+EPM Note Engine - SERP Snapshot Repository
+
+Storage for dated Tavily search result snapshots and deduplicated page content.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database.models import SerpPage, SerpSnapshot
+
+
+class SerpSnapshotRepository:
+    """Repository for SERP snapshots and their pages."""
+
+    def __init__(self, session: Session) -> None:
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy session instance.
+        """
+        self.session = session
+
+    def get(
+        self,
+        query: str,
+        domain_profile: str | None,
+        search_depth: str,
+        filter_key: str,
+        snapshot_date: date,
+    ) -> SerpSnapshot | None:
+        """
+        Get the snapshot for a search on a given day.
+
+        Args:
+            query: Normalized search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            search_depth: Tavily search depth.
+            filter_key: Hash of the answer flag and domain lists of the search.
+            snapshot_date: Day of the snapshot.
+
+        Returns:
+            SerpSnapshot or None if not stored.
+        """
+        stmt = select(SerpSnapshot).where(
+            SerpSnapshot.query == query,
+            SerpSnapshot.domain_profile == (domain_profile or ""),
+            SerpSnapshot.search_depth == search_depth,
+            SerpSnapshot.filter_key == filter_key,
+            SerpSnapshot.snapshot_date == snapshot_date,
+        )
+        return self.session.scalars(stmt).first()
+
+    def get_latest(
+        self,
+        query: str,
+        domain_profile: str | None,
+        search_depth: str,
+        filter_key: str,
+        max_age: timedelta | None = None,
+        min_results: int = 0,
+    ) -> SerpSnapshot | None:
+        """
+        Get the newest snapshot if it is recent and requested enough results.
+
+        Args:
+            query: Normalized search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            search_depth: Tavily search depth.
+            filter_key: Hash of the answer flag and domain lists of the search.
+            max_age: Maximum age of the snapshot (None = any age).
+            min_results: Minimum max_results the snapshot was searched with.
+
+        Returns:
+            SerpSnapshot or None if missing or stale.
+        """
+        stmt = (
+            select(SerpSnapshot)
+            .where(
+                SerpSnapshot.query == query,
+                SerpSnapshot.domain_profile == (domain_profile or ""),
+                SerpSnapshot.search_depth == search_depth,
+                SerpSnapshot.filter_key == filter_key,
+                SerpSnapshot.max_results >= min_results,
+            )
+            .order_by(SerpSnapshot.updated_at.desc())
+            .limit(1)
+        )
+        snapshot = self.session.scalars(stmt).first()
+        if snapshot is None or max_age is None:
+            return snapshot
+        updated_at = snapshot.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) - updated_at > max_age:
+            return None
+        return snapshot
+
+    def list_history(
+        self,
+        query: str,
+        domain_profile: str | None = None,
+        search_depth: str | None = None,
+        limit: int = 30,
+    ) -> Sequence[SerpSnapshot]:
+        """
+        Get snapshots of a query, newest first.
+
+        Args:
+            query: Normalized search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            search_depth: Tavily search depth (None = any).
+            limit: Maximum number of snapshots.
+
+        Returns:
+            Snapshots ordered by date, newest first.
+        """
+        stmt = select(SerpSnapshot).where(
+            SerpSnapshot.query == query,
+            SerpSnapshot.domain_profile == (domain_profile or ""),
+        )
+        if search_depth is not None:
+            stmt = stmt.where(SerpSnapshot.search_depth == search_depth)
+        stmt = stmt.order_by(SerpSnapshot.snapshot_date.desc()).limit(limit)
+        return self.session.scalars(stmt).all()
+
+    def get_pages(self, content_hashes: list[str]) -> dict[str, SerpPage]:
+        """
+        Get stored pages by content hash.
+
+        Args:
+            content_hashes: Page content hashes.
+
+        Returns:
+            Dict mapping content hash to SerpPage (unknown hashes are omitted).
+        """
+        if not content_hashes:
+            return {}
+        stmt = select(SerpPage).where(SerpPage.content_hash.in_(set(content_hashes)))
+        return {page.content_hash: page for page in self.session.scalars(stmt)}
+
+    def save(
+        self,
+        query: str,
+        domain_profile: str | None,
+        search_depth: str,
+        filter_key: str,
+        max_results: int,
+        answer: str,
+        results: list[dict[str, Any]],
+        results_hash: str,
+        snapshot_date: date | None = None,
+    ) -> SerpSnapshot:
+        """
+        Insert or overwrite the snapshot for a search on a given day.
+
+        Pages and the snapshot are upserted, so concurrent saves that share a
+        page or a snapshot key do not conflict; pages whose content hash is
+        already stored are left as they are.
+
+        Args:
+            query: Normalized search query.
+            domain_profile: Tavily domain profile (None = default domains).
+            search_depth: Tavily search depth.
+            filter_key: Hash of the answer flag and domain lists of the search.
+            max_results: Number of results requested from the search.
+            answer: Tavily answer summary.
+            results: Normalized results including "content" and "content_hash".
+            results_hash: Hash of the ranked result list.
+            snapshot_date: Day of the snapshot (default: today, UTC).
+
+        Returns:
+            The stored snapshot.
+        """
+        now = datetime.now(timezone.utc)
+        snapshot_date = snapshot_date or now.date()
+
+        pages = {
+            result["content_hash"]: {
+                "content_hash": result["content_hash"],
+                "url": result["url"],
+                "title": result["title"],
+                "content": result["content"],
+            }
+            for result in results
+        }
+        if pages:
+            # Sorted so concurrent saves take row locks in the same order
+            self.session.execute(
+                insert(SerpPage)
+                .values([pages[content_hash] for content_hash in sorted(pages)])
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+
+        values = {
+            "max_results": max_results,
+            "answer": answer,
+            "results": [
+                {key: value for key, value in result.items() if key != "content"}
+                for result in results
+            ],
+            "results_hash": results_hash,
+            "updated_at": now,
+        }
+        stmt = insert(SerpSnapshot).values(
+            query=query,
+            domain_profile=domain_profile or "",
+            search_depth=search_depth,
+            filter_key=filter_key,
+            snapshot_date=snapshot_date,
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_serp_snapshots_query_profile_depth_filter_date",
+            set_=values,
+        ).returning(SerpSnapshot)
+        return self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
@@ -1,17 +1,47 @@
 """
 EPM Note Engine - Services
 
-Contains business logic services for image search, link suggestions, and other integrations.
+Contains business logic services for image search, link suggestions, archive indexing,
+cached Tavily search, the shared LLM gateway, and other integrations.
 """
 
+from src.services.archive_indexer import (
+    ArchiveIndexer,
+    SyncStats,
+    SyncWatermark,
+    schedule_article_index,
+)
 from src.services.image_service import ImageService, ImageResult, ImageSearchResult
 from src.services.link_service import LinkService, LinkSuggestion, LinkSuggestionResult
+from src.services.llm_gateway import LLMGateway, get_llm_gateway
+from src.services.llm_usage import CallUsage, UsageTracker, get_usage_tracker
+from src.services.response_cache import ResponseCache, SingleFlight
+from src.services.task_graph import StepTiming, TaskGraph
+from src.services.rate_limit import TokenBucket
+from src.services.tavily_gateway import AsyncTavilyGateway, tavily_search, tavily_search_async
 
 __all__ = [
+    "ArchiveIndexer",
+    "SyncStats",
+    "SyncWatermark",
+    "schedule_article_index",
     "ImageService",
     "ImageResult",
     "ImageSearchResult",
     "LinkService",
     "LinkSuggestion",
     "LinkSuggestionResult",
+    "LLMGateway",
+    "get_llm_gateway",
+    "CallUsage",
+    "UsageTracker",
+    "get_usage_tracker",
+    "ResponseCache",
+    "SingleFlight",
+    "StepTiming",
+    "TaskGraph",
+    "TokenBucket",
+    "AsyncTavilyGateway",
+    "tavily_search",
+    "tavily_search_async",
 ]
@@ -0,0 +1,465 @@
+"""
+EPM Note Engine - Archive Indexer
+
+Keeps the archive_index collection in sync with articles and snippets in PostgreSQL.
+
+- Delta sync: only rows changed since the last stored watermark are re-chunked
+  and re-embedded (articles by updated_at, snippets by created_at).
+- Write-through: completed articles are indexed on a background worker so the
+  request path never waits for embeddings.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config import get_settings
+from src.database.connection import get_session
+from src.database.models import Article, Snippet
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "archive_index"
+WATERMARK_FILENAME = "archive_index_watermark.json"
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
+    """Split text into chunks with overlap."""
+    if len(text) <= chunk_size:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            for sep in ["。\n", "。", "\n\n", "\n", ".", " "]:
+                last_sep = text[start:end].rfind(sep)
+                if last_sep > chunk_size // 2:
+                    end = start + last_sep + len(sep)
+                    break
+        chunks.append(text[start:end].strip())
+        start = end - overlap
+
+    return [c for c in chunks if c]
+
+
+def build_article_text(article: dict) -> str:
+    """Build searchable text for an article (dict-based)."""
+    title = article.get("title") or ""
+    if not title:
+        return ""
+
+    parts = [f"# {title}"]
+    if article.get("target_persona"):
+        parts.append(f"ターゲット: {article.get('target_persona')}")
+    if article.get("seo_keywords"):
+        parts.append(f"SEOキーワード: {article.get('seo_keywords')}")
+    if article.get("hook_statement"):
+        parts.append(f"フック: {article.get('hook_statement')}")
+    if article.get("content_outline"):
+        parts.append(f"見出し案: {article.get('content_outline')}")
+    if article.get("research_summary"):
+        parts.append("リサーチサマリー:")
+        parts.append(article.get("research_summary") or "")
+
+    content = article.get("final_content_md") or article.get("draft_content_md") or ""
+    if content:
+        parts.append(content)
+
+    return "\n\n".join(parts).strip()
+
+
+def article_to_dict(article: Article) -> dict[str, Any]:
+    """Copy the indexed Article fields into a plain dict (safe after session close)."""
+    return {
+        "id": str(article.id),
+        "week_id": article.week_id,
+        "title": article.title,
+        "target_persona": article.target_persona,
+        "seo_keywords": article.seo_keywords,
+        "hook_statement": article.hook_statement,
+        "content_outline": article.content_outline,
+        "research_summary": article.research_summary,
+        "draft_content_md": article.draft_content_md,
+        "final_content_md": article.final_content_md,
+        "updated_at": article.updated_at,
+    }
+
+
+def snippet_to_dict(snippet: Snippet) -> dict[str, Any]:
+    """Copy the indexed Snippet fields into a plain dict (safe after session close)."""
+    category = snippet.category
+    return {
+        "id": str(snippet.id),
+        "article_id": str(snippet.article_id),
+        "category": getattr(category, "value", str(category)),
+        "content": snippet.content,
+        "created_at": snippet.created_at,
+    }
+
+
+@dataclass
+class SyncWatermark:
+    """Last indexed change timestamps for articles and snippets."""
+
+    articles: datetime | None = None
+    snippets: datetime | None = None
+
+    def to_dict(self) -> dict[str, str | None]:
+        """Convert to JSON-serializable dictionary."""
+        return {
+            "articles": self.articles.isoformat() if self.articles else None,
+            "snippets": self.snippets.isoformat() if self.snippets else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SyncWatermark":
+        """Create from a dictionary produced by to_dict."""
+        def parse(value: str | None) -> datetime | None:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(articles=parse(data.get("articles")), snippets=parse(data.get("snippets")))
+
+
+@dataclass
+class SyncStats:
+    """Result of an archive sync run."""
+
+    articles: int = 0
+    snippets: int = 0
+    chunks_created: int = 0
+    chunks_pruned: int = 0
+    errors: int = 0
+    watermark: SyncWatermark = field(default_factory=SyncWatermark)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "articles": self.articles,
+            "snippets": self.snippets,
+            "chunks_created": self.chunks_created,
+            "chunks_pruned": self.chunks_pruned,
+            "errors": self.errors,
+            "watermark": self.watermark.to_dict(),
+        }
+
+
+class ArchiveIndexer:
+    """
+    Indexes articles and snippets into the archive_index collection.
+
+    Chunk ids are deterministic (article_{id}_{i:03d}, snippet_{id}), so
+    re-indexing a row is an idempotent upsert followed by a tail prune.
+    """
+
+    def __init__(
+        self,
+        rag_service=None,
+        watermark_path: str | Path | None = None,
+    ) -> None:
+        """
+        Initialize the indexer.
+
+        Args:
+            rag_service: Optional RAGService instance (created lazily if omitted).
+            watermark_path: Optional watermark file path.
+                            Defaults to a file inside the ChromaDB directory.
+        """
+        self._rag_service = rag_service
+        self.watermark_path = (
+            Path(watermark_path)
+            if watermark_path
+            else get_settings().chroma_path / WATERMARK_FILENAME
+        )
+
+    @property
+    def rag_service(self):
+        """Get (or lazily create) the RAG service."""
+        if self._rag_service is None:
+            from src.repositories.rag_service import RAGService
+            self._rag_service = RAGService()
+        return self._rag_service
+
+    # ===========================================
+    # Watermark
+    # ===========================================
+
+    def load_watermark(self) -> SyncWatermark:
+        """Load the stored watermark, or an empty one if none exists."""
+        try:
+            data = json.loads(self.watermark_path.read_text(encoding="utf-8"))
+            return SyncWatermark.from_dict(data)
+        except FileNotFoundError:
+            return SyncWatermark()
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable archive watermark {self.watermark_path}: {e}")
+            return SyncWatermark()
+
+    def save_watermark(self, watermark: SyncWatermark) -> None:
+        """Persist the watermark atomically."""
+        self.watermark_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.watermark_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(watermark.to_dict()), encoding="utf-8")
+        tmp_path.replace(self.watermark_path)
+
+    # ===========================================
+    # Indexing
+    # ===========================================
+
+    def index_article(self, article: dict[str, Any]) -> int:
+        """
+        Upsert an article's chunks and drop chunks left over from a longer version.
+
+        Args:
+            article: Article dict (see article_to_dict).
+
+        Returns:
+            Number of chunks written.
+        """
+        prefix = f"article_{article['id']}"
+        text = build_article_text(article)
+        chunks = chunk_text(text) if text else []
+        doc_ids = [f"{prefix}_{i:03d}" for i in range(len(chunks))]
+
+        if chunks:
+            metadatas = [{
+                "source_type": "article",
+                "article_id": article["id"],
+                "week_id": article["week_id"],
+                "title": article["title"],
+                "chunk_index": i,
+                "total_chunks": len(chunks),
+            } for i in range(len(chunks))]
+
+            self.rag_service.add_documents(
+                collection_name=ARCHIVE_COLLECTION,
+                document_ids=doc_ids,
+                contents=chunks,
+                metadatas=metadatas,
+            )
+
+        stored_ids = self.rag_service.get_document_ids(
+            ARCHIVE_COLLECTION,
+            {"source_type": "article", "article_id": article["id"]},
+        )
+        keep = set(doc_ids)
+        stale_ids = [doc_id for doc_id in stored_ids if doc_id not in keep]
+        if stale_ids:
+            self.rag_service.delete_documents(ARCHIVE_COLLECTION, stale_ids)
+
+        return len(chunks)
+
+    def index_snippet(self, snippet: dict[str, Any]) -> bool:
+        """
+        Upsert a single snippet.
+
+        Args:
+            snippet: Snippet dict (see snippet_to_dict).
+
+        Returns:
+            True if the snippet had content and was written.
+        """
+        content = snippet.get("content") or ""
+        if not content:
+            return False
+
+        self.rag_service.add_document(
+            collection_name=ARCHIVE_COLLECTION,
+            document_id=f"snippet_{snippet['id']}",
+            content=content,
+            metadata={
+                "source_type": "snippet",
+                "snippet_id": snippet["id"],
+                "article_id": snippet["article_id"],
+                "category": snippet.get("category", ""),
+            },
+        )
+        return True
+
+    def index_article_by_id(self, article_id: str) -> int:
+        """
+        Load an article and its snippets from the DB and index them.
+
+        Args:
+            article_id: Article UUID.
+
+        Returns:
+            Number of chunks written (0 if the article does not exist).
+        """
+        with get_session() as session:
+            article = session.get(Article, article_id)
+            if article is None:
+                logger.warning(f"Archive write-through skipped, article not found: {article_id}")
+                return 0
+            article_data = article_to_dict(article)
+            snippet_data = [snippet_to_dict(s) for s in article.snippets]
+
+        chunks = self.index_article(article_data)
+        for snippet in snippet_data:
+            if self.index_snippet(snippet):
+                chunks += 1
+
+        logger.info(f"Archive indexed article {article_id}: {chunks} chunks")
+        return chunks
+
+    # ===========================================
+    # Delta sync
+    # ===========================================
+
+    def sync(self, full: bool = False, dry_run: bool = False) -> SyncStats:
+        """
+        Index rows changed since the stored watermark.
+
+        Rows at exactly the watermark timestamp are re-read (>=) so that rows
+        committed in the same instant are never skipped; re-indexing is idempotent.
+
+        A full sync ignores the watermark and also prunes chunks whose DB
+        records no longer exist, since deletions leave no timestamp behind.
+
+        Args:
+            full: Re-index everything and prune deleted records.
+            dry_run: Count changed rows without writing chunks or the watermark.
+
+        Returns:
+            SyncStats with counts and the new watermark.
+        """
+        if not full and not dry_run and self.rag_service.get_collection_count(ARCHIVE_COLLECTION) == 0:
+            # Collection was cleared or recreated; the watermark no longer applies
+            logger.info("Archive collection is empty, running full sync")
+            full = True
+
+        watermark = SyncWatermark() if full else self.load_watermark()
+        stats = SyncStats(watermark=SyncWatermark(watermark.articles, watermark.snippets))
+
+        # Load data as plain dicts to avoid detached instance issues
+        with get_session() as session:
+            article_query = session.query(Article)
+            if watermark.articles:
+                article_query = article_query.filter(Article.updated_at >= watermark.articles)
+            articles = [
+                article_to_dict(a)
+                for a in article_query.order_by(Article.updated_at).all()
+            ]
+
+            snippet_query = session.query(Snippet)
+            if watermark.snippets:
+                snippet_query = snippet_query.filter(Snippet.created_at >= watermark.snippets)
+            snippets = [
+                snippet_to_dict(s)
+                for s in snippet_query.order_by(Snippet.created_at).all()
+            ]
+
+        logger.info(
+            f"Archive sync ({'full' if full else 'delta'}): "
+            f"{len(articles)} articles, {len(snippets)} snippets changed"
+        )
+
+        # Source prefix -> chunk ids to keep, used for the full-sync prune
+        manifest: dict[str, set[str] | None] = {}
+        failed = False
+
+        for article in articles:
+            prefix = f"article_{article['id']}"
+            manifest[prefix] = None
+            try:
+                if dry_run:
+                    text = build_article_text(article)
+                    chunk_count = len(chunk_text(text)) if text else 0
+                else:
+                    chunk_count = self.index_article(article)
+                    manifest[prefix] = {f"{prefix}_{i:03d}" for i in range(chunk_count)}
+                if chunk_count:
+                    stats.articles += 1
+                    stats.chunks_created += chunk_count
+                if not failed:
+                    stats.watermark.articles = article["updated_at"]
+            except Exception as e:
+                logger.error(f"Archive sync failed for article {article['id']}: {e}")
+                stats.errors += 1
+                # Keep the watermark before this row so it is retried next run
+                failed = True
+
+        failed = False
+        for snippet in snippets:
+            doc_id = f"snippet_{snippet['id']}"
+            manifest[doc_id] = None
+            try:
+                if dry_run:
+                    written = bool(snippet.get("content"))
+                else:
+                    written = self.index_snippet(snippet)
+                if written:
+                    stats.snippets += 1
+                    stats.chunks_created += 1
+                if not failed:
+                    stats.watermark.snippets = snippet["created_at"]
+            except Exception as e:
+                logger.error(f"Archive sync failed for snippet {snippet['id']}: {e}")
+                stats.errors += 1
+                failed = True
+
+        if not dry_run:
+            if full:
+                stats.chunks_pruned = self.rag_service.prune_documents(
+                    ARCHIVE_COLLECTION,
+                    manifest,
+                    prune_missing=True,
+                )
+            self.save_watermark(stats.watermark)
+
+        return stats
+
+
+# ===========================================
+# Background write-through
+# ===========================================
+
+_executor: ThreadPoolExecutor | None = None
+_indexer: ArchiveIndexer | None = None
+_lock = threading.Lock()
+
+
+def get_archive_indexer() -> ArchiveIndexer:
+    """Get the process-wide ArchiveIndexer (reuses one RAGService/embedding client)."""
+    global _indexer
+    with _lock:
+        if _indexer is None:
+            _indexer = ArchiveIndexer()
+        return _indexer
+
+
+def _run_index_article(article_id: str) -> int:
+    """Worker entry point; failures are logged, never raised to the caller."""
+    try:
+        return get_archive_indexer().index_article_by_id(article_id)
+    except Exception as e:
+        logger.warning(f"Archive write-through failed for {article_id} (non-critical): {e}")
+        return 0
+
+
+def schedule_article_index(article_id: str) -> Future:
+    """
+    Queue an article for archive indexing on the background worker.
+
+    A single worker thread serializes writes to the Chroma collection.
+    Call this after the article's DB transaction has committed so the
+    worker reads the final content.
+
+    Args:
+        article_id: Article UUID.
+
+    Returns:
+        Future resolving to the number of chunks written.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive-indexer")
+        executor = _executor
+    return executor.submit(_run_index_article, article_id)
@@ -0,0 +1,291 @@
+"""
+EPM Note Engine - Article Section Planning
+
+Splits an article into independently writable sections (the fixed structure
+elements plus the suggested outline headings) and assembles written sections
+back into one Markdown document with a generated table of contents. Existing
+drafts are split into their top-level parts so single sections can be
+rewritten and spliced back.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.services.markdown_document import parse_markdown
+
+# Outline headings that already cover a mandatory element
+_CAUSES_HEADING = re.compile(r"原因|課題|問題|なぜ|理由")
+_ROADMAP_HEADING = re.compile(r"解決|打ち手|進め方|ステップ|ロードマップ|実践|方法|導入")
+# Outline headings replaced by the fixed opening and closing sections
+_SKIPPED_HEADING = re.compile(r"^(はじめに|導入|まとめ|おわりに|さいごに|最後に)([：:\s]|$)")
+_OUTLINE_NUMBER = re.compile(r"^\s*(\d+[.)．]|[-*])\s*")
+
+CAUSES_INSTRUCTIONS = (
+    "原因/問題を必ず3つ（原因①②③）に構造化する。各原因は同じ構造で書く："
+    "問いかけ → 具体例3つ → 「これが〇〇の状態」で締める。"
+)
+ROADMAP_INSTRUCTIONS = (
+    "打ち手を期間付きのロードマップ（例：90日、Week 1〜2）で示す。最小限から始め、"
+    "各ステップに成果物（定義書、カレンダー、マップなど）を置き、表やリストで整理する。"
+)
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """One independently written part of an article."""
+
+    key: str  # "opening", "diagram", "body_1", "causes", ..., "closing"
+    heading: str  # Suggested H2 heading ("" for the opening, which has none)
+    instructions: str  # What the section must contain
+    weight: int = 1  # Relative share of the article length
+    target_chars: int = 0  # Set by plan_sections
+
+    @property
+    def has_heading(self) -> bool:
+        """Whether the section starts with an H2 heading."""
+        return bool(self.heading)
+
+
+# Sections for the fixed structure elements, keyed like the reviewer's
+# structure elements where they match one ("closing" covers related + cta)
+FIXED_SECTIONS = {
+    "opening": SectionSpec(
+        "opening", "",
+        "見出しを付けずに、冒頭「会議の一言」（「〇〇〇〇？」で始まる共感シーンと症状3〜4行）と、"
+        "「**結論から言います。**」で始まる結論3行を書く。",
+    ),
+    "diagram": SectionSpec(
+        "diagram", "一枚絵で見る全体像",
+        "記事の核心を罫線文字のテキスト図解1つで可視化し、図の下に「現場で起きていること」を添える。",
+    ),
+    "causes": SectionSpec("causes", "うまくいかない3つの原因", CAUSES_INSTRUCTIONS, weight=3),
+    "roadmap": SectionSpec("roadmap", "90日で進めるロードマップ", ROADMAP_INSTRUCTIONS, weight=3),
+    "antipattern": SectionSpec(
+        "antipattern", "よくある失敗（アンチパターン）",
+        "よくある失敗を2〜3個、「失敗①：〜」「→ 対策：〜」の形式で、現場の知見を入れて書く。",
+        weight=2,
+    ),
+    "it_corner": SectionSpec(
+        "it_corner", "情シス/DXの方へ",
+        "1段落で完結させ、主読者（経営企画/FP&A）を崩さずに情シス/DXの読者へのお願いを書く。",
+    ),
+    "checklist": SectionSpec(
+        "checklist", "今日の持ち帰り：セルフチェック",
+        "見出しの「セルフチェック」の前にテーマを入れ、5〜7項目の「- [ ]」チェックリストを書き、"
+        "最後に「3つ以上チェックが付かなければ、まず○○から始めてください」と添える。",
+    ),
+    "related": SectionSpec(
+        "related", "次に読む",
+        "設計図方向とテンプレ方向の関連記事を1本ずつ（未作成なら「（準備中）」）挙げる。",
+    ),
+    "closing": SectionSpec(
+        "closing", "次に読む",
+        "設計図方向とテンプレ方向の関連記事を1本ずつ（未作成なら「（準備中）」）挙げ、"
+        "区切り線（---）の後に控えめCTAを1行書く。",
+    ),
+}
+
+
+def _clean_outline(outline: list[str]) -> list[str]:
+    headings = []
+    for item in outline:
+        text = _OUTLINE_NUMBER.sub("", item).strip().lstrip("#").strip()
+        if text and not _SKIPPED_HEADING.match(text):
+            headings.append(text)
+    return headings
+
+
+def plan_sections(outline: list[str], total_chars: int) -> list[SectionSpec]:
+    """
+    Plan the sections of an article.
+
+    The opening (hook and three-line conclusion), the diagram and the closing
+    elements are fixed. The outline headings form the body; the first
+    heading about causes and the first about solutions carry the cause and
+    roadmap elements, which get their own sections if no heading fits.
+
+    Args:
+        outline: Suggested outline headings (numbering is stripped).
+        total_chars: Target length of the whole article in characters.
+
+    Returns:
+        Sections in article order with target lengths.
+    """
+    body: list[SectionSpec] = []
+    has_causes = has_roadmap = False
+    for i, heading in enumerate(_clean_outline(outline), 1):
+        if not has_causes and _CAUSES_HEADING.search(heading):
+            body.append(SectionSpec("causes", heading, CAUSES_INSTRUCTIONS, weight=3))
+            has_causes = True
+        elif not has_roadmap and _ROADMAP_HEADING.search(heading):
+            body.append(SectionSpec("roadmap", heading, ROADMAP_INSTRUCTIONS, weight=3))
+            has_roadmap = True
+        else:
+            body.append(SectionSpec(
+                f"body_{i}", heading,
+                "見出しのテーマを具体例・数字を交えて解説する。", weight=2,
+            ))
+    if not has_causes:
+        body.insert(0, FIXED_SECTIONS["causes"])
+    if not has_roadmap:
+        body.append(FIXED_SECTIONS["roadmap"])
+
+    sections = [
+        FIXED_SECTIONS["opening"],
+        FIXED_SECTIONS["diagram"],
+        *body,
+        FIXED_SECTIONS["antipattern"],
+        FIXED_SECTIONS["it_corner"],
+        FIXED_SECTIONS["checklist"],
+        FIXED_SECTIONS["closing"],
+    ]
+
+    total_weight = sum(s.weight for s in sections)
+    return [
+        SectionSpec(s.key, s.heading, s.instructions, s.weight, round(total_chars * s.weight / total_weight))
+        for s in sections
+    ]
+
+
+def normalize_section(spec: SectionSpec, text: str) -> str:
+    """
+    Clean up a written section before assembly.
+
+    Drops any H1 title or table of contents the model added and makes sure
+    headed sections start with an H2 heading.
+
+    Args:
+        spec: Section that was written.
+        text: Generated Markdown.
+
+    Returns:
+        Section Markdown without surrounding blank lines.
+    """
+    lines = [line for line in text.strip().split("\n") if not re.match(r"^#\s", line)]
+    document = parse_markdown("\n".join(lines))
+    toc = document.find_heading("目次")
+    if toc is not None:
+        section = next(s for s in document.sections if s.heading == toc)
+        lines = (document.text[:section.start] + document.text[section.end:]).split("\n")
+    text = "\n".join(lines).strip()
+    if spec.has_heading and not text.startswith("## "):
+        text = f"## {spec.heading}\n\n{text}"
+    return text
+
+
+def build_toc(sections: list[str]) -> str:
+    """
+    Build the table of contents from the H2 headings of written sections.
+
+    Args:
+        sections: Section Markdown texts in order.
+
+    Returns:
+        "## 目次" block.
+    """
+    headings = [h for text in sections for h in parse_markdown(text).headings_at(2)]
+    items = "\n".join(f"{i}. {heading}" for i, heading in enumerate(headings, 1))
+    return f"## 目次\n{items}"
+
+
+def assemble_article(
+    title: str,
+    specs: list[SectionSpec],
+    texts: list[str],
+    transitions: dict[int, str] | None = None,
+) -> str:
+    """
+    Stitch written sections into one article.
+
+    Args:
+        title: Article title (H1).
+        specs: Planned sections.
+        texts: Written Markdown for each section, in the same order.
+        transitions: Optional bridging sentence appended to section i.
+
+    Returns:
+        Article Markdown with the table of contents after the opening.
+    """
+    transitions = transitions or {}
+    parts = []
+    for i, (spec, text) in enumerate(zip(specs, texts)):
+        text = normalize_section(spec, text)
+        if transitions.get(i):
+            text = f"{text}\n\n{transitions[i].strip()}"
+        parts.append(text)
+
+    headed = [text for spec, text in zip(specs, parts) if spec.has_heading]
+    blocks = [f"# {title}"] if title else []
+    for spec, text in zip(specs, parts):
+        blocks.append(text)
+        if spec.key == "opening":
+            blocks.append(build_toc(headed))
+    return "\n\n".join(blocks) + "\n"
+
+
+@dataclass(frozen=True)
+class ArticlePart:
+    """A top-level part of an article: the preamble before the first H2, or one H2 section."""
+
+    heading: str  # H2 heading text ("" for the preamble with the title and opening)
+    text: str  # Markdown of the part including its heading line
+
+    @property
+    def is_toc(self) -> bool:
+        """Whether this part is the table of contents."""
+        return "目次" in self.heading
+
+
+def split_article(content: str) -> list[ArticlePart]:
+    """
+    Split an article at its H2 headings.
+
+    Args:
+        content: Article Markdown.
+
+    Returns:
+        Parts in order; joining them with join_parts restores the article
+        up to blank lines between parts.
+    """
+    document = parse_markdown(content)
+    headings = [h for h in document.headings if h.level == 2]
+    bounds = [0, *(h.offset for h in headings), len(content)]
+    parts = []
+    for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        text = content[start:end].strip("\n")
+        if i == 0:
+            if text.strip():
+                parts.append(ArticlePart("", text))
+        else:
+            parts.append(ArticlePart(headings[i - 1].text, text))
+    return parts
+
+
+def join_parts(parts: list[ArticlePart]) -> str:
+    """Join article parts back into one Markdown document."""
+    return "\n\n".join(part.text.strip() for part in parts) + "\n"
+
+
+def refresh_toc(parts: list[ArticlePart]) -> list[ArticlePart]:
+    """
+    Rebuild the table of contents from the current H2 headings.
+
+    Content after the TOC list (e.g. a diagram placed right below it) is
+    kept. A missing TOC is inserted after the preamble.
+
+    Args:
+        parts: Article parts.
+
+    Returns:
+        Parts with an up-to-date TOC.
+    """
+    body = [part for part in parts if not part.is_toc]
+    toc = build_toc([part.text for part in body if part.heading])
+    old = next((part for part in parts if part.is_toc), None)
+    if old is not None:
+        lines = parse_markdown(old.text).lines[1:]
+        rest = next((line for line in lines if line.kind not in ("blank", "ordered", "unordered")), None)
+        if rest is not None:
+            toc = f"{toc}\n\n{old.text[rest.offset:].strip()}"
+    position = parts.index(old) if old is not None else (1 if body and not body[0].heading else 0)
+    return [*body[:position], ArticlePart("目次", toc), *body[position:]]
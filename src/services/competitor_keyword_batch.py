@@ -0,0 +1,211 @@
+"""
+EPM Note Engine - Batch Competitor Keyword Research
+
+Runs competitor keyword extraction for many seed queries (e.g. every planned
+article's SEO keywords) and stores the results in Postgres, so the editor can
+show them without a live search.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+from src.config import get_settings
+from src.database.connection import get_session
+from src.database.models import Article, ArticleStatus
+from src.repositories.competitor_keyword_repository import CompetitorKeywordRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompetitorBatchStats:
+    """Summary of a batch research run."""
+
+    queries: int = 0
+    reused: int = 0  # Fresh results already stored
+    researched: int = 0
+    stored: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+def split_seo_keywords(seo_keywords: str | None) -> list[str]:
+    """Split a comma-separated seo_keywords value into queries."""
+    return [kw.strip() for kw in (seo_keywords or "").split(",") if kw.strip()]
+
+
+def collect_planned_queries(
+    statuses: tuple[ArticleStatus, ...] = (ArticleStatus.PLANNING,),
+    first_keyword_only: bool = False,
+) -> list[str]:
+    """
+    Collect seed queries from articles' SEO keywords.
+
+    Args:
+        statuses: Article statuses to include (default: planned articles).
+        first_keyword_only: Use only the first keyword of each article.
+
+    Returns:
+        Unique queries in week order.
+    """
+    with get_session() as session:
+        articles = (
+            session.query(Article)
+            .filter(Article.status.in_(statuses))
+            .order_by(Article.week_id)
+            .all()
+        )
+        queries: list[str] = []
+        for article in articles:
+            keywords = split_seo_keywords(article.seo_keywords)
+            queries.extend(keywords[:1] if first_keyword_only else keywords)
+    return list(dict.fromkeys(queries))
+
+
+def get_stored_competitor_keywords(
+    query: str,
+    domain_profile: str | None = None,
+    max_age_days: float | None = None,
+) -> dict | None:
+    """
+    Get a stored competitor keyword result.
+
+    Args:
+        query: Search query.
+        domain_profile: Tavily domain profile.
+        max_age_days: Maximum age in days (default from settings).
+
+    Returns:
+        CompetitorKeywordResult.to_dict() payload with "updated_at", or None.
+    """
+    if max_age_days is None:
+        max_age_days = get_settings().competitor_keywords_max_age_days
+    try:
+        with get_session() as session:
+            record = CompetitorKeywordRepository(session).get_fresh(
+                query.strip(), domain_profile, max_age=timedelta(days=max_age_days)
+            )
+            if record is None:
+                return None
+            return {**record.result, "updated_at": record.updated_at.isoformat()}
+    except Exception as e:
+        logger.warning(f"Failed to load stored competitor keywords (non-critical): {e}")
+        return None
+
+
+def save_competitor_keywords(
+    query: str,
+    domain_profile: str | None,
+    max_articles: int,
+    result,
+) -> bool:
+    """
+    Store a CompetitorKeywordResult (results without articles are not stored).
+
+    Args:
+        query: Search query.
+        domain_profile: Tavily domain profile.
+        max_articles: Number of articles requested from the search.
+        result: CompetitorKeywordResult.
+
+    Returns:
+        True if the result was stored.
+    """
+    # Failed searches produce an empty result; keep any older stored result
+    if result.total_articles == 0:
+        return False
+    try:
+        with get_session() as session:
+            CompetitorKeywordRepository(session).save(
+                query.strip(), domain_profile, max_articles, result.to_dict()
+            )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to store competitor keywords for {query} (non-critical): {e}")
+        return False
+
+
+def run_competitor_keyword_batch(
+    queries: list[str],
+    domain_profile: str | None = None,
+    max_articles: int = 10,
+    max_concurrency: int | None = None,
+    max_age_days: float | None = None,
+    refresh: bool = False,
+    agent=None,
+    on_progress: Callable[[str, str], None] | None = None,
+) -> CompetitorBatchStats:
+    """
+    Research competitor keywords for many queries and store the results.
+
+    Queries with a fresh stored result are skipped unless refresh is set.
+    Each result is stored as soon as its query finishes.
+
+    Args:
+        queries: Seed queries.
+        domain_profile: Tavily domain profile.
+        max_articles: Maximum number of articles to analyze per query.
+        max_concurrency: Maximum concurrent searches (default from settings).
+        max_age_days: Reuse stored results younger than this (default from settings).
+        refresh: Re-research every query even if a fresh result is stored.
+        agent: ResearchAgent to use (created if None).
+        on_progress: Called with (query, status) where status is
+                     "reused", "stored" or "failed".
+
+    Returns:
+        CompetitorBatchStats.
+    """
+    settings = get_settings()
+    if max_age_days is None:
+        max_age_days = settings.competitor_keywords_max_age_days
+    max_age = timedelta(days=max_age_days)
+
+    unique_queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    stats = CompetitorBatchStats(queries=len(unique_queries))
+
+    def report(query: str, status: str) -> None:
+        if on_progress is not None:
+            on_progress(query, status)
+
+    pending = unique_queries
+    if not refresh:
+        pending = []
+        with get_session() as session:
+            repo = CompetitorKeywordRepository(session)
+            for query in unique_queries:
+                if repo.get_fresh(query, domain_profile, max_age=max_age, min_articles=max_articles):
+                    stats.reused += 1
+                    report(query, "reused")
+                else:
+                    pending.append(query)
+
+    if not pending:
+        return stats
+
+    if agent is None:
+        from src.agents.research_agent import ResearchAgent
+        agent = ResearchAgent()
+
+    def store(query: str, result) -> None:
+        stats.researched += 1
+        if save_competitor_keywords(query, domain_profile, max_articles, result):
+            stats.stored += 1
+            report(query, "stored")
+        else:
+            stats.failed.append(query)
+            report(query, "failed")
+
+    agent.extract_competitor_keywords_batch(
+        pending,
+        max_articles=max_articles,
+        domain_profile=domain_profile,
+        max_concurrency=max_concurrency,
+        on_result=store,
+    )
+
+    logger.info(
+        f"Competitor keyword batch: {stats.queries} queries, {stats.reused} reused, "
+        f"{stats.stored} stored, {len(stats.failed)} failed"
+    )
+    return stats
@@ -0,0 +1,131 @@
+"""
+EPM Note Engine - Competitor Keyword Statistics
+
+Batched keyword extraction over a competitor result set: each distinct text is
+tokenized once, and keyword document frequencies are counted per article with
+exact article membership.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from src.services.japanese_tokenizer import JANOME_AVAILABLE, Token, tokenize
+
+# Common Japanese stop words for the fallback splitter
+STOP_WORDS = {"の", "は", "が", "を", "に", "で", "と", "も", "や", "へ", "から", "まで", "より", "など"}
+_SPLIT_PATTERN = re.compile(r"[【】「」\s\-\|｜・、。！？\n]+")
+
+
+@dataclass
+class CompetitorDocument:
+    """Title and headings of one competitor article."""
+
+    title: str = ""
+    headings: list[str] = field(default_factory=list)
+
+
+def nouns_from_tokens(tokens: Iterable[Token]) -> set[str]:
+    """
+    Extract keyword candidates from tokens.
+
+    Nouns of 2+ characters (excluding numbers), plus compound nouns formed by
+    two adjacent noun tokens with 3+ characters.
+    """
+    keywords: set[str] = set()
+    previous_noun: str | None = None
+    for token in tokens:
+        if not token.part_of_speech.startswith("名詞"):
+            previous_noun = None
+            continue
+        surface = token.surface
+        if len(surface) >= 2 and not surface.isdigit():
+            keywords.add(surface)
+        if previous_noun is not None:
+            compound = previous_noun + surface
+            if len(compound) >= 3:
+                keywords.add(compound)
+        previous_noun = surface
+    return keywords
+
+
+def words_from_text(text: str) -> set[str]:
+    """Split text into keyword candidates without Janome (fallback)."""
+    return {
+        word.strip()
+        for word in _SPLIT_PATTERN.split(text)
+        if len(word.strip()) >= 2 and word.strip() not in STOP_WORDS
+    }
+
+
+class CompetitorKeywordAnalyzer:
+    """
+    Count keyword document frequencies across competitor articles.
+
+    Identical titles/headings (common across search results) are tokenized
+    once per analyzer; tokenization itself goes through the shared, cached
+    Janome tokenizer.
+    """
+
+    def __init__(self, use_janome: bool | None = None) -> None:
+        """
+        Initialize the analyzer.
+
+        Args:
+            use_janome: Use Janome noun extraction (defaults to availability).
+        """
+        self.use_janome = JANOME_AVAILABLE if use_janome is None else use_janome
+        self._keywords_by_text: dict[str, frozenset[str]] = {}
+
+    def keywords_for_text(self, text: str) -> frozenset[str]:
+        """Get keyword candidates for a text, memoized per analyzer."""
+        cached = self._keywords_by_text.get(text)
+        if cached is None:
+            if not text:
+                cached = frozenset()
+            elif self.use_janome:
+                cached = frozenset(nouns_from_tokens(tokenize(text)))
+            else:
+                cached = frozenset(words_from_text(text))
+            self._keywords_by_text[text] = cached
+        return cached
+
+    def analyze(self, documents: Iterable[CompetitorDocument]) -> dict[str, dict[str, int]]:
+        """
+        Compute per-keyword statistics in one streamed pass over the documents.
+
+        Args:
+            documents: Competitor articles (any iterable, consumed once).
+
+        Returns:
+            Dict mapping keyword -> {
+                "article_count": articles whose title or headings contain it,
+                "found_in_titles": titles containing it,
+                "found_in_headings": headings containing it,
+            }
+        """
+        article_freq: Counter[str] = Counter()
+        title_freq: Counter[str] = Counter()
+        heading_freq: Counter[str] = Counter()
+
+        for document in documents:
+            title_keywords = self.keywords_for_text(document.title)
+            title_freq.update(title_keywords)
+            article_keywords = set(title_keywords)
+
+            for heading in document.headings:
+                heading_keywords = self.keywords_for_text(heading)
+                heading_freq.update(heading_keywords)
+                article_keywords.update(heading_keywords)
+
+            article_freq.update(article_keywords)
+
+        return {
+            keyword: {
+                "article_count": count,
+                "found_in_titles": title_freq[keyword],
+                "found_in_headings": heading_freq[keyword],
+            }
+            for keyword, count in article_freq.items()
+        }
@@ -0,0 +1,307 @@
+"""
+EPM Note Engine - Competitor Page Headings
+
+Fetches competitor pages concurrently and extracts their h1–h3 outline with a
+streaming HTML parser. Tavily only returns short snippets, so headings found
+in the snippets are usually empty; the real page outline gives
+generate_outline_suggestion something to work with.
+
+Extracted headings are cached on disk per URL together with the ETag and
+Last-Modified validators, so stale entries are revalidated with a
+conditional GET instead of downloading the page again.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "EPMNoteEngine/1.0 (+competitor-outline)"
+
+# Text inside these elements is never a heading
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template", "svg"})
+
+MAX_HEADING_LENGTH = 120
+
+
+class HeadingExtractor(HTMLParser):
+    """
+    Streaming h1–h3 extractor.
+
+    Feed HTML in chunks of any size with feed(); headings are available in
+    `headings` as soon as their closing tag has been seen.
+    """
+
+    def __init__(self, levels: tuple[int, ...] = (1, 2, 3)) -> None:
+        """
+        Initialize the extractor.
+
+        Args:
+            levels: Heading levels to extract.
+        """
+        super().__init__(convert_charrefs=True)
+        self.heading_tags = {f"h{level}" for level in levels}
+        self.headings: list[str] = []
+        self._current: list[str] | None = None
+        self._current_tag = ""
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self.heading_tags and self._current is None:
+            self._current = []
+            self._current_tag = tag
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == self._current_tag and self._current is not None:
+            text = " ".join("".join(self._current).split())
+            if text and len(text) <= MAX_HEADING_LENGTH and (
+                not self.headings or self.headings[-1] != text
+            ):
+                self.headings.append(text)
+            self._current = None
+            self._current_tag = ""
+
+    def handle_data(self, data: str) -> None:
+        if self._current is not None and self._skip_depth == 0:
+            self._current.append(data)
+
+
+def extract_html_headings(html: str, levels: tuple[int, ...] = (1, 2, 3)) -> list[str]:
+    """
+    Extract headings from a complete HTML document.
+
+    Args:
+        html: HTML text.
+        levels: Heading levels to extract.
+
+    Returns:
+        Heading texts in document order.
+    """
+    extractor = HeadingExtractor(levels)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.headings
+
+
+@dataclass
+class PageHeadings:
+    """Headings of one competitor page."""
+
+    url: str
+    headings: list[str] = field(default_factory=list)
+    status: str = "fetched"  # fetched, not_modified, cached, failed
+    error: str = ""
+
+
+class PageCache:
+    """
+    Disk cache of extracted page headings with HTTP validators.
+
+    One JSON file per URL. Entries younger than the TTL are used without a
+    request; older ones are revalidated with If-None-Match/If-Modified-Since.
+    """
+
+    def __init__(self, directory: str | Path, ttl_seconds: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if missing).
+            ttl_seconds: Seconds an entry is used without revalidation.
+        """
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """
+        Get the cached entry for a URL.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            Entry dict (url, headings, etag, last_modified, fetched_at) or None.
+        """
+        try:
+            entry = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def set(self, url: str, entry: dict[str, Any]) -> None:
+        """
+        Store the entry for a URL.
+
+        Args:
+            url: Page URL.
+            entry: Entry dict.
+        """
+        path = self._path(url)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps({**entry, "url": url}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Competitor page cache write failed (non-critical): {e}")
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        """Whether an entry can be used without revalidation."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+
+def _conditional_headers(entry: dict[str, Any] | None) -> dict[str, str]:
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    url: str,
+    cache: PageCache | None,
+    max_bytes: int,
+) -> PageHeadings:
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        return PageHeadings(url=url, headings=entry["headings"], status="cached")
+
+    async with client.stream("GET", url, headers=_conditional_headers(entry)) as response:
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+            cache.set(url, entry)
+            return PageHeadings(url=url, headings=entry["headings"], status="not_modified")
+        if response.status_code >= 300:
+            return PageHeadings(url=url, status="failed", error=f"HTTP {response.status_code}")
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "html" not in content_type:
+            return PageHeadings(url=url, status="failed", error=f"Not HTML: {content_type}")
+
+        extractor = HeadingExtractor()
+        received = 0
+        async for chunk in response.aiter_text():
+            extractor.feed(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                break
+        extractor.close()
+
+    headings = extractor.headings
+    if cache is not None:
+        cache.set(url, {
+            "headings": headings,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "fetched_at": time.time(),
+        })
+    return PageHeadings(url=url, headings=headings)
+
+
+async def fetch_page_headings(
+    urls: list[str],
+    cache: PageCache | None = None,
+    max_concurrency: int = 4,
+    timeout: float = 10.0,
+    max_bytes: int = 2_000_000,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, PageHeadings]:
+    """
+    Fetch pages concurrently and extract their headings.
+
+    A failing page never fails the others.
+
+    Args:
+        urls: Page URLs (duplicates and blanks are skipped).
+        cache: Optional disk cache.
+        max_concurrency: Maximum pages downloaded at once.
+        timeout: Per-page timeout in seconds.
+        max_bytes: Stop parsing a page after this many characters.
+        client: Optional preconfigured client.
+
+    Returns:
+        Dict mapping URL to PageHeadings.
+    """
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    if not unique_urls:
+        return {}
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max(1, max_concurrency)),
+        )
+
+    async def fetch(url: str) -> PageHeadings:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(_fetch_one(client, url, cache, max_bytes), timeout)
+            except Exception as e:
+                logger.warning(f"Competitor page fetch failed for {url} (non-critical): {e!r}")
+                return PageHeadings(url=url, status="failed", error=repr(e))
+
+    try:
+        results = await asyncio.gather(*(fetch(url) for url in unique_urls))
+    finally:
+        if own_client:
+            await client.aclose()
+    return {result.url: result for result in results}
+
+
+def fetch_competitor_headings(urls: list[str]) -> dict[str, list[str]]:
+    """
+    Fetch competitor page headings with the configured cache and limits.
+
+    Returns an empty dict when the fetch stage is disabled. Must be called
+    from a thread without a running event loop.
+
+    Args:
+        urls: Competitor page URLs.
+
+    Returns:
+        Dict mapping URL to headings for pages where headings were found.
+    """
+    settings = get_settings()
+    if not settings.competitor_page_fetch_enabled or not urls:
+        return {}
+
+    cache = PageCache(
+        settings.competitor_page_cache_path,
+        ttl_seconds=settings.competitor_page_cache_ttl_hours * 3600,
+    )
+    start = time.perf_counter()
+    pages = asyncio.run(fetch_page_headings(
+        urls,
+        cache=cache,
+        max_concurrency=settings.competitor_page_fetch_concurrency,
+        timeout=settings.competitor_page_timeout_seconds,
+    ))
+    logger.info(
+        f"Fetched competitor headings for {sum(1 for p in pages.values() if p.headings)}"
+        f"/{len(pages)} pages in {time.perf_counter() - start:.2f}s"
+    )
+    return {url: page.headings for url, page in pages.items() if page.headings}
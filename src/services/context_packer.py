@@ -0,0 +1,142 @@
+"""
+EPM Note Engine - Prompt Context Packing
+
+Fits the per-article context of a prompt (outline, essences, competitor
+keywords, knowledge base references, ...) into an input token budget.
+Sections are ranked by priority; when the context is too large, items of
+the lowest-priority sections are dropped from the end (or the last kept
+item is truncated) until it fits, and what was cut is reported.
+"""
+
+import math
+from dataclasses import dataclass, field
+
+from src.services.llm_stream import CHARS_PER_TOKEN_ESTIMATE
+
+# Characters per token for ASCII text (English words, URLs, numbers)
+ASCII_CHARS_PER_TOKEN = 4.0
+# A truncated item shorter than this is dropped instead
+MIN_TRUNCATED_CHARS = 80
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """
+    Estimate the input token count of prompt text without calling the API.
+
+    Japanese and other non-ASCII characters use the same ratio as the
+    streaming progress estimate; ASCII text packs about four characters
+    into a token.
+
+    Args:
+        text: Prompt text.
+
+    Returns:
+        Estimated token count.
+    """
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return math.ceil(
+        ascii_chars / ASCII_CHARS_PER_TOKEN
+        + (len(text) - ascii_chars) / CHARS_PER_TOKEN_ESTIMATE
+    )
+
+
+@dataclass
+class ContextSection:
+    """One "## heading" block of prompt context."""
+
+    key: str  # Name used in the report, e.g. "references"
+    heading: str  # Heading text without "## "
+    items: list[str]  # Entries in relevance order; trailing ones are cut first
+    priority: int = 0  # Higher is kept longer
+    required: bool = False  # Never cut
+    separator: str = "\n"  # Between items
+    empty_text: str = ""  # Body when there are no items
+    note: str = ""  # Text after the items (kept while the section has any)
+
+    def render(self) -> str:
+        """Render the section as Markdown."""
+        body = self.separator.join(self.items) if self.items else self.empty_text
+        text = f"## {self.heading}\n{body}"
+        if self.note and self.items:
+            text += f"\n\n{self.note}"
+        return text
+
+
+@dataclass
+class PackReport:
+    """What pack_context kept and cut."""
+
+    budget_tokens: int
+    original_tokens: int = 0
+    packed_tokens: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)  # Section key -> items dropped
+    truncated: list[str] = field(default_factory=list)  # Section keys with a shortened item
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the required sections alone exceed the budget."""
+        return self.budget_tokens > 0 and self.packed_tokens > self.budget_tokens
+
+    @property
+    def trimmed(self) -> bool:
+        """Whether anything was cut."""
+        return bool(self.dropped or self.truncated)
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        budget = self.budget_tokens if self.budget_tokens > 0 else "unlimited"
+        text = f"{self.packed_tokens}/{budget} tokens (from {self.original_tokens})"
+        cuts = [f"{key} -{count}" for key, count in self.dropped.items()]
+        cuts += [f"{key} truncated" for key in self.truncated]
+        return f"{text}, cut: {', '.join(cuts)}" if cuts else text
+
+
+def _join(sections: list[ContextSection]) -> str:
+    return "\n\n".join(section.render() for section in sections)
+
+
+def pack_context(
+    sections: list[ContextSection],
+    budget_tokens: int,
+) -> tuple[str, PackReport]:
+    """
+    Render context sections within a token budget.
+
+    Sections keep their order in the output; only the cutting follows
+    priority. Within a section, items are removed from the end, and the last
+    item that does not fit entirely is truncated when enough of it remains.
+
+    Args:
+        sections: Context sections in output order (modified in place).
+        budget_tokens: Maximum estimated tokens (0 = unlimited).
+
+    Returns:
+        Tuple of (rendered context, report).
+    """
+    text = _join(sections)
+    report = PackReport(budget_tokens=budget_tokens, original_tokens=estimate_prompt_tokens(text))
+    report.packed_tokens = report.original_tokens
+    if budget_tokens <= 0 or report.packed_tokens <= budget_tokens:
+        return text, report
+
+    for section in sorted((s for s in sections if not s.required), key=lambda s: s.priority):
+        while section.items and report.packed_tokens > budget_tokens:
+            last = section.items.pop()
+            without = estimate_prompt_tokens(_join(sections))
+            room = budget_tokens - without
+            # Keep a shortened version of the item if a useful part fits
+            max_chars = int((room - 2) * CHARS_PER_TOKEN_ESTIMATE)
+            if len(last) > max_chars >= MIN_TRUNCATED_CHARS:
+                section.items.append(last[:max_chars - 1] + "…")
+                shortened = estimate_prompt_tokens(_join(sections))
+                if shortened <= budget_tokens:
+                    report.truncated.append(section.key)
+                    report.packed_tokens = shortened
+                    break
+                section.items.pop()
+            report.dropped[section.key] = report.dropped.get(section.key, 0) + 1
+            report.packed_tokens = without
+        if report.packed_tokens <= budget_tokens:
+            break
+
+    return _join(sections), report
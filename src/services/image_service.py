@@ -13,7 +13,9 @@ from typing import Literal
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from src.config import get_settings, get_openai_client
+from src.config import get_settings
+from src.services.llm_gateway import get_anthropic_client, get_llm_gateway, get_openai_client
+from src.services.markdown_document import parse_markdown
 
 logger = logging.getLogger(__name__)
 
@@ -289,7 +291,9 @@ class ImageService:
             if self._openai_client is None:
                 self._openai_client = get_openai_client()
 
-            response = self._openai_client.chat.completions.create(
+            response = get_llm_gateway().create_chat_completion(
+                "image.translate",
+                client=self._openai_client,
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -334,7 +338,6 @@ class ImageService:
             Generated alt text (50-100 characters).
         """
         try:
-            from src.config import get_anthropic_client
             client = get_anthropic_client()
             if not client:
                 return query  # Fallback to query
@@ -357,7 +360,9 @@ class ImageService:
 alt属性テキストのみを出力（説明不要）。
 """
 
-            response = client.messages.create(
+            response = get_llm_gateway().create_message(
+                "image.alt_text",
+                client=client,
                 model="claude-haiku-3-5-20241022",
                 max_tokens=150,
                 messages=[
@@ -412,16 +417,17 @@ alt属性テキストのみを出力（説明不要）。
         if not all_images:
             return content
 
-        lines = content.split("\n")
+        lines = parse_markdown(content).lines
         result_lines = []
         image_index = 0
         toc_found = False
 
         for i, line in enumerate(lines):
-            result_lines.append(line)
+            result_lines.append(line.text)
+            is_h2 = line.kind == "heading" and line.level == 2
 
             # Insert first image after "## 目次"
-            if not toc_found and line.strip().startswith("## 目次"):
+            if not toc_found and is_h2 and line.content.startswith("目次"):
                 toc_found = True
                 # Find end of TOC section (next empty line or heading)
                 continue
@@ -429,8 +435,8 @@ alt属性テキストのみを出力（説明不要）。
             # Insert image after TOC ends
             if toc_found and image_index == 0:
                 # Check if this is the end of TOC section
-                if (line.strip() == "" or
-                    (line.strip().startswith("##") and "目次" not in line)):
+                if (line.kind == "blank" or
+                    (line.kind == "heading" and line.level >= 2 and "目次" not in line.text)):
                     if image_index < len(all_images):
                         img = all_images[image_index]
                         image_md = self._format_image_markdown(img)
@@ -441,18 +447,17 @@ alt属性テキストのみを出力（説明不要）。
                     continue
 
             # Insert subsequent images after major headings (## but not ###)
-            if (line.strip().startswith("## ") and
-                not line.strip().startswith("### ") and
-                "目次" not in line and
-                "次に読む" not in line and
-                "チェックリスト" not in line and
+            if (is_h2 and
+                "目次" not in line.text and
+                "次に読む" not in line.text and
+                "チェックリスト" not in line.text and
                 image_index > 0 and
                 image_index < len(all_images)):
 
                 # Look ahead to find end of section intro (after 2-3 paragraphs)
                 para_count = 0
                 for j in range(i + 1, min(i + 10, len(lines))):
-                    if lines[j].strip() == "":
+                    if lines[j].kind == "blank":
                         para_count += 1
                     if para_count >= 2:
                         break
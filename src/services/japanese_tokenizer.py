@@ -0,0 +1,155 @@
+"""
+EPM Note Engine - Japanese Tokenizer
+
+One process-wide Janome tokenizer (memory-mapped dictionary) shared by all
+agents, with an LRU cache of tokenization results keyed by text hash.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Try to import Janome for Japanese NLP
+try:
+    from janome.tokenizer import Tokenizer
+    JANOME_AVAILABLE = True
+except ImportError:
+    JANOME_AVAILABLE = False
+    logger.warning("Janome not installed. Keyword analysis will be limited.")
+
+
+class Token(NamedTuple):
+    """Immutable token (safe to share from the cache)."""
+
+    surface: str
+    part_of_speech: str
+
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+_tokenize_lock = threading.Lock()
+_warmup_thread: threading.Thread | None = None
+
+_cache: "OrderedDict[str, tuple[Token, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_tokenizer():
+    """
+    Get the shared Janome tokenizer, loading the dictionary on first use.
+
+    Returns:
+        janome Tokenizer instance.
+
+    Raises:
+        RuntimeError: If Janome is not installed.
+    """
+    global _tokenizer
+    if not JANOME_AVAILABLE:
+        raise RuntimeError("Janome is not installed")
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                # mmap keeps the system dictionary out of the Python heap
+                _tokenizer = Tokenizer(mmap=True)
+                logger.info("Janome tokenizer loaded (mmap dictionary)")
+    return _tokenizer
+
+
+def _text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def tokenize(text: str) -> tuple[Token, ...]:
+    """
+    Tokenize text with the shared tokenizer, using the LRU result cache.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        Tuple of tokens.
+    """
+    key = _text_key(text)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return cached
+        _cache_stats["misses"] += 1
+
+    tokenizer = get_tokenizer()
+    # Janome does not document thread safety; tokenization is CPU-bound under
+    # the GIL anyway, so serializing costs nothing.
+    with _tokenize_lock:
+        tokens = tuple(
+            Token(t.surface, t.part_of_speech) for t in tokenizer.tokenize(text)
+        )
+
+    max_entries = get_settings().tokenizer_cache_size
+    if max_entries > 0:
+        with _cache_lock:
+            _cache[key] = tokens
+            _cache.move_to_end(key)
+            while len(_cache) > max_entries:
+                _cache.popitem(last=False)
+    return tokens
+
+
+def warm_up() -> bool:
+    """
+    Load the dictionary and run one tokenization so the first real call is fast.
+
+    Returns:
+        True if the tokenizer is ready, False if Janome is unavailable or failed.
+    """
+    if not JANOME_AVAILABLE:
+        return False
+    try:
+        tokenizer = get_tokenizer()
+        with _tokenize_lock:
+            list(tokenizer.tokenize("予算管理の基本"))
+        return True
+    except Exception as e:
+        logger.warning(f"Janome warm-up failed: {e}")
+        return False
+
+
+def warm_up_in_background() -> threading.Thread | None:
+    """
+    Start warm_up on a daemon thread (used at application startup).
+
+    Safe to call on every Streamlit rerun: only the first call starts a thread.
+
+    Returns:
+        The warm-up thread, or None if it was already started.
+    """
+    global _warmup_thread
+    with _tokenizer_lock:
+        if _warmup_thread is not None or not JANOME_AVAILABLE:
+            return None
+        _warmup_thread = threading.Thread(target=warm_up, name="janome-warmup", daemon=True)
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def cache_info() -> dict[str, int]:
+    """Get token cache statistics."""
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache)}
+
+
+def clear_cache() -> None:
+    """Clear the token cache and its statistics."""
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
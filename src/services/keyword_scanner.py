@@ -0,0 +1,206 @@
+"""
+EPM Note Engine - Keyword Scanner
+
+Aho-Corasick multi-pattern matcher: finds every occurrence of many keywords in
+a single pass over the text, instead of one regex scan per keyword.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+
+class KeywordScanner:
+    """
+    Case-insensitive multi-keyword matcher.
+
+    The automaton is built once per keyword set; scanning is linear in the
+    text length plus the number of matches. Callers pass text that is already
+    lowercased (see lower_text), so long documents are lowercased only once.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Keywords to match (blank keywords are ignored).
+        """
+        self.patterns: list[str] = []
+        self._pattern_ids: dict[str, int] = {}
+        # Trie as parallel arrays: goto transitions, failure links, outputs
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        for keyword in keywords:
+            pattern = keyword.lower()
+            if not pattern or pattern in self._pattern_ids:
+                continue
+            pattern_id = len(self.patterns)
+            self._pattern_ids[pattern] = pattern_id
+            self.patterns.append(pattern)
+            self._insert(pattern, pattern_id)
+
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end at the failure state
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def pattern_id(self, keyword: str) -> int | None:
+        """Get the pattern index for a keyword, or None if it was not added."""
+        return self._pattern_ids.get(keyword.lower())
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """
+        Yield every (start, pattern_id) occurrence, including overlapping ones.
+
+        Matches are yielded in order of their end offset.
+
+        Args:
+            text: Lowercased text to scan.
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in out[node]:
+                yield i - len(patterns[pattern_id]) + 1, pattern_id
+
+    def find_all(self, text: str) -> list[list[int]]:
+        """
+        Collect all match start offsets per pattern.
+
+        Args:
+            text: Lowercased text to scan.
+
+        Returns:
+            List indexed by pattern id of sorted start offsets.
+        """
+        starts: list[list[int]] = [[] for _ in self.patterns]
+        for start, pattern_id in self.iter_matches(text):
+            starts[pattern_id].append(start)
+        return starts
+
+
+def count_non_overlapping(starts: list[int], length: int) -> int:
+    """
+    Count leftmost non-overlapping matches (same result as re.findall).
+
+    Args:
+        starts: Sorted start offsets of all (possibly overlapping) matches.
+        length: Pattern length.
+    """
+    count = 0
+    next_free = 0
+    for start in starts:
+        if start >= next_free:
+            count += 1
+            next_free = start + length
+    return count
+
+
+@dataclass
+class KeywordSectionStats:
+    """Occurrences of one keyword across document sections."""
+
+    count: int = 0
+    positions: list[str] = field(default_factory=list)
+
+
+def scan_sections(
+    keywords: Iterable[str],
+    sections: dict,
+) -> dict[str, KeywordSectionStats]:
+    """
+    Count keywords and find the sections they appear in, in one pass per section.
+
+    Section checks match the previous per-keyword logic: a keyword is in
+    "h2"/"h3" if any heading of that level contains it, in "conclusion" if it
+    occurs at or after sections["conclusion_start"] in the body, and the count
+    is the number of non-overlapping case-insensitive matches in the body.
+
+    Args:
+        keywords: Keywords to analyze.
+        sections: Output of ResearchAgent._parse_content_sections.
+
+    Returns:
+        Mapping of keyword (as given) to its stats.
+    """
+    keywords = list(keywords)
+    scanner = KeywordScanner(keywords)
+    if not scanner.patterns:
+        return {kw: KeywordSectionStats() for kw in keywords}
+
+    body = sections["body"]
+    body_lower = body.lower()
+    body_starts = scanner.find_all(body_lower)
+
+    conclusion_start = sections.get("conclusion_start")
+    conclusion_offset = (
+        len(body[:conclusion_start].lower()) if conclusion_start is not None else None
+    )
+
+    # Short sections joined with a separator that never occurs in keywords
+    def present_in(parts: list[str]) -> set[int]:
+        text = "\x00".join(p.lower() for p in parts if p)
+        return {pattern_id for _, pattern_id in scanner.iter_matches(text)} if text else set()
+
+    in_title = present_in([sections.get("title", "")])
+    in_h2 = present_in(sections.get("h2_headings", []))
+    in_h3 = present_in(sections.get("h3_headings", []))
+    in_first = present_in([sections.get("first_paragraph", "")])
+
+    results: dict[str, KeywordSectionStats] = {}
+    for keyword in keywords:
+        pattern_id = scanner.pattern_id(keyword)
+        if pattern_id is None:
+            results[keyword] = KeywordSectionStats()
+            continue
+
+        starts = body_starts[pattern_id]
+        positions = []
+        if pattern_id in in_title:
+            positions.append("title")
+        if pattern_id in in_h2:
+            positions.append("h2")
+        if pattern_id in in_h3:
+            positions.append("h3")
+        if pattern_id in in_first:
+            positions.append("first_paragraph")
+        if conclusion_offset is not None and starts and starts[-1] >= conclusion_offset:
+            positions.append("conclusion")
+        if starts:
+            positions.append("body")
+
+        results[keyword] = KeywordSectionStats(
+            count=count_non_overlapping(starts, len(scanner.patterns[pattern_id])),
+            positions=positions,
+        )
+    return results
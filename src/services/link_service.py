@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from src.database.connection import get_session
 from src.database.models import Article, ArticleStatus
 from src.repositories.article_repository import ArticleRepository
+from src.services.markdown_document import parse_markdown
 
 logger = logging.getLogger(__name__)
 
@@ -109,19 +110,18 @@ class LinkService:
         import re
 
         keywords = []
+        document = parse_markdown(content)
 
-        # Extract from headings (## and ###)
-        headings = re.findall(r"^##?\s+(.+)$", content, re.MULTILINE)
-        for heading in headings[:5]:
+        # Extract from headings (# and ##)
+        for heading in document.headings_at(1, 2)[:5]:
             # Clean heading
             clean = re.sub(r"[【】「」『』（）\[\]\d\.\:\：]", " ", heading)
             keywords.extend(clean.split())
 
         # Extract from bold text
-        bold_texts = re.findall(r"\*\*([^*]+)\*\*", content)
-        for text in bold_texts[:10]:
-            if len(text) < 20:  # Skip long bold sections
-                keywords.append(text)
+        for span in document.bold_spans[:10]:
+            if len(span.text) < 20:  # Skip long bold sections
+                keywords.append(span.text)
 
         # Clean and dedupe
         cleaned = []
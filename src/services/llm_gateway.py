@@ -0,0 +1,487 @@
+"""
+EPM Note Engine - LLM Gateway
+
+Single instrumented path for Anthropic and OpenAI calls. The gateway owns
+long-lived sync and async SDK clients (one connection pool per provider for
+the whole process), caps concurrent requests per model, draws every request
+from a per-model token bucket shared by threads and event loops, retries
+429/5xx responses and connection errors with backoff, and records latency,
+input/output/cached tokens and retries of every call in the usage tracker.
+
+Async calls run on the gateway's own event loop thread, so the async client
+and its connections are reused across articles instead of being created and
+closed for every batch.
+
+Calls whose label is listed in LLM_CACHE_LABELS can be replayed from an
+opt-in on-disk cache keyed by a hash of the full request (model, system,
+messages, max_tokens, temperature, ...), so reruns after a crash, UI reruns
+and test runs do not pay for identical prompts again.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Iterator, TypeVar
+
+from src import config
+from src.config import get_settings
+from src.services.llm_usage import record_usage
+from src.services.rate_limit import TokenBucket, get_bucket, retry_delay
+from src.services.response_cache import ResponseCache, payload_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LLM_CACHE_NAMESPACE = "llm"
+
+# Status codes worth retrying (timeout, conflict, rate limited, server errors, overloaded)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+def _provider(model: str) -> str:
+    """Provider serving a model."""
+    return "anthropic" if model.startswith("claude") else "openai"
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed SDK call may succeed when repeated."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    # APITimeoutError subclasses APIConnectionError in both SDKs
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> ResponseCache | None:
+    """
+    Get the shared LLM response cache.
+
+    Returns:
+        ResponseCache instance, or None if caching is disabled.
+    """
+    global _cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                settings.response_cache_path,
+                namespace=LLM_CACHE_NAMESPACE,
+                ttl_seconds=settings.llm_cache_ttl_hours * 3600,
+                max_bytes=int(settings.llm_cache_max_mb * 1024 * 1024),
+            )
+        return _cache
+
+
+def _cache_for(label: str) -> ResponseCache | None:
+    """The response cache if calls with this label are cached."""
+    prefixes = get_settings().llm_cache_labels
+    if not any(label == p or label.startswith(f"{p}.") for p in prefixes):
+        return None
+    return get_llm_cache()
+
+
+def _cache_key(kind: str, kwargs: dict[str, Any]) -> str | None:
+    """Hash of a request, or None if it is not JSON-serializable."""
+    try:
+        return payload_hash({"kind": kind, **kwargs})
+    except (TypeError, ValueError):
+        return None
+
+
+def _dump_response(response: Any) -> dict | None:
+    """JSON form of an SDK response, or None if it has none."""
+    dump = getattr(response, "model_dump", None)
+    data = dump(mode="json") if callable(dump) else None
+    return data if isinstance(data, dict) else None
+
+
+def _load_response(kind: str, data: dict) -> Any:
+    """Rebuild an SDK response from its cached JSON form."""
+    if kind == "anthropic":
+        from anthropic.types import Message
+
+        return Message.model_validate(data)
+    from openai.types.chat import ChatCompletion
+
+    return ChatCompletion.model_validate(data)
+
+
+class LLMGateway:
+    """
+    Process-wide entry point for LLM calls.
+
+    Clients are created on first use with SDK retries disabled, since the
+    gateway retries itself and counts the attempts. Synchronous calls share
+    one concurrency cap per model; async calls share one per model and event
+    loop. Both draw from the same per-model token bucket.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[str, Any] = {}
+        self._sync_slots: dict[str, threading.BoundedSemaphore] = {}
+        # Async semaphores are bound to a loop, so each loop gets its own set
+        self._async_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # ----- Clients -----
+
+    def _client(self, name: str, factory: Callable[..., Any]) -> Any:
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = factory(max_retries=0)
+                self._clients[name] = client
+            return client
+
+    def anthropic_client(self) -> Any:
+        """
+        Get the shared Anthropic client.
+
+        Raises:
+            ValueError: If ANTHROPIC_API_KEY is not configured.
+        """
+        return self._client("anthropic", config.get_anthropic_client)
+
+    def async_anthropic_client(self) -> Any:
+        """
+        Get the shared AsyncAnthropic client.
+
+        Its connections belong to the gateway's event loop, so use it only in
+        coroutines passed to run().
+
+        Raises:
+            ValueError: If ANTHROPIC_API_KEY is not configured.
+        """
+        return self._client("async_anthropic", config.get_async_anthropic_client)
+
+    def openai_client(self) -> Any:
+        """
+        Get the shared OpenAI client.
+
+        Raises:
+            ValueError: If OPENAI_API_KEY is not configured.
+        """
+        return self._client("openai", config.get_openai_client)
+
+    # ----- Event loop -----
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """
+        Schedule a coroutine on the gateway's event loop without waiting.
+
+        Lets the calling thread handle progress while the coroutine runs
+        (e.g. update a UI from its script thread) and cancel it.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            Future for the coroutine's result; cancelling it cancels the task.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._event_loop())
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the gateway's event loop and wait for its result.
+
+        Can be called from any thread, including one with a running loop,
+        except from coroutines already running on the gateway loop.
+
+        Args:
+            coro: Coroutine to run.
+
+        Returns:
+            The coroutine's result.
+        """
+        loop = self._event_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("LLMGateway.run() cannot wait on its own event loop")
+        return self.submit(coro).result()
+
+    # ----- Limits -----
+
+    def max_concurrency(self, model: str) -> int:
+        """Concurrent request cap for a model."""
+        settings = get_settings()
+        return max(1, settings.llm_model_concurrency.get(model, settings.llm_max_concurrency))
+
+    def rate_limiter(self, model: str) -> TokenBucket | None:
+        """
+        Get the token bucket for a model.
+
+        Returns:
+            Shared TokenBucket, or None if the provider has no key configured
+            or limiting is off.
+        """
+        settings = get_settings()
+        provider = _provider(model)
+        api_key = settings.anthropic_api_key if provider == "anthropic" else settings.openai_api_key
+        if not api_key or settings.llm_rate_limit_per_minute <= 0:
+            return None
+        return get_bucket(
+            f"{provider}:{model}",
+            api_key,
+            rate=settings.llm_rate_limit_per_minute / 60,
+            capacity=settings.llm_rate_limit_burst,
+        )
+
+    @contextmanager
+    def slot(self, model: str) -> Iterator[None]:
+        """
+        Hold a request slot for a model in synchronous code.
+
+        Waits for the rate limit, then for a free concurrency slot.
+
+        Raises:
+            TimeoutError: If the rate limit wait exceeds GENERATION_TIMEOUT.
+        """
+        limiter = self.rate_limiter(model)
+        if limiter is not None:
+            limiter.acquire(timeout=get_settings().generation_timeout)
+        with self._lock:
+            semaphore = self._sync_slots.get(model)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_concurrency(model))
+                self._sync_slots[model] = semaphore
+        with semaphore:
+            yield
+
+    @asynccontextmanager
+    async def aslot(self, model: str) -> AsyncIterator[None]:
+        """
+        Hold a request slot for a model without blocking the event loop.
+
+        Raises:
+            TimeoutError: If the rate limit wait exceeds GENERATION_TIMEOUT.
+        """
+        limiter = self.rate_limiter(model)
+        if limiter is not None:
+            deadline = time.monotonic() + get_settings().generation_timeout
+            await limiter.acquire_async(deadline=deadline)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.setdefault(loop, {})
+            semaphore = slots.get(model)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency(model))
+                slots[model] = semaphore
+        async with semaphore:
+            yield
+
+    # ----- Calls -----
+
+    def call(self, label: str, model: str, request: Callable[[], T]) -> T:
+        """
+        Make one SDK request within the model's limits, retrying transient errors.
+
+        Args:
+            label: Label for token accounting, e.g. "writer.titles".
+            model: Model the request is sent to.
+            request: Makes the request and returns the SDK response.
+
+        Returns:
+            The SDK response.
+        """
+        max_retries = get_settings().llm_max_retries
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                with self.slot(model):
+                    response = request()
+                break
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= max_retries:
+                    raise
+                delay = retry_delay(getattr(e, "response", None), attempt)
+                logger.warning(
+                    f"LLM call [{label}] failed ({type(e).__name__}), retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
+        latency = time.perf_counter() - start
+        record_usage(label, model, getattr(response, "usage", None), latency, retries=attempt)
+        return response
+
+    async def acall(self, label: str, model: str, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async counterpart of call().
+
+        Args:
+            label: Label for token accounting.
+            model: Model the request is sent to.
+            request: Returns an awaitable making the request.
+
+        Returns:
+            The SDK response.
+        """
+        max_retries = get_settings().llm_max_retries
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                async with self.aslot(model):
+                    response = await request()
+                break
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= max_retries:
+                    raise
+                delay = retry_delay(getattr(e, "response", None), attempt)
+                logger.warning(
+                    f"LLM call [{label}] failed ({type(e).__name__}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+        latency = time.perf_counter() - start
+        record_usage(label, model, getattr(response, "usage", None), latency, retries=attempt)
+        return response
+
+    def _replay(self, label: str, kind: str, data: Any) -> Any:
+        """Cached response rebuilt for the caller, or None on a miss."""
+        if data is None:
+            return None
+        try:
+            response = _load_response(kind, data)
+        except Exception as e:
+            logger.warning(f"LLM cache entry unreadable [{label}] (non-critical): {e}")
+            return None
+        logger.info(f"LLM cache hit [{label}]")
+        return response
+
+    def _through_cache(
+        self,
+        label: str,
+        kind: str,
+        kwargs: dict[str, Any],
+        fetch: Callable[[], T],
+    ) -> T:
+        """Serve a request from the response cache, or fetch and store it."""
+        cache = _cache_for(label)
+        key = _cache_key(kind, kwargs) if cache is not None else None
+        if key is not None:
+            response = self._replay(label, kind, cache.get(key))
+            if response is not None:
+                return response
+        response = fetch()
+        data = _dump_response(response) if key is not None else None
+        if data is not None:
+            cache.set(key, data)
+        return response
+
+    def create_message(self, label: str, client: Any | None = None, **kwargs: Any) -> Any:
+        """
+        Call Anthropic messages.create through the gateway.
+
+        Args:
+            label: Label for token accounting and response caching.
+            client: Anthropic client (defaults to the shared one).
+            **kwargs: Arguments for messages.create.
+
+        Returns:
+            Anthropic message.
+        """
+        def fetch() -> Any:
+            sdk = client if client is not None else self.anthropic_client()
+            return self.call(label, kwargs.get("model", ""), lambda: sdk.messages.create(**kwargs))
+
+        return self._through_cache(label, "anthropic", kwargs, fetch)
+
+    async def acreate_message(self, label: str, client: Any | None = None, **kwargs: Any) -> Any:
+        """
+        Call AsyncAnthropic messages.create through the gateway.
+
+        Args:
+            label: Label for token accounting and response caching.
+            client: AsyncAnthropic client (defaults to the shared one).
+            **kwargs: Arguments for messages.create.
+
+        Returns:
+            Anthropic message.
+        """
+        cache = _cache_for(label)
+        key = _cache_key("anthropic", kwargs) if cache is not None else None
+        if key is not None:
+            response = self._replay(label, "anthropic", await asyncio.to_thread(cache.get, key))
+            if response is not None:
+                return response
+
+        sdk = client if client is not None else self.async_anthropic_client()
+        model = kwargs.get("model", "")
+        response = await self.acall(label, model, lambda: sdk.messages.create(**kwargs))
+        data = _dump_response(response) if key is not None else None
+        if data is not None:
+            await asyncio.to_thread(cache.set, key, data)
+        return response
+
+    def create_chat_completion(self, label: str, client: Any | None = None, **kwargs: Any) -> Any:
+        """
+        Call OpenAI chat.completions.create through the gateway.
+
+        Args:
+            label: Label for token accounting and response caching.
+            client: OpenAI client (defaults to the shared one).
+            **kwargs: Arguments for chat.completions.create.
+
+        Returns:
+            OpenAI chat completion.
+        """
+        def fetch() -> Any:
+            sdk = client if client is not None else self.openai_client()
+            return self.call(
+                label, kwargs.get("model", ""), lambda: sdk.chat.completions.create(**kwargs)
+            )
+
+        return self._through_cache(label, "openai", kwargs, fetch)
+
+
+_gateway: LLMGateway | None = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+def get_anthropic_client() -> Any:
+    """Get the shared Anthropic client (see LLMGateway.anthropic_client)."""
+    return get_llm_gateway().anthropic_client()
+
+
+def get_async_anthropic_client() -> Any:
+    """Get the shared AsyncAnthropic client (see LLMGateway.async_anthropic_client)."""
+    return get_llm_gateway().async_anthropic_client()
+
+
+def get_openai_client() -> Any:
+    """Get the shared OpenAI client (see LLMGateway.openai_client)."""
+    return get_llm_gateway().openai_client()
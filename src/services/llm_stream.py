@@ -0,0 +1,170 @@
+"""
+EPM Note Engine - LLM Streaming
+
+Streams Anthropic message text as progress events so long generations can be
+rendered as they are written and stopped early.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from src.services.llm_gateway import get_llm_gateway
+from src.services.llm_usage import record_usage
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per output token for mostly-Japanese text; only used for
+# live progress until the exact usage arrives with the final message
+CHARS_PER_TOKEN_ESTIMATE = 1.2
+
+
+class GenerationCancelledError(Exception):
+    """A streaming generation was cancelled before it finished."""
+
+    def __init__(self, stage: str = "") -> None:
+        super().__init__(f"Generation cancelled ({stage})" if stage else "Generation cancelled")
+        self.stage = stage
+
+
+@dataclass(frozen=True)
+class StreamProgress:
+    """Progress of a streaming generation."""
+
+    stage: str  # Caller-defined label, e.g. "draft", "refine", "revise"
+    delta: str  # Text added by this event
+    text: str  # Text generated so far
+    output_tokens: int  # Estimated while streaming, exact when done
+    elapsed: float  # Seconds since the request was sent
+    first_token_seconds: float | None  # Time to the first text delta
+    done: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Output tokens per second since the first token."""
+        if self.first_token_seconds is None:
+            return 0.0
+        generating = self.elapsed - self.first_token_seconds
+        return self.output_tokens / generating if generating > 0 else 0.0
+
+
+StreamCallback = Callable[[StreamProgress], None]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the output token count of generated text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+
+
+def stream_text(
+    client: Any,
+    stage: str = "",
+    cancel_event: threading.Event | None = None,
+    usage_label: str = "",
+    **create_kwargs: Any,
+) -> Iterator[StreamProgress]:
+    """
+    Stream a message and yield progress for every text delta.
+
+    The stream holds one of the model's LLM gateway slots while it runs.
+    Closing the generator or cancelling closes the HTTP stream, so the model
+    stops generating.
+
+    Args:
+        client: Anthropic client.
+        stage: Label copied into every StreamProgress.
+        cancel_event: Set to stop the generation at the next delta.
+        usage_label: Label for token accounting (defaults to stage).
+        **create_kwargs: Arguments for messages.stream (model, max_tokens, messages, ...).
+
+    Yields:
+        StreamProgress per delta, then a final one with done=True and exact usage.
+
+    Raises:
+        GenerationCancelledError: If cancel_event is set during the generation.
+    """
+    start = time.perf_counter()
+    first_token_seconds = None
+    text = ""
+
+    with (
+        get_llm_gateway().slot(create_kwargs.get("model", "")),
+        client.messages.stream(**create_kwargs) as stream,
+    ):
+        for delta in stream.text_stream:
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelledError(stage)
+            elapsed = time.perf_counter() - start
+            if first_token_seconds is None:
+                first_token_seconds = elapsed
+            text += delta
+            yield StreamProgress(
+                stage=stage,
+                delta=delta,
+                text=text,
+                output_tokens=estimate_tokens(text),
+                elapsed=elapsed,
+                first_token_seconds=first_token_seconds,
+            )
+        final = stream.get_final_message()
+
+    usage = getattr(final, "usage", None)
+    output_tokens = getattr(usage, "output_tokens", None) or estimate_tokens(text)
+    progress = StreamProgress(
+        stage=stage,
+        delta="",
+        text=text,
+        output_tokens=output_tokens,
+        elapsed=time.perf_counter() - start,
+        first_token_seconds=first_token_seconds,
+        done=True,
+    )
+    logger.info(
+        f"Streamed {stage or 'message'}: {output_tokens} tokens in {progress.elapsed:.1f}s "
+        f"(first token {first_token_seconds or 0:.1f}s, {progress.tokens_per_second:.1f} tok/s)"
+    )
+    record_usage(
+        usage_label or stage or "stream",
+        create_kwargs.get("model", ""),
+        usage,
+        latency=progress.elapsed,
+    )
+    yield progress
+
+
+def complete_streaming(
+    client: Any,
+    on_progress: StreamCallback | None = None,
+    stage: str = "",
+    cancel_event: threading.Event | None = None,
+    usage_label: str = "",
+    **create_kwargs: Any,
+) -> str:
+    """
+    Stream a message to completion and return its text.
+
+    Args:
+        client: Anthropic client.
+        on_progress: Called with every StreamProgress.
+        stage: Label copied into every StreamProgress.
+        cancel_event: Set to stop the generation early.
+        usage_label: Label for token accounting (defaults to stage).
+        **create_kwargs: Arguments for messages.stream.
+
+    Returns:
+        Generated text.
+
+    Raises:
+        GenerationCancelledError: If cancel_event is set during the generation.
+    """
+    text = ""
+    for progress in stream_text(
+        client, stage=stage, cancel_event=cancel_event, usage_label=usage_label, **create_kwargs
+    ):
+        if on_progress is not None:
+            on_progress(progress)
+        text = progress.text
+    return text
@@ -0,0 +1,223 @@
+"""
+EPM Note Engine - LLM Prompt Caching and Token Accounting
+
+Builds system prompts whose static instruction prefix carries an Anthropic
+cache breakpoint, and records per-call token usage split into uncached,
+cache-write and cache-read input tokens so the effect of caching can be
+checked across a batch of articles. OpenAI usage (prompt/completion tokens
+with cached prompt tokens) is mapped onto the same fields.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, replace
+from typing import Any
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def cacheable_text(text: str, enabled: bool | None = None) -> dict[str, Any]:
+    """
+    Build a text content block that ends a cacheable prompt prefix.
+
+    Args:
+        text: Text that is identical across the calls sharing the prefix.
+        enabled: Override for the ANTHROPIC_PROMPT_CACHE_ENABLED setting.
+
+    Returns:
+        Text content block, with a cache breakpoint when caching is enabled.
+    """
+    if enabled is None:
+        enabled = get_settings().anthropic_prompt_cache_enabled
+    block: dict[str, Any] = {"type": "text", "text": text}
+    if enabled:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def cached_system(static_text: str, enabled: bool | None = None) -> list[dict[str, Any]]:
+    """
+    Build a system prompt with a cache breakpoint after the static prefix.
+
+    The prefix must be byte-identical between calls to be read from the
+    cache, so only fixed instructions belong here; per-article data goes in
+    the user message. Prefixes shorter than the model's minimum cacheable
+    length are sent normally.
+
+    Args:
+        static_text: Fixed instruction text.
+        enabled: Override for the ANTHROPIC_PROMPT_CACHE_ENABLED setting.
+
+    Returns:
+        System content blocks for messages.create/messages.stream.
+    """
+    return [cacheable_text(static_text, enabled)]
+
+
+def _tokens(usage: Any, name: str) -> int:
+    value = getattr(usage, name, None)
+    return value if isinstance(value, int) else 0
+
+
+@dataclass
+class CallUsage:
+    """Token usage of one or more LLM calls."""
+
+    label: str
+    model: str = ""
+    input_tokens: int = 0  # Uncached input (after the last cache breakpoint)
+    cache_creation_input_tokens: int = 0  # Written to the cache
+    cache_read_input_tokens: int = 0  # Read from the cache
+    output_tokens: int = 0
+    latency: float = 0.0
+    calls: int = 1
+    retries: int = 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """All input tokens, cached or not."""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of input tokens read from the cache."""
+        total = self.total_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    def add(self, other: "CallUsage") -> None:
+        """Accumulate another usage into this one."""
+        self.input_tokens += other.input_tokens
+        self.cache_creation_input_tokens += other.cache_creation_input_tokens
+        self.cache_read_input_tokens += other.cache_read_input_tokens
+        self.output_tokens += other.output_tokens
+        self.latency += other.latency
+        self.calls += other.calls
+        self.retries += other.retries
+
+
+class UsageTracker:
+    """Thread-safe accumulator of per-call token usage."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: list[CallUsage] = []
+
+    def record(
+        self,
+        label: str,
+        model: str,
+        usage: Any,
+        latency: float = 0.0,
+        retries: int = 0,
+    ) -> CallUsage:
+        """
+        Record the usage of one call.
+
+        Args:
+            label: Call label, e.g. "writer.draft" or "reviewer.review".
+            model: Model name.
+            usage: `usage` object of an Anthropic message or OpenAI completion.
+            latency: Seconds the call took.
+            retries: Retries made before the call succeeded.
+
+        Returns:
+            The recorded CallUsage.
+        """
+        if _tokens(usage, "prompt_tokens"):
+            cached = _tokens(getattr(usage, "prompt_tokens_details", None), "cached_tokens")
+            call = CallUsage(
+                label=label,
+                model=model,
+                input_tokens=_tokens(usage, "prompt_tokens") - cached,
+                cache_read_input_tokens=cached,
+                output_tokens=_tokens(usage, "completion_tokens"),
+                latency=latency,
+                retries=retries,
+            )
+        else:
+            call = CallUsage(
+                label=label,
+                model=model,
+                input_tokens=_tokens(usage, "input_tokens"),
+                cache_creation_input_tokens=_tokens(usage, "cache_creation_input_tokens"),
+                cache_read_input_tokens=_tokens(usage, "cache_read_input_tokens"),
+                output_tokens=_tokens(usage, "output_tokens"),
+                latency=latency,
+                retries=retries,
+            )
+        with self._lock:
+            self._calls.append(call)
+        logger.info(
+            f"LLM usage [{label}]: input={call.input_tokens} "
+            f"cache_read={call.cache_read_input_tokens} "
+            f"cache_write={call.cache_creation_input_tokens} "
+            f"output={call.output_tokens} retries={retries} ({latency:.1f}s)"
+        )
+        return call
+
+    @property
+    def calls(self) -> list[CallUsage]:
+        """Recorded calls in order."""
+        with self._lock:
+            return list(self._calls)
+
+    def summary(self) -> dict[str, CallUsage]:
+        """
+        Aggregate recorded calls by label.
+
+        Returns:
+            Dict mapping label to summed CallUsage.
+        """
+        totals: dict[str, CallUsage] = {}
+        for call in self.calls:
+            if call.label in totals:
+                totals[call.label].add(call)
+            else:
+                totals[call.label] = replace(call)
+        return totals
+
+    def mark(self) -> int:
+        """Position to pass to total(since=...) to sum only later calls."""
+        with self._lock:
+            return len(self._calls)
+
+    def total(self, since: int = 0) -> CallUsage:
+        """
+        Sum recorded calls.
+
+        Args:
+            since: Only include calls recorded after this mark().
+
+        Returns:
+            Summed CallUsage labelled "total".
+        """
+        total = CallUsage(label="total", calls=0)
+        for call in self.calls[since:]:
+            total.add(call)
+        return total
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            self._calls.clear()
+
+
+_tracker = UsageTracker()
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Get the process-wide usage tracker."""
+    return _tracker
+
+
+def record_usage(
+    label: str,
+    model: str,
+    usage: Any,
+    latency: float = 0.0,
+    retries: int = 0,
+) -> CallUsage:
+    """Record one call's usage on the process-wide tracker."""
+    return _tracker.record(label, model, usage, latency, retries)
@@ -0,0 +1,246 @@
+"""
+EPM Note Engine - Markdown Document Model
+
+One immutable parse of a Markdown draft (lines, headings, sections, paragraphs,
+list items and bold spans, with character offsets) shared by all analyzers.
+Parses are memoized by content hash, so a draft is parsed once per revision.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Number of parsed documents kept in memory (drafts, revisions, previews)
+MAX_CACHED_DOCUMENTS = 32
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
+_UNORDERED_PATTERN = re.compile(r"^[-*]\s+(.*)$")
+_ORDERED_PATTERN = re.compile(r"^\d+\.\s+(.+)$")
+_THEMATIC_BREAK_PATTERN = re.compile(r"^-{3,}$")
+_BOLD_PATTERN = re.compile(r"\*\*([^*]+)\*\*")
+
+
+@dataclass(frozen=True)
+class MarkdownLine:
+    """A source line and its block type."""
+
+    index: int
+    offset: int  # Character offset of the line start in the document
+    text: str  # Line without the trailing newline
+    kind: str  # "blank", "heading", "unordered", "ordered", "break" or "text"
+    level: int = 0  # Heading level (1-6) for headings
+    content: str = ""  # Heading text / list item text / stripped line
+
+    @property
+    def stripped(self) -> str:
+        """Line with surrounding whitespace removed."""
+        return self.text.strip()
+
+
+@dataclass(frozen=True)
+class Heading:
+    """A Markdown heading (# to ######)."""
+
+    level: int
+    text: str
+    line: int
+    offset: int
+
+
+@dataclass(frozen=True)
+class Section:
+    """Content from a heading up to the next heading of the same or higher level."""
+
+    heading: Heading
+    start: int  # Offset of the heading line
+    end: int  # Offset where the next section starts (or document length)
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    """A run of consecutive non-blank, non-heading lines (may include list items)."""
+
+    lines: tuple[str, ...]  # Stripped lines
+    start_line: int
+    offset: int
+
+    @property
+    def text(self) -> str:
+        """Paragraph lines joined with spaces."""
+        return " ".join(self.lines)
+
+
+@dataclass(frozen=True)
+class ListItem:
+    """A bullet (- / *) or numbered (1.) list item."""
+
+    ordered: bool
+    text: str
+    line: int
+    offset: int
+
+
+@dataclass(frozen=True)
+class BoldSpan:
+    """A **bold** span (may cross lines)."""
+
+    text: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class MarkdownDocument:
+    """Immutable parsed Markdown document."""
+
+    text: str
+    lines: tuple[MarkdownLine, ...]
+    headings: tuple[Heading, ...]
+    sections: tuple[Section, ...]
+    paragraphs: tuple[Paragraph, ...]
+    list_items: tuple[ListItem, ...]
+    bold_spans: tuple[BoldSpan, ...]
+
+    @property
+    def title(self) -> str:
+        """Text of the first H1, or an empty string."""
+        return next((h.text for h in self.headings if h.level == 1), "")
+
+    @property
+    def first_paragraph(self) -> str:
+        """Text of the first paragraph, or an empty string."""
+        return self.paragraphs[0].text if self.paragraphs else ""
+
+    def headings_at(self, *levels: int) -> list[str]:
+        """Heading texts at the given levels, in document order."""
+        return [h.text for h in self.headings if h.level in levels]
+
+    def find_heading(self, contains: str, min_level: int = 1) -> Heading | None:
+        """First heading at min_level or deeper whose text contains a substring."""
+        return next(
+            (h for h in self.headings if h.level >= min_level and contains in h.text),
+            None,
+        )
+
+    def find_break(self) -> MarkdownLine | None:
+        """First thematic break line (---)."""
+        return next((line for line in self.lines if line.kind == "break"), None)
+
+
+def _classify(index: int, offset: int, text: str) -> MarkdownLine:
+    stripped = text.strip()
+    if not stripped:
+        return MarkdownLine(index, offset, text, "blank")
+
+    match = _HEADING_PATTERN.match(stripped)
+    if match:
+        return MarkdownLine(
+            index, offset, text, "heading",
+            level=len(match.group(1)), content=match.group(2).strip(),
+        )
+    if _THEMATIC_BREAK_PATTERN.match(stripped):
+        return MarkdownLine(index, offset, text, "break", content=stripped)
+
+    match = _UNORDERED_PATTERN.match(stripped)
+    if match:
+        return MarkdownLine(index, offset, text, "unordered", content=match.group(1))
+    match = _ORDERED_PATTERN.match(stripped)
+    if match:
+        return MarkdownLine(index, offset, text, "ordered", content=match.group(1))
+
+    return MarkdownLine(index, offset, text, "text", content=stripped)
+
+
+def _parse(text: str) -> MarkdownDocument:
+    lines: list[MarkdownLine] = []
+    offset = 0
+    for index, line_text in enumerate(text.split("\n")):
+        lines.append(_classify(index, offset, line_text))
+        offset += len(line_text) + 1
+
+    headings = tuple(
+        Heading(level=line.level, text=line.content, line=line.index, offset=line.offset)
+        for line in lines
+        if line.kind == "heading"
+    )
+
+    sections = []
+    for i, heading in enumerate(headings):
+        end = len(text)
+        for following in headings[i + 1:]:
+            if following.level <= heading.level:
+                end = following.offset
+                break
+        sections.append(Section(heading=heading, start=heading.offset, end=end))
+
+    paragraphs = []
+    current: list[MarkdownLine] = []
+    for line in lines + [None]:
+        if line is None or line.kind in ("blank", "heading"):
+            if current:
+                paragraphs.append(Paragraph(
+                    lines=tuple(line.stripped for line in current),
+                    start_line=current[0].index,
+                    offset=current[0].offset,
+                ))
+                current = []
+            continue
+        current.append(line)
+
+    list_items = tuple(
+        ListItem(ordered=line.kind == "ordered", text=line.content, line=line.index, offset=line.offset)
+        for line in lines
+        if line.kind in ("unordered", "ordered")
+    )
+
+    bold_spans = tuple(
+        BoldSpan(text=match.group(1), start=match.start(), end=match.end())
+        for match in _BOLD_PATTERN.finditer(text)
+    )
+
+    return MarkdownDocument(
+        text=text,
+        lines=tuple(lines),
+        headings=headings,
+        sections=tuple(sections),
+        paragraphs=tuple(paragraphs),
+        list_items=list_items,
+        bold_spans=bold_spans,
+    )
+
+
+_cache: "OrderedDict[str, MarkdownDocument]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_markdown(text: str) -> MarkdownDocument:
+    """
+    Parse Markdown into a MarkdownDocument, memoized by content hash.
+
+    Args:
+        text: Markdown content.
+
+    Returns:
+        Parsed document (shared between callers; it is immutable).
+    """
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    with _cache_lock:
+        document = _cache.get(key)
+        if document is not None:
+            _cache.move_to_end(key)
+            return document
+
+    document = _parse(text)
+    with _cache_lock:
+        _cache[key] = document
+        while len(_cache) > MAX_CACHED_DOCUMENTS:
+            _cache.popitem(last=False)
+    return document
+
+
+def clear_cache() -> None:
+    """Clear memoized documents."""
+    with _cache_lock:
+        _cache.clear()
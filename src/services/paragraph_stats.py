@@ -0,0 +1,146 @@
+"""
+EPM Note Engine - Paragraph Statistics Cache
+
+Incremental token/noun statistics for drafts being edited: the draft is split
+into paragraphs, each paragraph's counts are cached by content hash, and only
+paragraphs that changed since the last analysis are re-tokenized.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+
+from src.services.japanese_tokenizer import tokenize
+
+# Paragraphs are separated by blank lines (same blocks as Markdown)
+_PARAGRAPH_SEPARATOR = re.compile(r"\n[ \t]*\n")
+
+
+def split_paragraphs(content: str) -> list[str]:
+    """Split Markdown content into blank-line separated paragraphs."""
+    return [p for p in _PARAGRAPH_SEPARATOR.split(content) if p.strip()]
+
+
+def count_nouns(tokens) -> Counter:
+    """Count keyword-candidate nouns (2+ characters, not numbers) in tokens."""
+    return Counter(
+        t.surface
+        for t in tokens
+        if t.part_of_speech.startswith("名詞")
+        and len(t.surface) > 1
+        and not t.surface.isdigit()
+    )
+
+
+@dataclass(frozen=True)
+class ParagraphStats:
+    """Token statistics of one paragraph."""
+
+    token_count: int
+    noun_frequency: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class DocumentStats:
+    """Token statistics of a document, recombined from its paragraphs."""
+
+    total_words: int = 0
+    noun_frequency: dict[str, int] = field(default_factory=dict)
+    paragraphs: int = 0
+    tokenized_paragraphs: int = 0  # Paragraphs that missed the cache
+
+
+class ParagraphStatsCache:
+    """
+    LRU cache of per-paragraph token and noun counts keyed by paragraph hash.
+
+    One instance is kept per editor session; typing in one paragraph only
+    re-tokenizes that paragraph. Document totals are the sums of the paragraph
+    counts, so they can differ by a few tokens from tokenizing the whole
+    document at once (paragraph separators are not counted).
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached paragraphs.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParagraphStats]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(paragraph: str) -> str:
+        return hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).hexdigest()
+
+    def paragraph_stats(self, paragraph: str) -> tuple[ParagraphStats, bool]:
+        """
+        Get statistics for one paragraph.
+
+        Args:
+            paragraph: Paragraph text.
+
+        Returns:
+            Tuple of (stats, cached) where cached is False if it was tokenized.
+        """
+        key = self._key(paragraph)
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return stats, True
+            self.misses += 1
+
+        tokens = tokenize(paragraph)
+        stats = ParagraphStats(
+            token_count=len(tokens),
+            noun_frequency=dict(count_nouns(tokens)),
+        )
+        with self._lock:
+            self._entries[key] = stats
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stats, False
+
+    def document_stats(self, content: str) -> DocumentStats:
+        """
+        Recombine document totals from (mostly cached) paragraph statistics.
+
+        Args:
+            content: Full Markdown content.
+
+        Returns:
+            DocumentStats with total token count and noun frequencies.
+        """
+        total_words = 0
+        noun_frequency: Counter = Counter()
+        paragraphs = split_paragraphs(content)
+        tokenized = 0
+
+        for paragraph in paragraphs:
+            stats, cached = self.paragraph_stats(paragraph)
+            total_words += stats.token_count
+            noun_frequency.update(stats.noun_frequency)
+            if not cached:
+                tokenized += 1
+
+        return DocumentStats(
+            total_words=total_words,
+            noun_frequency=dict(noun_frequency),
+            paragraphs=len(paragraphs),
+            tokenized_paragraphs=tokenized,
+        )
+
+    def clear(self) -> None:
+        """Clear cached paragraphs and statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,145 @@
+"""
+EPM Note Engine - Rate Limiting
+
+Token buckets shared by threads and event loops, so synchronous and async
+callers of the same provider draw from one quota, and the backoff used
+between retries of rate-limited requests.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Any
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity` (the
+    allowed burst). Waiting never holds a reservation, so a cancelled waiter
+    leaves the bucket untouched.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second (> 0).
+            capacity: Maximum tokens, i.e. the allowed burst (>= 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available.
+
+        Args:
+            tokens: Number of tokens to take.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until they will be available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> None:
+        """
+        Block until tokens are taken.
+
+        Args:
+            tokens: Number of tokens to take.
+            timeout: Maximum seconds to wait (None = no limit).
+
+        Raises:
+            TimeoutError: If the tokens cannot be taken within timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError("Rate limit wait exceeds the deadline")
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0, deadline: float | None = None) -> None:
+        """
+        Wait without blocking the event loop until tokens are taken.
+
+        Args:
+            tokens: Number of tokens to take.
+            deadline: time.monotonic() value by which the tokens must be taken.
+
+        Raises:
+            TimeoutError: If the tokens cannot be taken before the deadline.
+        """
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError("Rate limit wait exceeds the deadline")
+            await asyncio.sleep(wait)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider: str, api_key: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Get the shared bucket for a provider API key.
+
+    Args:
+        provider: Provider name (e.g. "tavily").
+        api_key: API key the quota belongs to (only its hash is kept).
+        rate: Tokens per second for a new bucket.
+        capacity: Burst size for a new bucket.
+
+    Returns:
+        TokenBucket shared by every caller using the same key.
+    """
+    key = f"{provider}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]}"
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None or bucket.rate != rate or bucket.capacity != max(1.0, capacity):
+            bucket = TokenBucket(rate, capacity)
+            _buckets[key] = bucket
+        return bucket
+
+
+def retry_delay(response: Any, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed request.
+
+    Args:
+        response: HTTP response of the failed attempt (None for transport errors).
+        attempt: Number of retries already made.
+
+    Returns:
+        The Retry-After header value if given, else jittered exponential backoff.
+    """
+    headers = getattr(response, "headers", None)
+    retry_after = headers.get("Retry-After") if headers is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return (2 ** attempt) * 0.5 + random.uniform(0, 0.25)
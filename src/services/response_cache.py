@@ -0,0 +1,218 @@
+"""
+EPM Note Engine - Response Cache
+
+Persistent key/value cache for external API responses, plus in-process
+request coalescing (single-flight) for identical in-flight calls.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def payload_hash(payload: Any) -> str:
+    """
+    Stable content hash for a JSON-serializable payload.
+
+    Keys are sorted so that dict ordering never changes the hash.
+    """
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of JSON responses with a per-entry TTL and an
+    optional size budget (oldest entries are evicted first).
+
+    One database file can hold several namespaces (e.g. "tavily", "llm").
+    A new connection is opened per operation, so the cache is safe to share
+    across threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        namespace: str,
+        ttl_seconds: float,
+        max_bytes: int = 0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file path.
+            namespace: Logical partition for keys.
+            ttl_seconds: Entry lifetime in seconds.
+            max_bytes: Size budget of the stored values in this namespace
+                       (0 = unlimited).
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (WAL mode so readers never block the writer)."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Decoded value, or None if missing or expired.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed ({self.namespace}): {e}")
+            return None
+
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at < time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable value.
+        """
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (
+                        self.namespace,
+                        key,
+                        json.dumps(value, ensure_ascii=False),
+                        now,
+                        now + self.ttl_seconds,
+                    ),
+                )
+                if self.max_bytes > 0:
+                    self._evict(conn, now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Response cache write failed ({self.namespace}): {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the oldest ones until the namespace fits max_bytes."""
+        cursor = conn.execute(
+            """
+            DELETE FROM responses WHERE namespace = ? AND (expires_at < ? OR key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(LENGTH(CAST(value AS BLOB)))
+                        OVER (ORDER BY created_at DESC, key) AS kept
+                    FROM responses WHERE namespace = ?
+                ) WHERE kept > ?
+            ))
+            """,
+            (self.namespace, now, self.namespace, self.max_bytes),
+        )
+        if cursor.rowcount:
+            logger.debug(f"Response cache evicted {cursor.rowcount} entries ({self.namespace})")
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries in this namespace.
+
+        Returns:
+            Number of deleted entries.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM responses WHERE namespace = ? AND expires_at < ?",
+                (self.namespace, time.time()),
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete all entries in this namespace."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE namespace = ?", (self.namespace,))
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the in-flight call table."""
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Call identity.
+            fn: Function to run.
+
+        Returns:
+            Tuple of (result, shared) where shared is True for coalesced callers.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
@@ -0,0 +1,323 @@
+"""
+EPM Note Engine - SERP Snapshots
+
+Keeps a dated history of normalized Tavily results in Postgres (serp_snapshots,
+serp_pages). Research and theme proposal read a recent snapshot instead of
+calling the API, and ranking trends and diffs are computed from stored
+snapshots without new searches.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+from src.config import get_settings
+from src.database.connection import get_session
+from src.repositories.serp_snapshot_repository import SerpSnapshotRepository
+from src.services.response_cache import payload_hash
+from src.services.tavily_gateway import normalize_search_payload, tavily_search
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SerpDiff:
+    """Differences between two snapshots of the same search."""
+
+    added: list[str] = field(default_factory=list)  # URLs new in the later snapshot
+    removed: list[str] = field(default_factory=list)  # URLs gone from the later snapshot
+    moved: dict[str, tuple[int, int]] = field(default_factory=dict)  # URL -> (old rank, new rank)
+    changed: list[str] = field(default_factory=list)  # URLs whose title/content changed
+
+    @property
+    def unchanged(self) -> bool:
+        """True if ranking and page content are identical."""
+        return not (self.added or self.removed or self.moved or self.changed)
+
+
+def snapshots_enabled() -> bool:
+    """Whether searches are recorded to and served from SERP snapshots."""
+    return get_settings().serp_snapshot_enabled
+
+
+def page_hash(url: str, title: str, content: str) -> str:
+    """Content hash of one result page."""
+    return payload_hash({"url": url, "title": title, "content": content})
+
+
+def normalize_serp_results(response: dict) -> list[dict[str, Any]]:
+    """
+    Normalize Tavily results for storage.
+
+    Args:
+        response: Tavily response dict.
+
+    Returns:
+        Results in rank order as {rank, url, title, content, score, content_hash}.
+    """
+    normalized = []
+    for rank, result in enumerate(response.get("results") or [], start=1):
+        url = str(result.get("url") or "").strip()
+        title = " ".join(str(result.get("title") or "").split())
+        content = str(result.get("content") or "").strip()
+        normalized.append({
+            "rank": rank,
+            "url": url,
+            "title": title,
+            "content": content,
+            "score": result.get("score"),
+            "content_hash": page_hash(url, title, content),
+        })
+    return normalized
+
+
+def results_hash(results: list[dict[str, Any]]) -> str:
+    """Hash of a ranked result list (order and page content)."""
+    return payload_hash([[r["url"], r["content_hash"]] for r in results])
+
+
+def _snapshot_key(payload: dict[str, Any]) -> tuple[str, str, str, int]:
+    normalized = normalize_search_payload(payload)
+    # The domain profile name alone does not say which filters were sent
+    # (e.g. the unfiltered fallback) or whether an answer was requested
+    filter_key = payload_hash({
+        "include_answer": normalized["include_answer"],
+        "include_domains": normalized.get("include_domains", []),
+        "exclude_domains": normalized.get("exclude_domains", []),
+    })
+    return (
+        normalized["query"],
+        normalized["search_depth"],
+        filter_key,
+        normalized["max_results"],
+    )
+
+
+def record_snapshot(
+    payload: dict[str, Any],
+    response: dict,
+    domain_profile: str | None = None,
+    snapshot_date: date | None = None,
+) -> bool:
+    """
+    Store a Tavily response as today's snapshot of the search.
+
+    Args:
+        payload: Tavily search payload.
+        response: Tavily response dict.
+        domain_profile: Tavily domain profile used for the search.
+        snapshot_date: Day of the snapshot (default: today, UTC).
+
+    Returns:
+        True if the snapshot was stored.
+    """
+    results = normalize_serp_results(response)
+    # Failed or empty searches would hide an older, useful snapshot
+    if not results:
+        return False
+    query, search_depth, filter_key, max_results = _snapshot_key(payload)
+    try:
+        with get_session() as session:
+            SerpSnapshotRepository(session).save(
+                query,
+                domain_profile,
+                search_depth,
+                filter_key,
+                max_results,
+                str(response.get("answer") or ""),
+                results,
+                results_hash(results),
+                snapshot_date=snapshot_date,
+            )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to store SERP snapshot for {query} (non-critical): {e}")
+        return False
+
+
+def _snapshot_to_dict(snapshot, pages: dict) -> dict[str, Any]:
+    results = []
+    for result in snapshot.results:
+        page = pages.get(result["content_hash"])
+        results.append({**result, "content": page.content if page is not None else ""})
+    return {
+        "query": snapshot.query,
+        "domain_profile": snapshot.domain_profile,
+        "search_depth": snapshot.search_depth,
+        "snapshot_date": snapshot.snapshot_date.isoformat(),
+        "answer": snapshot.answer,
+        "results": results,
+        "results_hash": snapshot.results_hash,
+    }
+
+
+def load_recent_snapshot(
+    payload: dict[str, Any],
+    domain_profile: str | None = None,
+    max_age_days: float | None = None,
+) -> dict | None:
+    """
+    Get a recent snapshot of a search as a Tavily-shaped response.
+
+    Args:
+        payload: Tavily search payload.
+        domain_profile: Tavily domain profile used for the search.
+        max_age_days: Maximum age in days (default from settings).
+
+    Returns:
+        Response dict with "answer", "results" (at most max_results) and
+        "snapshot_date", or None if no recent snapshot is stored.
+    """
+    if max_age_days is None:
+        max_age_days = get_settings().serp_snapshot_max_age_days
+    if max_age_days <= 0:
+        return None
+    query, search_depth, filter_key, max_results = _snapshot_key(payload)
+    try:
+        with get_session() as session:
+            repo = SerpSnapshotRepository(session)
+            snapshot = repo.get_latest(
+                query,
+                domain_profile,
+                search_depth,
+                filter_key,
+                max_age=timedelta(days=max_age_days),
+                min_results=max_results,
+            )
+            if snapshot is None:
+                return None
+            pages = repo.get_pages([r["content_hash"] for r in snapshot.results])
+            stored = _snapshot_to_dict(snapshot, pages)
+    except Exception as e:
+        logger.warning(f"Failed to load SERP snapshot for {query} (non-critical): {e}")
+        return None
+
+    return {
+        "query": payload.get("query", ""),
+        "answer": stored["answer"],
+        "results": [
+            {
+                "url": r["url"],
+                "title": r["title"],
+                "content": r["content"],
+                "score": r["score"],
+            }
+            for r in stored["results"][:max_results]
+        ],
+        "snapshot_date": stored["snapshot_date"],
+    }
+
+
+def search_with_snapshots(
+    payload: dict[str, Any],
+    domain_profile: str | None = None,
+    max_age_days: float | None = None,
+) -> dict:
+    """
+    Run a Tavily search, preferring a recent snapshot over an API call.
+
+    Fresh API responses are recorded as today's snapshot.
+
+    Args:
+        payload: Tavily search parameters.
+        domain_profile: Tavily domain profile used for the search.
+        max_age_days: Maximum snapshot age in days (default from settings,
+                      0 = always call the API).
+
+    Returns:
+        Tavily response dict.
+    """
+    if not snapshots_enabled():
+        return tavily_search(payload)
+
+    snapshot = load_recent_snapshot(payload, domain_profile, max_age_days)
+    if snapshot is not None:
+        logger.info(
+            f"SERP snapshot hit: {payload.get('query')} ({snapshot['snapshot_date']})"
+        )
+        return snapshot
+
+    response = tavily_search(payload)
+    if isinstance(response, dict):
+        record_snapshot(payload, response, domain_profile)
+    return response
+
+
+def get_serp_history(
+    query: str,
+    domain_profile: str | None = None,
+    search_depth: str | None = None,
+    limit: int = 30,
+) -> list[dict[str, Any]]:
+    """
+    Get stored snapshots of a search, newest first.
+
+    Args:
+        query: Search query as sent to Tavily (normalized here).
+        domain_profile: Tavily domain profile.
+        search_depth: Tavily search depth (None = any).
+        limit: Maximum number of snapshots.
+
+    Returns:
+        Snapshot dicts with "snapshot_date", "answer" and ranked "results".
+    """
+    normalized_query = normalize_search_payload({"query": query})["query"]
+    try:
+        with get_session() as session:
+            repo = SerpSnapshotRepository(session)
+            snapshots = repo.list_history(normalized_query, domain_profile, search_depth, limit)
+            hashes = [r["content_hash"] for s in snapshots for r in s.results]
+            pages = repo.get_pages(hashes)
+            return [_snapshot_to_dict(s, pages) for s in snapshots]
+    except Exception as e:
+        logger.warning(f"Failed to load SERP history for {query} (non-critical): {e}")
+        return []
+
+
+def diff_snapshots(old: dict[str, Any], new: dict[str, Any]) -> SerpDiff:
+    """
+    Compare two snapshots of the same search.
+
+    Args:
+        old: Earlier snapshot dict (from get_serp_history).
+        new: Later snapshot dict.
+
+    Returns:
+        SerpDiff with added, removed, moved and changed URLs.
+    """
+    old_by_url = {r["url"]: r for r in old.get("results", [])}
+    new_by_url = {r["url"]: r for r in new.get("results", [])}
+
+    diff = SerpDiff(
+        added=[url for url in new_by_url if url not in old_by_url],
+        removed=[url for url in old_by_url if url not in new_by_url],
+    )
+    for url, result in new_by_url.items():
+        before = old_by_url.get(url)
+        if before is None:
+            continue
+        if before["rank"] != result["rank"]:
+            diff.moved[url] = (before["rank"], result["rank"])
+        if before["content_hash"] != result["content_hash"]:
+            diff.changed.append(url)
+    return diff
+
+
+def rank_trend(snapshots: list[dict[str, Any]]) -> dict[str, list[tuple[str, int | None]]]:
+    """
+    Rank of every URL across snapshots, oldest first.
+
+    Args:
+        snapshots: Snapshot dicts (any order).
+
+    Returns:
+        Dict mapping URL to [(snapshot_date, rank or None if absent), ...].
+    """
+    ordered = sorted(snapshots, key=lambda s: s["snapshot_date"])
+    urls = list(dict.fromkeys(r["url"] for s in ordered for r in s.get("results", [])))
+    ranks = [{r["url"]: r["rank"] for r in s.get("results", [])} for s in ordered]
+    return {
+        url: [(s["snapshot_date"], by_url.get(url)) for s, by_url in zip(ordered, ranks)]
+        for url in urls
+    }
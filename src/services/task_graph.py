@@ -0,0 +1,153 @@
+"""
+EPM Note Engine - Task Graph
+
+Minimal threaded DAG runner: each step starts as soon as the steps it depends on
+have finished, and per-step timings are recorded for logging.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StepTiming:
+    """Wall-clock timing of a single step, relative to the graph start."""
+
+    name: str
+    started_at: float
+    duration: float
+
+    @property
+    def finished_at(self) -> float:
+        """Offset in seconds at which the step finished."""
+        return self.started_at + self.duration
+
+
+@dataclass
+class _Step:
+    name: str
+    fn: Callable[..., Any]
+    deps: tuple[str, ...] = field(default_factory=tuple)
+
+
+class TaskGraph:
+    """
+    Run dependent steps concurrently on a thread pool.
+
+    Each step function receives the results of its dependencies as keyword
+    arguments named after the dependency steps.
+
+    Example:
+        graph = TaskGraph()
+        graph.add("search", lambda: search(query))
+        graph.add("refs", lambda: rag_search(query))
+        graph.add("gaps", lambda search, refs: analyze(search, refs), deps=["search", "refs"])
+        results = graph.run()
+    """
+
+    def __init__(self, name: str = "task_graph", max_workers: int = 4) -> None:
+        """
+        Initialize the task graph.
+
+        Args:
+            name: Graph name used in log messages.
+            max_workers: Maximum number of steps running at once.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._steps: dict[str, _Step] = {}
+        self.timings: dict[str, StepTiming] = {}
+        self.total_duration: float = 0.0
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: list[str] | tuple[str, ...] = (),
+    ) -> "TaskGraph":
+        """
+        Add a step.
+
+        Args:
+            name: Unique step name.
+            fn: Step function, called with dependency results as kwargs.
+            deps: Names of steps that must finish first (must already be added).
+
+        Returns:
+            The graph, for chaining.
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate step: {name}")
+        missing = [d for d in deps if d not in self._steps]
+        if missing:
+            raise ValueError(f"Step {name} depends on unknown steps: {missing}")
+        self._steps[name] = _Step(name=name, fn=fn, deps=tuple(deps))
+        return self
+
+    def run(self) -> dict[str, Any]:
+        """
+        Execute all steps.
+
+        If a step raises, no new steps are started, running steps are allowed
+        to finish and the first exception is re-raised.
+
+        Returns:
+            Mapping of step name to result.
+        """
+        results: dict[str, Any] = {}
+        pending = dict(self._steps)
+        running: dict[Future, str] = {}
+        start = time.perf_counter()
+
+        def call(step: _Step) -> Any:
+            step_start = time.perf_counter()
+            try:
+                return step.fn(**{dep: results[dep] for dep in step.deps})
+            finally:
+                self.timings[step.name] = StepTiming(
+                    name=step.name,
+                    started_at=step_start - start,
+                    duration=time.perf_counter() - step_start,
+                )
+
+        error: BaseException | None = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [
+                        step for step in pending.values()
+                        if all(dep in results for dep in step.deps)
+                    ]
+                    for step in ready:
+                        del pending[step.name]
+                        running[executor.submit(call, step)] = step.name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_name = running.pop(future)
+                    try:
+                        results[step_name] = future.result()
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+                            logger.error(f"{self.name}: step '{step_name}' failed: {e}")
+
+        self.total_duration = time.perf_counter() - start
+        if error is not None:
+            raise error
+
+        logger.info(f"{self.name} finished in {self.total_duration:.2f}s ({self.format_timings()})")
+        return results
+
+    def format_timings(self) -> str:
+        """Format step timings as 'name=1.23s' pairs in start order."""
+        ordered = sorted(self.timings.values(), key=lambda t: t.started_at)
+        return ", ".join(f"{t.name}={t.duration:.2f}s" for t in ordered)
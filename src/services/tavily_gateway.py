@@ -0,0 +1,403 @@
+"""
+EPM Note Engine - Tavily Gateway
+
+Single entry point for Tavily searches with a persistent TTL cache keyed by the
+normalized request payload and single-flight coalescing of identical requests.
+
+Every search goes through AsyncTavilyGateway. Synchronous callers
+(tavily_search, run_tavily_searches) run on one long-lived gateway on a
+dedicated event loop thread, so the whole process shares one HTTP connection
+pool, the per-key token bucket, the concurrency cap and the retry/deadline
+policy, and batch research and concurrent workflows stay within the
+provider's quota.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Coroutine, TypeVar
+
+import httpx
+
+from src.config import get_settings
+from src.services.rate_limit import TokenBucket, get_bucket, retry_delay
+from src.services.response_cache import ResponseCache, payload_hash
+
+logger = logging.getLogger(__name__)
+
+TAVILY_CACHE_NAMESPACE = "tavily"
+TAVILY_API_URL = "https://api.tavily.com"
+
+# Status codes worth retrying (rate limited or transient server errors)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+class TavilyAPIError(RuntimeError):
+    """Tavily returned an error response."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"Tavily API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+def normalize_search_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Normalize a Tavily search payload for use as a cache key.
+
+    Whitespace/case in the query and ordering/case of domain lists do not
+    change the search, so they do not change the key either.
+
+    Args:
+        payload: Keyword arguments for TavilyClient.search.
+
+    Returns:
+        Normalized payload dict.
+    """
+    normalized = dict(payload)
+    normalized["query"] = " ".join(str(payload.get("query", "")).split()).casefold()
+    normalized["search_depth"] = payload.get("search_depth") or "basic"
+    normalized["max_results"] = int(payload.get("max_results") or 5)
+    normalized["include_answer"] = bool(payload.get("include_answer", False))
+    normalized["include_raw_content"] = bool(payload.get("include_raw_content", False))
+    for key in ("include_domains", "exclude_domains"):
+        domains = payload.get(key) or []
+        if domains:
+            normalized[key] = sorted({d.strip().lower() for d in domains if d.strip()})
+        else:
+            normalized.pop(key, None)
+    return normalized
+
+
+def get_tavily_cache() -> ResponseCache | None:
+    """
+    Get the shared Tavily response cache.
+
+    Returns:
+        ResponseCache instance, or None if caching is disabled.
+    """
+    global _cache
+    settings = get_settings()
+    if not settings.tavily_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                settings.response_cache_path,
+                namespace=TAVILY_CACHE_NAMESPACE,
+                ttl_seconds=settings.tavily_cache_ttl_hours * 3600,
+            )
+        return _cache
+
+
+def get_rate_limiter() -> TokenBucket | None:
+    """
+    Get the token bucket for the configured Tavily API key.
+
+    Returns:
+        Shared TokenBucket, or None if no key is configured or limiting is off.
+    """
+    settings = get_settings()
+    if not settings.tavily_api_key or settings.tavily_rate_limit_per_minute <= 0:
+        return None
+    return get_bucket(
+        "tavily",
+        settings.tavily_api_key,
+        rate=settings.tavily_rate_limit_per_minute / 60,
+        capacity=settings.tavily_rate_limit_burst,
+    )
+
+
+class AsyncTavilyGateway:
+    """
+    Async Tavily search client for one event loop.
+
+    All searches share one HTTP connection pool, the per-key token bucket and
+    a concurrency cap. Every search has a deadline; identical concurrent
+    searches share one request, which is cancelled once no caller waits for it.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = TAVILY_API_URL,
+        max_concurrency: int = 4,
+        limiter: TokenBucket | None = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """
+        Initialize the gateway.
+
+        Args:
+            api_key: Tavily API key.
+            base_url: Tavily API base URL.
+            max_concurrency: Maximum requests in flight.
+            limiter: Token bucket shared with other callers (None = unlimited).
+            timeout: Default deadline per search in seconds.
+            max_retries: Retries on 429/5xx responses and transport errors.
+            http_client: Optional preconfigured client (tests).
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._client = http_client or httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            limits=httpx.Limits(
+                max_connections=max(1, max_concurrency),
+                max_keepalive_connections=max(1, max_concurrency),
+            ),
+            timeout=timeout,
+        )
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+
+    async def search(self, payload: dict[str, Any], timeout: float | None = None) -> dict:
+        """
+        Run a Tavily search through the cache.
+
+        Args:
+            payload: Tavily search parameters (same as TavilyClient.search).
+            timeout: Deadline in seconds (default: the gateway timeout).
+
+        Returns:
+            Tavily response dict (a private copy the caller may modify).
+
+        Raises:
+            TimeoutError: If the search does not finish before the deadline.
+            TavilyAPIError: If Tavily returns a non-retryable error.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        key = payload_hash(normalize_search_payload(payload))
+        cache = get_tavily_cache()
+
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                logger.info(f"Tavily cache hit: {payload.get('query')}")
+                return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(payload, key, cache, deadline))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info(f"Tavily request coalesced: {payload.get('query')}")
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            remaining = max(0.0, deadline - time.monotonic())
+            response = await asyncio.wait_for(asyncio.shield(task), remaining)
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                # Nobody is waiting any more (deadline or cancellation)
+                if not task.done():
+                    task.cancel()
+        return copy.deepcopy(response)
+
+    async def _fetch(
+        self,
+        payload: dict[str, Any],
+        key: str,
+        cache: ResponseCache | None,
+        deadline: float,
+    ) -> dict:
+        response = await self._post(payload, deadline)
+        if cache is not None:
+            await asyncio.to_thread(cache.set, key, response)
+        return response
+
+    async def _post(self, payload: dict[str, Any], deadline: float) -> dict:
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                await self.limiter.acquire_async(deadline=deadline)
+
+            response = None
+            error: Exception | None = None
+            async with self._semaphore:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Tavily search deadline exceeded")
+                try:
+                    response = await self._client.post("/search", json=payload, timeout=remaining)
+                except httpx.TransportError as e:
+                    error = e
+
+            if response is not None and response.status_code < 400:
+                return response.json()
+
+            retryable = error is not None or response.status_code in RETRYABLE_STATUS_CODES
+            if not retryable or attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                raise TavilyAPIError(response.status_code, response.text[:200])
+
+            delay = retry_delay(response, attempt)
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError("Tavily search deadline exceeded while backing off")
+            logger.warning(
+                f"Tavily request failed ({error or response.status_code}), "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def search_many(
+        self,
+        payloads: list[dict[str, Any]],
+        timeout: float | None = None,
+    ) -> list[dict | BaseException]:
+        """
+        Run searches concurrently within the shared limits.
+
+        Args:
+            payloads: Tavily search parameters.
+            timeout: Deadline in seconds for each search.
+
+        Returns:
+            Response dicts or exceptions, in payload order.
+        """
+        return await asyncio.gather(
+            *(self.search(payload, timeout) for payload in payloads),
+            return_exceptions=True,
+        )
+
+    async def aclose(self) -> None:
+        """Cancel in-flight requests and close the connection pool."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await self._client.aclose()
+
+
+_async_gateways: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTavilyGateway]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_tavily_gateway() -> AsyncTavilyGateway:
+    """
+    Get the gateway for the running event loop.
+
+    Returns:
+        AsyncTavilyGateway shared by every caller on this loop.
+
+    Raises:
+        ValueError: If TAVILY_API_KEY is not configured.
+    """
+    loop = asyncio.get_running_loop()
+    gateway = _async_gateways.get(loop)
+    if gateway is None:
+        settings = get_settings()
+        if not settings.tavily_api_key:
+            raise ValueError("TAVILY_API_KEY is not configured")
+        gateway = AsyncTavilyGateway(
+            settings.tavily_api_key,
+            max_concurrency=settings.tavily_max_concurrency,
+            limiter=get_rate_limiter(),
+            timeout=settings.tavily_timeout_seconds,
+            max_retries=settings.tavily_max_retries,
+        )
+        _async_gateways[loop] = gateway
+    return gateway
+
+
+async def tavily_search_async(payload: dict[str, Any], timeout: float | None = None) -> dict:
+    """
+    Async counterpart of tavily_search.
+
+    Args:
+        payload: Tavily search parameters.
+        timeout: Deadline in seconds (default from settings).
+
+    Returns:
+        Tavily response dict.
+    """
+    return await get_async_tavily_gateway().search(payload, timeout)
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Event loop thread that owns the shared gateway for synchronous callers."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tavily-gateway", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the gateway's event loop and wait for its result.
+
+    Can be called from any thread, including one with a running loop,
+    except from coroutines already running on the gateway loop.
+    """
+    loop = _event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Synchronous Tavily searches cannot wait on the gateway loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def tavily_search(payload: dict[str, Any], timeout: float | None = None) -> dict:
+    """
+    Run a Tavily search from synchronous code.
+
+    Uses the shared gateway, so cache hits return immediately, concurrent
+    identical requests share one API call, 429/5xx responses are retried and
+    every search has a deadline. Failed calls are never cached.
+
+    Args:
+        payload: Tavily search parameters (same as TavilyClient.search).
+        timeout: Deadline in seconds (default from settings).
+
+    Returns:
+        Tavily response dict (a private copy the caller may modify).
+
+    Raises:
+        ValueError: If TAVILY_API_KEY is not configured.
+        TimeoutError: If the search does not finish before the deadline.
+        TavilyAPIError: If Tavily returns a non-retryable error.
+    """
+    return _run(tavily_search_async(payload, timeout))
+
+
+def run_tavily_searches(
+    payloads: list[dict[str, Any]],
+    timeout: float | None = None,
+) -> list[dict | BaseException]:
+    """
+    Run searches concurrently from synchronous code on the shared gateway.
+
+    Args:
+        payloads: Tavily search parameters.
+        timeout: Deadline in seconds for each search.
+
+    Returns:
+        Response dicts or exceptions, in payload order.
+    """
+    async def run() -> list[dict | BaseException]:
+        return await get_async_tavily_gateway().search_many(payloads, timeout)
+
+    return _run(run())
@@ -345,11 +345,12 @@ def render_article_management_tab() -> None:
     """Render article management tab."""
     st.subheader("記事管理")
 
-    # Three sections: Add, Bulk Import, and List
-    add_section, import_section, list_section = st.tabs([
+    # Sections: Add, Bulk Import, List and batch competitor research
+    add_section, import_section, list_section, competitor_section = st.tabs([
         "➕ 新規追加",
         "📥 一括取込",
         "📋 一覧・削除",
+        "🔍 競合キーワード",
     ])
 
     with add_section:
@@ -361,6 +362,9 @@ def render_article_management_tab() -> None:
     with list_section:
         render_article_list()
 
+    with competitor_section:
+        render_competitor_keyword_batch()
+
 
 def render_article_add_form() -> None:
     """Render form to add a new article."""
@@ -738,6 +742,60 @@ def render_article_list() -> None:
         st.error(f"記事の読み込みに失敗: {e}")
 
 
+def render_competitor_keyword_batch() -> None:
+    """Render batch competitor keyword research for planned articles."""
+    st.markdown("#### 競合キーワード一括分析")
+    render_help_popover(
+        "ℹ️ 一括分析とは？",
+        [
+            "企画中の記事のSEOキーワードごとに競合記事を検索し、キーワード分析結果をDBに保存します。",
+            "保存済みの結果はエディタの「競合キーワード分析」ですぐに表示されます。",
+        ],
+    )
+
+    refresh = st.checkbox("保存済みの結果も再分析する", key="competitor_batch_refresh")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("対象キーワードを確認", use_container_width=True):
+            with st.spinner("対象キーワードを集計中..."):
+                result = run_seed_script(
+                    "research_competitor_keywords.py", dry_run=True, extra_args=["--from-articles"]
+                )
+                st.code(result, language="text")
+    with col2:
+        if st.button("一括分析を実行", type="primary", use_container_width=True):
+            with st.spinner("競合記事を分析中..."):
+                extra_args = ["--from-articles"] + (["--refresh"] if refresh else [])
+                result = run_seed_script("research_competitor_keywords.py", extra_args=extra_args)
+                st.code(result, language="text")
+
+    try:
+        from src.database.connection import get_session
+        from src.repositories.competitor_keyword_repository import CompetitorKeywordRepository
+
+        with get_session() as session:
+            records = CompetitorKeywordRepository(session).list_recent(limit=50)
+            rows = [
+                {
+                    "キーワード": record.query,
+                    "プロファイル": record.domain_profile or "-",
+                    "分析記事数": record.total_articles,
+                    "上位キーワード": "、".join(
+                        kw["keyword"] for kw in record.result.get("keywords", [])[:5]
+                    ),
+                    "更新日時": record.updated_at.strftime("%Y-%m-%d %H:%M"),
+                }
+                for record in records
+            ]
+        if rows:
+            st.dataframe(rows, use_container_width=True)
+        else:
+            st.info("保存済みの分析結果はありません")
+    except Exception as e:
+        st.warning(f"保存済み結果の取得に失敗しました: {e}")
+
+
 def render_theme_proposal_tab() -> None:
     """Render theme proposal tab for AI-assisted article theme generation."""
     st.subheader("記事テーマ提案")
@@ -1059,12 +1117,12 @@ def render_knowledge_base_tab() -> None:
         with col3:
             if st.button("アーカイブを更新", use_container_width=True):
                 with st.spinner("archive_index を更新中..."):
-                    result = run_seed_script("seed_archive_index.py", dry_run=False, extra_args=["--prune-missing"])
+                    result = run_seed_script("seed_archive_index.py", dry_run=False)
                     st.code(result, language="text")
                     st.success("archive_index の更新完了！")
             render_help_popover(
                 "ℹ️ アーカイブ更新",
-                "DBの過去記事/スニペットを archive_index に反映します。",
+                "前回以降に更新された過去記事/スニペットだけを archive_index に反映します（完了した記事は自動で反映済み）。",
             )
 
         if st.button("RAG更新（知識ベース + アーカイブ）", use_container_width=True):
@@ -1168,6 +1226,8 @@ def render_search_test_tab() -> None:
 
 def generate_rag_answer(query: str, results: list, provider: str) -> str:
     """Generate an answer using retrieved RAG results."""
+    from src.services.llm_gateway import get_llm_gateway
+
     # Build compact context
     context_parts = []
     for i, r in enumerate(results, 1):
@@ -1188,9 +1248,8 @@ def generate_rag_answer(query: str, results: list, provider: str) -> str:
 """
 
     if provider == "OpenAI":
-        from src.config import get_openai_client
-        client = get_openai_client()
-        response = client.chat.completions.create(
+        response = get_llm_gateway().create_chat_completion(
+            "admin.rag_answer",
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": "あなたは経営管理・FP&Aの専門家です。"},
@@ -1201,9 +1260,8 @@ def generate_rag_answer(query: str, results: list, provider: str) -> str:
         )
         return response.choices[0].message.content or ""
 
-    from src.config import get_anthropic_client
-    client = get_anthropic_client()
-    response = client.messages.create(
+    response = get_llm_gateway().create_message(
+        "admin.rag_answer",
         model="claude-sonnet-4-20250514",
         max_tokens=800,
         messages=[{"role": "user", "content": prompt}],
@@ -214,6 +214,13 @@ def render_editor(
         if isinstance(keyword_analysis, str):
             keyword_analysis = {}
 
+        # Live analysis of the text being edited (only changed paragraphs are re-tokenized)
+        seo_keywords = [kw.strip() for kw in (article.seo_keywords or "").split(",") if kw.strip()]
+        if seo_keywords and content:
+            live_analysis = _analyze_live_content(content, seo_keywords)
+            if live_analysis:
+                keyword_analysis = live_analysis
+
         if keyword_analysis:
             # Overall SEO score
             overall_score = keyword_analysis.get("overall_seo_score", 0)
@@ -300,7 +307,7 @@ def render_editor(
                 if content:
                     try:
                         from src.agents.research_agent import ResearchAgent
-                        agent = ResearchAgent.__new__(ResearchAgent)
+                        agent = ResearchAgent()
                         # Use article title keywords as target
                         target_kws = article.title.split() if article.title else []
                         if not target_kws:
@@ -343,10 +350,21 @@ def render_editor(
             if search_query:
                 with st.spinner("競合記事を分析中..."):
                     try:
-                        from src.agents.research_agent import ResearchAgent
-                        agent = ResearchAgent()
-                        result = agent.extract_competitor_keywords(search_query, max_articles=10)
-                        st.session_state["competitor_keywords"] = result.to_dict()
+                        from src.services.competitor_keyword_batch import (
+                            get_stored_competitor_keywords,
+                            save_competitor_keywords,
+                        )
+
+                        # Results from batch research are shown without a live search
+                        stored = get_stored_competitor_keywords(search_query)
+                        if stored:
+                            st.session_state["competitor_keywords"] = stored
+                        else:
+                            from src.agents.research_agent import ResearchAgent
+                            agent = ResearchAgent()
+                            result = agent.extract_competitor_keywords(search_query, max_articles=10)
+                            save_competitor_keywords(search_query, None, 10, result)
+                            st.session_state["competitor_keywords"] = result.to_dict()
                         st.rerun()
                     except Exception as e:
                         st.error(f"分析エラー: {e}")
@@ -356,6 +374,8 @@ def render_editor(
         # Display competitor keywords if available
         if competitor_keywords:
             st.success(f"✅ 「{competitor_keywords.get('query', '')}」の競合分析完了")
+            if competitor_keywords.get("updated_at"):
+                st.caption(f"保存済みの分析結果（{competitor_keywords['updated_at'][:16].replace('T', ' ')}）")
 
             total = competitor_keywords.get("total_articles", 0)
             st.caption(f"分析対象: 上位{total}記事")
@@ -438,6 +458,46 @@ def render_editor(
     return edited_content
 
 
+def _analyze_live_content(content: str, seo_keywords: list[str]) -> dict | None:
+    """
+    Analyze the editor content with the session's paragraph statistics cache.
+
+    Args:
+        content: Current editor content.
+        seo_keywords: Target SEO keywords.
+
+    Returns:
+        KeywordAnalysis as a dict, or None if the analysis failed.
+    """
+    import time
+
+    from src.agents.research_agent import JANOME_AVAILABLE, ResearchAgent
+    from src.services.paragraph_stats import ParagraphStatsCache
+
+    if not JANOME_AVAILABLE:
+        return None
+
+    cache = st.session_state.get("seo_paragraph_cache")
+    if cache is None:
+        cache = ParagraphStatsCache()
+        st.session_state["seo_paragraph_cache"] = cache
+
+    try:
+        agent = ResearchAgent()
+        misses_before = cache.misses
+        start = time.perf_counter()
+        result = agent.analyze_keyword_density(content, seo_keywords[:3], paragraph_cache=cache)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        st.warning(f"ライブ分析に失敗しました: {e}")
+        return None
+
+    st.caption(
+        f"編集中の本文を分析（{elapsed_ms:.0f}ms、再解析した段落: {cache.misses - misses_before}）"
+    )
+    return result.to_dict()
+
+
 def render_upload_progress() -> None:
     """Render the upload progress indicator."""
     st.header("🚀 Note.comへアップロード中")
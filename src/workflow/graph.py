@@ -5,7 +5,8 @@ Defines the article generation workflow using LangGraph StateGraph.
 """
 
 import logging
-from typing import Literal, TypedDict
+import threading
+from typing import Any, Callable, Literal, TypedDict
 
 from langgraph.graph import StateGraph, END
 
@@ -45,6 +46,7 @@ class ArticleState(TypedDict):
     suggested_outline: list[str]
     competitor_keywords: list[dict]  # [{"keyword": "...", "priority": "必須/推奨/検討", "usage_rate": 80.0}]
     internal_references: list[str]  # RAG knowledge base content for article generation
+    research_timings: dict[str, float]  # Research step name -> seconds
 
     # User essences
     essences: list[dict]
@@ -98,6 +100,7 @@ def create_initial_state(
         suggested_outline=[],
         competitor_keywords=[],
         internal_references=[],
+        research_timings={},
         essences=[],
         draft_content_md="",
         title_candidates=[],
@@ -127,29 +130,50 @@ def research_node(state: ArticleState) -> ArticleState:
 
     from src.agents.research_agent import ResearchAgent
     from src.repositories.rag_service import RAGService
+    from src.services.task_graph import TaskGraph
 
     try:
         rag_service = RAGService()
         agent = ResearchAgent(rag_service)
 
         profile = state.get("tavily_profile") or None
-        result = agent.analyze(state["seo_keywords"], domain_profile=profile)
 
         # Extract competitor keywords for WriterAgent
-        competitor_keywords = []
-        try:
-            kw_result = agent.extract_competitor_keywords(state["seo_keywords"], max_articles=5)
-            competitor_keywords = [
-                {
-                    "keyword": kw.keyword,
-                    "priority": kw.priority,
-                    "usage_rate": kw.usage_rate,
-                }
-                for kw in kw_result.keywords[:10]
-            ]
-            logger.info(f"Extracted {len(competitor_keywords)} competitor keywords")
-        except Exception as kw_err:
-            logger.warning(f"Competitor keyword extraction failed (non-critical): {kw_err}")
+        def extract_keywords() -> list[dict]:
+            try:
+                # Same payload as analyze() -> one shared (cached) Tavily search
+                kw_result = agent.extract_competitor_keywords(
+                    state["seo_keywords"],
+                    max_articles=5,
+                    domain_profile=profile,
+                )
+                keywords = [
+                    {
+                        "keyword": kw.keyword,
+                        "priority": kw.priority,
+                        "usage_rate": kw.usage_rate,
+                    }
+                    for kw in kw_result.keywords[:10]
+                ]
+                logger.info(f"Extracted {len(keywords)} competitor keywords")
+                return keywords
+            except Exception as kw_err:
+                logger.warning(f"Competitor keyword extraction failed (non-critical): {kw_err}")
+                return []
+
+        # Keyword extraction (tokenization) overlaps with the research LLM calls
+        graph = TaskGraph(name="research_node", max_workers=2)
+        graph.add("analysis", lambda: agent.analyze(state["seo_keywords"], domain_profile=profile))
+        graph.add("competitor_keywords", extract_keywords)
+        results = graph.run()
+
+        result = results["analysis"]
+        competitor_keywords = results["competitor_keywords"]
+        research_timings = {
+            **result.step_timings,
+            "competitor_keywords": round(graph.timings["competitor_keywords"].duration, 3),
+            "total": round(graph.total_duration, 3),
+        }
 
         return {
             **state,
@@ -160,6 +184,7 @@ def research_node(state: ArticleState) -> ArticleState:
             "suggested_outline": result.suggested_outline,
             "competitor_keywords": competitor_keywords,
             "internal_references": result.internal_references,
+            "research_timings": research_timings,
         }
 
     except Exception as e:
@@ -170,19 +195,30 @@ def research_node(state: ArticleState) -> ArticleState:
         }
 
 
-def drafting_node(state: ArticleState) -> ArticleState:
+def drafting_node(
+    state: ArticleState,
+    on_stream: Callable[[Any], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> ArticleState:
     """
     Execute drafting phase.
 
     Uses WriterAgent to generate article content.
+
+    Args:
+        state: Workflow state.
+        on_stream: Optional StreamProgress callback; streams long generations.
+        cancel_event: Optional event that stops a streamed generation.
+                      Cancellation is re-raised as GenerationCancelledError.
     """
     logger.info(f"Drafting node: article_id={state['article_id']}")
 
     from src.agents.writer_agent import WriterAgent
     from src.agents.research_agent import ResearchResult, CompetitorAnalysis
+    from src.services.llm_stream import GenerationCancelledError
 
     try:
-        agent = WriterAgent()
+        agent = WriterAgent(on_stream=on_stream, cancel_event=cancel_event)
 
         # Reconstruct research result
         research_result = ResearchResult(
@@ -202,6 +238,8 @@ def drafting_node(state: ArticleState) -> ArticleState:
                 original_content=state["draft_content_md"],
                 feedback=state["review_feedback"],
                 score_breakdown=state["score_breakdown"],
+                article_title=state["article_title"],
+                target_persona=state["target_persona"],
             )
             return {
                 **state,
@@ -230,6 +268,9 @@ def drafting_node(state: ArticleState) -> ArticleState:
                 "sns_posts": result.sns_posts,
             }
 
+    except GenerationCancelledError:
+        logger.info(f"Drafting cancelled: article_id={state['article_id']}")
+        raise
     except Exception as e:
         logger.error(f"Drafting failed: {e}")
         return {
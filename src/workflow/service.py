@@ -5,12 +5,15 @@ High-level service for executing and managing article generation workflows.
 """
 
 import logging
-from typing import Callable
+import threading
+from typing import Any, Callable
 
 from src.database.connection import get_session
 from src.database.models import Article, ArticleStatus
 from src.repositories.article_repository import ArticleRepository
 from src.repositories.snippet_repository import SnippetRepository
+from src.services.llm_stream import StreamProgress
+from src.services.llm_usage import get_usage_tracker
 from src.workflow.graph import (
     ArticleState,
     create_initial_state,
@@ -224,8 +227,9 @@ class WorkflowService:
         state: ArticleState,
         phase: str,
         on_phase_change: Callable[[str], None] | None,
+        **node_kwargs: Any,
     ) -> ArticleState:
-        """Run a single workflow phase."""
+        """Run a single workflow phase (node_kwargs are passed to the node)."""
         from src.workflow.graph import (
             research_node,
             drafting_node,
@@ -240,7 +244,7 @@ class WorkflowService:
 
         node_func = phase_nodes.get(phase)
         if node_func:
-            state = node_func(state)
+            state = node_func(state, **node_kwargs)
 
         return state
 
@@ -278,7 +282,22 @@ class WorkflowService:
                 repo.update(article)
 
     def _sync_complete_to_db(self, article_id: str, state: ArticleState) -> None:
-        """Sync final results to database."""
+        """
+        Sync final results to database.
+
+        Keyword analysis and the SEO enhancement calls run concurrently
+        between two short sessions (read title/persona, then write), so no
+        connection is held while waiting on the LLM.
+        """
+        with get_session() as session:
+            article = ArticleRepository(session).get_by_id(article_id)
+            title = article.title if article else ""
+            persona = article.target_persona if article else ""
+        if not article:
+            return
+
+        enhancements = self._compute_seo_enhancements(state, title, persona)
+
         with get_session() as session:
             repo = ArticleRepository(session)
             article = repo.get_by_id(article_id)
@@ -299,54 +318,106 @@ class WorkflowService:
                     article.estimated_read_time = calculate_read_time(state["draft_content_md"])
                     logger.info(f"Reading time: {article.estimated_read_time} min")
 
-                # Auto-run SEO keyword analysis
-                try:
-                    from src.agents.research_agent import ResearchAgent
-                    agent = ResearchAgent()
-                    keywords = [kw.strip() for kw in state["seo_keywords"].split(",") if kw.strip()]
-                    if keywords and state["draft_content_md"]:
-                        analysis = agent.analyze_keyword_density(state["draft_content_md"], keywords)
-                        article.keyword_analysis = analysis.to_dict()
-                        logger.info(f"SEO analysis saved: score={analysis.overall_seo_score:.0f}")
-                except Exception as e:
-                    logger.warning(f"SEO analysis failed (non-critical): {e}")
+                for name, value in enhancements.items():
+                    setattr(article, name, value)
 
-                # Generate SEO enhancements (meta description, FAQ schema, CTA variants)
-                try:
-                    from src.agents.writer_agent import WriterAgent
-                    writer = WriterAgent()
-
-                    # Meta description
-                    if state["draft_content_md"]:
-                        meta_desc = writer.generate_meta_description(
-                            article.title,
-                            state["draft_content_md"]
-                        )
-                        if meta_desc:
-                            article.meta_description = meta_desc
-                            logger.info(f"Meta description generated: {len(meta_desc)} chars")
-
-                    # FAQ schema
-                    if state["draft_content_md"]:
-                        faq_schema = writer.generate_faq_schema(state["draft_content_md"])
-                        if faq_schema and faq_schema.get("mainEntity"):
-                            article.structured_data = faq_schema
-                            logger.info(f"FAQ schema generated: {len(faq_schema.get('mainEntity', []))} items")
-
-                    # CTA variants
-                    if article.target_persona:
-                        cta_variants = writer.generate_cta_variants(
-                            article.target_persona,
-                            article.title
-                        )
-                        if cta_variants:
-                            article.cta_variants = cta_variants
-                            logger.info(f"CTA variants generated: {len(cta_variants)} types")
+                repo.update(article)
 
-                except Exception as e:
-                    logger.warning(f"SEO enhancements failed (non-critical): {e}")
+        # Index the final content once committed, off the request path
+        if article:
+            from src.config import get_settings
+            if get_settings().archive_write_through:
+                from src.services.archive_indexer import schedule_article_index
+                schedule_article_index(article_id)
 
-                repo.update(article)
+    def _compute_seo_enhancements(
+        self,
+        state: ArticleState,
+        title: str,
+        persona: str | None,
+    ) -> dict[str, Any]:
+        """
+        Compute keyword analysis, meta description, FAQ schema and CTA variants.
+
+        The steps run concurrently; each one is non-critical, so a failed step
+        only leaves its column unchanged.
+
+        Args:
+            state: Final workflow state.
+            title: Article title.
+            persona: Target persona of the article.
+
+        Returns:
+            Article column name to new value, for the steps that succeeded.
+        """
+        from src.agents.research_agent import ResearchAgent
+        from src.agents.writer_agent import WriterAgent
+        from src.services.task_graph import TaskGraph
+
+        content = state["draft_content_md"]
+        keywords = [kw.strip() for kw in state["seo_keywords"].split(",") if kw.strip()]
+
+        def non_critical(
+            name: str,
+            fn: Callable[[], dict[str, Any]],
+        ) -> Callable[[], dict[str, Any]]:
+            def step() -> dict[str, Any]:
+                try:
+                    return fn()
+                except Exception as e:
+                    logger.warning(f"SEO {name} failed (non-critical): {e}")
+                    return {}
+            return step
+
+        def keyword_analysis() -> dict[str, Any]:
+            analysis = ResearchAgent().analyze_keyword_density(content, keywords)
+            logger.info(f"SEO analysis saved: score={analysis.overall_seo_score:.0f}")
+            return {"keyword_analysis": analysis.to_dict()}
+
+        def meta_description() -> dict[str, Any]:
+            meta_desc = writer.generate_meta_description(title, content)
+            if not meta_desc:
+                return {}
+            logger.info(f"Meta description generated: {len(meta_desc)} chars")
+            return {"meta_description": meta_desc}
+
+        def faq_schema() -> dict[str, Any]:
+            schema = writer.generate_faq_schema(content)
+            if not (schema and schema.get("mainEntity")):
+                return {}
+            logger.info(f"FAQ schema generated: {len(schema['mainEntity'])} items")
+            return {"structured_data": schema}
+
+        def cta_variants() -> dict[str, Any]:
+            variants = writer.generate_cta_variants(persona, title)
+            if not variants:
+                return {}
+            logger.info(f"CTA variants generated: {len(variants)} types")
+            return {"cta_variants": variants}
+
+        steps: dict[str, Callable[[], dict[str, Any]]] = {}
+        if keywords and content:
+            steps["keyword_analysis"] = keyword_analysis
+        try:
+            writer = WriterAgent()
+        except Exception as e:
+            logger.warning(f"SEO enhancements failed (non-critical): {e}")
+        else:
+            if content:
+                steps["meta_description"] = meta_description
+                steps["faq_schema"] = faq_schema
+            if persona:
+                steps["cta_variants"] = cta_variants
+        if not steps:
+            return {}
+
+        graph = TaskGraph(name="seo_enhancements", max_workers=len(steps))
+        for name, fn in steps.items():
+            graph.add(name, non_critical(name, fn))
+        enhancements: dict[str, Any] = {}
+        for fields in graph.run().values():
+            enhancements.update(fields)
+        return enhancements
 
     # ===========================================
     # UI-oriented methods (individual phases)
@@ -418,6 +489,8 @@ class WorkflowService:
         self,
         article_id: str,
         on_progress: Callable[[int, str], None] | None = None,
+        on_stream: Callable[[StreamProgress], None] | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> ArticleState:
         """
         Run drafting and review phases with Self-Correction loop.
@@ -428,6 +501,10 @@ class WorkflowService:
         Args:
             article_id: The article ID to process.
             on_progress: Optional callback for progress updates (percent, message).
+            on_stream: Optional callback receiving StreamProgress while the
+                       draft, refinement and revision are generated.
+            cancel_event: Optional event that stops generation early
+                          (raises GenerationCancelledError; nothing is saved).
 
         Returns:
             Final workflow state after completion.
@@ -492,9 +569,14 @@ class WorkflowService:
         if on_progress:
             on_progress(10, "記事生成を開始...")
 
+        usage_tracker = get_usage_tracker()
+        usage_mark = usage_tracker.mark()
+
         # Run drafting phase
         state["phase"] = "drafting"
-        state = self._run_phase(state, "drafting", None)
+        state = self._run_phase(
+            state, "drafting", None, on_stream=on_stream, cancel_event=cancel_event
+        )
 
         if on_progress:
             on_progress(50, "記事生成完了、レビュー中...")
@@ -520,7 +602,9 @@ class WorkflowService:
                 on_progress(75, "スコア不足のため修正中...")
 
             state["phase"] = "revision"
-            state = self._run_phase(state, "drafting", None)
+            state = self._run_phase(
+                state, "drafting", None, on_stream=on_stream, cancel_event=cancel_event
+            )
             state = self._run_phase(state, "review", None)
 
             if on_progress:
@@ -535,6 +619,14 @@ class WorkflowService:
         # Final sync to database
         self._sync_complete_to_db(article_id, state)
 
+        usage = usage_tracker.total(since=usage_mark)
+        logger.info(
+            f"LLM usage for article {article_id}: {usage.calls} calls, "
+            f"input={usage.input_tokens} cache_read={usage.cache_read_input_tokens} "
+            f"cache_write={usage.cache_creation_input_tokens} output={usage.output_tokens} "
+            f"(cache hit {usage.cache_hit_ratio:.0%}, {usage.latency:.1f}s in LLM calls)"
+        )
+
         if on_progress:
             on_progress(100, "完了")
 
@@ -557,6 +649,7 @@ class WorkflowService:
                     "urls": state["competitor_urls"],
                     "content_gaps": state["content_gaps"],
                     "generated_at": __import__("datetime").datetime.now().isoformat(),
+                    "timings": state.get("research_timings", {}),
                 }
                 article.outline_json = {
                     "suggested_outline": state["suggested_outline"],
@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures for EPM Note Engine tests.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_tavily_cache():
+    """Keep the persistent Tavily cache out of tests that mock the client."""
+    with patch("src.services.tavily_gateway.get_tavily_cache", return_value=None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_llm_cache():
+    """Keep the persistent LLM response cache out of tests that mock the clients."""
+    with patch("src.services.llm_gateway.get_llm_cache", return_value=None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_serp_snapshots():
+    """Keep searches in tests from reading or writing SERP snapshots in Postgres."""
+    with patch("src.services.serp_snapshots.snapshots_enabled", return_value=False):
+        yield
@@ -5,7 +5,7 @@ Tests ResearchAgent, WriterAgent, and ReviewerAgent with mocked dependencies.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from dataclasses import asdict
 
 from src.agents.research_agent import (
@@ -17,6 +17,37 @@ from src.agents.writer_agent import WriterAgent, DraftResult
 from src.agents.reviewer_agent import ReviewerAgent, ReviewResult, ScoreBreakdown
 
 
+# Article containing all 11 mandatory structure elements
+STRUCTURED_ARTICLE = """「予算、誰が作ってるの？」
+
+**結論から言います。** 予算は経営の言語です。
+
+## 目次
+1. 原因
+
+┌────┐
+│予算│
+└────┘
+
+## 原因①：定義がない
+
+## 90日ロードマップ
+
+## よくある失敗
+失敗①：ツール先行
+
+## 情シス/DXの方へ
+
+## 今日の持ち帰り：予算セルフチェック
+- [ ] 定義書がある
+
+## 次に読む
+
+---
+予算設計を壁打ちしたい方は、プロフィールのリンクからどうぞ。
+"""
+
+
 # ============================================================================
 # ResearchAgent Tests
 # ============================================================================
@@ -52,6 +83,17 @@ class TestResearchAgent:
             ]
         }
 
+    @patch("src.agents.research_agent.RAGService")
+    def test_rag_service_created_on_first_use(self, mock_rag_cls):
+        """Test keyword analysis does not open the vector store and search does lazily."""
+        agent = ResearchAgent()
+        agent.analyze_keyword_density("## 予算管理\n\n予算管理の基本。", ["予算管理"])
+        mock_rag_cls.assert_not_called()
+
+        mock_rag_cls.return_value.search_knowledge_base.return_value = [Mock(content="知見")]
+        assert agent.search_internal_knowledge("予算") == ["知見"]
+        mock_rag_cls.assert_called_once()
+
     def test_extract_headings_markdown(self):
         """Test heading extraction from Markdown content."""
         agent = ResearchAgent.__new__(ResearchAgent)
@@ -98,15 +140,13 @@ class TestResearchAgent:
         assert "第三章" in headings
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_search_competitors(
         self, mock_settings, mock_tavily, mock_resolve_domains, mock_rag_service, mock_tavily_response
     ):
         """Test competitor search with Tavily API."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         # Mock resolve_tavily_domains to return empty domain lists (no filtering)
         mock_resolve_domains.return_value = ([], [], [])
@@ -118,7 +158,7 @@ class TestResearchAgent:
         assert "results" in response
         assert len(response["results"]) == 2
         assert response["results"][0]["url"] == "https://example.com/article1"
-        mock_tavily_client.search.assert_called_once()
+        mock_tavily.assert_called_once()
 
     @patch("src.agents.research_agent.get_openai_client")
     @patch("src.agents.research_agent.get_settings")
@@ -146,6 +186,61 @@ class TestResearchAgent:
         assert len(gaps) == 2
         assert "差別化ポイント1" in gaps[0]
 
+    @patch("src.agents.research_agent.get_settings")
+    def test_analyze_runs_independent_steps_concurrently(
+        self, mock_settings, mock_rag_service, mock_tavily_response
+    ):
+        """Test Tavily and internal search overlap and the result shape is unchanged."""
+        import threading
+
+        mock_settings.return_value = Mock()
+        both_started = threading.Barrier(2, timeout=5)
+
+        def search_competitors(*args, **kwargs):
+            both_started.wait()
+            return {**mock_tavily_response, "answer": "要約"}
+
+        def search_knowledge_base(*args, **kwargs):
+            both_started.wait()
+            return [Mock(content="内部ナレッジ")]
+
+        mock_rag_service.search_knowledge_base.side_effect = search_knowledge_base
+        agent = ResearchAgent(rag_service=mock_rag_service)
+
+        with patch.object(agent, "search_competitors", side_effect=search_competitors), \
+                patch.object(agent, "analyze_content_gaps", return_value=["ギャップ"]) as gaps, \
+                patch.object(agent, "generate_outline_suggestion", return_value=["導入", "まとめ"]):
+            result = agent.analyze("予算管理")
+
+        assert isinstance(result, ResearchResult)
+        assert result.competitor_analysis.urls[0] == "https://example.com/article1"
+        assert result.competitor_analysis.headings[0] == ["予実管理とは"]
+        assert result.internal_references == ["内部ナレッジ"]
+        assert result.suggested_outline == ["導入", "まとめ"]
+        assert result.tavily_answer == "要約"
+        gaps.assert_called_once()
+        assert {"search", "internal_refs", "content_gaps", "outline", "summary", "total"} <= set(
+            result.step_timings
+        )
+
+    @patch("src.agents.research_agent.get_settings")
+    def test_analyze_prefers_fetched_page_headings(
+        self, mock_settings, mock_rag_service, mock_tavily_response
+    ):
+        """Test fetched page outlines replace snippet headings where available."""
+        mock_settings.return_value = Mock()
+        agent = ResearchAgent(rag_service=mock_rag_service)
+        fetched = {"https://example.com/article2": ["FP&Aとは", "FP&Aの始め方"]}
+
+        with patch.object(agent, "search_competitors", return_value=mock_tavily_response), \
+                patch("src.agents.research_agent.fetch_competitor_headings", return_value=fetched), \
+                patch.object(agent, "analyze_content_gaps", return_value=[]), \
+                patch.object(agent, "generate_outline_suggestion", return_value=["導入"]) as outline:
+            result = agent.analyze("FP&A")
+
+        assert result.competitor_analysis.headings == [["予実管理とは"], ["FP&Aとは", "FP&Aの始め方"]]
+        assert outline.call_args[0][1] == result.competitor_analysis.headings
+
     def test_search_internal_knowledge(self, mock_rag_service):
         """Test internal knowledge search."""
         with patch("src.agents.research_agent.get_settings"):
@@ -178,8 +273,9 @@ class TestWriterAgent:
             research_summary="リサーチサマリー",
         )
 
+    @patch("src.agents.writer_agent.get_async_anthropic_client")
     @patch("src.agents.writer_agent.get_anthropic_client")
-    def test_generate_draft(self, mock_anthropic, mock_research_result):
+    def test_generate_draft(self, mock_anthropic, mock_async_anthropic, mock_research_result):
         """Test draft generation."""
         mock_response = Mock()
         mock_response.content = [
@@ -188,6 +284,8 @@ class TestWriterAgent:
         mock_client = Mock()
         mock_client.messages.create.return_value = mock_response
         mock_anthropic.return_value = mock_client
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.return_value = mock_response
 
         agent = WriterAgent()
         result = agent.generate_draft(
@@ -201,6 +299,68 @@ class TestWriterAgent:
         assert "テスト記事" in result.draft_content_md
         assert mock_client.messages.create.call_count >= 1
 
+    @patch("src.agents.writer_agent.get_async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_generate_assets_runs_concurrently(
+        self, mock_anthropic, mock_async_anthropic, mock_research_result
+    ):
+        """Test titles, image prompts and SNS posts are requested at the same time."""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            prompt = kwargs["messages"][0]["content"]
+            if "タイトル候補" in prompt:
+                text = "1. 予算管理の始め方"
+            elif "図解" in prompt:
+                text = "### 図解1: SSOT 全体像\n- 目的: 説明"
+            else:
+                text = "### X (Twitter) 投稿文\n予算管理のコツ\n### LinkedIn 投稿文\n詳しく解説"
+            return Mock(content=[Mock(text=text)])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+
+        agent = WriterAgent()
+        with patch.object(agent, "search_images_for_prompts", return_value=[{"query": "q"}]) as search:
+            assets = agent._generate_assets("本文", mock_research_result, "予算管理入門", "経営企画部長")
+
+        assert peak == 3
+        assert assets["titles"] == ["予算管理の始め方"]
+        assert assets["image_prompts"][0].startswith("### 図解1: SSoT")
+        assert assets["image_suggestions"] == [{"query": "q"}]
+        assert assets["sns_posts"]["x"] == "予算管理のコツ"
+        search.assert_called_once_with(assets["image_prompts"])
+
+    @patch("src.agents.writer_agent.get_async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_generate_assets_partial_failure(
+        self, mock_anthropic, mock_async_anthropic, mock_research_result
+    ):
+        """Test a failing step falls back without affecting the others."""
+        async def create(**kwargs):
+            if "タイトル候補" in kwargs["messages"][0]["content"]:
+                raise RuntimeError("overloaded")
+            return Mock(content=[Mock(text="### X (Twitter) 投稿文\n投稿")])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+
+        agent = WriterAgent()
+        assets = agent._generate_assets("本文", mock_research_result, "予算管理入門", "経営企画部長")
+
+        assert assets["titles"] == ["予算管理入門"]
+        assert assets["image_prompts"] == []
+        assert assets["image_suggestions"] == []
+        assert assets["sns_posts"]["x"] == "投稿"
+
     @patch("src.agents.writer_agent.get_anthropic_client")
     def test_generate_titles(self, mock_anthropic):
         """Test title generation."""
@@ -242,6 +402,252 @@ class TestWriterAgent:
 
         assert "改善後" in revised
 
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_revise_whole_refines_against_title_and_persona(self, mock_anthropic):
+        """Test a whole rewrite refines against the real title and persona, and omits them when empty."""
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(content=[Mock(text="# 改善後の記事")])
+        mock_anthropic.return_value = mock_client
+
+        WriterAgent().revise_draft(
+            "# 元の記事", "改善してください", {},
+            article_title="予算管理入門", target_persona="経理部の課長",
+        )
+        WriterAgent().revise_draft("# 元の記事", "改善してください", {})
+
+        prompts = [c.kwargs["messages"][0]["content"] for c in mock_client.messages.create.call_args_list]
+        assert "## 記事タイトル\n予算管理入門" in prompts[1]
+        assert "## ターゲット読者\n経理部の課長" in prompts[1]
+        assert "## 記事タイトル" not in prompts[3]
+        assert "## ターゲット読者" not in prompts[3]
+
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_revise_draft_streams_with_callback(self, mock_anthropic):
+        """Test long generations stream through the callback when one is given."""
+        def stream(**kwargs):
+            stream = MagicMock()
+            stream.__enter__.return_value = stream
+            stream.text_stream = iter(["# 改善後", "の記事"])
+            stream.get_final_message.return_value = Mock(usage=Mock(output_tokens=5))
+            return stream
+
+        mock_client = Mock()
+        mock_client.messages.stream.side_effect = stream
+        mock_anthropic.return_value = mock_client
+        events = []
+
+        agent = WriterAgent(on_stream=events.append)
+        revised = agent.revise_draft("# 元の記事", "改善してください", {})
+
+        assert revised == "# 改善後の記事"
+        mock_client.messages.create.assert_not_called()
+        assert [e.stage for e in events if e.done] == ["revise", "refine"]
+
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_single_pass_skips_refine_when_structure_complete(self, mock_anthropic, mock_research_result):
+        """Test a single-pass draft with every structure element needs one long call."""
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(content=[Mock(text=STRUCTURED_ARTICLE)])
+        mock_anthropic.return_value = mock_client
+
+        agent = WriterAgent(draft_mode="single_pass")
+        with patch.object(agent, "_generate_assets", return_value={
+            "titles": [], "image_prompts": [], "image_suggestions": [], "sns_posts": {},
+        }):
+            result = agent.generate_draft(mock_research_result, [], "経営企画部長", "予算管理入門")
+
+        assert result.draft_content_md == STRUCTURED_ARTICLE
+        assert mock_client.messages.create.call_count == 1
+        assert "## 仕上げ" in mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_single_pass_fixes_only_missing_elements(self, mock_anthropic):
+        """Test the fix-up call names only the elements the local check could not find."""
+        draft = STRUCTURED_ARTICLE.replace("## 目次\n1. 原因\n", "")
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(content=[Mock(text=STRUCTURED_ARTICLE)])
+        mock_anthropic.return_value = mock_client
+
+        fixed = WriterAgent(draft_mode="single_pass")._fix_structure(draft)
+
+        assert fixed == STRUCTURED_ARTICLE
+        prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        missing_section = prompt.split("## 不足している要素")[1].split("## 修正方針")[0]
+        assert missing_section.strip() == "- 目次"
+
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_two_pass_always_refines(self, mock_anthropic, mock_research_result):
+        """Test two-pass mode refines even a complete draft against the title and persona."""
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(content=[Mock(text=STRUCTURED_ARTICLE)])
+        mock_anthropic.return_value = mock_client
+
+        agent = WriterAgent(draft_mode="two_pass")
+        with patch.object(agent, "_generate_assets", return_value={
+            "titles": [], "image_prompts": [], "image_suggestions": [], "sns_posts": {},
+        }):
+            agent.generate_draft(mock_research_result, [], "経営企画部長", "予算管理入門")
+
+        prompts = [c.kwargs["messages"][0]["content"] for c in mock_client.messages.create.call_args_list]
+        assert len(prompts) == 2
+        assert "## 仕上げ" not in prompts[0]
+        assert "最終チェック" in prompts[1]
+        assert "## 記事タイトル\n予算管理入門" in prompts[1]
+        assert "## ターゲット読者\n経営企画部長" in prompts[1]
+
+    @patch("src.services.llm_gateway.LLMGateway.async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_generate_sections_concurrently_with_cap(
+        self, mock_anthropic, mock_async_anthropic, mock_research_result
+    ):
+        """Test sections are written concurrently up to the cap and stitched with a TOC and transitions."""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+        headers = set()
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            header, task = kwargs["messages"][0]["content"]
+            headers.add(header["text"])
+            label = task["text"].split("\n")[1]
+            return Mock(content=[Mock(text=f"{label}\n\n本文")])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+        mock_anthropic.return_value.messages.create.return_value = Mock(
+            content=[Mock(text="1. つなぎの文です。")]
+        )
+
+        with patch("src.agents.writer_agent.get_settings") as mock_settings:
+            mock_settings.return_value = Mock(
+                writer_section_concurrency=2, generation_timeout=30, anthropic_prompt_cache_enabled=True,
+                writer_context_token_budget=0,
+            )
+            agent = WriterAgent(draft_mode="single_pass", section_parallel=True)
+            content = agent._generate_sections(mock_research_result, [], "経営企画部長", "予算管理入門")
+
+        assert peak == 2
+        assert len(headers) == 1
+        assert content.startswith("# 予算管理入門\n\n")
+        assert content.index("## 目次") < content.index("## 一枚絵で見る全体像")
+        assert "本文\n\nつなぎの文です。\n\n## " in content
+
+    @patch("src.services.llm_gateway.LLMGateway.async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_generate_sections_falls_back_to_one_pass(
+        self, mock_anthropic, mock_async_anthropic, mock_research_result
+    ):
+        """Test a failed section falls back to the single-call draft."""
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = RuntimeError("overloaded")
+        mock_anthropic.return_value.messages.create.return_value = Mock(content=[Mock(text="# 一括生成")])
+
+        agent = WriterAgent(draft_mode="single_pass", section_parallel=True)
+        content = agent._generate_sections(mock_research_result, [], "経営企画部長", "予算管理入門")
+
+        assert content == "# 一括生成"
+
+    @patch("src.services.llm_gateway.LLMGateway.async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_write_concurrently_reports_and_cancels_on_calling_thread(
+        self, mock_anthropic, mock_async_anthropic
+    ):
+        """Test section progress reaches the callback on the caller's thread and a set cancel event stops the rest."""
+        import asyncio
+        import threading
+
+        from src.services.llm_stream import GenerationCancelledError
+
+        async def create(**kwargs):
+            task = kwargs["messages"][0]["content"][1]["text"]
+            await asyncio.sleep(0.01 if task == "first" else 5)
+            return Mock(content=[Mock(text=task)])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+        cancel_event = threading.Event()
+        threads = []
+
+        def on_stream(progress):
+            threads.append(threading.current_thread())
+            cancel_event.set()
+
+        agent = WriterAgent(on_stream=on_stream, cancel_event=cancel_event)
+        with pytest.raises(GenerationCancelledError):
+            agent._write_concurrently("共通", [("first", 100), ("slow", 100)], stage="sections")
+
+        assert threads == [threading.current_thread()]
+
+    @patch("src.services.llm_gateway.LLMGateway.async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_revise_draft_regenerates_only_targeted_sections(self, mock_anthropic, mock_async_anthropic):
+        """Test flagged and missing sections are regenerated and spliced while the rest is kept."""
+        draft = "# 予算管理入門\n\n" + STRUCTURED_ARTICLE.replace("## よくある失敗\n失敗①：ツール先行\n\n", "")
+        tasks = []
+
+        async def create(**kwargs):
+            task = kwargs["messages"][0]["content"][1]["text"]
+            tasks.append(task)
+            if "新しいセクションの追加" in task:
+                return Mock(content=[Mock(text="## よくある失敗\n\n失敗①：丸投げ")])
+            return Mock(content=[Mock(text="## 90日ロードマップ\n\nWeek 1: 定義書を作る")])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+        feedback = "## 優先改善点\n- 「90日ロードマップ」に成果物がない\n\n## 強み\n- 冒頭の共感が強い"
+
+        agent = WriterAgent()
+        revised = agent.revise_draft(draft, feedback, {"target_appeal": 20})
+
+        assert len(tasks) == 2
+        assert "成果物がない" in tasks[0] and "冒頭の共感" not in tasks[0]
+        assert "「90日ロードマップ」の直後" in tasks[1]
+        mock_anthropic.return_value.messages.create.assert_not_called()
+        assert revised.startswith("# 予算管理入門\n\n「予算、誰が作ってるの？」")
+        assert "Week 1: 定義書を作る\n\n## よくある失敗\n\n失敗①：丸投げ\n\n## 情シス/DXの方へ" in revised
+        assert "2. 90日ロードマップ\n3. よくある失敗\n4. 情シス/DXの方へ" in revised
+        assert "## 次に読む\n\n---\n予算設計を壁打ちしたい方は" in revised
+
+    @patch("src.services.llm_gateway.LLMGateway.async_anthropic_client")
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_revise_draft_stop_during_section_revision(self, mock_anthropic, mock_async_anthropic):
+        """Test section revisions report on the caller's thread and a stop is not turned into a whole rewrite."""
+        import asyncio
+        import threading
+
+        from src.services.llm_stream import GenerationCancelledError
+
+        draft = "# 予算管理入門\n\n" + STRUCTURED_ARTICLE.replace("## よくある失敗\n失敗①：ツール先行\n\n", "")
+
+        async def create(**kwargs):
+            task = kwargs["messages"][0]["content"][1]["text"]
+            if "新しいセクションの追加" in task:
+                await asyncio.sleep(5)
+            return Mock(content=[Mock(text="## 90日ロードマップ\n\nWeek 1: 定義書を作る")])
+
+        mock_async_anthropic.return_value = AsyncMock()
+        mock_async_anthropic.return_value.messages.create.side_effect = create
+        cancel_event = threading.Event()
+        events = []
+
+        def on_stream(progress):
+            events.append((progress.stage, threading.current_thread()))
+            cancel_event.set()
+
+        agent = WriterAgent(on_stream=on_stream, cancel_event=cancel_event)
+        with pytest.raises(GenerationCancelledError):
+            agent.revise_draft(draft, "## 優先改善点\n- 「90日ロードマップ」に成果物がない", {})
+
+        assert events == [("revise", threading.current_thread())]
+        mock_anthropic.return_value.messages.create.assert_not_called()
+        mock_anthropic.return_value.messages.stream.assert_not_called()
+
     @patch("src.agents.writer_agent.get_anthropic_client")
     def test_search_images_for_prompts_no_service(self, mock_anthropic):
         """Test search_images_for_prompts when ImageService is unavailable."""
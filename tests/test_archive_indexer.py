@@ -0,0 +1,215 @@
+"""
+Unit tests for EPM Note Engine ArchiveIndexer.
+
+Tests watermark persistence, per-article tail pruning, delta sync and
+write-through scheduling with mocked DB and RAG service.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.services.archive_indexer import (
+    ArchiveIndexer,
+    SyncWatermark,
+    schedule_article_index,
+)
+
+
+def _article(article_id: str, content: str, updated_at: datetime) -> dict:
+    return {
+        "id": article_id,
+        "week_id": "2025-W01",
+        "title": f"記事{article_id}",
+        "target_persona": None,
+        "seo_keywords": None,
+        "hook_statement": None,
+        "content_outline": None,
+        "research_summary": None,
+        "draft_content_md": None,
+        "final_content_md": content,
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+def rag_service():
+    """Mock RAGService with a non-empty archive collection."""
+    service = Mock()
+    service.get_collection_count.return_value = 10
+    service.get_document_ids.return_value = []
+    service.prune_documents.return_value = 0
+    return service
+
+
+@pytest.fixture
+def indexer(rag_service, tmp_path):
+    """ArchiveIndexer writing its watermark into a temp directory."""
+    return ArchiveIndexer(rag_service=rag_service, watermark_path=tmp_path / "wm.json")
+
+
+class TestWatermark:
+    """Tests for watermark persistence."""
+
+    def test_missing_file_returns_empty(self, indexer):
+        """Test no watermark means everything is new."""
+        watermark = indexer.load_watermark()
+        assert watermark.articles is None
+        assert watermark.snippets is None
+
+    def test_round_trip(self, indexer):
+        """Test saved watermark is loaded back with timezone."""
+        ts = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        indexer.save_watermark(SyncWatermark(articles=ts, snippets=None))
+
+        loaded = indexer.load_watermark()
+        assert loaded.articles == ts
+        assert loaded.snippets is None
+
+    def test_corrupt_file_is_ignored(self, indexer):
+        """Test unreadable watermark falls back to a full sync."""
+        indexer.watermark_path.write_text("{not json", encoding="utf-8")
+        assert indexer.load_watermark().articles is None
+
+
+class TestIndexArticle:
+    """Tests for single-article indexing."""
+
+    def test_deletes_chunks_from_longer_version(self, indexer, rag_service):
+        """Test chunks beyond the new chunk count are deleted."""
+        rag_service.get_document_ids.return_value = [
+            "article_a1_000", "article_a1_001", "article_a1_002",
+        ]
+
+        count = indexer.index_article(_article("a1", "短い本文", datetime.now(timezone.utc)))
+
+        assert count == 1
+        rag_service.add_documents.assert_called_once()
+        assert rag_service.add_documents.call_args.kwargs["document_ids"] == ["article_a1_000"]
+        rag_service.delete_documents.assert_called_once_with(
+            "archive_index", ["article_a1_001", "article_a1_002"]
+        )
+
+    def test_no_delete_when_unchanged(self, indexer, rag_service):
+        """Test no delete call when stored chunks match."""
+        rag_service.get_document_ids.return_value = ["article_a1_000"]
+
+        indexer.index_article(_article("a1", "本文", datetime.now(timezone.utc)))
+
+        rag_service.delete_documents.assert_not_called()
+
+
+class TestSync:
+    """Tests for delta sync."""
+
+    def _patch_session(self, articles, snippets):
+        """Patch get_session so queries return the given ORM-like rows."""
+        session = MagicMock()
+
+        def query(model):
+            rows = articles if model.__name__ == "Article" else snippets
+            q = MagicMock()
+            q.filter.return_value = q
+            q.order_by.return_value = q
+            q.all.return_value = rows
+            return q
+
+        session.query.side_effect = query
+        ctx = patch("src.services.archive_indexer.get_session")
+        mock_get_session = ctx.start()
+        mock_get_session.return_value.__enter__ = Mock(return_value=session)
+        mock_get_session.return_value.__exit__ = Mock(return_value=None)
+        return ctx, session
+
+    def _orm_article(self, article_id, updated_at):
+        row = Mock()
+        for key, value in _article(article_id, "本文", updated_at).items():
+            setattr(row, key, value)
+        return row
+
+    def test_delta_sync_filters_and_advances_watermark(self, indexer, rag_service):
+        """Test stored watermark filters the query and moves forward."""
+        old = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        new = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        indexer.save_watermark(SyncWatermark(articles=old))
+
+        ctx, session = self._patch_session([self._orm_article("a1", new)], [])
+        try:
+            stats = indexer.sync()
+        finally:
+            ctx.stop()
+
+        assert stats.articles == 1
+        assert indexer.load_watermark().articles == new
+        rag_service.prune_documents.assert_not_called()
+
+    def test_failed_row_holds_watermark(self, indexer, rag_service):
+        """Test a failing row keeps the watermark so it is retried."""
+        t1 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        t2 = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        t3 = datetime(2025, 1, 3, tzinfo=timezone.utc)
+        rag_service.add_documents.side_effect = [None, RuntimeError("boom"), None]
+
+        ctx, _ = self._patch_session(
+            [self._orm_article("a1", t1), self._orm_article("a2", t2), self._orm_article("a3", t3)],
+            [],
+        )
+        try:
+            stats = indexer.sync()
+        finally:
+            ctx.stop()
+
+        assert stats.errors == 1
+        assert stats.articles == 2
+        assert indexer.load_watermark().articles == t1
+
+    def test_empty_collection_forces_full_sync(self, indexer, rag_service):
+        """Test a cleared collection ignores the watermark and prunes."""
+        rag_service.get_collection_count.return_value = 0
+        indexer.save_watermark(SyncWatermark(articles=datetime(2030, 1, 1, tzinfo=timezone.utc)))
+
+        ctx, _ = self._patch_session([], [])
+        try:
+            indexer.sync()
+        finally:
+            ctx.stop()
+
+        rag_service.prune_documents.assert_called_once()
+
+    def test_dry_run_writes_nothing(self, indexer, rag_service):
+        """Test dry run neither indexes nor stores a watermark."""
+        ctx, _ = self._patch_session(
+            [self._orm_article("a1", datetime(2025, 1, 1, tzinfo=timezone.utc))], []
+        )
+        try:
+            stats = indexer.sync(dry_run=True)
+        finally:
+            ctx.stop()
+
+        assert stats.articles == 1
+        rag_service.add_documents.assert_not_called()
+        assert not indexer.watermark_path.exists()
+
+
+class TestScheduleArticleIndex:
+    """Tests for background write-through."""
+
+    def test_runs_on_worker(self):
+        """Test the article is indexed off the calling thread."""
+        mock_indexer = Mock()
+        mock_indexer.index_article_by_id.return_value = 3
+
+        with patch("src.services.archive_indexer.get_archive_indexer", return_value=mock_indexer):
+            future = schedule_article_index("a1")
+            assert future.result(timeout=5) == 3
+
+        mock_indexer.index_article_by_id.assert_called_once_with("a1")
+
+    def test_failure_is_swallowed(self):
+        """Test indexing errors never propagate to the workflow."""
+        mock_indexer = Mock()
+        mock_indexer.index_article_by_id.side_effect = RuntimeError("chroma down")
+
+        with patch("src.services.archive_indexer.get_archive_indexer", return_value=mock_indexer):
+            assert schedule_article_index("a1").result(timeout=5) == 0
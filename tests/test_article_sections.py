@@ -0,0 +1,107 @@
+"""
+Unit tests for EPM Note Engine article section planning.
+
+Tests the section plan built from the outline and the fixed structure
+elements, and stitching written sections into one article.
+"""
+
+from src.services.article_sections import (
+    ArticlePart,
+    SectionSpec,
+    assemble_article,
+    build_toc,
+    join_parts,
+    normalize_section,
+    plan_sections,
+    refresh_toc,
+    split_article,
+)
+
+OUTLINE = ["1. はじめに", "2. 予算管理が形骸化する原因", "3. 解決のステップ", "4. 導入事例", "5. まとめ"]
+
+
+class TestPlanSections:
+    """Tests for plan_sections."""
+
+    def test_outline_fills_body_between_fixed_elements(self):
+        """Test outline headings carry the cause and roadmap elements and intro/summary are dropped."""
+        specs = plan_sections(OUTLINE, total_chars=4500)
+
+        assert [s.key for s in specs] == [
+            "opening", "diagram", "causes", "roadmap", "body_3",
+            "antipattern", "it_corner", "checklist", "closing",
+        ]
+        assert specs[2].heading == "予算管理が形骸化する原因"
+        assert specs[3].heading == "解決のステップ"
+        assert not specs[0].has_heading
+        assert abs(sum(s.target_chars for s in specs) - 4500) <= len(specs)
+
+    def test_missing_elements_get_own_sections(self):
+        """Test causes and roadmap sections are added when no outline heading fits."""
+        keys = [s.key for s in plan_sections(["予算とは", "事例紹介"], total_chars=3000)]
+
+        assert keys[2:6] == ["causes", "body_1", "body_2", "roadmap"]
+
+
+class TestAssembleArticle:
+    """Tests for stitching sections."""
+
+    def test_toc_after_opening_and_headings_enforced(self):
+        """Test the TOC lists every H2 and a section without a heading gets the planned one."""
+        specs = [
+            SectionSpec("opening", "", ""),
+            SectionSpec("causes", "3つの原因", ""),
+            SectionSpec("roadmap", "90日ロードマップ", ""),
+        ]
+        texts = [
+            "「予算、誰が作ってるの？」\n\n**結論から言います。** 予算は経営の言語です。",
+            "# 勝手なタイトル\n## 3つの原因\n\n原因①：定義がない",
+            "Week 1: 定義書を作る",
+        ]
+
+        article = assemble_article("予算管理入門", specs, texts, transitions={1: "では、どう進めるか。"})
+
+        assert article.startswith("# 予算管理入門\n\n「予算、誰が作ってるの？」")
+        assert "勝手なタイトル" not in article
+        assert article.index("## 目次") < article.index("## 3つの原因")
+        assert "## 目次\n1. 3つの原因\n2. 90日ロードマップ" in article
+        assert "原因①：定義がない\n\nでは、どう進めるか。\n\n## 90日ロードマップ\n\nWeek 1" in article
+
+    def test_normalize_drops_model_toc(self):
+        """Test a TOC written by the model is removed from the section."""
+        text = normalize_section(
+            SectionSpec("diagram", "全体像", ""),
+            "## 目次\n1. a\n\n## 全体像\n\n┌──┐",
+        )
+
+        assert text == "## 全体像\n\n┌──┐"
+        assert build_toc([text]) == "## 目次\n1. 全体像"
+
+
+class TestSplitArticle:
+    """Tests for splitting and rejoining existing drafts."""
+
+    ARTICLE = "# 題\n\n冒頭\n\n## 目次\n1. 古い見出し\n\n┌──┐\n└──┘\n\n## 原因\n\n本文\n\n### 小見出し\n\n詳細\n"
+
+    def test_split_at_h2_and_rejoin(self):
+        """Test parts follow H2 boundaries (H3 stays inside) and rejoin to the same text."""
+        parts = split_article(self.ARTICLE)
+
+        assert [p.heading for p in parts] == ["", "目次", "原因"]
+        assert parts[2].text.endswith("### 小見出し\n\n詳細")
+        assert join_parts(parts) == self.ARTICLE
+
+    def test_refresh_toc_keeps_content_below_list(self):
+        """Test the TOC list is rebuilt while a diagram below it is kept."""
+        parts = split_article(self.ARTICLE)
+        parts.append(ArticlePart("新しい節", "## 新しい節\n\n本文"))
+
+        toc = refresh_toc(parts)[1]
+
+        assert toc.text == "## 目次\n1. 原因\n2. 新しい節\n\n┌──┐\n└──┘"
+
+    def test_refresh_toc_inserts_missing_toc_after_preamble(self):
+        """Test a missing TOC is added right after the opening."""
+        parts = refresh_toc(split_article("# 題\n\n冒頭\n\n## 原因\n\n本文"))
+
+        assert [p.heading for p in parts] == ["", "目次", "原因"]
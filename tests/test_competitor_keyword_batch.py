@@ -0,0 +1,178 @@
+"""
+Unit tests for EPM Note Engine batch competitor keyword research.
+
+Tests the ResearchAgent batch entry point, result storage and reuse.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.agents.research_agent import (
+    CompetitorKeyword,
+    CompetitorKeywordResult,
+    ResearchAgent,
+)
+from src.repositories.competitor_keyword_repository import CompetitorKeywordRepository
+from src.services.competitor_keyword_batch import run_competitor_keyword_batch
+
+
+def _result(query: str, total_articles: int = 3) -> CompetitorKeywordResult:
+    return CompetitorKeywordResult(
+        query=query,
+        total_articles=total_articles,
+        keywords=[
+            CompetitorKeyword(
+                keyword="予算管理",
+                article_count=2,
+                total_articles=total_articles,
+                usage_rate=66.7,
+                found_in_titles=1,
+                found_in_headings=2,
+                priority="推奨",
+            )
+        ] if total_articles else [],
+    )
+
+
+@pytest.fixture
+def agent():
+    """ResearchAgent with a small batch concurrency."""
+    agent = ResearchAgent()
+    agent.settings = Mock(competitor_batch_concurrency=2)
+    return agent
+
+
+@pytest.fixture
+def session():
+    """Patch get_session in the batch module with a mock session."""
+    session = MagicMock()
+    with patch("src.services.competitor_keyword_batch.get_session") as mock_get_session:
+        mock_get_session.return_value.__enter__ = Mock(return_value=session)
+        mock_get_session.return_value.__exit__ = Mock(return_value=None)
+        yield session
+
+
+class TestCompetitorKeywordResult:
+    """Tests for CompetitorKeywordResult serialization."""
+
+    def test_round_trip(self):
+        """Test from_dict restores a stored result."""
+        result = _result("予算管理")
+        restored = CompetitorKeywordResult.from_dict(result.to_dict())
+
+        assert restored == result
+
+
+class TestExtractCompetitorKeywordsBatch:
+    """Tests for ResearchAgent.extract_competitor_keywords_batch."""
+
+    def test_runs_queries_concurrently_and_dedupes(self, agent):
+        """Test queries run in parallel, blanks/duplicates are skipped, order is kept."""
+        barrier = threading.Barrier(2, timeout=5)
+        calls = []
+
+        def extract(query, max_articles, domain_profile):
+            calls.append(query)
+            barrier.wait()  # Fails unless two searches are in flight at once
+            return _result(query)
+
+        agent.extract_competitor_keywords = Mock(side_effect=extract)
+        finished = []
+
+        results = agent.extract_competitor_keywords_batch(
+            ["予算管理", " 予実管理 ", "", "予算管理"],
+            on_result=lambda query, result: finished.append(query),
+        )
+
+        assert list(results) == ["予算管理", "予実管理"]
+        assert sorted(calls) == ["予実管理", "予算管理"]
+        assert sorted(finished) == ["予実管理", "予算管理"]
+
+    def test_failure_is_isolated(self, agent):
+        """Test one failing query does not abort the batch."""
+        def extract(query, max_articles, domain_profile):
+            if query == "失敗":
+                raise RuntimeError("boom")
+            return _result(query)
+
+        agent.extract_competitor_keywords = Mock(side_effect=extract)
+
+        results = agent.extract_competitor_keywords_batch(["失敗", "予算管理"], max_concurrency=1)
+
+        assert results["予算管理"].total_articles == 3
+        assert results["失敗"].total_articles == 0
+        assert "boom" in results["失敗"].suggestions[0]
+
+
+class TestRunCompetitorKeywordBatch:
+    """Tests for run_competitor_keyword_batch."""
+
+    def test_reuses_fresh_and_stores_new(self, agent, session):
+        """Test stored results are reused and new results are saved."""
+        agent.extract_competitor_keywords = Mock(side_effect=lambda q, **kw: _result(q, 0 if q == "空" else 3))
+
+        with patch(
+            "src.services.competitor_keyword_batch.CompetitorKeywordRepository"
+        ) as mock_repo_cls:
+            repo = mock_repo_cls.return_value
+            repo.get_fresh.side_effect = lambda query, *args, **kwargs: Mock() if query == "保存済み" else None
+
+            stats = run_competitor_keyword_batch(
+                ["保存済み", "予算管理", "空"], max_articles=5, max_age_days=7, agent=agent,
+            )
+
+        assert stats.queries == 3
+        assert stats.reused == 1
+        assert stats.researched == 2
+        assert stats.stored == 1
+        assert stats.failed == ["空"]
+        repo.save.assert_called_once()
+        assert repo.save.call_args[0][:3] == ("予算管理", None, 5)
+        searched = [c.args[0] for c in agent.extract_competitor_keywords.call_args_list]
+        assert sorted(searched) == ["予算管理", "空"]
+
+    def test_refresh_skips_lookup(self, agent, session):
+        """Test refresh researches every query."""
+        agent.extract_competitor_keywords = Mock(side_effect=lambda q, **kw: _result(q))
+
+        with patch(
+            "src.services.competitor_keyword_batch.CompetitorKeywordRepository"
+        ) as mock_repo_cls:
+            stats = run_competitor_keyword_batch(["予算管理"], refresh=True, max_age_days=7, agent=agent)
+
+        mock_repo_cls.return_value.get_fresh.assert_not_called()
+        assert stats.stored == 1
+
+
+class TestCompetitorKeywordRepository:
+    """Tests for CompetitorKeywordRepository freshness checks."""
+
+    def _repo_with(self, record):
+        repo = CompetitorKeywordRepository(MagicMock())
+        repo.get = Mock(return_value=record)
+        return repo
+
+    def test_get_fresh_checks_age_and_article_count(self):
+        """Test stale or smaller results are not returned."""
+        now = datetime.now(timezone.utc)
+        record = Mock(max_articles=10, updated_at=now - timedelta(days=2))
+        repo = self._repo_with(record)
+
+        assert repo.get_fresh("予算管理", max_age=timedelta(days=7)) is record
+        assert repo.get_fresh("予算管理", max_age=timedelta(days=1)) is None
+        assert repo.get_fresh("予算管理", min_articles=20) is None
+
+    def test_save_updates_existing_record(self):
+        """Test save overwrites the stored result for the same query."""
+        record = Mock()
+        repo = self._repo_with(record)
+
+        saved = repo.save("予算管理", "evidence", 10, {"total_articles": 4, "keywords": []})
+
+        assert saved is record
+        assert record.total_articles == 4
+        assert record.max_articles == 10
+        repo.session.add.assert_not_called()
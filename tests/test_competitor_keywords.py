@@ -0,0 +1,97 @@
+"""
+Unit tests for EPM Note Engine competitor keyword statistics.
+
+Tests exact per-article membership and title/heading frequencies.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.competitor_keywords import (
+    CompetitorDocument,
+    CompetitorKeywordAnalyzer,
+    nouns_from_tokens,
+    words_from_text,
+)
+from src.services.japanese_tokenizer import JANOME_AVAILABLE, Token
+
+
+class TestCompetitorKeywordAnalyzer:
+    """Tests for CompetitorKeywordAnalyzer (fallback splitter, no Janome needed)."""
+
+    def test_article_count_uses_exact_membership(self):
+        """Test a keyword in many headings of one article counts as one article."""
+        documents = [
+            CompetitorDocument(title="予算管理 入門", headings=["予算管理 基本", "予算管理 手順", "予算管理 事例"]),
+            CompetitorDocument(title="経営管理 解説", headings=[]),
+            CompetitorDocument(title="", headings=["予算管理 ツール"]),
+        ]
+        stats = CompetitorKeywordAnalyzer(use_janome=False).analyze(documents)
+
+        assert stats["予算管理"] == {
+            "article_count": 2,
+            "found_in_titles": 1,
+            "found_in_headings": 4,
+        }
+        assert stats["経営管理"]["article_count"] == 1
+
+    def test_article_count_never_exceeds_documents(self):
+        """Test counts stay within the number of articles for any heading layout."""
+        documents = [
+            CompetitorDocument(title=f"記事{i} 予算", headings=["予算 見出し"] * i)
+            for i in range(5)
+        ]
+        stats = CompetitorKeywordAnalyzer(use_janome=False).analyze(iter(documents))
+
+        assert stats["予算"]["article_count"] == 5
+        assert stats["見出し"]["article_count"] == 4
+        assert stats["見出し"]["found_in_headings"] == 10
+
+    def test_identical_texts_extracted_once(self):
+        """Test repeated titles/headings are only split/tokenized once."""
+        analyzer = CompetitorKeywordAnalyzer(use_janome=False)
+        documents = [CompetitorDocument(title="予算管理 入門", headings=["予算管理 入門"])] * 3
+
+        with patch(
+            "src.services.competitor_keywords.words_from_text",
+            wraps=words_from_text,
+        ) as mock_words:
+            stats = analyzer.analyze(documents)
+
+        assert mock_words.call_count == 1
+        assert stats["入門"]["article_count"] == 3
+
+    def test_empty_documents(self):
+        """Test empty input yields no keywords."""
+        assert CompetitorKeywordAnalyzer(use_janome=False).analyze([]) == {}
+
+
+class TestNounsFromTokens:
+    """Tests for noun and compound extraction."""
+
+    def test_compounds_only_from_adjacent_nouns(self):
+        """Test compounds are built from adjacent nouns, not across particles."""
+        tokens = [
+            Token("予算", "名詞,一般"),
+            Token("管理", "名詞,サ変接続"),
+            Token("の", "助詞,連体化"),
+            Token("基本", "名詞,一般"),
+            Token("2024", "名詞,数"),
+        ]
+        keywords = nouns_from_tokens(tokens)
+
+        assert {"予算", "管理", "予算管理", "基本", "基本2024"} == keywords
+        assert "管理基本" not in keywords
+
+    @pytest.mark.skipif(not JANOME_AVAILABLE, reason="Janome not installed")
+    def test_janome_analysis(self):
+        """Test the Janome path extracts compound nouns from real text."""
+        documents = [
+            CompetitorDocument(title="予算管理の基本", headings=["予算管理とは"]),
+            CompetitorDocument(title="経営管理の進め方", headings=[]),
+        ]
+        stats = CompetitorKeywordAnalyzer(use_janome=True).analyze(documents)
+
+        assert stats["予算管理"]["article_count"] == 1
+        assert stats["管理"]["article_count"] == 2
@@ -0,0 +1,154 @@
+"""
+Unit tests for EPM Note Engine competitor page heading extraction.
+
+Pages are served by a local HTTP server so fetching, streaming and
+conditional GET revalidation run over real HTTP.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.competitor_pages import (
+    HeadingExtractor,
+    PageCache,
+    extract_html_headings,
+    fetch_competitor_headings,
+    fetch_page_headings,
+)
+
+ARTICLE_HTML = """<!DOCTYPE html>
+<html><head><title>予算管理</title><script>var h = "<h2>偽</h2>";</script></head>
+<body>
+<h1>予算管理の基本</h1>
+<nav><h4>メニュー</h4></nav>
+<h2>予算管理とは<span> &amp; 目的</span></h2>
+<p>本文</p>
+<h3>予実差異の分析</h3>
+<h2>まとめ</h2>
+</body></html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    etag = '"v1"'
+    requests: list[dict] = []
+
+    def do_GET(self):
+        type(self).requests.append({"path": self.path, "if_none_match": self.headers.get("If-None-Match")})
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/pdf":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.end_headers()
+            self.wfile.write(b"%PDF")
+            return
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = ARTICLE_HTML.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server serving competitor pages."""
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHeadingExtractor:
+    """Tests for the streaming heading parser."""
+
+    def test_extracts_h1_to_h3(self):
+        """Test only h1–h3 outside scripts are extracted, with entities decoded."""
+        assert extract_html_headings(ARTICLE_HTML) == [
+            "予算管理の基本", "予算管理とは & 目的", "予実差異の分析", "まとめ",
+        ]
+
+    def test_chunked_feed_matches_full_parse(self):
+        """Test tags split across chunks are parsed the same."""
+        extractor = HeadingExtractor()
+        for i in range(0, len(ARTICLE_HTML), 7):
+            extractor.feed(ARTICLE_HTML[i:i + 7])
+        extractor.close()
+
+        assert extractor.headings == extract_html_headings(ARTICLE_HTML)
+
+
+class TestFetchPageHeadings:
+    """Tests for fetch_page_headings over HTTP."""
+
+    async def test_fetch_and_revalidate(self, server, tmp_path):
+        """Test pages are cached and stale entries are revalidated with a conditional GET."""
+        url = f"{server}/article"
+
+        cache = PageCache(tmp_path, ttl_seconds=3600)
+        first = await fetch_page_headings([url], cache=cache)
+        assert first[url].status == "fetched"
+        assert first[url].headings[0] == "予算管理の基本"
+
+        # Fresh entry: no request at all
+        assert (await fetch_page_headings([url], cache=cache))[url].status == "cached"
+        assert len(_Handler.requests) == 1
+
+        # Stale entry: revalidated, 304 keeps the stored headings
+        stale = PageCache(tmp_path, ttl_seconds=0)
+        revalidated = await fetch_page_headings([url], cache=stale)
+        assert revalidated[url].status == "not_modified"
+        assert revalidated[url].headings == first[url].headings
+        assert _Handler.requests[-1]["if_none_match"] == '"v1"'
+
+    async def test_failures_are_isolated(self, server):
+        """Test missing and non-HTML pages fail without affecting others."""
+        urls = [f"{server}/missing", f"{server}/pdf", f"{server}/article", ""]
+
+        pages = await fetch_page_headings(urls, max_concurrency=2)
+
+        assert set(pages) == set(urls[:3])
+        assert pages[urls[0]].status == "failed"
+        assert pages[urls[1]].status == "failed"
+        assert pages[urls[2]].headings
+
+
+class TestFetchCompetitorHeadings:
+    """Tests for the settings-driven entry point."""
+
+    def test_disabled_does_nothing(self):
+        """Test the fetch stage is skipped unless enabled."""
+        settings = Mock(competitor_page_fetch_enabled=False)
+        with patch("src.services.competitor_pages.get_settings", return_value=settings):
+            assert fetch_competitor_headings(["http://127.0.0.1:9/"]) == {}
+
+    def test_enabled_returns_found_headings(self, server, tmp_path):
+        """Test only pages with headings are returned."""
+        settings = Mock(
+            competitor_page_fetch_enabled=True,
+            competitor_page_cache_path=str(tmp_path),
+            competitor_page_cache_ttl_hours=1,
+            competitor_page_fetch_concurrency=2,
+            competitor_page_timeout_seconds=5,
+        )
+        with patch("src.services.competitor_pages.get_settings", return_value=settings):
+            headings = fetch_competitor_headings([f"{server}/article", f"{server}/missing"])
+
+        assert list(headings) == [f"{server}/article"]
@@ -0,0 +1,71 @@
+"""
+Unit tests for EPM Note Engine prompt context packing.
+
+Tests the local token estimate and fitting prioritized context sections
+into an input token budget.
+"""
+
+from src.services.context_packer import (
+    ContextSection,
+    estimate_prompt_tokens,
+    pack_context,
+)
+
+
+def _sections() -> list[ContextSection]:
+    return [
+        ContextSection("title", "記事タイトル", ["予算管理入門"], required=True),
+        ContextSection("outline", "推奨構成（参考）", ["- 原因", "- 打ち手"], priority=40),
+        ContextSection(
+            "references", "参考資料（ナレッジベース）",
+            [f"【参考{i}】" + "予算編成の知見。" * 60 for i in range(1, 4)],
+            priority=10, separator="\n\n", empty_text="（なし）", note="※直接引用は不要です。",
+        ),
+        ContextSection("essences", "著者のエッセンス", ["【経験】現場の話"], required=True),
+    ]
+
+
+class TestEstimatePromptTokens:
+    """Tests for estimate_prompt_tokens."""
+
+    def test_ascii_is_cheaper_than_japanese(self):
+        """Test ASCII text counts about four characters per token."""
+        assert estimate_prompt_tokens("a" * 400) == 100
+        assert estimate_prompt_tokens("予" * 120) == 100
+
+
+class TestPackContext:
+    """Tests for pack_context."""
+
+    def test_fits_unchanged(self):
+        """Test context within the budget is rendered in order and nothing is cut."""
+        text, report = pack_context(_sections(), budget_tokens=0)
+
+        assert text.startswith("## 記事タイトル\n予算管理入門\n\n## 推奨構成（参考）\n- 原因\n- 打ち手")
+        assert "※直接引用は不要です。\n\n## 著者のエッセンス" in text
+        assert not report.trimmed
+        assert report.packed_tokens == report.original_tokens
+
+    def test_lowest_priority_cut_first(self):
+        """Test trailing references are dropped, one is truncated, and higher sections are kept."""
+        full, _ = pack_context(_sections(), budget_tokens=0)
+        budget = estimate_prompt_tokens(full) - 500
+
+        text, report = pack_context(_sections(), budget_tokens=budget)
+
+        assert report.packed_tokens <= budget
+        assert report.dropped == {"references": 1}
+        assert report.truncated == ["references"]
+        assert "【参考3】" not in text
+        assert "【参考2】" in text and "…" in text
+        assert "- 打ち手" in text
+        assert "references -1" in report.summary()
+
+    def test_required_sections_never_cut(self):
+        """Test a budget below the required sections empties the rest and reports the overrun."""
+        text, report = pack_context(_sections(), budget_tokens=10)
+
+        assert "予算管理入門" in text and "現場の話" in text
+        assert "## 参考資料（ナレッジベース）\n（なし）" in text
+        assert report.dropped == {"references": 3, "outline": 2}
+        assert report.over_budget
@@ -0,0 +1,108 @@
+"""
+Unit tests for EPM Note Engine shared Japanese tokenizer.
+
+Tests the process-wide tokenizer and the LRU token cache.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services import japanese_tokenizer
+from src.services.japanese_tokenizer import (
+    JANOME_AVAILABLE,
+    Token,
+    cache_info,
+    clear_cache,
+    get_tokenizer,
+    tokenize,
+    warm_up,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start each test with an empty token cache."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+@pytest.fixture
+def fake_tokenizer():
+    """Tokenizer that splits on spaces and tags everything as a noun."""
+    tokenizer = Mock()
+    tokenizer.tokenize.side_effect = lambda text: [
+        Mock(surface=word, part_of_speech="名詞,一般,*,*") for word in text.split()
+    ]
+    with patch.object(japanese_tokenizer, "get_tokenizer", return_value=tokenizer):
+        yield tokenizer
+
+
+class TestTokenCache:
+    """Tests for the LRU token cache."""
+
+    def test_repeated_text_tokenized_once(self, fake_tokenizer):
+        """Test the same text is served from the cache."""
+        first = tokenize("予算 管理")
+        second = tokenize("予算 管理")
+
+        assert first == second == (Token("予算", "名詞,一般,*,*"), Token("管理", "名詞,一般,*,*"))
+        fake_tokenizer.tokenize.assert_called_once()
+        assert cache_info()["hits"] == 1
+
+    def test_least_recently_used_evicted(self, fake_tokenizer):
+        """Test the cache never grows past tokenizer_cache_size."""
+        with patch.object(japanese_tokenizer, "get_settings") as mock_settings:
+            mock_settings.return_value = Mock(tokenizer_cache_size=2)
+            tokenize("a")
+            tokenize("b")
+            tokenize("a")  # refresh "a"
+            tokenize("c")  # evicts "b"
+            tokenize("a")
+            tokenize("b")
+
+        assert fake_tokenizer.tokenize.call_count == 4
+        assert cache_info()["size"] == 2
+
+    def test_cache_disabled(self, fake_tokenizer):
+        """Test a zero cache size always re-tokenizes."""
+        with patch.object(japanese_tokenizer, "get_settings") as mock_settings:
+            mock_settings.return_value = Mock(tokenizer_cache_size=0)
+            tokenize("a")
+            tokenize("a")
+
+        assert fake_tokenizer.tokenize.call_count == 2
+
+
+class TestWarmUp:
+    """Tests for the startup warm-up."""
+
+    def test_waits_for_tokenize_lock(self, fake_tokenizer):
+        """Test warm-up does not use the shared tokenizer while a tokenize call holds it."""
+        with patch.object(japanese_tokenizer, "JANOME_AVAILABLE", True):
+            with japanese_tokenizer._tokenize_lock:
+                thread = threading.Thread(target=warm_up)
+                thread.start()
+                thread.join(timeout=0.1)
+                assert thread.is_alive()
+                fake_tokenizer.tokenize.assert_not_called()
+            thread.join(timeout=5)
+
+        fake_tokenizer.tokenize.assert_called_once()
+
+
+@pytest.mark.skipif(not JANOME_AVAILABLE, reason="Janome not installed")
+class TestSharedTokenizer:
+    """Tests for the process-wide Janome tokenizer."""
+
+    def test_single_instance(self):
+        """Test every caller gets the same tokenizer."""
+        assert get_tokenizer() is get_tokenizer()
+
+    def test_tokenize_japanese(self):
+        """Test real tokenization returns surfaces and parts of speech."""
+        tokens = tokenize("予算管理の基本")
+        assert tokens[0].surface == "予算"
+        assert tokens[0].part_of_speech.startswith("名詞")
@@ -443,16 +443,14 @@ class TestResearchAgentCompetitorKeywords:
         }
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_basic(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service, mock_tavily_response
     ):
         """Test basic competitor keyword extraction."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -466,16 +464,14 @@ class TestResearchAgentCompetitorKeywords:
         assert len(result.article_urls) == 3
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_finds_common_keywords(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service, mock_tavily_response
     ):
         """Test that common keywords are extracted from competitor articles."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -493,16 +489,14 @@ class TestResearchAgentCompetitorKeywords:
             assert kw.priority in ["必須", "推奨", "検討"]
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_priority_assignment(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service, mock_tavily_response
     ):
         """Test that priority is correctly assigned based on usage rate."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -519,16 +513,14 @@ class TestResearchAgentCompetitorKeywords:
                 assert kw.priority == "検討"
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_generates_suggestions(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service, mock_tavily_response
     ):
         """Test that suggestions are generated."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -539,16 +531,14 @@ class TestResearchAgentCompetitorKeywords:
         assert len(result.suggestions) > 0
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_empty_results(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service
     ):
         """Test handling of empty search results."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = {"results": []}
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = {"results": []}
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -560,16 +550,14 @@ class TestResearchAgentCompetitorKeywords:
         assert "見つかりませんでした" in result.suggestions[0]
 
     @patch("src.agents.research_agent.resolve_tavily_domains")
-    @patch("src.agents.research_agent.get_tavily_client")
+    @patch("src.agents.research_agent.search_with_snapshots")
     @patch("src.agents.research_agent.get_settings")
     def test_extract_competitor_keywords_to_dict(
         self, mock_settings, mock_tavily, mock_resolve_domains,
         mock_rag_service, mock_tavily_response
     ):
         """Test that to_dict produces valid JSON-serializable output."""
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_tavily.return_value = mock_tavily_client
+        mock_tavily.return_value = mock_tavily_response
         mock_settings.return_value = Mock()
         mock_resolve_domains.return_value = ([], [], [])
 
@@ -0,0 +1,72 @@
+"""
+Unit tests for EPM Note Engine keyword scanner.
+
+Tests the Aho-Corasick matcher and section-aware keyword statistics.
+"""
+
+import re
+
+from src.services.keyword_scanner import (
+    KeywordScanner,
+    count_non_overlapping,
+    scan_sections,
+)
+
+
+class TestKeywordScanner:
+    """Tests for KeywordScanner."""
+
+    def test_finds_overlapping_and_nested_patterns(self):
+        """Test all occurrences of nested keywords are reported."""
+        scanner = KeywordScanner(["予算", "予算管理", "管理"])
+        starts = scanner.find_all("予算管理と予算")
+
+        assert starts[scanner.pattern_id("予算")] == [0, 5]
+        assert starts[scanner.pattern_id("予算管理")] == [0]
+        assert starts[scanner.pattern_id("管理")] == [2]
+
+    def test_case_insensitive_and_deduplicated(self):
+        """Test keywords are lowercased and duplicates share one pattern."""
+        scanner = KeywordScanner(["FP&A", "fp&a", ""])
+        assert scanner.patterns == ["fp&a"]
+        assert scanner.find_all("fp&aとfp&a") == [[0, 5]]
+
+    def test_non_overlapping_count_matches_findall(self):
+        """Test counts follow re.findall semantics for self-overlapping keywords."""
+        text = "aaaaa"
+        scanner = KeywordScanner(["aa"])
+        starts = scanner.find_all(text)[0]
+
+        assert starts == [0, 1, 2, 3]
+        assert count_non_overlapping(starts, 2) == len(re.findall("aa", text))
+
+
+class TestScanSections:
+    """Tests for scan_sections."""
+
+    def test_counts_and_positions(self):
+        """Test section positions and body counts in one scan."""
+        content = "# 予算管理入門\n\n予算の基本です。\n\n## 予算管理の手順\n\n本文\n\n## まとめ\n\n予算管理を始めよう"
+        sections = {
+            "title": "予算管理入門",
+            "first_paragraph": "予算の基本です。",
+            "h2_headings": ["予算管理の手順", "まとめ"],
+            "h3_headings": [],
+            "body": content,
+            "conclusion_start": content.index("## まとめ"),
+        }
+
+        stats = scan_sections(["予算管理", "予算", "KPI"], sections)
+
+        assert stats["予算管理"].count == 3
+        assert stats["予算管理"].positions == ["title", "h2", "conclusion", "body"]
+        assert stats["予算"].count == 4
+        assert "first_paragraph" in stats["予算"].positions
+        assert stats["KPI"].count == 0
+        assert stats["KPI"].positions == []
+
+    def test_no_conclusion(self):
+        """Test conclusion is never reported when there is none."""
+        sections = {"title": "", "first_paragraph": "", "h2_headings": [], "h3_headings": [],
+                    "body": "予算", "conclusion_start": None}
+        assert scan_sections(["予算"], sections)["予算"].positions == ["body"]
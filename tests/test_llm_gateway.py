@@ -0,0 +1,188 @@
+"""
+Unit tests for EPM Note Engine LLM gateway.
+
+Tests pooled clients, per-model concurrency caps, retries of transient
+errors, per-call usage accounting and the opt-in response cache.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.services.llm_gateway import LLMGateway
+from src.services.llm_usage import get_usage_tracker
+from src.services.response_cache import ResponseCache
+
+
+class _StatusError(Exception):
+    """SDK-like error carrying an HTTP status code."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+
+def _settings(**overrides) -> Mock:
+    values = dict(
+        llm_max_concurrency=4,
+        llm_model_concurrency={},
+        llm_rate_limit_per_minute=0,
+        llm_rate_limit_burst=5,
+        llm_max_retries=3,
+        llm_cache_labels=[],
+        generation_timeout=30,
+        anthropic_api_key="",
+        openai_api_key="",
+    )
+    values.update(overrides)
+    return Mock(**values)
+
+
+class TestClients:
+    """Tests for the shared SDK clients."""
+
+    @patch("src.config.get_anthropic_client")
+    def test_client_created_once_without_sdk_retries(self, mock_factory):
+        """Test every caller gets the same client, built with SDK retries off."""
+        gateway = LLMGateway()
+
+        assert gateway.anthropic_client() is gateway.anthropic_client()
+        mock_factory.assert_called_once_with(max_retries=0)
+
+    def test_run_from_running_loop(self):
+        """Test coroutines run on the gateway loop even when the caller has its own loop."""
+        gateway = LLMGateway()
+
+        async def caller() -> int:
+            async def work() -> int:
+                await asyncio.sleep(0)
+                return 7
+            return gateway.run(work())
+
+        assert asyncio.run(caller()) == 7
+
+
+class TestCalls:
+    """Tests for instrumented calls."""
+
+    @patch("src.services.llm_gateway.retry_delay", return_value=0)
+    @patch("src.services.llm_gateway.get_settings")
+    def test_retries_transient_errors_and_records_usage(self, mock_settings, _delay):
+        """Test an overloaded response is retried and the retry is recorded with the usage."""
+        mock_settings.return_value = _settings()
+        client = Mock()
+        client.messages.create.side_effect = [
+            _StatusError(529),
+            Mock(content=[Mock(text="ok")], usage=Mock(input_tokens=120, output_tokens=30)),
+        ]
+        tracker = get_usage_tracker()
+        mark = tracker.mark()
+
+        response = LLMGateway().create_message("writer.titles", client=client, model="m", max_tokens=10)
+
+        assert response.content[0].text == "ok"
+        call = tracker.calls[mark:][-1]
+        assert (call.label, call.retries, call.input_tokens, call.output_tokens) == (
+            "writer.titles", 1, 120, 30,
+        )
+
+    @patch("src.services.llm_gateway.get_settings")
+    def test_client_errors_are_not_retried(self, mock_settings):
+        """Test a 400 response is raised without retrying."""
+        mock_settings.return_value = _settings()
+        client = Mock()
+        client.messages.create.side_effect = _StatusError(400)
+
+        with pytest.raises(_StatusError):
+            LLMGateway().create_message("x", client=client, model="m")
+
+        assert client.messages.create.call_count == 1
+
+    @patch("src.services.llm_gateway.get_settings")
+    def test_per_model_concurrency_cap(self, mock_settings):
+        """Test a model override caps threads sharing the gateway while other models are not held up."""
+        mock_settings.return_value = _settings(llm_model_concurrency={"slow": 1})
+        gateway = LLMGateway()
+        in_flight = {"slow": 0, "fast": 0}
+        peak = {"slow": 0, "fast": 0}
+        lock = threading.Lock()
+
+        def request(model: str) -> Mock:
+            with lock:
+                in_flight[model] += 1
+                peak[model] = max(peak[model], in_flight[model])
+            time.sleep(0.02)
+            with lock:
+                in_flight[model] -= 1
+            return Mock(usage=None)
+
+        threads = [
+            threading.Thread(target=gateway.call, args=("x", model, lambda m=model: request(m)))
+            for model in ["slow", "slow", "slow", "fast", "fast", "fast"]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == {"slow": 1, "fast": 3}
+
+    @patch("src.services.llm_gateway.get_settings")
+    def test_async_calls_share_cap(self, mock_settings):
+        """Test async calls on one loop respect the model's cap."""
+        mock_settings.return_value = _settings(llm_max_concurrency=2)
+        gateway = LLMGateway()
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return Mock(usage=None)
+
+        client = Mock()
+        client.messages.create.side_effect = create
+
+        async def run():
+            await asyncio.gather(*(gateway.acreate_message("x", client=client, model="m") for _ in range(5)))
+
+        gateway.run(run())
+
+        assert peak == 2
+
+
+class TestResponseCaching:
+    """Tests for replaying identical requests from the response cache."""
+
+    @patch("src.services.llm_gateway.get_settings")
+    def test_identical_request_replayed_for_listed_label(self, mock_settings, tmp_path):
+        """Test a listed label is served from disk on the second call while other labels are not."""
+        from anthropic.types import Message
+
+        mock_settings.return_value = _settings(llm_cache_labels=["writer.meta_description"])
+        message = Message.model_validate({
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "m",
+            "content": [{"type": "text", "text": "説明文"}], "stop_reason": "end_turn",
+            "stop_sequence": None, "usage": {"input_tokens": 80, "output_tokens": 20},
+        })
+        client = Mock()
+        client.messages.create.return_value = message
+        cache = ResponseCache(tmp_path / "c.sqlite3", namespace="llm", ttl_seconds=60)
+        gateway = LLMGateway()
+        request = dict(model="m", max_tokens=200, messages=[{"role": "user", "content": "記事"}])
+
+        with patch("src.services.llm_gateway.get_llm_cache", return_value=cache):
+            first = gateway.create_message("writer.meta_description", client=client, **request)
+            second = gateway.create_message("writer.meta_description", client=client, **request)
+            gateway.create_message("writer.meta_description", client=client, **{**request, "max_tokens": 300})
+            gateway.create_message("writer.titles", client=client, **request)
+
+        assert second.content[0].text == first.content[0].text == "説明文"
+        assert client.messages.create.call_count == 3
@@ -0,0 +1,97 @@
+"""
+Unit tests for EPM Note Engine LLM streaming.
+
+Tests progress events, exact final usage and early cancellation.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.llm_stream import (
+    GenerationCancelledError,
+    StreamProgress,
+    complete_streaming,
+    stream_text,
+)
+
+
+class FakeStream:
+    """Stand-in for the Anthropic MessageStream context manager."""
+
+    def __init__(self, deltas: list[str], output_tokens: int = 42) -> None:
+        self.deltas = deltas
+        self.output_tokens = output_tokens
+        self.sent = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+        return False
+
+    @property
+    def text_stream(self):
+        for delta in self.deltas:
+            self.sent += 1
+            yield delta
+
+    def get_final_message(self):
+        return Mock(usage=Mock(output_tokens=self.output_tokens))
+
+
+def _client(stream: FakeStream) -> Mock:
+    client = Mock()
+    client.messages.stream.return_value = stream
+    return client
+
+
+class TestStreamText:
+    """Tests for stream_text."""
+
+    def test_yields_progress_then_exact_usage(self):
+        """Test every delta is reported and the final event carries exact usage."""
+        stream = FakeStream(["# 予算", "管理", "\n本文"])
+
+        events = list(stream_text(_client(stream), stage="draft", model="m", max_tokens=10, messages=[]))
+
+        assert [e.delta for e in events[:-1]] == ["# 予算", "管理", "\n本文"]
+        assert events[1].text == "# 予算管理"
+        assert all(e.stage == "draft" and not e.done for e in events[:-1])
+        assert events[-1].done
+        assert events[-1].text == "# 予算管理\n本文"
+        assert events[-1].output_tokens == 42
+        assert events[0].first_token_seconds is not None
+        assert stream.closed
+
+    def test_cancel_closes_stream(self):
+        """Test setting the cancel event stops at the next delta and closes the stream."""
+        stream = FakeStream(["a", "b", "c", "d"])
+        cancel = threading.Event()
+        seen = []
+
+        def on_progress(progress: StreamProgress) -> None:
+            seen.append(progress.delta)
+            if progress.delta == "b":
+                cancel.set()
+
+        with pytest.raises(GenerationCancelledError):
+            complete_streaming(_client(stream), on_progress=on_progress, cancel_event=cancel)
+
+        assert seen == ["a", "b"]
+        assert stream.sent == 3
+        assert stream.closed
+
+
+class TestStreamProgress:
+    """Tests for StreamProgress."""
+
+    def test_tokens_per_second_excludes_wait_for_first_token(self):
+        """Test throughput is measured from the first token."""
+        progress = StreamProgress("draft", "", "x", output_tokens=100, elapsed=12.0, first_token_seconds=2.0)
+
+        assert progress.tokens_per_second == 10.0
+        assert StreamProgress("draft", "", "", 0, 1.0, None).tokens_per_second == 0.0
@@ -0,0 +1,119 @@
+"""
+Unit tests for EPM Note Engine prompt caching and token accounting.
+
+Tests cache breakpoints on static prompt prefixes and per-call usage split
+into uncached, cache-write and cache-read input tokens.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.agents.reviewer_agent import REVIEW_INSTRUCTIONS, ReviewerAgent
+from src.agents.writer_agent import WriterAgent
+from src.services.llm_usage import UsageTracker, cached_system, get_usage_tracker
+
+
+def _usage(input_tokens=0, cache_write=0, cache_read=0, output_tokens=0) -> Mock:
+    return Mock(
+        input_tokens=input_tokens,
+        cache_creation_input_tokens=cache_write,
+        cache_read_input_tokens=cache_read,
+        output_tokens=output_tokens,
+    )
+
+
+class TestCachedSystem:
+    """Tests for cached_system."""
+
+    def test_breakpoint_on_static_prefix(self):
+        """Test the static block carries an ephemeral cache breakpoint."""
+        assert cached_system("固定指示", enabled=True) == [
+            {"type": "text", "text": "固定指示", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_disabled_sends_plain_block(self):
+        """Test disabling caching drops the breakpoint but keeps the prompt."""
+        assert cached_system("固定指示", enabled=False) == [{"type": "text", "text": "固定指示"}]
+
+
+class TestUsageTracker:
+    """Tests for UsageTracker."""
+
+    def test_records_cache_split_and_summarizes(self):
+        """Test usage is split per call and aggregated by label."""
+        tracker = UsageTracker()
+        tracker.record("writer.draft", "m", _usage(300, cache_write=2000, output_tokens=900), 20.0)
+        mark = tracker.mark()
+        tracker.record("writer.draft", "m", _usage(320, cache_read=2000, output_tokens=950), 15.0)
+        tracker.record("reviewer.review", "m", _usage(4000, cache_read=900, output_tokens=500), 8.0)
+
+        draft = tracker.summary()["writer.draft"]
+        assert draft.calls == 2
+        assert draft.input_tokens == 620
+        assert draft.cache_creation_input_tokens == 2000
+        assert draft.cache_read_input_tokens == 2000
+
+        batch = tracker.total(since=mark)
+        assert batch.calls == 2
+        assert batch.cache_read_input_tokens == 2900
+        assert batch.cache_hit_ratio == 2900 / 7220
+        assert tracker.total().calls == 3
+
+    def test_openai_usage_mapped(self):
+        """Test OpenAI prompt/completion tokens map onto the same fields with cached tokens split out."""
+        usage = Mock(prompt_tokens=1500, completion_tokens=200, prompt_tokens_details=Mock(cached_tokens=1024))
+
+        call = UsageTracker().record("research.outline", "gpt-4o", usage, retries=2)
+
+        assert (call.input_tokens, call.cache_read_input_tokens, call.output_tokens) == (476, 1024, 200)
+        assert call.retries == 2
+
+    def test_missing_usage_counts_zero(self):
+        """Test responses without usage are recorded with zero tokens."""
+        call = UsageTracker().record("x", "m", None)
+
+        assert call.total_input_tokens == 0
+        assert call.cache_hit_ratio == 0.0
+
+
+class TestAgentPromptCaching:
+    """Tests for the static/dynamic prompt split in the agents."""
+
+    @patch("src.agents.writer_agent.get_anthropic_client")
+    def test_writer_calls_share_cached_system_prefix(self, mock_anthropic):
+        """Test revise and refine send the same cached instructions and only article data as user input."""
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(
+            content=[Mock(text="# 改善後の記事")], usage=_usage(200, cache_read=2500, output_tokens=50)
+        )
+        mock_anthropic.return_value = mock_client
+        tracker = get_usage_tracker()
+        mark = tracker.mark()
+
+        WriterAgent().revise_draft("# 元の記事", "改善してください", {})
+
+        calls = mock_client.messages.create.call_args_list
+        assert len(calls) == 2
+        systems = [c.kwargs["system"] for c in calls]
+        assert systems[0] == systems[1]
+        assert systems[0][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "★必須の記事構造" in systems[0][0]["text"]
+        assert all("### 2. 冒頭「会議の一言」" not in c.kwargs["messages"][0]["content"] for c in calls)
+        labels = [c.label for c in tracker.calls[mark:]]
+        assert labels == ["writer.revise", "writer.refine"]
+        assert tracker.total(since=mark).cache_read_input_tokens == 5000
+
+    @patch("src.agents.reviewer_agent.get_anthropic_client")
+    def test_reviewer_rubric_is_cached_prefix(self, mock_anthropic):
+        """Test the rubric is sent as the cached system prompt and the score goes in the user prompt."""
+        mock_client = Mock()
+        mock_client.messages.create.return_value = Mock(content=[Mock(text="{}")], usage=_usage(100))
+        mock_anthropic.return_value = mock_client
+
+        ReviewerAgent().review("# 記事", "経営企画部長", "")
+
+        kwargs = mock_client.messages.create.call_args.kwargs
+        assert kwargs["system"][0]["text"] == REVIEW_INSTRUCTIONS
+        assert "cache_control" in kwargs["system"][0]
+        prompt = kwargs["messages"][0]["content"]
+        assert "評価基準" not in prompt
+        assert "プログラム検出スコア" in prompt
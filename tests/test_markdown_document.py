@@ -0,0 +1,83 @@
+"""
+Unit tests for EPM Note Engine Markdown document model.
+
+Tests the parsed structure, offsets and memoization.
+"""
+
+from src.services.markdown_document import clear_cache, parse_markdown
+
+SAMPLE = """# 予算管理の基本
+
+「予算、誰が作ってるの？」
+**結論から言います。** 予算は**経営の言語**です。
+
+## 目次
+- 予算管理とは
+- まとめ
+
+## 予算管理とは
+### 手順
+1. 目標を決める
+2. 予実を比較する
+
+---
+## まとめ
+予算管理で経営を改善しましょう。"""
+
+
+class TestParseMarkdown:
+    """Tests for parse_markdown."""
+
+    def test_headings_and_offsets(self):
+        """Test headings are parsed with levels and line offsets."""
+        document = parse_markdown(SAMPLE)
+
+        assert document.title == "予算管理の基本"
+        assert document.headings_at(2) == ["目次", "予算管理とは", "まとめ"]
+        assert document.headings_at(3) == ["手順"]
+        for heading in document.headings:
+            assert SAMPLE[heading.offset:].startswith("#" * heading.level + " " + heading.text)
+
+    def test_sections_end_at_next_heading_of_same_level(self):
+        """Test an H2 section contains its H3 subsections."""
+        document = parse_markdown(SAMPLE)
+        section = next(s for s in document.sections if s.heading.text == "予算管理とは")
+        body = SAMPLE[section.start:section.end]
+
+        assert "### 手順" in body
+        assert "## まとめ" not in body
+
+    def test_paragraphs_lists_and_bold(self):
+        """Test paragraphs, list items and bold spans."""
+        document = parse_markdown(SAMPLE)
+
+        assert document.first_paragraph.startswith("「予算、誰が作ってるの？」 **結論から言います。**")
+        assert [item.text for item in document.list_items if not item.ordered] == ["予算管理とは", "まとめ"]
+        assert [item.text for item in document.list_items if item.ordered] == ["目標を決める", "予実を比較する"]
+        assert [span.text for span in document.bold_spans] == ["結論から言います。", "経営の言語"]
+        span = document.bold_spans[1]
+        assert SAMPLE[span.start:span.end] == "**経営の言語**"
+
+    def test_conclusion_lookups(self):
+        """Test heading search and thematic break lookup."""
+        document = parse_markdown(SAMPLE)
+
+        assert document.find_heading("まとめ", min_level=2).offset == SAMPLE.index("## まとめ")
+        assert document.find_break().offset == SAMPLE.index("---")
+        assert document.find_heading("存在しない") is None
+
+    def test_memoized_by_content(self):
+        """Test identical content returns the same parsed document."""
+        clear_cache()
+        first = parse_markdown(SAMPLE)
+
+        assert parse_markdown("".join([SAMPLE])) is first
+        assert parse_markdown(SAMPLE + "\n") is not first
+
+    def test_empty_document(self):
+        """Test empty content parses to an empty model."""
+        document = parse_markdown("")
+
+        assert document.title == ""
+        assert document.first_paragraph == ""
+        assert document.headings == ()
@@ -0,0 +1,95 @@
+"""
+Unit tests for EPM Note Engine paragraph statistics cache.
+
+Tests incremental re-tokenization and recombined document totals.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.japanese_tokenizer import JANOME_AVAILABLE, Token
+from src.services.paragraph_stats import ParagraphStatsCache, split_paragraphs
+
+
+def fake_tokenize(text: str) -> tuple[Token, ...]:
+    """Split on whitespace and tag every word as a noun."""
+    return tuple(Token(word, "名詞,一般,*,*") for word in text.split())
+
+
+@pytest.fixture
+def mock_tokenize():
+    """Patch the shared tokenizer with the whitespace tokenizer."""
+    with patch("src.services.paragraph_stats.tokenize", side_effect=fake_tokenize) as mock:
+        yield mock
+
+
+class TestSplitParagraphs:
+    """Tests for split_paragraphs."""
+
+    def test_splits_on_blank_lines(self):
+        """Test blank (or whitespace-only) lines separate paragraphs."""
+        content = "# 予算管理\n\n第一段落\n続き\n  \n第二段落\n\n\n"
+        assert split_paragraphs(content) == ["# 予算管理", "第一段落\n続き", "第二段落"]
+
+
+class TestParagraphStatsCache:
+    """Tests for ParagraphStatsCache."""
+
+    def test_document_totals_are_paragraph_sums(self, mock_tokenize):
+        """Test totals and noun counts are recombined across paragraphs."""
+        cache = ParagraphStatsCache()
+        stats = cache.document_stats("予算 管理 予算\n\n管理 会計 12")
+
+        assert stats.total_words == 6
+        assert stats.noun_frequency == {"予算": 2, "管理": 2, "会計": 1}
+        assert stats.paragraphs == 2
+        assert stats.tokenized_paragraphs == 2
+
+    def test_only_changed_paragraphs_are_tokenized(self, mock_tokenize):
+        """Test editing one paragraph re-tokenizes only that paragraph."""
+        cache = ParagraphStatsCache()
+        cache.document_stats("予算 管理\n\n経営 企画\n\nまとめ 予算")
+        mock_tokenize.reset_mock()
+
+        stats = cache.document_stats("予算 管理\n\n経営 企画 会議\n\nまとめ 予算")
+
+        mock_tokenize.assert_called_once_with("経営 企画 会議")
+        assert stats.tokenized_paragraphs == 1
+        assert stats.noun_frequency["予算"] == 2
+        assert stats.noun_frequency["会議"] == 1
+
+    def test_lru_eviction(self, mock_tokenize):
+        """Test the least recently used paragraph is evicted."""
+        cache = ParagraphStatsCache(max_entries=2)
+        cache.paragraph_stats("段落 一")
+        cache.paragraph_stats("段落 二")
+        cache.paragraph_stats("段落 一")
+        cache.paragraph_stats("段落 三")
+
+        assert cache.paragraph_stats("段落 一")[1] is True
+        assert cache.paragraph_stats("段落 二")[1] is False
+
+    @pytest.mark.skipif(not JANOME_AVAILABLE, reason="Janome not installed")
+    def test_keyword_analysis_matches_full_tokenization(self):
+        """Test cached analysis gives the same keyword results as a full pass."""
+        from src.agents.research_agent import ResearchAgent
+
+        content = (
+            "# 予算管理の基本\n\n"
+            "予算管理は経営管理の中心です。予算管理の目的を解説します。\n\n"
+            "## 予算管理の手順\n\n"
+            "まず予算を策定し、次に予実分析を行います。\n\n"
+            "## まとめ\n\n"
+            "予算管理で経営を改善しましょう。"
+        )
+
+        agent = ResearchAgent()
+        full = agent.analyze_keyword_density(content, ["予算管理"])
+        cached = agent.analyze_keyword_density(
+            content, ["予算管理"], paragraph_cache=ParagraphStatsCache()
+        )
+
+        assert cached.noun_frequency == full.noun_frequency
+        assert cached.primary_keyword.count == full.primary_keyword.count
+        assert abs(cached.total_words - full.total_words) <= content.count("\n\n")
@@ -0,0 +1,200 @@
+"""
+Unit tests for EPM Note Engine RAGService.
+
+Tests id-based pruning and HNSW settings with a mocked Chroma collection.
+"""
+
+from unittest.mock import Mock
+
+from src.repositories.rag_service import RAGService, document_id_prefix, hnsw_metadata
+
+
+def _make_service(stored_ids: list[str]) -> tuple[RAGService, Mock]:
+    """Create a RAGService whose archive collection pages over stored_ids."""
+    collection = Mock()
+
+    def fake_get(include=None, limit=None, offset=0):
+        return {"ids": stored_ids[offset:offset + limit]}
+
+    collection.get.side_effect = fake_get
+
+    service = RAGService.__new__(RAGService)
+    service._knowledge_base = Mock()
+    service._archive_index = collection
+    return service, collection
+
+
+class TestDocumentIdPrefix:
+    """Tests for document_id_prefix helper."""
+
+    def test_strips_chunk_index(self):
+        """Test chunk suffix is removed from article ids."""
+        assert document_id_prefix("article_abc-123_004") == "article_abc-123"
+
+    def test_knowledge_base_id(self):
+        """Test knowledge base hash ids."""
+        assert document_id_prefix("0a1b2c3d4e5f_000") == "0a1b2c3d4e5f"
+
+    def test_snippet_id_unchanged(self):
+        """Test ids without chunk suffix are returned as-is."""
+        snippet_id = "snippet_1f0e2d3c-0000-4000-8000-123456789abc"
+        assert document_id_prefix(snippet_id) == snippet_id
+
+
+class TestPruneDocuments:
+    """Tests for RAGService.prune_documents."""
+
+    def test_iter_document_ids_pages(self):
+        """Test ids are fetched page by page without metadata."""
+        ids = [f"article_a_{i:03d}" for i in range(5)]
+        service, collection = _make_service(ids)
+
+        pages = list(service.iter_document_ids("archive_index", page_size=2))
+
+        assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+        for call in collection.get.call_args_list:
+            assert call.kwargs["include"] == []
+
+    def test_prunes_shrunk_and_missing_sources(self):
+        """Test stale chunks of shrunk and deleted sources are removed."""
+        ids = [
+            "article_a_000", "article_a_001", "article_a_002",
+            "article_b_000",
+            "snippet_s1",
+        ]
+        service, collection = _make_service(ids)
+        manifest = {
+            "article_a": {"article_a_000", "article_a_001"},
+            "snippet_s1": None,
+        }
+
+        deleted = service.prune_documents("archive_index", manifest, page_size=2)
+
+        assert deleted == 2
+        collection.delete.assert_called_once_with(ids=["article_a_002", "article_b_000"])
+
+    def test_keeps_missing_sources_without_prune_missing(self):
+        """Test absent sources survive when prune_missing is False."""
+        ids = ["article_a_000", "article_a_001", "article_b_000"]
+        service, collection = _make_service(ids)
+
+        deleted = service.prune_documents(
+            "archive_index",
+            {"article_a": {"article_a_000"}},
+            prune_missing=False,
+        )
+
+        assert deleted == 1
+        collection.delete.assert_called_once_with(ids=["article_a_001"])
+
+    def test_owner_key_keeps_documents_added_elsewhere(self):
+        """Test absent sources are only pruned when their metadata marks them as owned."""
+        metadatas = {
+            "0a1b2c3d4e5f_000": {"source_path": "91_RefDoc/old.md"},
+            "manual_note": {"title": "手動追加"},
+        }
+        service, collection = _make_service(["0a1b2c3d4e5f_000", "manual_note"])
+        collection.get.side_effect = lambda ids=None, include=None, limit=None, offset=0: (
+            {"ids": ids, "metadatas": [metadatas[i] for i in ids]} if ids is not None
+            else {"ids": list(metadatas)[offset:offset + limit]}
+        )
+
+        deleted = service.prune_documents("archive_index", {}, owner_key="source_path")
+
+        assert deleted == 1
+        collection.delete.assert_called_once_with(ids=["0a1b2c3d4e5f_000"])
+
+    def test_deletes_in_batches(self):
+        """Test large deletions are split into id batches."""
+        ids = [f"article_gone_{i:03d}" for i in range(5)]
+        service, collection = _make_service(ids)
+
+        deleted = service.prune_documents("archive_index", {}, batch_size=2)
+
+        assert deleted == 5
+        assert collection.delete.call_count == 3
+
+    def test_nothing_to_prune(self):
+        """Test no delete call when every chunk is current."""
+        service, collection = _make_service(["snippet_s1"])
+
+        deleted = service.prune_documents("archive_index", {"snippet_s1": {"snippet_s1"}})
+
+        assert deleted == 0
+        collection.delete.assert_not_called()
+
+
+class TestHnswSettings:
+    """Tests for HNSW collection parameters."""
+
+    def _settings(self, **overrides):
+        settings = Mock(
+            chroma_hnsw_space="cosine",
+            chroma_hnsw_m=32,
+            chroma_hnsw_construction_ef=200,
+            chroma_hnsw_search_ef=64,
+        )
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        return settings
+
+    def _service(self, settings) -> RAGService:
+        service = RAGService.__new__(RAGService)
+        service._hnsw_metadata = hnsw_metadata(settings)
+        return service
+
+    def _collection(self, **hnsw):
+        collection = Mock()
+        collection.name = "archive_index_v2"
+        collection.configuration = {"hnsw": {
+            "space": "cosine",
+            "max_neighbors": 32,
+            "ef_construction": 200,
+            "ef_search": 64,
+            **hnsw,
+        }}
+        return collection
+
+    def test_metadata_from_settings(self):
+        """Test settings map to Chroma hnsw:* metadata keys."""
+        assert hnsw_metadata(self._settings()) == {
+            "hnsw:space": "cosine",
+            "hnsw:M": 32,
+            "hnsw:construction_ef": 200,
+            "hnsw:search_ef": 64,
+        }
+
+    def test_collection_metadata_includes_hnsw(self):
+        """Test created collections carry description and HNSW parameters."""
+        service = self._service(self._settings())
+        metadata = service._collection_metadata(RAGService.ARCHIVE_INDEX_COLLECTION)
+
+        assert metadata["description"] == "Past articles and snippets"
+        assert metadata["hnsw:M"] == 32
+
+    def test_search_ef_updated_in_place(self):
+        """Test a changed search_ef is applied to the existing collection."""
+        service = self._service(self._settings())
+        collection = self._collection(ef_search=10)
+
+        service._apply_search_ef(collection)
+
+        collection.modify.assert_called_once_with(configuration={"hnsw": {"ef_search": 64}})
+
+    def test_matching_collection_untouched(self):
+        """Test no modify call when the collection already matches."""
+        service = self._service(self._settings())
+        collection = self._collection()
+
+        service._apply_search_ef(collection)
+
+        collection.modify.assert_not_called()
+
+    def test_build_params_not_modified(self):
+        """Test build-time parameters are never changed on an existing index."""
+        service = self._service(self._settings())
+        collection = self._collection(max_neighbors=16, space="l2")
+
+        service._apply_search_ef(collection)
+
+        collection.modify.assert_not_called()
@@ -0,0 +1,129 @@
+"""
+Unit tests for EPM Note Engine knowledge base seeder.
+
+Tests the parse pipeline (bounded in-flight work, failed files skipped)
+and batched upserts with deterministic chunk ids, using a mocked RAGService.
+"""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import patch
+
+from scripts import seed_knowledge_base as seeder
+
+
+def _write_ref_docs(ref_doc_dir: Path) -> None:
+    (ref_doc_dir / "01_参考サイト").mkdir(parents=True)
+    (ref_doc_dir / "03_本").mkdir()
+    paragraphs = [f"第{i}章の要点です。" + "予算と実績の差異を分析します。" * 40 for i in range(150)]
+    (ref_doc_dir / "01_参考サイト" / "a_long.md").write_text(
+        "# 長い資料\n\n" + "\n\n".join(paragraphs), encoding="utf-8",
+    )
+    (ref_doc_dir / "03_本" / "b_note.txt").write_text("読書メモ", encoding="utf-8")
+    (ref_doc_dir / "03_本" / "c_broken.json").write_text("{not json", encoding="utf-8")
+    (ref_doc_dir / "03_本" / "d_research.json").write_text(
+        json.dumps({"title": "調査", "content": "調査結果"}, ensure_ascii=False), encoding="utf-8",
+    )
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread pool standing in for the process pool, counting submissions."""
+
+    submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        type(self).submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+class _BreakingExecutor(ThreadPoolExecutor):
+    """Thread pool whose worker "dies" on 3.md, breaking the pool like a process pool."""
+
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers=max_workers)
+        self.broken = False
+
+    def submit(self, fn, /, *args, **kwargs):
+        if self.broken:
+            raise BrokenProcessPool("pool is broken")
+        if args[0].name == "3.md":
+            self.broken = True
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestIterParsedFiles:
+    """Tests for the parallel parse pipeline."""
+
+    def test_in_flight_work_capped_and_errors_skipped(self, tmp_path):
+        """Test at most workers*2 files are queued ahead and a crashing parse yields no chunks."""
+        files = [tmp_path / f"{i}.md" for i in range(10)]
+
+        def fake_process(file_path, ref_doc_dir):
+            if file_path.name == "3.md":
+                raise RuntimeError("worker crashed")
+            return [(file_path.stem, "text", {})]
+
+        _CountingExecutor.submitted = 0
+        with patch.object(seeder, "ProcessPoolExecutor", _CountingExecutor), \
+                patch.object(seeder, "process_file", side_effect=fake_process):
+            results = seeder.iter_parsed_files(files, tmp_path, workers=2)
+            first = next(results)
+            assert _CountingExecutor.submitted <= 2 * 2 + 1
+            results = dict([first, *results])
+
+        assert set(results) == set(files)
+        assert results[tmp_path / "3.md"] == []
+        assert results[tmp_path / "4.md"] == [("4", "text", {})]
+
+    def test_broken_pool_falls_back_to_serial(self, tmp_path):
+        """Test a dead worker skips the files in flight and parses the rest in-process."""
+        files = [tmp_path / f"{i}.md" for i in range(10)]
+
+        def fake_process(file_path, ref_doc_dir):
+            return [(file_path.stem, "text", {})]
+
+        with patch.object(seeder, "ProcessPoolExecutor", _BreakingExecutor), \
+                patch.object(seeder, "process_file", side_effect=fake_process):
+            results = list(seeder.iter_parsed_files(files, tmp_path, workers=2))
+
+        by_file = dict(results)
+        assert sorted(by_file) == sorted(files)
+        assert len(results) == len(files)
+        assert by_file[tmp_path / "3.md"] == []
+        assert by_file[tmp_path / "9.md"] == [("9", "text", {})]
+
+
+class TestSeedKnowledgeBase:
+    """Tests for seed_knowledge_base."""
+
+    @patch.object(seeder, "RAGService")
+    def test_chunks_upserted_in_order_with_deterministic_ids(self, mock_rag_cls, tmp_path):
+        """Test every chunk is upserted once in file order and a broken file is skipped."""
+        _write_ref_docs(tmp_path)
+        rag = mock_rag_cls.return_value
+        rag.prune_documents.return_value = 0
+
+        stats = seeder.seed_knowledge_base(tmp_path, workers=1)
+
+        batches = [c.kwargs["document_ids"] for c in rag.add_documents.call_args_list]
+        upserted = [doc_id for batch in batches for doc_id in batch]
+        expected = []
+        for rel in ["01_参考サイト/a_long.md", "03_本/b_note.txt", "03_本/d_research.json"]:
+            chunks = seeder.process_file(tmp_path / rel, tmp_path)
+            prefix = seeder.source_id_prefix(str(Path(rel)))
+            assert [c[0] for c in chunks] == [f"{prefix}_{i:03d}" for i in range(len(chunks))]
+            expected.extend(c[0] for c in chunks)
+
+        assert upserted == expected
+        assert len(batches) == 2 and len(batches[0]) >= seeder.INSERT_BATCH_SIZE
+        assert stats["files_processed"] == 3
+        assert stats["errors"] == 1
+        assert stats["chunks_created"] == len(expected)
+
+        manifest = rag.prune_documents.call_args.args[1]
+        assert manifest[seeder.source_id_prefix(str(Path("03_本/c_broken.json")))] is None
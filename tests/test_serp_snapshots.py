@@ -0,0 +1,202 @@
+"""
+Unit tests for EPM Note Engine SERP snapshots.
+
+Tests result normalization, snapshot reuse, page deduplication and local
+diff/trend computation.
+"""
+
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.repositories.serp_snapshot_repository import SerpSnapshotRepository
+from src.services import serp_snapshots
+from src.services.serp_snapshots import (
+    diff_snapshots,
+    normalize_serp_results,
+    rank_trend,
+    search_with_snapshots,
+)
+
+PAYLOAD = {"query": "予算管理 経営管理", "search_depth": "advanced", "max_results": 2}
+
+
+def _response(*pages):
+    return {
+        "answer": "回答",
+        "results": [{"url": url, "title": title, "content": content, "score": 0.5} for url, title, content in pages],
+    }
+
+
+def _snapshot(snapshot_date, *pages):
+    return {
+        "snapshot_date": snapshot_date,
+        "results": normalize_serp_results(_response(*pages)),
+    }
+
+
+@pytest.fixture
+def enabled():
+    """Enable snapshots (disabled globally in conftest)."""
+    with patch("src.services.serp_snapshots.snapshots_enabled", return_value=True):
+        yield
+
+
+class TestNormalizeSerpResults:
+    """Tests for normalize_serp_results."""
+
+    def test_ranks_and_hashes(self):
+        """Test results are ranked and identical pages hash identically."""
+        results = normalize_serp_results(_response(
+            ("https://a", " 予算  管理 ", "本文"),
+            ("https://b", "予実", "本文"),
+        ))
+
+        assert [r["rank"] for r in results] == [1, 2]
+        assert results[0]["title"] == "予算 管理"
+        again = normalize_serp_results(_response(("https://a", "予算 管理", "本文 ")))
+        assert again[0]["content_hash"] == results[0]["content_hash"]
+        assert results[0]["content_hash"] != results[1]["content_hash"]
+
+
+class TestSearchWithSnapshots:
+    """Tests for search_with_snapshots."""
+
+    def test_recent_snapshot_skips_api(self, enabled):
+        """Test a recent snapshot is returned without calling Tavily."""
+        stored = {"answer": "保存済み", "results": [], "snapshot_date": "2026-10-18"}
+        with patch.object(serp_snapshots, "load_recent_snapshot", return_value=stored), \
+             patch.object(serp_snapshots, "tavily_search") as mock_search:
+            assert search_with_snapshots(PAYLOAD, "evidence") is stored
+
+        mock_search.assert_not_called()
+
+    def test_miss_searches_and_records(self, enabled):
+        """Test a miss calls Tavily and records the response."""
+        response = _response(("https://a", "A", "本文"))
+        with patch.object(serp_snapshots, "load_recent_snapshot", return_value=None), \
+             patch.object(serp_snapshots, "tavily_search", return_value=response), \
+             patch.object(serp_snapshots, "record_snapshot") as mock_record:
+            assert search_with_snapshots(PAYLOAD, "evidence") is response
+
+        mock_record.assert_called_once_with(PAYLOAD, response, "evidence")
+
+    def test_disabled_calls_api_only(self):
+        """Test snapshots are neither read nor written when disabled."""
+        with patch.object(serp_snapshots, "load_recent_snapshot") as mock_load, \
+             patch.object(serp_snapshots, "tavily_search", return_value={"results": []}):
+            search_with_snapshots(PAYLOAD)
+
+        mock_load.assert_not_called()
+
+    def test_load_maps_snapshot_to_response(self):
+        """Test a stored snapshot is served in Tavily response shape."""
+        results = normalize_serp_results(_response(
+            ("https://a", "A", "本文A"), ("https://b", "B", "本文B"), ("https://c", "C", "本文C"),
+        ))
+        snapshot = Mock(
+            query="予算管理 経営管理", domain_profile="", search_depth="advanced",
+            snapshot_date=date(2026, 10, 18), answer="回答", results_hash="h",
+            results=[{k: v for k, v in r.items() if k != "content"} for r in results],
+        )
+        pages = {r["content_hash"]: Mock(content=r["content"]) for r in results}
+        session = MagicMock()
+        with patch.object(serp_snapshots, "get_session") as mock_get_session, \
+             patch.object(serp_snapshots, "SerpSnapshotRepository") as mock_repo_cls:
+            mock_get_session.return_value.__enter__ = Mock(return_value=session)
+            mock_get_session.return_value.__exit__ = Mock(return_value=None)
+            mock_repo_cls.return_value.get_latest.return_value = snapshot
+            mock_repo_cls.return_value.get_pages.return_value = pages
+
+            response = serp_snapshots.load_recent_snapshot(PAYLOAD, max_age_days=1)
+
+        get_latest = mock_repo_cls.return_value.get_latest
+        assert get_latest.call_args.args[:4] == (
+            "予算管理 経営管理", None, "advanced", serp_snapshots._snapshot_key(PAYLOAD)[2],
+        )
+        assert get_latest.call_args.kwargs["min_results"] == 2
+        assert response["answer"] == "回答"
+        assert [r["content"] for r in response["results"]] == ["本文A", "本文B"]
+        assert response["snapshot_date"] == "2026-10-18"
+
+
+class TestSnapshotKey:
+    """Tests for matching snapshots to the filters of a search."""
+
+    def test_answer_flag_and_domains_change_key(self):
+        """Test searches differing only in answer flag or domain filters use different snapshots."""
+        filtered = {**PAYLOAD, "include_answer": True, "include_domains": ["b.jp", "A.jp"]}
+        key = serp_snapshots._snapshot_key(filtered)
+
+        assert serp_snapshots._snapshot_key({**filtered, "include_domains": ["a.jp", "b.jp"]}) == key
+        assert serp_snapshots._snapshot_key({**filtered, "include_answer": False}) != key
+        unfiltered = {k: v for k, v in filtered.items() if k != "include_domains"}
+        assert serp_snapshots._snapshot_key(unfiltered) != key
+
+
+class TestSerpSnapshotRepository:
+    """Tests for SerpSnapshotRepository.save."""
+
+    @staticmethod
+    def _sql(statement) -> str:
+        from sqlalchemy.dialects import postgresql
+
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    def test_saves_sharing_a_page_upsert(self):
+        """Test two snapshots sharing a page insert it with ON CONFLICT instead of check-then-insert."""
+        shared = ("https://a", "A", "本文")
+        first = normalize_serp_results(_response(shared, ("https://b", "B", "本文")))
+        second = normalize_serp_results(_response(("https://c", "C", "本文"), shared))
+        session = MagicMock()
+        repo = SerpSnapshotRepository(session)
+
+        repo.save("q1", None, "advanced", "f", 2, "", first, "h1")
+        repo.save("q2", "evidence", "advanced", "f", 2, "", second, "h2")
+
+        page_inserts = [c.args[0] for c in session.execute.call_args_list]
+        assert len(page_inserts) == 2
+        for statement, results in zip(page_inserts, [first, second]):
+            assert "ON CONFLICT (content_hash) DO NOTHING" in self._sql(statement)
+            rows = statement.compile().params
+            assert {v for k, v in rows.items() if k.startswith("content_hash")} == {
+                r["content_hash"] for r in results
+            }
+        snapshot_inserts = [c.args[0] for c in session.scalars.call_args_list]
+        assert all(
+            "ON CONFLICT ON CONSTRAINT uq_serp_snapshots_query_profile_depth_filter_date DO UPDATE"
+            in self._sql(statement)
+            for statement in snapshot_inserts
+        )
+        stored = snapshot_inserts[1].compile().params
+        assert stored["domain_profile"] == "evidence"
+        assert all("content" not in r for r in stored["results"])
+        session.add.assert_not_called()
+
+
+class TestSnapshotDiff:
+    """Tests for diff_snapshots and rank_trend."""
+
+    def test_diff(self):
+        """Test added, removed, moved and changed pages are detected."""
+        old = _snapshot("2026-10-17", ("https://a", "A", "1"), ("https://b", "B", "1"), ("https://c", "C", "1"))
+        new = _snapshot("2026-10-18", ("https://b", "B", "2"), ("https://a", "A", "1"), ("https://d", "D", "1"))
+
+        diff = diff_snapshots(old, new)
+
+        assert diff.added == ["https://d"]
+        assert diff.removed == ["https://c"]
+        assert diff.moved == {"https://b": (2, 1), "https://a": (1, 2)}
+        assert diff.changed == ["https://b"]
+        assert diff_snapshots(old, old).unchanged
+
+    def test_rank_trend(self):
+        """Test ranks are listed oldest first with None when absent."""
+        older = _snapshot("2026-10-16", ("https://a", "A", "1"))
+        newer = _snapshot("2026-10-17", ("https://b", "B", "1"), ("https://a", "A", "1"))
+
+        trend = rank_trend([newer, older])
+
+        assert trend["https://a"] == [("2026-10-16", 1), ("2026-10-17", 2)]
+        assert trend["https://b"] == [("2026-10-16", None), ("2026-10-17", 1)]
@@ -0,0 +1,62 @@
+"""
+Unit tests for EPM Note Engine TaskGraph.
+
+Tests dependency ordering, concurrency, error propagation and timings.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.services.task_graph import TaskGraph
+
+
+class TestTaskGraph:
+    """Tests for TaskGraph."""
+
+    def test_passes_dependency_results(self):
+        """Test steps receive their dependencies' results as kwargs."""
+        graph = TaskGraph()
+        graph.add("a", lambda: 2)
+        graph.add("b", lambda: 3)
+        graph.add("c", lambda a, b: a * b, deps=["a", "b"])
+
+        assert graph.run() == {"a": 2, "b": 3, "c": 6}
+
+    def test_independent_steps_overlap(self):
+        """Test steps without dependencies run at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+        graph = TaskGraph(max_workers=2)
+        graph.add("a", lambda: barrier.wait() is not None)
+        graph.add("b", lambda: barrier.wait() is not None)
+
+        # Would raise BrokenBarrierError if the steps ran sequentially
+        assert graph.run() == {"a": True, "b": True}
+
+    def test_dependent_step_waits(self):
+        """Test a step starts only after its dependency finishes."""
+        graph = TaskGraph()
+        graph.add("slow", lambda: time.sleep(0.05))
+        graph.add("after", lambda slow: None, deps=["slow"])
+        graph.run()
+
+        assert graph.timings["after"].started_at >= graph.timings["slow"].finished_at
+
+    def test_failure_stops_downstream_steps(self):
+        """Test the first error is raised and dependents never run."""
+        ran = []
+        graph = TaskGraph()
+        graph.add("bad", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        graph.add("next", lambda bad: ran.append(bad), deps=["bad"])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            graph.run()
+        assert ran == []
+        assert "bad" in graph.timings
+
+    def test_unknown_dependency_rejected(self):
+        """Test dependencies must be added first."""
+        graph = TaskGraph()
+        with pytest.raises(ValueError):
+            graph.add("b", lambda a: a, deps=["a"])
@@ -0,0 +1,346 @@
+"""
+Unit tests for EPM Note Engine Tavily gateway and response cache.
+
+Tests payload normalization, TTL expiry, single-flight coalescing, rate
+limiting and the async gateway.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from src.services import tavily_gateway
+from src.services.rate_limit import TokenBucket
+from src.services.response_cache import ResponseCache, SingleFlight
+from src.services.tavily_gateway import (
+    AsyncTavilyGateway,
+    TavilyAPIError,
+    normalize_search_payload,
+    run_tavily_searches,
+    tavily_search,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Temporary Tavily response cache."""
+    return ResponseCache(tmp_path / "cache.sqlite3", namespace="tavily", ttl_seconds=60)
+
+
+class TestNormalizeSearchPayload:
+    """Tests for cache key normalization."""
+
+    def test_equivalent_payloads_match(self):
+        """Test whitespace, case and domain order do not change the key."""
+        a = normalize_search_payload({
+            "query": "予算管理  FP&A",
+            "search_depth": "advanced",
+            "max_results": 5,
+            "include_domains": ["b.com", "A.com"],
+        })
+        b = normalize_search_payload({
+            "query": " 予算管理 fp&a ",
+            "search_depth": "advanced",
+            "max_results": 5,
+            "include_domains": ["a.com", "b.com"],
+            "exclude_domains": [],
+        })
+        assert a == b
+
+    def test_max_results_is_part_of_key(self):
+        """Test different result counts are cached separately."""
+        a = normalize_search_payload({"query": "q", "max_results": 5})
+        b = normalize_search_payload({"query": "q", "max_results": 10})
+        assert a != b
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_round_trip(self, cache):
+        """Test stored values are returned."""
+        cache.set("k", {"results": [{"url": "https://example.com"}]})
+        assert cache.get("k") == {"results": [{"url": "https://example.com"}]}
+
+    def test_expired_entry_is_miss(self, tmp_path):
+        """Test entries past their TTL are not returned."""
+        cache = ResponseCache(tmp_path / "c.sqlite3", namespace="tavily", ttl_seconds=-1)
+        cache.set("k", {"a": 1})
+        assert cache.get("k") is None
+        assert cache.purge_expired() == 1
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test namespaces sharing a file do not see each other."""
+        a = ResponseCache(tmp_path / "c.sqlite3", namespace="a", ttl_seconds=60)
+        b = ResponseCache(tmp_path / "c.sqlite3", namespace="b", ttl_seconds=60)
+        a.set("k", 1)
+        assert b.get("k") is None
+
+    def test_size_budget_evicts_oldest(self, tmp_path):
+        """Test writes beyond max_bytes drop the oldest entries and keep the newest."""
+        cache = ResponseCache(tmp_path / "c.sqlite3", namespace="llm", ttl_seconds=60, max_bytes=250)
+        for key in ["a", "b", "c"]:
+            cache.set(key, "x" * 100)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_calls_coalesce(self):
+        """Test concurrent callers share one execution."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(single_flight.do("k", slow)))
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=lambda: results.append(single_flight.do("k", slow)))
+        follower.start()
+        leader.join()
+        follower.join()
+
+        assert len(calls) == 1
+        assert sorted(results) == [("result", False), ("result", True)]
+
+    def test_exception_is_not_remembered(self):
+        """Test a failed call does not poison later calls."""
+        single_flight = SingleFlight()
+        with pytest.raises(RuntimeError):
+            single_flight.do("k", Mock(side_effect=RuntimeError("boom")))
+        assert single_flight.do("k", lambda: 42) == (42, False)
+
+
+class TestTavilySearch:
+    """Tests for synchronous searches on the shared gateway."""
+
+    @pytest.fixture
+    def shared_gateway(self):
+        """Install a gateway backed by a mock transport on the shared loop."""
+        loop = tavily_gateway._event_loop()
+        installed = []
+
+        def install(handler, **kwargs) -> AsyncTavilyGateway:
+            gateway = _gateway(handler, **kwargs)
+            tavily_gateway._async_gateways[loop] = gateway
+            installed.append(gateway)
+            return gateway
+
+        yield install
+        for gateway in installed:
+            asyncio.run_coroutine_threadsafe(gateway.aclose(), loop).result()
+        tavily_gateway._async_gateways.pop(loop, None)
+
+    def test_second_call_served_from_cache(self, cache, shared_gateway):
+        """Test an identical payload does not call the API twice."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"results": [{"title": "t"}], "answer": "a"})
+
+        shared_gateway(handler)
+        payload = {"query": "予算管理", "search_depth": "advanced", "max_results": 5}
+
+        with patch("src.services.tavily_gateway.get_tavily_cache", return_value=cache):
+            first = tavily_search(payload)
+            second = tavily_search(dict(payload, query="予算管理 "))
+
+        assert first == second
+        assert len(calls) == 1
+
+    def test_failures_are_not_cached(self, cache, shared_gateway):
+        """Test a failed search is retried on the next call."""
+        responses = [httpx.Response(400, text="bad"), httpx.Response(200, json={"results": []})]
+        shared_gateway(lambda request: responses.pop(0))
+
+        with patch("src.services.tavily_gateway.get_tavily_cache", return_value=cache):
+            with pytest.raises(TavilyAPIError):
+                tavily_search({"query": "q"})
+            assert tavily_search({"query": "q"}) == {"results": []}
+
+    def test_threads_share_one_request(self, shared_gateway):
+        """Test identical searches from different threads are coalesced on the shared loop."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"results": []})
+
+        shared_gateway(handler)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(tavily_search({"query": "予算管理"})))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [{"results": []}] * 3
+        assert len(calls) == 1
+
+    def test_batches_reuse_open_gateway(self, shared_gateway):
+        """Test batch searches run on the long-lived gateway without closing its pool."""
+        gateway = shared_gateway(lambda request: httpx.Response(200, json={"results": []}))
+
+        assert run_tavily_searches([{"query": "a"}, {"query": "b"}]) == [{"results": []}] * 2
+        assert run_tavily_searches([{"query": "c"}]) == [{"results": []}]
+        assert not gateway._client.is_closed
+
+
+def _gateway(handler, **kwargs) -> AsyncTavilyGateway:
+    client = httpx.AsyncClient(
+        base_url="https://tavily.test", transport=httpx.MockTransport(handler)
+    )
+    return AsyncTavilyGateway("key", http_client=client, **kwargs)
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        """Test the burst is served immediately and the next token must wait."""
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert 0 < bucket.try_acquire() <= 0.1
+
+    def test_acquire_timeout(self):
+        """Test acquire fails fast when the wait exceeds the timeout."""
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+
+        with pytest.raises(TimeoutError):
+            bucket.acquire(timeout=0.01)
+
+    async def test_cancelled_waiter_takes_no_token(self):
+        """Test cancelling an async waiter leaves the bucket untouched."""
+        bucket = TokenBucket(rate=20, capacity=1)
+        bucket.try_acquire()
+        waiter = asyncio.ensure_future(bucket.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.sleep(0.06)
+        assert bucket.try_acquire() == 0.0
+
+
+class TestAsyncTavilyGateway:
+    """Tests for AsyncTavilyGateway."""
+
+    async def test_identical_searches_share_one_request(self):
+        """Test concurrent identical searches are coalesced."""
+        calls = []
+
+        async def handler(request):
+            calls.append(json.loads(request.content))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"results": [{"title": "t"}]})
+
+        gateway = _gateway(handler)
+        first, second = await asyncio.gather(
+            gateway.search({"query": "予算管理"}),
+            gateway.search({"query": "予算管理 "}),
+        )
+        await gateway.aclose()
+
+        assert first == second == {"results": [{"title": "t"}]}
+        assert len(calls) == 1
+
+    async def test_concurrency_cap(self):
+        """Test no more than max_concurrency requests are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return httpx.Response(200, json={"results": []})
+
+        gateway = _gateway(handler, max_concurrency=2)
+        results = await gateway.search_many([{"query": f"q{i}"} for i in range(6)])
+        await gateway.aclose()
+
+        assert results == [{"results": []}] * 6
+        assert peak == 2
+
+    async def test_retries_rate_limited_response(self):
+        """Test a 429 is retried after Retry-After."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"results": []}),
+        ]
+
+        gateway = _gateway(lambda request: responses.pop(0))
+        assert await gateway.search({"query": "q"}) == {"results": []}
+        await gateway.aclose()
+
+    async def test_client_error_is_not_retried(self):
+        """Test a 400 raises immediately."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, text="bad query")
+
+        gateway = _gateway(handler)
+        with pytest.raises(TavilyAPIError) as exc_info:
+            await gateway.search({"query": "q"})
+        await gateway.aclose()
+
+        assert exc_info.value.status_code == 400
+        assert len(calls) == 1
+
+    async def test_deadline_cancels_request(self):
+        """Test a search past its deadline raises and cancels the request."""
+        cancelled = asyncio.Event()
+
+        async def handler(request):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return httpx.Response(200, json={})
+
+        gateway = _gateway(handler)
+        with pytest.raises(TimeoutError):
+            await gateway.search({"query": "q"}, timeout=0.05)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await gateway.aclose()
+
+    async def test_rate_limiter_is_shared(self):
+        """Test searches wait for the shared token bucket."""
+        bucket = TokenBucket(rate=20, capacity=1)
+        gateway = _gateway(lambda request: httpx.Response(200, json={}), limiter=bucket)
+
+        start = time.monotonic()
+        await gateway.search_many([{"query": "a"}, {"query": "b"}, {"query": "c"}])
+        await gateway.aclose()
+
+        assert time.monotonic() - start >= 0.09
@@ -132,12 +132,10 @@ class TestThemeProposalAgent:
         assert d["proposals"][0]["title"] == "テストタイトル"
         assert len(d["seo_trends"]) == 2
 
-    @patch("src.agents.theme_proposal_agent.get_tavily_client")
-    def test_search_seo_trends_success(self, mock_get_client, mock_tavily_response):
+    @patch("src.agents.theme_proposal_agent.search_with_snapshots")
+    def test_search_seo_trends_success(self, mock_search, mock_tavily_response):
         """Test successful SEO trends search."""
-        mock_client = Mock()
-        mock_client.search.return_value = mock_tavily_response
-        mock_get_client.return_value = mock_client
+        mock_search.return_value = mock_tavily_response
 
         agent = ThemeProposalAgent()
         results, answer = agent.search_seo_trends("予算管理")
@@ -146,10 +144,10 @@ class TestThemeProposalAgent:
         assert results[0]["title"] == "予実管理の基本と実践"
         assert "予算管理" in answer
 
-    @patch("src.agents.theme_proposal_agent.get_tavily_client")
-    def test_search_seo_trends_no_client(self, mock_get_client):
-        """Test SEO trends search when Tavily client is not available."""
-        mock_get_client.return_value = None
+    @patch("src.agents.theme_proposal_agent.search_with_snapshots")
+    def test_search_seo_trends_not_configured(self, mock_search):
+        """Test SEO trends search when Tavily is not configured."""
+        mock_search.side_effect = ValueError("TAVILY_API_KEY is not configured")
 
         agent = ThemeProposalAgent()
         results, answer = agent.search_seo_trends("予算管理")
@@ -285,10 +283,10 @@ class TestThemeProposalAgent:
         assert "利用できません" in result.generation_summary
 
     @patch("src.agents.theme_proposal_agent.get_anthropic_client")
-    @patch("src.agents.theme_proposal_agent.get_tavily_client")
+    @patch("src.agents.theme_proposal_agent.search_with_snapshots")
     def test_propose_full_flow(
         self,
-        mock_get_tavily,
+        mock_search,
         mock_get_anthropic,
         mock_rag_service,
         mock_tavily_response,
@@ -296,9 +294,7 @@ class TestThemeProposalAgent:
     ):
         """Test full proposal flow with all components."""
         # Setup mocks
-        mock_tavily_client = Mock()
-        mock_tavily_client.search.return_value = mock_tavily_response
-        mock_get_tavily.return_value = mock_tavily_client
+        mock_search.return_value = mock_tavily_response
 
         mock_anthropic_client = Mock()
         mock_anthropic_client.messages.create.return_value = mock_anthropic_response
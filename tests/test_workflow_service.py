@@ -222,7 +222,7 @@ class TestRunGenerationWithReview:
         mock_snippet_repo.get_by_article_id.return_value = mock_snippets
         mock_snippet_repo_class.return_value = mock_snippet_repo
 
-        def mock_run_phase(state, phase, callback):
+        def mock_run_phase(state, phase, callback, **node_kwargs):
             if phase == "drafting":
                 state["draft_content_md"] = "# 生成された記事"
                 state["title_candidates"] = ["タイトル1"]
@@ -274,7 +274,7 @@ class TestRunGenerationWithReview:
 
         call_count = {"drafting": 0, "review": 0}
 
-        def mock_run_phase(state, phase, callback):
+        def mock_run_phase(state, phase, callback, **node_kwargs):
             if phase == "drafting":
                 call_count["drafting"] += 1
                 state["draft_content_md"] = f"# 記事 v{call_count['drafting']}"
@@ -338,7 +338,7 @@ class TestRunGenerationWithReview:
 
         call_count = {"drafting": 0, "review": 0}
 
-        def mock_run_phase(state, phase, callback):
+        def mock_run_phase(state, phase, callback, **node_kwargs):
             if phase == "drafting":
                 call_count["drafting"] += 1
                 state["draft_content_md"] = "# 記事"
@@ -412,6 +412,65 @@ class TestSyncResearchToDb:
         mock_repo.update.assert_called_once_with(mock_article)
 
 
+class TestSyncCompleteToDb:
+    """Tests for _sync_complete_to_db method."""
+
+    @patch("src.agents.writer_agent.WriterAgent")
+    @patch("src.workflow.service.get_session")
+    @patch("src.workflow.service.ArticleRepository")
+    def test_enhancements_run_concurrently_outside_session(
+        self, mock_repo_class, mock_get_session, mock_writer_class
+    ):
+        """Test the SEO calls overlap, hold no session, and their results are written in one update."""
+        import threading
+
+        open_sessions = []
+        mock_get_session.return_value.__enter__ = Mock(side_effect=lambda: open_sessions.append(1))
+        mock_get_session.return_value.__exit__ = Mock(side_effect=lambda *a: open_sessions.pop())
+
+        mock_article = Mock(title="予算管理入門", target_persona="経営企画部長")
+        mock_repo = Mock()
+        mock_repo.get_by_id.return_value = mock_article
+        mock_repo_class.return_value = mock_repo
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def llm_step(value):
+            def call(*args):
+                assert not open_sessions
+                barrier.wait()
+                return value
+            return call
+
+        writer = mock_writer_class.return_value
+        writer.generate_meta_description.side_effect = llm_step("メタ説明")
+        writer.generate_faq_schema.side_effect = llm_step({"mainEntity": [{"name": "Q"}]})
+        writer.generate_cta_variants.side_effect = llm_step({})
+
+        state = {
+            "draft_content_md": "# 予算管理入門\n\n本文",
+            "seo_keywords": "予算管理",
+            "title_candidates": [],
+            "image_prompts": [],
+            "image_suggestions": [],
+            "sns_posts": {},
+            "review_score": 85,
+            "review_feedback": "",
+        }
+
+        service = WorkflowService()
+        with patch("src.config.get_settings") as mock_settings:
+            mock_settings.return_value = Mock(archive_write_through=False)
+            service._sync_complete_to_db("test-id", state)
+
+        assert mock_get_session.return_value.__enter__.call_count == 2
+        assert mock_article.meta_description == "メタ説明"
+        assert mock_article.structured_data == {"mainEntity": [{"name": "Q"}]}
+        assert "primary_keyword" in mock_article.keyword_analysis
+        assert mock_article.status == ArticleStatus.COMPLETED
+        mock_repo.update.assert_called_once_with(mock_article)
+
+
 class TestGetWorkflowStatus:
     """Tests for get_workflow_status method."""
 